@@ -0,0 +1,69 @@
+"""Persistent notification inbox with unread counters
+
+Revision ID: 20261018_000002
+Revises: 20260117_000001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_000002'
+down_revision: Union[str, None] = '20260117_000001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'inbox_notifications',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('tenant_id', sa.String(100), nullable=False, server_default='tenant_default'),
+        sa.Column('notification_id', sa.String(50), nullable=False, unique=True),
+        sa.Column('notification_type', sa.String(50), nullable=False),
+        sa.Column('recipient_user_id', sa.String(50), nullable=False),
+        sa.Column('recipient_email', sa.String(255)),
+        sa.Column('subject', sa.String(500), nullable=False, server_default=''),
+        sa.Column('body', sa.Text),
+        sa.Column('context', sa.JSON),
+        sa.Column('reference_type', sa.String(50)),
+        sa.Column('reference_id', sa.String(100)),
+        sa.Column('priority', sa.String(20), server_default='normal'),
+        sa.Column('action_url', sa.String(500)),
+        sa.Column('action_label', sa.String(100)),
+        sa.Column('is_read', sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column('read_at', sa.DateTime),
+        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime),
+    )
+
+    op.create_index(
+        'ix_inbox_user_created', 'inbox_notifications',
+        ['tenant_id', 'recipient_user_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_inbox_user_unread', 'inbox_notifications',
+        ['tenant_id', 'recipient_user_id', 'is_read']
+    )
+    op.create_index('ix_inbox_read_at', 'inbox_notifications', ['is_read', 'read_at'])
+
+    op.create_table(
+        'inbox_counters',
+        sa.Column('tenant_id', sa.String(100), primary_key=True),
+        sa.Column('user_id', sa.String(50), primary_key=True),
+        sa.Column('unread_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('total_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('inbox_counters')
+    op.drop_index('ix_inbox_read_at', table_name='inbox_notifications')
+    op.drop_index('ix_inbox_user_unread', table_name='inbox_notifications')
+    op.drop_index('ix_inbox_user_created', table_name='inbox_notifications')
+    op.drop_table('inbox_notifications')
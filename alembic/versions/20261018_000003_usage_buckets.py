@@ -0,0 +1,45 @@
+"""Time-bucketed usage metering table
+
+Revision ID: 20261018_000003
+Revises: 20261018_000002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_000003'
+down_revision: Union[str, None] = '20261018_000002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'usage_buckets',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('tenant_id', sa.String(100), nullable=False),
+        sa.Column('usage_type', sa.String(50), nullable=False),
+        sa.Column('granularity', sa.String(10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime, nullable=False),
+        sa.Column('quantity', sa.Float, nullable=False, server_default='0'),
+        sa.Column('event_count', sa.Integer, nullable=False, server_default='0'),
+        sa.UniqueConstraint(
+            'tenant_id', 'usage_type', 'granularity', 'bucket_start',
+            name='uq_usage_bucket'
+        )
+    )
+
+    op.create_index(
+        'ix_usage_buckets_range', 'usage_buckets',
+        ['tenant_id', 'granularity', 'bucket_start']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_usage_buckets_range', table_name='usage_buckets')
+    op.drop_table('usage_buckets')
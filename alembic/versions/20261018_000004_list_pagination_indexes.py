@@ -0,0 +1,53 @@
+"""Keyset pagination and user search indexes
+
+Revision ID: 20261018_000004
+Revises: 20261018_000003
+Create Date: 2026-10-18
+
+- Composite indexes matching the users / violations keyset orderings
+- PostgreSQL only: pg_trgm GIN index over the user search document used
+  by UserRepository.search_document()
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_000004'
+down_revision: Union[str, None] = '20261018_000003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keep in sync with UserRepository.search_document()
+USER_SEARCH_DOCUMENT = (
+    "lower(coalesce(full_name, '') || ' ' || coalesce(email, '') || ' ' || "
+    "user_id || ' ' || username || ' ' || coalesce(department, ''))"
+)
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_users_keyset_name', 'users',
+        ['tenant_id', sa.text("coalesce(full_name, '')"), 'id']
+    )
+    op.create_index(
+        'ix_risk_violations_keyset', 'risk_violations',
+        ['tenant_id', 'detected_at', 'id']
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            f"CREATE INDEX ix_users_search_trgm ON users "
+            f"USING gin (({USER_SEARCH_DOCUMENT}) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_users_search_trgm")
+    op.drop_index('ix_risk_violations_keyset', table_name='risk_violations')
+    op.drop_index('ix_users_keyset_name', table_name='users')
@@ -0,0 +1,34 @@
+"""Materialized tenant statistics summaries
+
+Revision ID: 20261018_000005
+Revises: 20261018_000004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_000005'
+down_revision: Union[str, None] = '20261018_000004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tenant_stats_summaries',
+        sa.Column('tenant_id', sa.String(100), primary_key=True),
+        sa.Column('entity', sa.String(50), primary_key=True),
+        sa.Column('payload', sa.JSON, nullable=False),
+        sa.Column('version', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('computed_version', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('computed_at', sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tenant_stats_summaries')
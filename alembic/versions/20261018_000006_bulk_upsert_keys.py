@@ -0,0 +1,49 @@
+"""Natural-key unique indexes for bulk upserts
+
+Revision ID: 20261018_000006
+Revises: 20261018_000005
+Create Date: 2026-10-18
+
+BaseRepository.bulk_upsert issues INSERT ... ON CONFLICT on the natural
+key, which needs a unique index to infer. users and roles already have
+unique constraints; rules and violations get unique indexes (these work on
+SQLite too, unlike ALTER TABLE ADD CONSTRAINT). Nothing enforced these keys
+before, so existing duplicates are collapsed to the newest row (highest id)
+first; no other table references risk_rules.id or risk_violations.id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_000006'
+down_revision: Union[str, None] = '20261018_000005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _delete_duplicates(table: str, key: str) -> None:
+    op.execute(
+        f"DELETE FROM {table} WHERE id NOT IN ("
+        f"SELECT MAX(id) FROM {table} GROUP BY tenant_id, {key})"
+    )
+
+
+def upgrade() -> None:
+    _delete_duplicates('risk_rules', 'rule_id')
+    _delete_duplicates('risk_violations', 'violation_id')
+    op.create_index(
+        'uq_risk_rules_tenant_rule', 'risk_rules',
+        ['tenant_id', 'rule_id'], unique=True
+    )
+    op.create_index(
+        'uq_risk_violations_tenant_violation', 'risk_violations',
+        ['tenant_id', 'violation_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_risk_violations_tenant_violation', table_name='risk_violations')
+    op.drop_index('uq_risk_rules_tenant_rule', table_name='risk_rules')
@@ -0,0 +1,35 @@
+"""Delivery status on inbox notifications
+
+Revision ID: 20261018_000007
+Revises: 20261018_000006
+Create Date: 2026-10-18
+
+NotificationService and the dispatcher write each notification's channel
+delivery results back to the inbox row.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_000007'
+down_revision: Union[str, None] = '20261018_000006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'inbox_notifications',
+        sa.Column('is_sent', sa.Boolean, nullable=False, server_default=sa.false())
+    )
+    op.add_column('inbox_notifications', sa.Column('sent_at', sa.DateTime))
+    op.add_column('inbox_notifications', sa.Column('delivery_status', sa.JSON))
+
+
+def downgrade() -> None:
+    op.drop_column('inbox_notifications', 'delivery_status')
+    op.drop_column('inbox_notifications', 'sent_at')
+    op.drop_column('inbox_notifications', 'is_sent')
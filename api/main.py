@@ -19,7 +19,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 import time
 
 from api.routers import (
@@ -53,6 +55,8 @@ from api.routers import (
 )
 from api.middleware import TenantMiddleware
 from db.database import init_db, db_manager
+from core.scheduler import sync_scheduler, SyncType, JobPriority
+from connectors.sap.extractors import SAPExtractorConfig, register_sync_sources
 
 # Configure logging
 logging.basicConfig(
@@ -69,9 +73,47 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Governex+ Platform...")
     init_db()
     logger.info("Database initialized")
+    metering = tenants.billing.usage_meter.engine
+    restored = metering.restore(tenants.usage_sink.load(metering.config.retention_seconds))
+    tenants.billing.usage_meter.restore_rate_limits()
+    metering.start_background_flush()
+    logger.info(f"Usage metering started ({restored} buckets restored)")
+    notifications.notification_service.enable_async_dispatch()
+    logger.info("Notification dispatcher started")
+    sync_scheduler.register_task("notification_inbox_compaction", notifications.compact_inbox)
+    sync_scheduler.create_job(
+        tenant_id="tenant_default",
+        name="Notification Inbox Compaction",
+        sync_type=SyncType.CUSTOM,
+        system_id="platform",
+        interval_minutes=1440,
+        config={"task": "notification_inbox_compaction"},
+        priority=JobPriority.LOW
+    )
+    sap_config = SAPExtractorConfig.from_env()
+    if sap_config.ashost or sap_config.mshost:
+        sap_system_id = os.getenv("SAP_SYSTEM_ID", "SAP")
+        register_sync_sources(sync_scheduler, sap_system_id, sap_config)
+        for name, sync_type in (("SAP User Sync", SyncType.FULL_USER_SYNC),
+                                ("SAP Role Sync", SyncType.FULL_ROLE_SYNC)):
+            sync_scheduler.create_job(
+                tenant_id="tenant_default",
+                name=name,
+                sync_type=sync_type,
+                system_id=sap_system_id,
+                interval_minutes=1440
+            )
+        logger.info(f"SAP user/role sync scheduled for {sap_system_id}")
+    await sync_scheduler.start()
     yield
     # Shutdown
     logger.info("Shutting down Governex+ Platform...")
+    await sync_scheduler.stop()
+    tenants.billing.usage_meter.engine.stop()
+    if notifications.notification_service.dispatcher is not None:
+        # Draining waits on worker threads; keep it off the event loop
+        await asyncio.to_thread(notifications.notification_service.dispatcher.stop, drain=True)
+    await db_manager.dispose_async()
 
 
 # Create FastAPI application
@@ -119,8 +161,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Multi-tenant middleware
-app.add_middleware(TenantMiddleware)
+# Multi-tenant middleware (shares the tenant router's manager so tenant
+# updates invalidate cached request contexts, and its usage meter)
+app.add_middleware(
+    TenantMiddleware,
+    tenant_manager=tenants.tenant_manager,
+    usage_meter=tenants.billing.usage_meter
+)
 
 
 # Request timing middleware
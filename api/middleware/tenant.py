@@ -3,16 +3,45 @@
 
 from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 import re
 
 from core.tenant import (
-    TenantManager, TenantStatus,
+    TenantManager,
     set_current_tenant, TenantContext,
-    create_tenant_context_from_request
+    create_tenant_context_from_request,
+    TenantContextCache,
+    UsageMeter, UsageType
 )
 
 
+# Subdomain pattern: tenant.grc-platform.com or tenant.localhost
+_SUBDOMAIN_RE = re.compile(r'^([a-z0-9-]+)\.(grc-platform\.com|localhost)')
+_NON_TENANT_SUBDOMAINS = frozenset(['www', 'api', 'app', 'admin'])
+
+
+class PathClassifier:
+    """
+    Matches a path against a set of prefixes with one compiled regex.
+
+    A prefix matches the path itself or anything below it ("/risk" matches
+    "/risk" and "/risk/rules" but not "/risky").
+    """
+
+    def __init__(self, prefixes: List[str]):
+        self.prefixes = list(prefixes)
+        if self.prefixes:
+            alternation = "|".join(
+                re.escape(p) for p in sorted(set(self.prefixes), key=len, reverse=True)
+            )
+            self._pattern = re.compile(f"(?:{alternation})(?:/|$)")
+        else:
+            self._pattern = None
+
+    def matches(self, path: str) -> bool:
+        return self._pattern is not None and self._pattern.match(path) is not None
+
+
 class TenantMiddleware(BaseHTTPMiddleware):
     """
     Multi-Tenant Middleware
@@ -33,9 +62,19 @@ class TenantMiddleware(BaseHTTPMiddleware):
     - Usage tracking per tenant
     """
 
-    def __init__(self, app, tenant_manager: TenantManager = None):
+    def __init__(
+        self,
+        app,
+        tenant_manager: TenantManager = None,
+        context_cache: TenantContextCache = None,
+        usage_meter: UsageMeter = None
+    ):
         super().__init__(app)
         self.tenant_manager = tenant_manager or TenantManager()
+        self.context_cache = context_cache or TenantContextCache(self.tenant_manager)
+
+        # Optional API metering and daily rate limiting per tenant
+        self.usage_meter = usage_meter
 
         # Paths that don't require tenant context
         # In production, reduce this list and require tenant for most paths
@@ -94,6 +133,13 @@ class TenantMiddleware(BaseHTTPMiddleware):
             "/tenants",  # Tenant management
         ]
 
+        self.refresh_path_rules()
+
+    def refresh_path_rules(self):
+        """Recompile path classifiers after editing public_paths/admin_paths"""
+        self._public_classifier = PathClassifier(self.public_paths)
+        self._admin_classifier = PathClassifier(self.admin_paths)
+
     async def dispatch(self, request: Request, call_next: Callable):
         """Process request with tenant context"""
         path = request.url.path
@@ -126,79 +172,55 @@ class TenantMiddleware(BaseHTTPMiddleware):
                        "Provide X-Tenant-ID header or use subdomain."
             )
 
-        # Get tenant
-        tenant = self.tenant_manager.get_tenant(tenant_id)
-        if not tenant:
+        # Resolve cached tenant template (rebuilt only when the tenant changes)
+        template = self.context_cache.get_template(tenant_id)
+        if template is None:
             return self._error_response(
                 status_code=404,
                 message=f"Tenant not found: {tenant_id}"
             )
 
         # Validate tenant status
-        if tenant.status == TenantStatus.SUSPENDED:
-            return self._error_response(
-                status_code=403,
-                message="This account has been suspended. "
-                       "Please contact support."
-            )
-
-        if tenant.status == TenantStatus.DEACTIVATED:
-            return self._error_response(
-                status_code=403,
-                message="This account has been deactivated."
-            )
-
-        if tenant.status != TenantStatus.ACTIVE:
-            return self._error_response(
-                status_code=403,
-                message=f"Tenant is not active (status: {tenant.status.value})"
-            )
+        if template.rejection:
+            status_code, message = template.rejection
+            return self._error_response(status_code=status_code, message=message)
+
+        # Enforce the tier's daily API budget and meter the call
+        if self.usage_meter is not None:
+            limit = template.limits.get("max_api_calls_per_day")
+            if limit:
+                decision = self.usage_meter.check_rate_limit(
+                    template.tenant_id, UsageType.API_CALLS, limit, consume=True
+                )
+                if not decision["within_limit"]:
+                    response = self._error_response(
+                        status_code=429,
+                        message="Daily API call limit reached for this tenant."
+                    )
+                    response.headers["Retry-After"] = str(decision["retry_after_seconds"])
+                    return response
+            self.usage_meter.record(template.tenant_id, UsageType.API_CALLS)
 
         # Extract user context from JWT (simplified)
         user_data = self._extract_user_context(request)
 
-        # Create and set tenant context
-        context = TenantContext(
-            tenant_id=tenant.id,
-            tenant_slug=tenant.slug,
-            tenant_name=tenant.name,
-            user_id=user_data.get("user_id"),
-            user_email=user_data.get("email"),
-            user_roles=user_data.get("roles", []),
-            is_tenant_admin=user_data.get("is_admin", False),
+        # Create per-request context from the shared template
+        context = template.build_context(
+            user_data,
             request_id=request.headers.get("X-Request-ID", ""),
-            source_ip=request.client.host if request.client else "",
-            config={
-                "timezone": tenant.config.timezone,
-                "language": tenant.config.language,
-                "enabled_modules": tenant.config.enabled_modules
-            },
-            limits={
-                "max_users": tenant.limits.max_users,
-                "max_systems": tenant.limits.max_systems,
-                "max_api_calls_per_day": tenant.limits.max_api_calls_per_day
-            },
-            features={
-                "sso_enabled": tenant.limits.sso_enabled,
-                "ai_features": tenant.limits.ai_features,
-                "advanced_analytics": tenant.limits.advanced_analytics,
-                "custom_branding": tenant.limits.custom_branding
-            }
+            source_ip=request.client.host if request.client else ""
         )
 
         # Set context for this request
         set_current_tenant(context)
 
-        # Track API usage (would be async in production)
-        # billing.track_api_call(tenant_id)
-
         try:
             # Process request
             response = await call_next(request)
 
             # Add tenant info to response headers
             response.headers["X-Tenant-ID"] = tenant_id
-            response.headers["X-Tenant-Slug"] = tenant.slug
+            response.headers["X-Tenant-Slug"] = template.tenant_slug
 
             return response
 
@@ -231,12 +253,11 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
     def _extract_subdomain(self, host: str) -> Optional[str]:
         """Extract subdomain from host"""
-        # Match: tenant.grc-platform.com or tenant.localhost
-        match = re.match(r'^([a-z0-9-]+)\.(grc-platform\.com|localhost)', host)
+        match = _SUBDOMAIN_RE.match(host)
         if match:
             subdomain = match.group(1)
             # Exclude common non-tenant subdomains
-            if subdomain not in ['www', 'api', 'app', 'admin']:
+            if subdomain not in _NON_TENANT_SUBDOMAINS:
                 return subdomain
         return None
 
@@ -253,17 +274,11 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
     def _is_public_path(self, path: str) -> bool:
         """Check if path is public"""
-        for public_path in self.public_paths:
-            if path == public_path or path.startswith(f"{public_path}/"):
-                return True
-        return False
+        return self._public_classifier.matches(path)
 
     def _is_admin_path(self, path: str) -> bool:
         """Check if path requires admin access"""
-        for admin_path in self.admin_paths:
-            if path == admin_path or path.startswith(f"{admin_path}/"):
-                return True
-        return False
+        return self._admin_classifier.matches(path)
 
     def _error_response(self, status_code: int, message: str):
         """Create error response with CORS headers"""
@@ -19,6 +19,9 @@ import hashlib
 import secrets
 from pathlib import Path
 
+from db import database
+from db.instrumentation import query_registry
+
 router = APIRouter(tags=["Super Admin"])
 
 
@@ -612,6 +615,33 @@ async def delete_tenant_user(tenant_id: str, user_id: str):
     return {"success": True, "message": "User deleted"}
 
 
+# ==================== Database ====================
+
+@router.get("/database/pools")
+async def get_database_pools():
+    """Connection pool occupancy and checkout wait times (primary and read replica)"""
+    return {
+        "read_replica": database.db_manager.has_read_replica,
+        "pools": database.db_manager.get_pool_metrics(),
+    }
+
+
+@router.get("/database/queries")
+async def get_query_stats(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|calls)$")
+):
+    """Database time by repository call site, top statements and the slowest executions"""
+    return database.db_manager.get_query_stats(limit, order_by)
+
+
+@router.post("/database/queries/reset")
+async def reset_query_stats():
+    """Clear collected statement statistics"""
+    query_registry.reset()
+    return {"success": True, "message": "Query statistics reset"}
+
+
 # ==================== Available Tiers & Modules ====================
 
 @router.get("/tiers")
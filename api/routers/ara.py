@@ -620,6 +620,70 @@ async def toggle_sod_rule(rule_id: str, enabled: bool = Query(...)):
     return {"status": "updated", "rule_id": rule_id, "enabled": enabled}
 
 
+# =============================================================================
+# Profiling Endpoints
+# =============================================================================
+
+@router.get("/profiling/rules", response_model=Dict[str, Any])
+async def get_costly_rules(
+    limit: int = Query(default=20, ge=1, le=500),
+    sort_by: str = Query(default="total_time")
+):
+    """
+    Get the most costly rules since profiling was enabled.
+
+    sort_by: total_time, avg_time, max_time, evaluations or hits.
+    """
+    profiler = get_ara_engine().profiler
+
+    try:
+        rules = profiler.top_rules(limit=limit, sort_by=sort_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {**profiler.get_summary(), "sort_by": sort_by, "rules": rules}
+
+
+@router.get("/profiling/report", response_model=Dict[str, Any])
+async def get_profiling_report(limit: int = Query(default=20, ge=1, le=500)):
+    """Get rule, operator, analyzer latency and sampling profiles."""
+    return get_ara_engine().profiler.get_report(limit=limit)
+
+
+@router.put("/profiling/toggle")
+async def toggle_profiling(
+    enabled: bool = Query(...),
+    track_operators: bool = Query(True),
+    sampling: bool = Query(False),
+    sampling_interval_ms: float = Query(default=5.0, ge=1.0, le=1000.0)
+):
+    """Enable or disable ARA profiling (off by default)."""
+    profiler = get_ara_engine().profiler
+
+    if enabled:
+        try:
+            profiler.enable(
+                track_operators=track_operators,
+                sampling=sampling,
+                sampling_interval=sampling_interval_ms / 1000
+            )
+        except RuntimeError as e:
+            # Sampling needs SIGPROF and the main thread
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        profiler.disable()
+
+    return {"status": "updated", **profiler.get_summary()}
+
+
+@router.post("/profiling/reset")
+async def reset_profiling():
+    """Clear collected profiling data."""
+    profiler = get_ara_engine().profiler
+    profiler.reset()
+    return {"status": "reset", **profiler.get_summary()}
+
+
 # =============================================================================
 # Mitigation Control Endpoints
 # =============================================================================
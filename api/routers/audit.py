@@ -9,14 +9,16 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 
-from audit.logger import AuditLogger, AuditAction
-from db.database import get_db
+from audit.logger import AuditAction
+from db.database import get_db, get_async_read_db
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from repositories.async_repository import AsyncAuditLogRepository
 
 router = APIRouter(tags=["Audit"])
 
-# Initialize audit logger
-audit_logger = AuditLogger()
+# Log queries and reports read through async sessions on the read replica
+# (the primary when DATABASE_READ_URL is unset)
 
 
 # =============================================================================
@@ -56,7 +58,8 @@ async def get_audit_logs(
     end_date: Optional[datetime] = Query(None, description="End date filter"),
     success_only: bool = Query(False, description="Only return successful actions"),
     limit: int = Query(100, le=1000, description="Maximum results"),
-    offset: int = Query(0, description="Offset for pagination")
+    offset: int = Query(0, description="Offset for pagination"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Query audit logs with filters.
@@ -73,7 +76,7 @@ async def get_audit_logs(
                     action_enum = a
                     break
 
-    logs = audit_logger.query(
+    logs = await AsyncAuditLogRepository(db).query_logs(
         action=action_enum,
         actor_user_id=actor,
         target_id=target_id,
@@ -124,12 +127,18 @@ async def list_audit_actions():
 @router.get("/logs/user/{user_id}")
 async def get_user_audit_trail(
     user_id: str,
-    days: int = Query(30, description="Number of days to look back")
+    days: int = Query(30, description="Number of days to look back"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get complete audit trail for a specific user.
     """
-    activities = audit_logger.get_user_activity(user_id, days)
+    logs = await AsyncAuditLogRepository(db).query_logs(
+        actor_user_id=user_id,
+        start_date=datetime.utcnow() - timedelta(days=days),
+        limit=1000
+    )
+    activities = [log.to_dict() for log in logs]
 
     return {
         'user_id': user_id,
@@ -143,24 +152,21 @@ async def get_user_audit_trail(
 async def get_target_audit_trail(
     target_type: str,
     target_id: str,
-    days: int = Query(90, description="Number of days to look back")
+    days: int = Query(90, description="Number of days to look back"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get audit trail for a specific target object.
     """
     start_date = datetime.utcnow() - timedelta(days=days)
 
-    logs = audit_logger.query(
+    logs = await AsyncAuditLogRepository(db).query_logs(
         target_id=target_id,
+        target_type=target_type,
         start_date=start_date,
         limit=1000
     )
-
-    # Filter by target type
-    filtered_logs = [
-        log.to_dict() for log in logs
-        if log.target_type == target_type
-    ]
+    filtered_logs = [log.to_dict() for log in logs]
 
     return {
         'target_type': target_type,
@@ -176,24 +182,32 @@ async def get_target_audit_trail(
 # =============================================================================
 
 @router.post("/reports/compliance")
-async def generate_compliance_report(request: ComplianceReportRequest):
+async def generate_compliance_report(
+    request: ComplianceReportRequest,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Generate a compliance report for a date range.
 
     This report aggregates all compliance-relevant audit entries.
     """
-    report = audit_logger.get_compliance_report(
-        start_date=request.start_date,
-        end_date=request.end_date,
-        tags=request.compliance_tags
+    summary = await AsyncAuditLogRepository(db).get_compliance_summary(
+        request.start_date, request.end_date
     )
 
-    return report
+    return {
+        'period': {
+            'start': request.start_date.isoformat(),
+            'end': request.end_date.isoformat()
+        },
+        **summary
+    }
 
 
 @router.get("/reports/summary")
 async def get_audit_summary(
-    days: int = Query(30, description="Number of days to summarize")
+    days: int = Query(30, description="Number of days to summarize"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get a summary of audit activity for the specified period.
@@ -201,38 +215,7 @@ async def get_audit_summary(
     start_date = datetime.utcnow() - timedelta(days=days)
     end_date = datetime.utcnow()
 
-    logs = audit_logger.query(
-        start_date=start_date,
-        end_date=end_date,
-        limit=10000
-    )
-
-    # Aggregate by action
-    by_action = {}
-    by_actor = {}
-    by_day = {}
-    failed_count = 0
-
-    for log in logs:
-        # By action
-        action = log.action.value
-        by_action[action] = by_action.get(action, 0) + 1
-
-        # By actor
-        if log.actor_user_id:
-            by_actor[log.actor_user_id] = by_actor.get(log.actor_user_id, 0) + 1
-
-        # By day
-        day = log.timestamp.strftime('%Y-%m-%d')
-        by_day[day] = by_day.get(day, 0) + 1
-
-        # Failed count
-        if not log.success:
-            failed_count += 1
-
-    # Sort by count
-    top_actors = sorted(by_actor.items(), key=lambda x: x[1], reverse=True)[:10]
-    top_actions = sorted(by_action.items(), key=lambda x: x[1], reverse=True)[:10]
+    summary = await AsyncAuditLogRepository(db).get_activity_summary(start_date, end_date)
 
     return {
         'period': {
@@ -240,43 +223,29 @@ async def get_audit_summary(
             'end': end_date.isoformat(),
             'days': days
         },
-        'total_entries': len(logs),
-        'failed_actions': failed_count,
-        'unique_actors': len(by_actor),
-        'top_actors': [{'user_id': a[0], 'count': a[1]} for a in top_actors],
-        'top_actions': [{'action': a[0], 'count': a[1]} for a in top_actions],
-        'by_day': by_day
+        **summary
     }
 
 
 @router.get("/reports/firefighter")
 async def get_firefighter_audit_report(
     days: int = Query(30, description="Number of days to report"),
-    session_id: Optional[str] = Query(None, description="Filter by specific session")
+    session_id: Optional[str] = Query(None, description="Filter by specific session"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Generate a firefighter activity audit report.
     """
     start_date = datetime.utcnow() - timedelta(days=days)
 
-    # Get all firefighter-related logs
-    all_logs = audit_logger.query(
+    # Firefighter actions only, filtered in the query
+    ff_logs = await AsyncAuditLogRepository(db).query_logs(
         start_date=start_date,
+        action_prefix='ff_',
+        target_id=session_id,
         limit=10000
     )
 
-    # Filter to firefighter actions
-    ff_logs = [
-        log for log in all_logs
-        if log.action.value.startswith('ff_')
-    ]
-
-    if session_id:
-        ff_logs = [
-            log for log in ff_logs
-            if log.target_id == session_id
-        ]
-
     # Aggregate by action type
     by_action = {}
     sessions = set()
@@ -305,7 +274,8 @@ async def get_firefighter_audit_report(
 async def export_audit_logs_csv(
     start_date: datetime = Query(..., description="Start date"),
     end_date: datetime = Query(..., description="End date"),
-    action: Optional[str] = Query(None, description="Filter by action type")
+    action: Optional[str] = Query(None, description="Filter by action type"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Export audit logs as CSV (returns data in CSV-friendly format).
@@ -317,7 +287,7 @@ async def export_audit_logs_csv(
                 action_enum = a
                 break
 
-    logs = audit_logger.query(
+    logs = await AsyncAuditLogRepository(db).query_logs(
         action=action_enum,
         start_date=start_date,
         end_date=end_date,
@@ -103,12 +103,42 @@ async def create_campaign(campaign: CreateCampaignModel):
 
 
 @router.post("/campaigns/{campaign_id}/generate-items")
-async def generate_campaign_items(campaign_id: str):
+async def generate_campaign_items(
+    campaign_id: str,
+    stream: bool = Query(False, description="Generate from the user repository in the background"),
+    batch_size: int = Query(1000, ge=1, le=50000)
+):
     """
     Generate certification items for a campaign.
 
-    Pulls data from connected systems based on campaign scope.
+    Pulls data from connected systems based on campaign scope. With
+    stream=true, items are generated in batches in the background; poll
+    /generation-progress and the items endpoint while it runs.
     """
+    if stream:
+        campaign = certification_manager.get_campaign(campaign_id)
+        if not campaign:
+            raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
+        if campaign.status != CampaignStatus.DRAFT:
+            raise HTTPException(status_code=400, detail="Can only generate items for draft campaigns")
+        progress = certification_manager.get_generation_progress(campaign_id)
+        if progress and progress.status == "running":
+            raise HTTPException(status_code=409, detail="Item generation is already running")
+
+        # Marks the generation running before returning, so a concurrent
+        # request gets the 409 above
+        try:
+            certification_manager.start_streaming_generation(campaign_id, batch_size=batch_size)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "campaign_id": campaign_id,
+            "status": campaign.status.value,
+            "generation": "started",
+            "message": "Item generation started. Poll /generation-progress for status."
+        }
+
     try:
         campaign = await certification_manager.generate_campaign_items(campaign_id)
 
@@ -123,6 +153,15 @@ async def generate_campaign_items(campaign_id: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/campaigns/{campaign_id}/generation-progress")
+async def get_generation_progress(campaign_id: str):
+    """Progress of a streaming item generation"""
+    progress = certification_manager.get_generation_progress(campaign_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="No item generation for this campaign")
+    return progress.to_dict()
+
+
 @router.post("/campaigns/{campaign_id}/start")
 async def start_campaign(campaign_id: str):
     """
@@ -55,6 +55,10 @@ class CorrelateAccountsRequest(BaseModel):
     target_accounts: List[Dict]
 
 
+class LoadSystemAccountsRequest(BaseModel):
+    accounts: List[Dict]
+
+
 class MitigateConflictRequest(BaseModel):
     control_id: str
 
@@ -205,6 +209,16 @@ async def correlate_accounts(request: CorrelateAccountsRequest):
     }
 
 
+@router.post("/systems/{system_id}/accounts")
+async def load_system_accounts(system_id: str, request: LoadSystemAccountsRequest):
+    """Load a system's account feed for automatic correlation"""
+    loaded = cross_system_manager.load_system_accounts(system_id, request.accounts)
+    return {
+        "system_id": system_id,
+        "accounts_loaded": loaded
+    }
+
+
 @router.post("/correlate/auto")
 async def run_auto_correlation():
     """Run automatic correlation across all systems"""
@@ -4,13 +4,17 @@ Dashboard API Router
 Endpoints for real-time dashboards and analytics.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 
 from core.analytics import DashboardManager, MetricsCollector
 from core.analytics.metrics import MetricCategory
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import database
+from db.database import get_async_read_db
+from services.stats_service import StatsService
 
 router = APIRouter(tags=["Dashboard"])
 
@@ -42,6 +46,37 @@ async def get_dashboard_stats():
         "riskTrend": "down" if (metrics_collector.get_current("risk.score.average") or 50) < 50 else "up"
     }
 
+
+@router.get("/stats/tenant")
+async def get_tenant_stats(
+    refresh: bool = Query(False, description="Recompute instead of serving cached statistics"),
+    db: AsyncSession = Depends(get_async_read_db),
+    x_tenant_id: Optional[str] = Header(None)
+):
+    """
+    User, violation and rule statistics for the tenant.
+
+    Served from the per-tenant statistics cache; writes to users,
+    violations or rules invalidate it. With a read replica configured the
+    aggregates run on the replica (summary rows are only maintained on the
+    primary).
+    """
+    tenant_id = x_tenant_id or "tenant_default"
+    use_summaries = not database.db_manager.has_read_replica
+
+    def load(session):
+        service = StatsService(session, use_summaries=use_summaries)
+        if refresh:
+            return service.refresh(tenant_id)
+        return service.get_dashboard_stats(tenant_id)
+
+    stats = await db.run_sync(load)
+    if use_summaries:
+        # Persist summary rows recomputed by this read
+        await db.commit()
+    return stats
+
+
 # Seed some sample metrics for demonstration
 def _seed_sample_metrics():
     """Seed sample metrics for demo purposes"""
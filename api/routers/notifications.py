@@ -9,13 +9,21 @@ from enum import Enum
 
 from core.notifications import (
     NotificationService, Notification, NotificationType,
-    NotificationChannel, NotificationPriority
+    NotificationChannel, NotificationPriority, DatabaseInbox
 )
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
-# Global service instance
-notification_service = NotificationService()
+# Global service instance (inbox persisted in the database)
+notification_service = NotificationService(inbox=DatabaseInbox())
+
+# Read notifications older than this are removed by the daily compaction job
+INBOX_READ_RETENTION_DAYS = 90
+
+
+def compact_inbox() -> int:
+    """Scheduled inbox compaction; returns the number of rows removed"""
+    return notification_service.compact_inbox(read_retention_days=INBOX_READ_RETENTION_DAYS)
 
 
 # ==================== Request/Response Models ====================
@@ -44,96 +52,81 @@ class NotificationPreferencesRequest(BaseModel):
 
 # ==================== User Notifications ====================
 
+def _serialize_notification(n: Notification) -> Dict[str, Any]:
+    return {
+        "id": n.notification_id,
+        "type": n.notification_type.value,
+        "title": n.subject,
+        "message": n.body,
+        "priority": n.priority.value,
+        "read": n.is_read,
+        "created_at": n.created_at.isoformat(),
+        "read_at": n.read_at.isoformat() if n.read_at else None,
+        "action_url": n.action_url,
+        "context": n.context
+    }
+
+
 @router.get("/")
 async def list_notifications(
     user_id: str,
     unread_only: bool = False,
     notification_type: Optional[str] = None,
     limit: int = Query(default=50, le=200),
-    offset: int = 0
+    cursor: Optional[str] = None
 ):
     """
     List notifications for a user
 
-    Filter by read/unread status and notification type.
+    Filter by read/unread status and notification type. Pages are
+    keyset-paginated: pass the returned next_cursor to fetch the next page.
     """
-    notifications = notification_service.get_user_notifications(
-        user_id=user_id,
-        unread_only=unread_only
-    )
-
-    # Apply type filter
+    n_type = None
     if notification_type:
         try:
             n_type = NotificationType(notification_type)
-            notifications = [n for n in notifications if n.notification_type == n_type]
         except ValueError:
-            pass
+            raise HTTPException(status_code=400, detail=f"Unknown notification type: {notification_type}")
 
-    # Apply pagination
-    total = len(notifications)
-    notifications = notifications[offset:offset + limit]
+    try:
+        page = notification_service.get_user_notifications_page(
+            user_id=user_id,
+            unread_only=unread_only,
+            notification_type=n_type,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
-        "notifications": [
-            {
-                "id": n.id,
-                "type": n.notification_type.value,
-                "title": n.title,
-                "message": n.message,
-                "priority": n.priority.value,
-                "read": n.read,
-                "created_at": n.created_at.isoformat(),
-                "read_at": n.read_at.isoformat() if n.read_at else None,
-                "action_url": n.action_url,
-                "context": n.context
-            }
-            for n in notifications
-        ],
-        "total": total,
-        "unread_count": len([n for n in notifications if not n.read])
+        "notifications": [_serialize_notification(n) for n in page["notifications"]],
+        "next_cursor": page["next_cursor"],
+        "unread_count": notification_service.get_unread_count(user_id)
     }
 
 
 @router.get("/unread-count")
 async def get_unread_count(user_id: str):
     """Get count of unread notifications for a user"""
-    notifications = notification_service.get_user_notifications(
-        user_id=user_id,
-        unread_only=True
-    )
-    return {"unread_count": len(notifications)}
+    return {"unread_count": notification_service.get_unread_count(user_id)}
 
 
 @router.get("/{notification_id}")
 async def get_notification(notification_id: str):
     """Get a specific notification"""
-    for notifications in notification_service.notifications.values():
-        for n in notifications:
-            if n.id == notification_id:
-                return {
-                    "id": n.id,
-                    "type": n.notification_type.value,
-                    "title": n.title,
-                    "message": n.message,
-                    "priority": n.priority.value,
-                    "read": n.read,
-                    "created_at": n.created_at.isoformat(),
-                    "read_at": n.read_at.isoformat() if n.read_at else None,
-                    "action_url": n.action_url,
-                    "context": n.context
-                }
-
-    raise HTTPException(status_code=404, detail="Notification not found")
+    n = notification_service.get_notification(notification_id)
+    if not n:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return _serialize_notification(n)
 
 
 @router.post("/{notification_id}/read")
 async def mark_notification_read(notification_id: str):
     """Mark a notification as read"""
-    result = notification_service.mark_as_read(notification_id)
-    if not result["success"]:
-        raise HTTPException(status_code=404, detail=result["error"])
-    return result
+    if not notification_service.mark_as_read(notification_id):
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return {"success": True, "notification_id": notification_id}
 
 
 @router.post("/mark-read")
@@ -141,8 +134,7 @@ async def mark_multiple_read(request: MarkReadRequest):
     """Mark multiple notifications as read"""
     results = []
     for nid in request.notification_ids:
-        result = notification_service.mark_as_read(nid)
-        results.append({"id": nid, "success": result["success"]})
+        results.append({"id": nid, "success": notification_service.mark_as_read(nid)})
 
     return {
         "results": results,
@@ -153,8 +145,8 @@ async def mark_multiple_read(request: MarkReadRequest):
 @router.post("/mark-all-read")
 async def mark_all_read(user_id: str):
     """Mark all notifications as read for a user"""
-    result = notification_service.mark_all_as_read(user_id)
-    return result
+    count = notification_service.mark_all_as_read(user_id)
+    return {"success": True, "marked_count": count}
 
 
 # ==================== Send Notifications ====================
@@ -413,27 +405,6 @@ async def update_preferences(user_id: str, request: NotificationPreferencesReque
 @router.get("/stats")
 async def get_notification_stats():
     """Get notification statistics"""
-    total_notifications = sum(
-        len(notifications)
-        for notifications in notification_service.notifications.values()
-    )
-
-    unread_count = sum(
-        len([n for n in notifications if not n.read])
-        for notifications in notification_service.notifications.values()
-    )
-
-    by_type = {}
-    for notifications in notification_service.notifications.values():
-        for n in notifications:
-            type_key = n.notification_type.value
-            if type_key not in by_type:
-                by_type[type_key] = 0
-            by_type[type_key] += 1
-
-    return {
-        "total_notifications": total_notifications,
-        "unread_count": unread_count,
-        "by_type": by_type,
-        "templates_count": len(notification_service.templates)
-    }
+    stats = notification_service.get_notification_stats()
+    stats["templates_count"] = len(notification_service.templates)
+    return stats
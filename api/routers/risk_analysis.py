@@ -4,7 +4,7 @@ Risk Analysis API Router
 Endpoints for running risk analysis, managing rules, and viewing violations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -13,8 +13,15 @@ from core.rules import RuleEngine, RiskSeverity, RuleType
 from core.rules.models import Entitlement, UserAccess, RiskCategory
 from connectors.sap.mock_connector import SAPMockConnector
 from connectors.base import ConnectionConfig, ConnectionType
-from db.database import get_db
+from db.database import get_db, get_async_db
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.risk_service import RiskService
+from repositories.async_repository import AsyncRiskViolationRepository
+from api.schemas.risk import (
+    ViolationFilters, ViolationStatus, ViolationSeverity, ViolationType,
+    PaginatedViolationsResponse
+)
 
 router = APIRouter(tags=["Risk Analysis"])
 
@@ -432,6 +439,59 @@ async def simulate_role_addition(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+# =============================================================================
+# Stored Violations
+# =============================================================================
+
+@router.get("/violations", response_model=PaginatedViolationsResponse)
+async def list_violations(
+    search: Optional[str] = Query(None, description="Search by violation ID, rule or user"),
+    status: Optional[ViolationStatus] = Query(None),
+    severity: Optional[ViolationSeverity] = Query(None),
+    violation_type: Optional[ViolationType] = Query(None),
+    user_id: Optional[str] = Query(None),
+    rule_id: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    limit: int = Query(100, le=1000, description="Maximum results"),
+    offset: int = Query(0, ge=0, description="Pagination offset"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimate)$", description="Total count mode"),
+    db: AsyncSession = Depends(get_async_db),
+    x_tenant_id: Optional[str] = Header(None)
+):
+    """
+    List stored violations, newest first.
+
+    Use **cursor** (the previous response's next_cursor) for deep pages and
+    **count=estimate** to skip the exact total on large tenants.
+    """
+    filters = ViolationFilters(
+        search=search,
+        status=status,
+        severity=severity,
+        violation_type=violation_type,
+        user_id=user_id,
+        rule_id=rule_id,
+        date_from=date_from,
+        date_to=date_to
+    )
+
+    try:
+        page = await AsyncRiskViolationRepository(db).get_violations_page(
+            x_tenant_id or "tenant_default",
+            cursor=cursor,
+            limit=limit,
+            offset=offset,
+            count_mode=count,
+            **RiskService.page_filters(filters)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return RiskService.page_response(page, limit, offset, cursor)
+
+
 # Legacy endpoint for backwards compatibility
 @router.post("/analyze")
 def analyze_access(payload: dict):
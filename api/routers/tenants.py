@@ -4,12 +4,12 @@
 from fastapi import APIRouter, HTTPException, Query, Header, Depends
 from pydantic import BaseModel, EmailStr
 from typing import Dict, List, Optional, Any
-from datetime import datetime
 
 from core.tenant import (
     TenantManager, Tenant, TenantStatus, TenantTier, TenantConfig,
     TenantOnboarding, OnboardingStatus,
     BillingManager, UsageMeter, UsageType,
+    MeteringEngine, DatabaseUsageSink,
     TenantIsolation, DataIsolationStrategy,
     get_current_tenant, TenantContext
 )
@@ -19,7 +19,9 @@ router = APIRouter(prefix="/tenants", tags=["Tenants"])
 # Initialize services
 tenant_manager = TenantManager()
 onboarding = TenantOnboarding()
-billing = BillingManager()
+# Usage buckets are flushed to usage_buckets and restored at startup (see main.py)
+usage_sink = DatabaseUsageSink()
+billing = BillingManager(usage_meter=UsageMeter(engine=MeteringEngine(sink=usage_sink)))
 isolation = TenantIsolation()
 
 
@@ -207,20 +209,13 @@ async def get_tenant(tenant_id: str):
 @router.put("/{tenant_id}")
 async def update_tenant(tenant_id: str, request: UpdateTenantRequest):
     """Update tenant settings"""
-    tenant = tenant_manager.get_tenant(tenant_id)
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    if request.name:
-        tenant.name = request.name
-
-    if request.config:
-        # Update config fields
-        for key, value in request.config.items():
-            if hasattr(tenant.config, key):
-                setattr(tenant.config, key, value)
-
-    tenant.updated_at = datetime.utcnow()
+    result = tenant_manager.update_config(
+        tenant_id,
+        config=request.config,
+        name=request.name
+    )
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["error"])
 
     return {"success": True, "message": "Tenant updated"}
 
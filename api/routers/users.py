@@ -10,9 +10,11 @@ from typing import List, Optional, Dict
 from datetime import datetime
 
 from sqlalchemy.orm import Session
-from db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import get_db, get_async_db
 
 from services.user_service import UserService
+from repositories.async_repository import AsyncUserRepository
 from api.schemas.user import (
     UserCreate,
     UserUpdate,
@@ -45,6 +47,14 @@ def get_current_user() -> str:
     return "system"
 
 
+async def load_user_detail(db: AsyncSession, tenant_id: str, user_id: str) -> UserDetailResponse:
+    """User detail through the async session, or 404"""
+    user = await AsyncUserRepository(db).get_user_with_details(tenant_id, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+    return UserService.detail_response(user)
+
+
 # =============================================================================
 # User CRUD Endpoints
 # =============================================================================
@@ -59,7 +69,9 @@ async def list_users(
     has_violations: Optional[bool] = Query(None, description="Filter users with violations"),
     limit: int = Query(100, le=1000, description="Maximum results"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimate)$", description="Total count mode"),
+    db: AsyncSession = Depends(get_async_db),
     tenant_id: str = Depends(get_tenant_id)
 ):
     """
@@ -70,9 +82,9 @@ async def list_users(
     - **department**: Filter by department name
     - **risk_level**: low, medium, high, critical
     - **has_violations**: true/false to filter by violation status
+    - **cursor**: Keyset cursor; prefer it over offset for deep pages
+    - **count**: exact, or estimate for a cheap approximate total
     """
-    service = UserService(db)
-
     filters = UserFilters(
         search=search,
         status=UserStatus(status) if status else None,
@@ -82,12 +94,24 @@ async def list_users(
         has_violations=has_violations
     )
 
-    return service.list_users(tenant_id, filters, limit, offset)
+    try:
+        page = await AsyncUserRepository(db).get_users_page(
+            tenant_id,
+            cursor=cursor,
+            limit=limit,
+            offset=offset,
+            count_mode=count,
+            **UserService.page_filters(filters)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return UserService.page_response(page, limit, offset, cursor)
 
 
 @router.get("/stats", response_model=UserStatsResponse)
 async def get_user_statistics(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     tenant_id: str = Depends(get_tenant_id)
 ):
     """
@@ -95,26 +119,24 @@ async def get_user_statistics(
 
     Returns counts by status, risk level, and department breakdown.
     """
-    service = UserService(db)
-    return service.get_user_stats(tenant_id)
+    return await db.run_sync(lambda session: UserService(session).get_user_stats(tenant_id))
 
 
 @router.get("/departments", response_model=List[str])
 async def list_departments(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     tenant_id: str = Depends(get_tenant_id)
 ):
     """
     Get list of unique departments.
     """
-    service = UserService(db)
-    return service.get_departments(tenant_id)
+    return await AsyncUserRepository(db).get_departments(tenant_id)
 
 
 @router.get("/{user_id}", response_model=UserDetailResponse)
 async def get_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     tenant_id: str = Depends(get_tenant_id)
 ):
     """
@@ -122,13 +144,7 @@ async def get_user(
 
     Includes roles, violations, entitlements, and risk metrics.
     """
-    service = UserService(db)
-    user = service.get_user(tenant_id, user_id)
-
-    if not user:
-        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-
-    return user
+    return await load_user_detail(db, tenant_id, user_id)
 
 
 @router.post("/", response_model=UserResponse, status_code=201)
@@ -273,17 +289,13 @@ async def revoke_role_from_user(
 @router.get("/{user_id}/risk-profile")
 async def get_user_risk_profile(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     tenant_id: str = Depends(get_tenant_id)
 ):
     """
     Get user's risk profile including score, violations, and sensitive access.
     """
-    service = UserService(db)
-    user = service.get_user(tenant_id, user_id)
-
-    if not user:
-        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+    user = await load_user_detail(db, tenant_id, user_id)
 
     return {
         "user_id": user.user_id,
@@ -326,7 +338,7 @@ async def recalculate_user_risk(
 @router.get("/{user_id}/entitlements")
 async def get_user_entitlements(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     tenant_id: str = Depends(get_tenant_id)
 ):
     """
@@ -334,11 +346,7 @@ async def get_user_entitlements(
 
     Returns the expanded authorization values from all assigned roles.
     """
-    service = UserService(db)
-    user = service.get_user(tenant_id, user_id)
-
-    if not user:
-        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+    user = await load_user_detail(db, tenant_id, user_id)
 
     return {
         "user_id": user_id,
@@ -351,7 +359,7 @@ async def get_user_entitlements(
 @router.get("/{user_id}/transactions")
 async def get_user_transactions(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     tenant_id: str = Depends(get_tenant_id)
 ):
     """
@@ -359,11 +367,7 @@ async def get_user_transactions(
 
     Filters entitlements to show only S_TCODE authorizations.
     """
-    service = UserService(db)
-    user = service.get_user(tenant_id, user_id)
-
-    if not user:
-        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+    user = await load_user_detail(db, tenant_id, user_id)
 
     # Filter to S_TCODE authorizations
     tcodes = [
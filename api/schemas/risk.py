@@ -196,6 +196,8 @@ class PaginatedViolationsResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class ViolationStatsResponse(BaseModel):
@@ -224,6 +224,8 @@ class PaginatedUsersResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class UserStatsResponse(BaseModel):
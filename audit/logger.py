@@ -14,6 +14,7 @@ import uuid
 
 from db.models.audit import AuditLog, AuditAction
 from db.database import db_manager
+from repositories.audit_repository import AuditLogRepository
 
 logger = logging.getLogger(__name__)
 
@@ -286,29 +287,18 @@ class AuditLogger:
         """
         session = self._get_session()
         try:
-            query = session.query(AuditLog)
-
-            if action:
-                query = query.filter(AuditLog.action == action)
-            if actor_user_id:
-                query = query.filter(AuditLog.actor_user_id == actor_user_id)
-            if target_id:
-                query = query.filter(AuditLog.target_id == target_id)
-            if start_date:
-                query = query.filter(AuditLog.timestamp >= start_date)
-            if end_date:
-                query = query.filter(AuditLog.timestamp <= end_date)
-            if success_only:
-                query = query.filter(AuditLog.success == True)
-            if compliance_tags:
-                # Note: This requires JSON containment, which varies by database
-                # For PostgreSQL: AuditLog.compliance_tags.contains(compliance_tags)
-                pass
-
-            query = query.order_by(AuditLog.timestamp.desc())
-            query = query.offset(offset).limit(limit)
-
-            return query.all()
+            # compliance_tags needs JSON containment, which varies by
+            # database (PostgreSQL: AuditLog.compliance_tags.contains(...))
+            return AuditLogRepository(session).query_logs(
+                action=action,
+                actor_user_id=actor_user_id,
+                target_id=target_id,
+                start_date=start_date,
+                end_date=end_date,
+                success_only=success_only,
+                limit=limit,
+                offset=offset
+            )
 
         finally:
             if not self._db_session:
@@ -331,32 +321,13 @@ class AuditLogger:
         """Generate compliance report for a date range"""
         session = self._get_session()
         try:
-            query = session.query(AuditLog).filter(
-                AuditLog.timestamp >= start_date,
-                AuditLog.timestamp <= end_date,
-                AuditLog.compliance_relevant == True
-            )
-
-            logs = query.all()
-
-            # Aggregate by action type
-            by_action = {}
-            for log in logs:
-                action_name = log.action.value
-                if action_name not in by_action:
-                    by_action[action_name] = {'count': 0, 'failed': 0}
-                by_action[action_name]['count'] += 1
-                if not log.success:
-                    by_action[action_name]['failed'] += 1
-
+            summary = AuditLogRepository(session).get_compliance_summary(start_date, end_date)
             return {
                 'period': {
                     'start': start_date.isoformat(),
                     'end': end_date.isoformat()
                 },
-                'total_entries': len(logs),
-                'by_action': by_action,
-                'failed_actions': sum(1 for l in logs if not l.success)
+                **summary
             }
 
         finally:
@@ -38,7 +38,7 @@ from .audit_logs import SecurityAuditLogExtractor
 from .tcode_usage import TransactionUsageExtractor
 from .change_documents import ChangeDocumentExtractor
 from .firefighter import FirefighterSessionExtractor
-from .integration import FirefighterSAPIntegration, create_sap_integration
+from .integration import FirefighterSAPIntegration, create_sap_integration, register_sync_sources
 
 # HANA-optimized and enterprise features
 from .tcode_usage_hana import HANAOptimizedTCodeExtractor, create_hana_extractor
@@ -95,4 +95,5 @@ __all__ = [
     # Integration
     "FirefighterSAPIntegration",
     "create_sap_integration",
+    "register_sync_sources",
 ]
@@ -13,7 +13,7 @@ Features:
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Generator
+from typing import Dict, List, Any, Optional, Generator, Iterable
 from datetime import datetime
 from dataclasses import dataclass, field
 import logging
@@ -107,7 +107,8 @@ class BaseExtractor(ABC):
         fields: List[str],
         where_clauses: Optional[List[str]] = None,
         max_rows: int = 10000,
-        delimiter: str = "|"
+        delimiter: str = "|",
+        row_skips: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Read data from SAP table using RFC_READ_TABLE.
@@ -118,6 +119,7 @@ class BaseExtractor(ABC):
             where_clauses: Optional WHERE conditions
             max_rows: Maximum rows to retrieve
             delimiter: Field delimiter
+            row_skips: Rows to skip first (for batched reads)
 
         Returns:
             List of dictionaries with field values
@@ -135,7 +137,8 @@ class BaseExtractor(ABC):
             DELIMITER=delimiter,
             OPTIONS=options,
             FIELDS=field_specs,
-            ROWCOUNT=max_rows
+            ROWCOUNT=max_rows,
+            ROWSKIPS=row_skips
         )
 
         return self._parse_table_result(result, fields, delimiter)
@@ -216,6 +219,74 @@ class BaseExtractor(ABC):
 
             offset += batch_size
 
+    def load(
+        self,
+        repository: Any,
+        tenant_id: str,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = 1000,
+        upsert: bool = True
+    ) -> Dict[str, int]:
+        """
+        Write transformed records through a repository's bulk API.
+
+        Rows are buffered into batches and written with bulk_upsert (keyed
+        on the repository's NATURAL_KEY) or, for append-only data,
+        copy_rows. Everything commits once at the end.
+
+        Args:
+            repository: BaseRepository for the target table
+            tenant_id: Tenant the rows belong to
+            rows: Rows shaped for the target table
+            batch_size: Rows per bulk statement batch
+            upsert: Upsert on the natural key instead of appending
+
+        Returns:
+            Counts of rows written, inserted and updated
+        """
+        counts = {"written": 0, "inserted": 0, "updated": 0}
+
+        def flush(batch: List[Dict[str, Any]]):
+            if upsert:
+                result = repository.bulk_upsert(
+                    batch, tenant_id=tenant_id, chunk_size=batch_size, commit=False
+                )
+                counts["inserted"] += result.inserted
+                counts["updated"] += result.updated
+            else:
+                counts["inserted"] += repository.copy_rows(batch, tenant_id=tenant_id, commit=False)
+            counts["written"] += len(batch)
+
+        try:
+            batch: List[Dict[str, Any]] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+            repository.db.commit()
+        except Exception:
+            repository.db.rollback()
+            raise
+
+        logger.info(
+            f"Loaded {counts['written']} rows into {repository.model.__tablename__} "
+            f"({counts['inserted']} new, {counts['updated']} updated)"
+        )
+        return counts
+
+    def _iter_batched(self, batch_size: int = 1000, **kwargs) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield records from extract_batched, raising on a failed batch so a
+        partial extraction is never mistaken for the complete data set.
+        """
+        for result in self.extract_batched(batch_size=batch_size, **kwargs):
+            if not result.success:
+                raise RuntimeError(f"Extraction from {result.source_table} failed: {'; '.join(result.errors)}")
+            yield from result.data
+
     def _format_date(self, date_str: str) -> Optional[str]:
         """
         Convert SAP date format (YYYYMMDD) to ISO format.
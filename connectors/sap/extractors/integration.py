@@ -18,6 +18,9 @@ import logging
 
 from .firefighter import FirefighterSessionExtractor, FirefighterSessionEvidence
 from .config import SAPExtractorConfig
+from .connection import SAPRFCConnectionManager
+from .users import UserMasterExtractor
+from .roles import RoleExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -321,3 +324,50 @@ def create_sap_integration(
         sap_config = None
 
     return FirefighterSAPIntegration(config=sap_config)
+
+
+def register_sync_sources(
+    scheduler: Any,
+    system_id: str,
+    config: Optional[SAPExtractorConfig] = None
+) -> None:
+    """
+    Register USR02 / AGR_DEFINE as the user and role record sources for a
+    system in a SyncScheduler, so its user and role sync jobs bulk-upsert
+    the extracted rows.
+
+    Both extractors share one connection pool. Job filters may narrow the
+    extraction with "username_pattern" or "role_pattern". The extractors
+    have no delta read, so incremental syncs re-read the full tables and
+    rely on the upsert to leave unchanged rows as they are.
+
+    Args:
+        scheduler: SyncScheduler to register with
+        system_id: Connected system the jobs target
+        config: SAP connection configuration
+    """
+    from core.scheduler import SyncType
+
+    connection_manager = SAPRFCConnectionManager(config)
+    users = UserMasterExtractor(connection_manager=connection_manager)
+    roles = RoleExtractor(connection_manager=connection_manager)
+    batch_size = connection_manager.config.batch_size
+
+    def fetch_users(job, since):
+        return users.iter_user_rows(
+            system_id,
+            username_pattern=job.filters.get("username_pattern", "%"),
+            batch_size=batch_size
+        )
+
+    def fetch_roles(job, since):
+        return roles.iter_role_rows(
+            role_pattern=job.filters.get("role_pattern", "*"),
+            batch_size=batch_size
+        )
+
+    for sync_type in (SyncType.FULL_USER_SYNC, SyncType.INCREMENTAL_USER_SYNC):
+        scheduler.register_source(system_id, sync_type, fetch_users)
+    for sync_type in (SyncType.FULL_ROLE_SYNC, SyncType.INCREMENTAL_ROLE_SYNC):
+        scheduler.register_source(system_id, sync_type, fetch_roles)
+    logger.info(f"Registered SAP user and role sync sources for {system_id}")
@@ -15,7 +15,7 @@ Used by GOVERNEX+ for:
 - Role description for audit justification
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Generator
 from datetime import datetime
 import logging
 
@@ -243,7 +243,8 @@ class RoleExtractor(BaseExtractor):
     def get_role_definitions(
         self,
         role_pattern: str = "*",
-        limit: int = 1000
+        limit: int = 1000,
+        offset: int = 0
     ) -> ExtractionResult:
         """
         Extract role definitions from AGR_DEFINE.
@@ -251,6 +252,7 @@ class RoleExtractor(BaseExtractor):
         Args:
             role_pattern: Pattern to filter roles
             limit: Maximum records to return
+            offset: Starting offset for pagination
 
         Returns:
             ExtractionResult with role definitions
@@ -267,7 +269,8 @@ class RoleExtractor(BaseExtractor):
                 table_name="AGR_DEFINE",
                 fields=self.AGR_DEFINE_FIELDS,
                 where_clauses=where_clauses if where_clauses else None,
-                max_rows=limit
+                max_rows=limit,
+                row_skips=offset
             )
 
             roles = []
@@ -282,6 +285,67 @@ class RoleExtractor(BaseExtractor):
             errors.append(str(e))
             return self._create_result([], "AGR_DEFINE", start_time, errors)
 
+    def to_role_row(self, role: Dict[str, Any]) -> Dict[str, Any]:
+        """Map an extracted AGR_DEFINE record to a roles table row."""
+        privilege = self._get_privilege_level(role["role_name"])
+        return {
+            "role_id": role["role_name"],
+            "role_name": role["role_name"],
+            "role_type": "composite" if role.get("role_type") == "composite" else "single",
+            "parent_role_id": role.get("parent_role") or None,
+            "risk_level": privilege if privilege in ("high", "medium") else "low",
+            "is_sensitive": privilege == "high",
+            "source_system": "SAP",
+            "last_synced_at": datetime.utcnow(),
+        }
+
+    def iter_role_rows(
+        self,
+        role_pattern: str = "*",
+        batch_size: int = 1000
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield roles table rows for every role definition matching the
+        pattern, reading AGR_DEFINE in batches. Usable as a SyncScheduler
+        record source.
+        """
+        offset = 0
+        while True:
+            result = self.get_role_definitions(role_pattern, limit=batch_size, offset=offset)
+            if not result.success:
+                raise RuntimeError(f"Extraction from AGR_DEFINE failed: {'; '.join(result.errors)}")
+            for role in result.data:
+                yield self.to_role_row(role)
+            if result.record_count < batch_size:
+                break
+            offset += batch_size
+
+    def sync_roles(
+        self,
+        repository: Any,
+        tenant_id: str,
+        role_pattern: str = "*",
+        batch_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Extract role definitions and upsert them on (tenant_id, role_id).
+
+        Args:
+            repository: RoleRepository bound to a session
+            tenant_id: Target tenant
+            role_pattern: AGR_DEFINE AGR_NAME pattern
+            batch_size: Rows per RFC read and per bulk write
+
+        Returns:
+            Counts of rows written, inserted and updated
+        """
+        return self.load(
+            repository,
+            tenant_id,
+            self.iter_role_rows(role_pattern, batch_size),
+            batch_size=batch_size
+        )
+
     def _get_role_definition(self, role_name: str) -> Optional[Dict[str, Any]]:
         """
         Get role definition, using cache to avoid repeated lookups.
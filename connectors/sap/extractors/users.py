@@ -20,7 +20,7 @@ Used by GOVERNEX+ for:
 - Inactivity monitoring
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Generator
 from datetime import datetime, timedelta
 import logging
 
@@ -31,6 +31,16 @@ from .config import SAPExtractorConfig
 logger = logging.getLogger(__name__)
 
 
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """ISO date string from _format_date to datetime (None if unset)."""
+    if not value or value.startswith("9999"):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 class UserMasterExtractor(BaseExtractor):
     """
     Extractor for SAP USR02 (User Master) data.
@@ -93,7 +103,8 @@ class UserMasterExtractor(BaseExtractor):
                 table_name="USR02",
                 fields=self.USR02_FIELDS,
                 where_clauses=where_clauses,
-                max_rows=limit
+                max_rows=limit,
+                row_skips=offset
             )
 
             # Transform and enrich data
@@ -282,6 +293,68 @@ class UserMasterExtractor(BaseExtractor):
             errors.append(str(e))
             return self._create_result([], "USR02", start_time, errors)
 
+    def to_user_row(self, user: Dict[str, Any], system_id: str) -> Dict[str, Any]:
+        """Map an extracted USR02 record to a users table row."""
+        lock_status = user.get("lock_status", {})
+        return {
+            "user_id": user["username"],
+            "username": user["username"],
+            "user_type": user.get("user_type_text", "Unknown").lower(),
+            "status": "suspended" if lock_status.get("locked") else "active",
+            "valid_from": _parse_iso(user.get("valid_from")),
+            "valid_to": _parse_iso(user.get("valid_to")),
+            "password_changed_at": _parse_iso(user.get("password_change_date")),
+            "source_system": "SAP",
+            "sync_source": system_id,
+            "last_synced_at": datetime.utcnow(),
+        }
+
+    def iter_user_rows(
+        self,
+        system_id: str,
+        username_pattern: str = "%",
+        batch_size: int = 1000
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield users table rows for every user matching the pattern,
+        reading USR02 in batches. Usable as a SyncScheduler record source.
+        """
+        for user in self._iter_batched(
+            batch_size=batch_size,
+            username_pattern=username_pattern,
+            include_locked=True,
+            include_expired=True
+        ):
+            yield self.to_user_row(user, system_id)
+
+    def sync_users(
+        self,
+        repository: Any,
+        tenant_id: str,
+        system_id: str,
+        username_pattern: str = "%",
+        batch_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Extract users and upsert them on (tenant_id, user_id).
+
+        Args:
+            repository: UserRepository bound to a session
+            tenant_id: Target tenant
+            system_id: Connected system the users come from
+            username_pattern: USR02 BNAME pattern
+            batch_size: Rows per RFC read and per bulk write
+
+        Returns:
+            Counts of rows written, inserted and updated
+        """
+        return self.load(
+            repository,
+            tenant_id,
+            self.iter_user_rows(system_id, username_pattern, batch_size),
+            batch_size=batch_size
+        )
+
     def _transform_user_record(self, raw: Dict[str, str]) -> Dict[str, Any]:
         """Transform raw USR02 record to structured format."""
         return {
@@ -94,6 +94,11 @@ from .rules import (
     RuleCondition,
 )
 
+from .profiling import (
+    ARAProfiler,
+    get_profiler,
+)
+
 from .mitigation import (
     MitigationControl,
     MitigationManager,
@@ -127,6 +132,7 @@ from .streaming import (
 # Graph-Based SoD Components
 from .graph import (
     SoDGraph,
+    GraphSnapshot,
     NodeType,
     EdgeType,
     RiskPattern,
@@ -207,6 +213,9 @@ __all__ = [
     "RuleEngine",
     "RuleDefinition",
     "RuleCondition",
+    # Profiling
+    "ARAProfiler",
+    "get_profiler",
     # Mitigation
     "MitigationControl",
     "MitigationManager",
@@ -229,6 +238,7 @@ __all__ = [
     "AuditEvent",
     # Graph-Based SoD
     "SoDGraph",
+    "GraphSnapshot",
     "NodeType",
     "EdgeType",
     "RiskPattern",
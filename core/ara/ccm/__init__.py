@@ -30,6 +30,11 @@ from .engine import (
     ControlEvaluationResult,
     ControlViolation,
     ControlConfig,
+    IncrementalEvaluationResult,
+)
+
+from .columnar import (
+    EntityTable,
 )
 
 from .monitoring import (
@@ -57,6 +62,9 @@ __all__ = [
     "ControlEvaluationResult",
     "ControlViolation",
     "ControlConfig",
+    "IncrementalEvaluationResult",
+    # Columnar
+    "EntityTable",
     # Monitoring
     "ControlMonitor",
     "MonitoringDashboard",
@@ -0,0 +1,264 @@
+# Columnar Entity Table
+# Entity population held as columns for shared, incremental CCM scans
+
+"""
+Columnar entity population for CCM.
+
+The row-by-row engine re-walks every entity dict for every control:
+dotted target paths are resolved and action lists converted to sets once
+per control. EntityTable loads the population once into columns - one
+per target path, list/set values interned to bitsets per column - and
+versions every row, so ControlEngine.evaluate_columnar can evaluate all
+controls in one scan and, on later runs, re-check only the rows that
+changed since.
+
+Entities are keyed by their "id"; ids must be unique within the table.
+"""
+
+from typing import Dict, List, Optional, Any, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Column read by Control.must_not_exist_actions
+ACTIONS_COLUMN = "actions"
+
+
+def get_nested_value(obj: Dict, path: str) -> Any:
+    """Get nested value from dict using dot notation."""
+    value = obj
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        else:
+            return None
+    return value
+
+
+class EntityColumn:
+    """
+    One target path across all rows.
+
+    values holds the raw value per row (referenced, not copied); masks the
+    interned bitset of list/set/tuple values (None for anything else).
+    counts tracks how many live rows have each bit, for picking the
+    rarest element of a check.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.values: List[Any] = []
+        self.masks: List[Optional[int]] = []
+        self.bits: Dict[Any, int] = {}
+        self.counts: Dict[int, int] = {}
+
+    def bit(self, item: Any) -> int:
+        """Bit for item (allocated on first use)"""
+        bit = self.bits.get(item)
+        if bit is None:
+            bit = self.bits[item] = 1 << len(self.bits)
+        return bit
+
+    def mask_of(self, items: Iterable[Any]) -> int:
+        mask = 0
+        for item in items:
+            mask |= self.bit(item)
+        return mask
+
+    def encode(self, value: Any) -> Optional[int]:
+        if isinstance(value, (list, set, tuple, frozenset)):
+            try:
+                return self.mask_of(value)
+            except TypeError:
+                # Unhashable elements: keep the raw value only
+                return None
+        return None
+
+    def _count(self, mask: Optional[int], delta: int) -> None:
+        counts = self.counts
+        while mask:
+            low = mask & -mask
+            counts[low] = counts.get(low, 0) + delta
+            mask ^= low
+
+    def set(self, row: int, value: Any, live: bool = True) -> None:
+        mask = self.encode(value)
+        if row == len(self.values):
+            self.values.append(value)
+            self.masks.append(mask)
+        else:
+            self._count(self.masks[row], -1)
+            self.values[row] = value
+            self.masks[row] = mask
+        if live:
+            self._count(mask, 1)
+
+    def cell_key(self, row: int) -> Any:
+        """Hashable summary of a cell, for change detection"""
+        mask = self.masks[row]
+        value = self.values[row]
+        if mask is not None:
+            return (mask, len(value))
+        return repr(value)
+
+    def frequency(self, bit: int) -> int:
+        return self.counts.get(bit, 0)
+
+
+class EntityTable:
+    """
+    Entity population as columns.
+
+    Usage:
+        table = EntityTable(targets=["user.sensitive_privileges"])
+        table.load(entities)                  # initial population
+        engine.evaluate_columnar(table)       # full scan
+        table.upsert(changed_entities)        # hourly delta
+        table.remove(["U123"])
+        engine.evaluate_columnar(table)       # re-checks changed rows only
+
+    Columns for targets used by controls are added on demand by the
+    engine; add them up front to avoid a second pass over the rows.
+    """
+
+    def __init__(self, targets: Iterable[str] = ()):
+        self._ids: List[str] = []
+        self._types: List[str] = []
+        self._entities: List[Optional[Dict[str, Any]]] = []  # None once removed
+        self._index: Dict[str, int] = {}
+        self._fingerprints: List[Optional[int]] = []
+        self._row_versions: List[int] = []
+        self._columns: Dict[str, EntityColumn] = {}
+        self._live = 0
+        self.version = 0
+
+        for path in (ACTIONS_COLUMN, *targets):
+            self.column(path)
+
+    # Columns
+
+    def column(self, path: str) -> EntityColumn:
+        """Column for a target path, extracted from every row if new"""
+        column = self._columns.get(path)
+        if column is None:
+            column = self._columns[path] = EntityColumn(path)
+            for row, entity in enumerate(self._entities):
+                live = entity is not None
+                column.set(row, get_nested_value(entity, path) if live else None, live)
+            # Fingerprints cover every column
+            for row, entity in enumerate(self._entities):
+                if entity is not None:
+                    self._fingerprints[row] = self._fingerprint(row)
+        return column
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def _fingerprint(self, row: int) -> int:
+        return hash((self._types[row], tuple(c.cell_key(row) for c in self._columns.values())))
+
+    # Loading
+
+    def upsert(self, entities: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add or replace entities; rows whose checked values are unchanged
+        keep their version. Returns the number of rows changed.
+        """
+        changed = 0
+        for entity in entities:
+            entity_id = entity.get("id", "unknown")
+            row = self._index.get(entity_id)
+            if row is None:
+                row = len(self._ids)
+                self._index[entity_id] = row
+                self._ids.append(entity_id)
+                self._types.append(entity.get("type", "USER"))
+                self._entities.append(entity)
+                self._fingerprints.append(None)
+                self._row_versions.append(0)
+                self._live += 1
+            else:
+                if self._entities[row] is None:
+                    self._live += 1
+                self._types[row] = entity.get("type", "USER")
+                self._entities[row] = entity
+
+            for path, column in self._columns.items():
+                column.set(row, get_nested_value(entity, path))
+
+            fingerprint = self._fingerprint(row)
+            if fingerprint != self._fingerprints[row]:
+                self._fingerprints[row] = fingerprint
+                self.version += 1
+                self._row_versions[row] = self.version
+                changed += 1
+        return changed
+
+    def load(self, entities: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the population: upsert entities and remove rows not in it.
+        Returns the number of rows changed or removed.
+        """
+        entities = list(entities)
+        changed = self.upsert(entities)
+        present = {entity.get("id", "unknown") for entity in entities}
+        return changed + self.remove([i for i in self._index if i not in present])
+
+    def remove(self, entity_ids: Iterable[str]) -> int:
+        """Tombstone entities; returns the number removed"""
+        removed = 0
+        for entity_id in entity_ids:
+            row = self._index.get(entity_id)
+            if row is None or self._entities[row] is None:
+                continue
+            self._entities[row] = None
+            for column in self._columns.values():
+                column.set(row, None, live=False)
+            self._fingerprints[row] = None
+            self.version += 1
+            self._row_versions[row] = self.version
+            self._live -= 1
+            removed += 1
+        return removed
+
+    # Access
+
+    def __len__(self) -> int:
+        return self._live
+
+    def is_live(self, row: int) -> bool:
+        return self._entities[row] is not None
+
+    def live_rows(self) -> List[int]:
+        return [row for row, entity in enumerate(self._entities) if entity is not None]
+
+    def rows_changed_since(self, version: int) -> List[int]:
+        """Rows added, changed or removed after table version `version`"""
+        return [row for row, v in enumerate(self._row_versions) if v > version]
+
+    def row_of(self, entity_id: str) -> Optional[int]:
+        return self._index.get(entity_id)
+
+    def entity_id(self, row: int) -> str:
+        return self._ids[row]
+
+    def entity_type(self, row: int) -> str:
+        return self._types[row]
+
+    def entity(self, row: int) -> Optional[Dict[str, Any]]:
+        return self._entities[row]
+
+    def entities(self, rows: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Live entity dicts (of rows, if given)"""
+        rows = range(len(self._entities)) if rows is None else rows
+        return [self._entities[row] for row in rows if self._entities[row] is not None]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self._ids),
+            "live": self._live,
+            "version": self.version,
+            "columns": {path: len(c.bits) for path, c in self._columns.items()},
+        }
@@ -9,10 +9,14 @@ Evaluates controls continuously and generates:
 - Violation details
 - Evidence for audit
 - Alerts on failure
+
+evaluate_columnar runs every active control over an EntityTable in one
+shared scan and, once a table has been evaluated, re-checks only the rows
+changed since, reporting violations opened and cleared.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable, Set
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from datetime import datetime
 import logging
 import uuid
@@ -25,6 +29,7 @@ from .controls import (
     ControlEvidence,
     AssertionType,
 )
+from .columnar import EntityTable, ACTIONS_COLUMN, get_nested_value
 
 logger = logging.getLogger(__name__)
 
@@ -126,6 +131,47 @@ class ControlEvaluationResult:
         }
 
 
+@dataclass
+class IncrementalEvaluationResult:
+    """
+    Result of a columnar evaluation run.
+
+    results carry each control's full current state (all open violations);
+    new_violations and cleared_violations are the changes since the
+    previous run, which is what ControlMonitor.record_incremental consumes.
+    """
+    run_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    results: List[ControlEvaluationResult] = field(default_factory=list)
+    new_violations: List[ControlViolation] = field(default_factory=list)
+    cleared_violations: List[ControlViolation] = field(default_factory=list)
+
+    # Scope
+    full_scan: bool = False
+    entities_total: int = 0
+    entities_evaluated: int = 0
+    table_version: int = 0
+
+    # Timing
+    evaluation_started: datetime = field(default_factory=datetime.now)
+    evaluation_completed: Optional[datetime] = None
+    duration_ms: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "results": [r.to_dict() for r in self.results],
+            "new_violations": [v.to_dict() for v in self.new_violations],
+            "cleared_violations": [v.to_dict() for v in self.cleared_violations],
+            "full_scan": self.full_scan,
+            "entities_total": self.entities_total,
+            "entities_evaluated": self.entities_evaluated,
+            "table_version": self.table_version,
+            "evaluation_started": self.evaluation_started.isoformat(),
+            "evaluation_completed": self.evaluation_completed.isoformat() if self.evaluation_completed else None,
+            "duration_ms": self.duration_ms,
+        }
+
+
 @dataclass
 class ControlConfig:
     """Configuration for control evaluation."""
@@ -166,6 +212,11 @@ class ControlEngine:
         self._custom_evaluators: Dict[str, Callable] = {}
         self._violation_counter = 0
 
+        # Columnar state: control_id -> entity_id -> violation key -> open violation
+        self._open_violations: Dict[str, Dict[str, Dict[str, ControlViolation]]] = {}
+        # control_id -> (control signature, id(table), table version evaluated)
+        self._columnar_state: Dict[str, Tuple[Any, int, int]] = {}
+
     def register_control(self, control: Control):
         """Register a control for evaluation."""
         self._controls[control.control_id] = control
@@ -285,23 +336,37 @@ class ControlEngine:
 
             # Check if entity has all forbidden actions
             if forbidden.issubset(entity_actions):
-                self._violation_counter += 1
-                violation = ControlViolation(
-                    violation_id=f"V-{control.control_id}-{self._violation_counter}",
-                    control_id=control.control_id,
-                    entity_id=entity_id,
-                    entity_type=entity.get("type", "USER"),
-                    violation_type="FORBIDDEN_COMBINATION",
-                    description=f"Entity has forbidden action combination",
-                    severity=control.severity_on_failure,
-                    violating_values=list(forbidden),
-                    expected_condition=f"Should NOT have: {forbidden}",
-                    actual_condition=f"Has: {entity_actions & forbidden}",
-                )
-                violations.append(violation)
+                violations.append(self._forbidden_combination_violation(
+                    control, entity_id, entity.get("type", "USER"), entity_actions
+                ))
 
         return violations
 
+    def _forbidden_combination_violation(
+        self,
+        control: Control,
+        entity_id: str,
+        entity_type: str,
+        entity_actions: Set[str],
+        violation_id: Optional[str] = None
+    ) -> ControlViolation:
+        forbidden = control.must_not_exist_actions
+        if violation_id is None:
+            self._violation_counter += 1
+            violation_id = f"V-{control.control_id}-{self._violation_counter}"
+        return ControlViolation(
+            violation_id=violation_id,
+            control_id=control.control_id,
+            entity_id=entity_id,
+            entity_type=entity_type,
+            violation_type="FORBIDDEN_COMBINATION",
+            description=f"Entity has forbidden action combination",
+            severity=control.severity_on_failure,
+            violating_values=list(forbidden),
+            expected_condition=f"Should NOT have: {forbidden}",
+            actual_condition=f"Has: {entity_actions & forbidden}",
+        )
+
     def _evaluate_assertion(
         self,
         control: Control,
@@ -318,51 +383,42 @@ class ControlEngine:
             # Get target value from entity
             target_value = self._get_nested_value(entity, assertion.target)
 
-            if assertion.assertion_type == AssertionType.MUST_NOT_EXIST:
-                forbidden = set(assertion.condition.get("actions", []))
-                if isinstance(target_value, (list, set)):
-                    if forbidden.issubset(set(target_value)):
-                        violations.append(self._create_violation(
-                            control, entity_id, entity.get("type", "USER"),
-                            "MUST_NOT_EXIST_VIOLATION",
-                            f"Has forbidden values: {forbidden}",
-                            target_value,
-                        ))
-
-            elif assertion.assertion_type == AssertionType.COUNT_LESS_THAN:
-                if target_value and len(target_value) >= assertion.threshold:
-                    violations.append(self._create_violation(
-                        control, entity_id, entity.get("type", "USER"),
-                        "COUNT_EXCEEDED",
-                        f"Count {len(target_value)} exceeds threshold {assertion.threshold}",
-                        target_value,
-                    ))
-
-            elif assertion.assertion_type == AssertionType.MUST_EXIST:
-                required = assertion.condition.get("required", [])
-                if isinstance(target_value, (list, set)):
-                    if not set(required).issubset(set(target_value)):
-                        violations.append(self._create_violation(
-                            control, entity_id, entity.get("type", "USER"),
-                            "MUST_EXIST_MISSING",
-                            f"Missing required values: {set(required) - set(target_value)}",
-                            target_value,
-                        ))
+            failure = self._assertion_failure(assertion, target_value)
+            if failure:
+                violations.append(self._create_violation(
+                    control, entity_id, entity.get("type", "USER"),
+                    failure[0], failure[1], target_value,
+                ))
 
         return violations
 
+    def _assertion_failure(
+        self,
+        assertion: ControlAssertion,
+        target_value: Any
+    ) -> Optional[Tuple[str, str]]:
+        """(violation_type, description) if target_value fails the assertion"""
+        if assertion.assertion_type == AssertionType.MUST_NOT_EXIST:
+            forbidden = set(assertion.condition.get("actions", []))
+            if isinstance(target_value, (list, set)):
+                if forbidden.issubset(set(target_value)):
+                    return "MUST_NOT_EXIST_VIOLATION", f"Has forbidden values: {forbidden}"
+
+        elif assertion.assertion_type == AssertionType.COUNT_LESS_THAN:
+            if target_value and len(target_value) >= assertion.threshold:
+                return "COUNT_EXCEEDED", f"Count {len(target_value)} exceeds threshold {assertion.threshold}"
+
+        elif assertion.assertion_type == AssertionType.MUST_EXIST:
+            required = assertion.condition.get("required", [])
+            if isinstance(target_value, (list, set)):
+                if not set(required).issubset(set(target_value)):
+                    return "MUST_EXIST_MISSING", f"Missing required values: {set(required) - set(target_value)}"
+
+        return None
+
     def _get_nested_value(self, obj: Dict, path: str) -> Any:
         """Get nested value from dict using dot notation."""
-        parts = path.split(".")
-        value = obj
-
-        for part in parts:
-            if isinstance(value, dict):
-                value = value.get(part)
-            else:
-                return None
-
-        return value
+        return get_nested_value(obj, path)
 
     def _create_violation(
         self,
@@ -371,12 +427,15 @@ class ControlEngine:
         entity_type: str,
         violation_type: str,
         description: str,
-        violating_values: Any
+        violating_values: Any,
+        violation_id: Optional[str] = None
     ) -> ControlViolation:
         """Create a violation object."""
-        self._violation_counter += 1
+        if violation_id is None:
+            self._violation_counter += 1
+            violation_id = f"V-{control.control_id}-{self._violation_counter}"
         return ControlViolation(
-            violation_id=f"V-{control.control_id}-{self._violation_counter}",
+            violation_id=violation_id,
             control_id=control.control_id,
             entity_id=entity_id,
             entity_type=entity_type,
@@ -430,3 +489,322 @@ class ControlEngine:
     def get_active_controls(self) -> List[Control]:
         """Get all active controls."""
         return [c for c in self._controls.values() if c.status == ControlStatus.ACTIVE]
+
+    # Columnar evaluation
+
+    def evaluate_columnar(
+        self,
+        table: EntityTable,
+        full_scan: bool = False
+    ) -> IncrementalEvaluationResult:
+        """
+        Evaluate all active controls over a columnar entity table.
+
+        The first run on a table, and any run after a control changes,
+        scans every row; later runs re-check only the rows changed since
+        the previous run. Set-valued checks share one pass per column, each
+        control filed under its rarest required element. Violations that
+        stay open keep their id and detection time.
+
+        Custom evaluators are called with only the rows being re-checked,
+        and a row is re-checked only when one of the table's columns
+        changes: a custom control reading data outside the table is not
+        re-run when that data changes. Controls that judge the population
+        as a whole (counts, ratios, cross-entity checks) must be evaluated
+        with full_scan=True.
+
+        Args:
+            table: Entity population
+            full_scan: Re-check every row regardless of what changed
+
+        Returns:
+            IncrementalEvaluationResult with per-control state and changes
+        """
+        start_time = datetime.now()
+        run = IncrementalEvaluationResult(
+            evaluation_started=start_time,
+            entities_total=len(table),
+            table_version=table.version,
+        )
+        controls = self.get_active_controls()
+
+        # Controls not yet evaluated on this table (or changed since) need every row
+        stale: Set[str] = set()
+        since = table.version
+        for control in controls:
+            state = self._columnar_state.get(control.control_id)
+            if full_scan or state is None or state[:2] != (self._control_signature(control), id(table)):
+                stale.add(control.control_id)
+            else:
+                since = min(since, state[2])
+        run.full_scan = bool(stale)
+        rows = table.rows_changed_since(0 if stale else since)
+        run.entities_evaluated = sum(1 for row in rows if table.is_live(row))
+        # Entity ids re-decided this run (None: all, as every row is scanned)
+        evaluated_ids = None if stale else {table.entity_id(row) for row in rows}
+
+        hits = self._scan_columns(controls, table, rows)
+
+        for control in controls:
+            result = ControlEvaluationResult(
+                control_id=control.control_id,
+                control_name=control.name,
+                evaluation_started=start_time,
+            )
+            try:
+                if control.control_id in self._custom_evaluators:
+                    violations = self._custom_evaluators[control.control_id](
+                        control, {"entities": table.entities(rows), "entity_count": len(table)}
+                    )
+                    fresh = [
+                        (f"{v.violation_type}|{v.description}", v.entity_id, lambda _, v=v: v)
+                        for v in violations
+                    ]
+                else:
+                    fresh = self._columnar_violations(control, table, hits.get(control.control_id, {}))
+
+                opened, cleared = self._apply_columnar(control, evaluated_ids, fresh)
+
+                run.new_violations.extend(opened)
+                run.cleared_violations.extend(cleared)
+                result.violations = self._ordered_open_violations(control, table)
+                result.violations_found = len(result.violations)
+                result.passed = result.violations_found == 0
+                result.status = "PASS" if result.passed else "FAIL"
+                result.entities_checked = len(table)
+
+                if self.config.store_evidence:
+                    result.evidence = self._generate_evidence(control, result)
+
+                self._columnar_state[control.control_id] = (
+                    self._control_signature(control), id(table), table.version
+                )
+
+            except Exception as e:
+                logger.error(f"Control evaluation error: {e}")
+                result.status = "ERROR"
+                result.error_message = str(e)
+                result.passed = False
+
+            result.evaluation_completed = datetime.now()
+            result.duration_ms = int((result.evaluation_completed - start_time).total_seconds() * 1000)
+            control.last_evaluation = result.evaluation_completed
+            control.last_result = result.passed
+            run.results.append(result)
+
+        run.evaluation_completed = datetime.now()
+        run.duration_ms = int((run.evaluation_completed - start_time).total_seconds() * 1000)
+        return run
+
+    def _control_signature(self, control: Control) -> Tuple:
+        """Everything evaluation depends on; a change forces a full scan for the control"""
+        return (
+            frozenset(control.must_not_exist_actions),
+            repr(control.assertion.to_dict()) if control.assertion else None,
+            control.severity_on_failure,
+            id(self._custom_evaluators.get(control.control_id)),
+        )
+
+    def _scan_columns(
+        self,
+        controls: List[Control],
+        table: EntityTable,
+        rows: List[int]
+    ) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Rows failing each control's built-in checks: control_id -> check -> rows.
+
+        "forbidden" and MUST_NOT_EXIST checks are subset tests on interned
+        bitsets; all of them on one column are answered in one pass, each
+        filed under its rarest element so a row only tests the checks whose
+        anchor it has.
+        """
+        hits: Dict[str, Dict[str, List[int]]] = {}
+        subset_checks: Dict[str, List[Tuple[str, str, int]]] = {}
+
+        for control in controls:
+            if control.control_id in self._custom_evaluators:
+                continue
+            control_hits = hits[control.control_id] = {}
+
+            if control.must_not_exist_actions:
+                column = table.column(ACTIONS_COLUMN)
+                subset_checks.setdefault(ACTIONS_COLUMN, []).append(
+                    (control.control_id, "forbidden", column.mask_of(control.must_not_exist_actions))
+                )
+                control_hits["forbidden"] = []
+
+            assertion = control.assertion
+            if assertion is None:
+                continue
+            column = table.column(assertion.target)
+            values, masks = column.values, column.masks
+
+            if assertion.assertion_type == AssertionType.MUST_NOT_EXIST:
+                subset_checks.setdefault(assertion.target, []).append(
+                    (control.control_id, "assertion", column.mask_of(assertion.condition.get("actions", [])))
+                )
+                control_hits["assertion"] = []
+
+            elif assertion.assertion_type == AssertionType.COUNT_LESS_THAN:
+                threshold = assertion.threshold
+                try:
+                    control_hits["assertion"] = [
+                        row for row in rows
+                        if values[row] and len(values[row]) >= threshold
+                    ]
+                except TypeError as e:
+                    # Same failure as the row-by-row engine; reported per control
+                    control_hits["error"] = e
+
+            elif assertion.assertion_type == AssertionType.MUST_EXIST:
+                required = column.mask_of(assertion.condition.get("required", []))
+                control_hits["assertion"] = [
+                    row for row in rows
+                    if masks[row] is not None and masks[row] & required != required
+                    and isinstance(values[row], (list, set))
+                ]
+
+        for path, checks in subset_checks.items():
+            column = table.column(path)
+            values, masks = column.values, column.masks
+            always = []
+            anchors: Dict[int, List[Tuple[str, str, int]]] = {}
+            anchor_mask = 0
+            for check in checks:
+                mask = check[2]
+                if not mask:
+                    always.append(check)
+                    continue
+                bits = []
+                while mask:
+                    low = mask & -mask
+                    bits.append(low)
+                    mask ^= low
+                anchor = min(bits, key=column.frequency)
+                anchors.setdefault(anchor, []).append(check)
+                anchor_mask |= anchor
+
+            for row in rows:
+                row_mask = masks[row]
+                if row_mask is None:
+                    continue
+                matched = list(always)
+                candidates = row_mask & anchor_mask
+                while candidates:
+                    low = candidates & -candidates
+                    for check in anchors[low]:
+                        if row_mask & check[2] == check[2]:
+                            matched.append(check)
+                    candidates ^= low
+                for control_id, kind, _ in matched:
+                    # Assertions only apply to list/set values
+                    if kind == "assertion" and not isinstance(values[row], (list, set)):
+                        continue
+                    hits[control_id][kind].append(row)
+
+        # Anchored checks are found out of order
+        for control_hits in hits.values():
+            for kind, found in control_hits.items():
+                if kind != "error":
+                    found.sort()
+        return hits
+
+    def _columnar_violations(
+        self,
+        control: Control,
+        table: EntityTable,
+        hits: Dict[str, List[int]]
+    ) -> List[Tuple[str, str, Callable[[Optional[str]], ControlViolation]]]:
+        """(key, entity_id, build(violation_id)) per failed check, in row-by-row engine order"""
+        if "error" in hits:
+            raise hits["error"]
+
+        fresh = []
+        for row in hits.get("forbidden", ()):
+            entity_id, entity_type = table.entity_id(row), table.entity_type(row)
+            actions = set(table.column(ACTIONS_COLUMN).values[row])
+            fresh.append(("FORBIDDEN_COMBINATION", entity_id, lambda vid, e=entity_id, t=entity_type, a=actions:
+                          self._forbidden_combination_violation(control, e, t, a, vid)))
+
+        if control.assertion is not None:
+            values = table.column(control.assertion.target).values
+            for row in hits.get("assertion", ()):
+                target_value = values[row]
+                failure = self._assertion_failure(control.assertion, target_value)
+                if failure:
+                    entity_id, entity_type = table.entity_id(row), table.entity_type(row)
+                    fresh.append((failure[0], entity_id, lambda vid, e=entity_id, t=entity_type, f=failure, v=target_value:
+                                  self._create_violation(control, e, t, f[0], f[1], v, vid)))
+        return fresh
+
+    def _apply_columnar(
+        self,
+        control: Control,
+        domain: Optional[Set[str]],
+        fresh: List[Tuple[str, str, Callable[[Optional[str]], ControlViolation]]]
+    ) -> Tuple[List[ControlViolation], List[ControlViolation]]:
+        """
+        Merge re-evaluated entities into the control's open violations.
+
+        domain is the set of entity ids that were re-evaluated (None: all).
+
+        Returns (opened, cleared). A violation still present is updated in
+        place, so anything holding it (e.g. ControlMonitor) sees the update.
+        """
+        open_violations = self._open_violations.setdefault(control.control_id, {})
+        opened: List[ControlViolation] = []
+        cleared: List[ControlViolation] = []
+        present: Dict[str, Set[str]] = {}
+
+        for key, entity_id, build in fresh:
+            current = open_violations.setdefault(entity_id, {})
+            previous = current.get(key)
+            if previous is None:
+                current[key] = build(None)
+                opened.append(current[key])
+            else:
+                latest = build(previous.violation_id)
+                for name in ("entity_type", "description", "severity", "violating_values",
+                             "expected_condition", "actual_condition"):
+                    setattr(previous, name, getattr(latest, name))
+            present.setdefault(entity_id, set()).add(key)
+
+        if domain is None:
+            candidates = list(open_violations)
+        elif len(domain) < len(open_violations):
+            candidates = [entity_id for entity_id in domain if entity_id in open_violations]
+        else:
+            candidates = [entity_id for entity_id in open_violations if entity_id in domain]
+
+        for entity_id in candidates:
+            current = open_violations[entity_id]
+            keep = present.get(entity_id, ())
+            for key in [k for k in current if k not in keep]:
+                cleared.append(current.pop(key))
+            if not current:
+                del open_violations[entity_id]
+
+        return opened, cleared
+
+    def _ordered_open_violations(self, control: Control, table: EntityTable) -> List[ControlViolation]:
+        """Open violations of a control, ordered as the row-by-row engine reports them"""
+        violations = [
+            v for current in self._open_violations.get(control.control_id, {}).values()
+            for v in current.values()
+        ]
+        def position(v: ControlViolation):
+            row = table.row_of(v.entity_id)
+            return v.violation_type != "FORBIDDEN_COMBINATION", row if row is not None else float("inf")
+
+        violations.sort(key=position)
+        return violations
+
+    def get_open_violations(self, control_id: Optional[str] = None) -> List[ControlViolation]:
+        """Violations currently open from columnar runs"""
+        ids = [control_id] if control_id else list(self._open_violations)
+        return [
+            v for cid in ids
+            for current in self._open_violations.get(cid, {}).values()
+            for v in current.values()
+        ]
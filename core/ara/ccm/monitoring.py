@@ -18,7 +18,7 @@ from collections import defaultdict
 import logging
 
 from .controls import Control, ControlStatus, ControlType
-from .engine import ControlEvaluationResult, ControlViolation
+from .engine import ControlEvaluationResult, ControlViolation, IncrementalEvaluationResult
 
 logger = logging.getLogger(__name__)
 
@@ -162,6 +162,31 @@ class ControlMonitor:
         # Record violations
         self._violations.extend(result.violations)
 
+        self._trim_history()
+
+    def record_incremental(self, run: IncrementalEvaluationResult):
+        """
+        Record a columnar evaluation run.
+
+        Each control's result counts as an evaluation, but only newly
+        opened violations are added - violations still open from earlier
+        runs are already held - and cleared ones are resolved, so open
+        counts and MTTR reflect the actual remediation.
+        """
+        self._evaluations.extend(run.results)
+        self._violations.extend(run.new_violations)
+
+        resolved_at = run.evaluation_completed or datetime.now()
+        for violation in run.cleared_violations:
+            if not violation.resolved:
+                violation.resolved = True
+                violation.resolved_at = resolved_at
+                violation.resolved_by = "CCM"
+                violation.resolution_notes = f"Condition no longer present (run {run.run_id})"
+
+        self._trim_history()
+
+    def _trim_history(self):
         # Trim history
         if len(self._evaluations) > self._max_history:
             self._evaluations = self._evaluations[-self._max_history:]
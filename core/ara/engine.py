@@ -36,6 +36,7 @@ from .models import (
     RemediationSuggestion,
 )
 from .rules import RuleEngine, RuleDefinition, RuleCondition, ConditionOperator
+from .profiling import get_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -652,6 +653,7 @@ class AccessRiskEngine:
         self.sod_analyzer = SoDAnalyzer(self.rule_engine)
         self.sensitive_analyzer = SensitiveAccessAnalyzer(self.rule_engine)
         self.risk_scorer = RiskScorer()
+        self.profiler = get_profiler()
 
         # Risk storage (in production, use database)
         self.risks: Dict[str, Risk] = {}
@@ -685,20 +687,26 @@ class AccessRiskEngine:
             context=context,
         )
 
+        profiler = self.profiler
+
         # 1. SoD Analysis
-        sod_conflicts = self.sod_analyzer.analyze_user(user_id, access, context)
+        with profiler.analyzer("sod"):
+            sod_conflicts = self.sod_analyzer.analyze_user(user_id, access, context)
         result.sod_conflicts = sod_conflicts
 
         # Convert conflicts to risks
         for conflict in sod_conflicts:
             risk = self._conflict_to_risk(conflict)
-            self.risk_scorer.calculate_score(risk, context, usage_data)
+            with profiler.analyzer("scorer"):
+                self.risk_scorer.calculate_score(risk, context, usage_data)
             result.risks.append(risk)
 
         # 2. Sensitive Access Analysis
-        sensitive_risks = self.sensitive_analyzer.analyze(user_id, access, context)
+        with profiler.analyzer("sensitive"):
+            sensitive_risks = self.sensitive_analyzer.analyze(user_id, access, context)
         for risk in sensitive_risks:
-            self.risk_scorer.calculate_score(risk, context, usage_data)
+            with profiler.analyzer("scorer"):
+                self.risk_scorer.calculate_score(risk, context, usage_data)
             result.risks.append(risk)
 
         # 3. Calculate summary
@@ -729,7 +737,8 @@ class AccessRiskEngine:
         )
 
         # SoD within role
-        conflicts = self.sod_analyzer.analyze_role(role_id, role_access)
+        with self.profiler.analyzer("sod_role"):
+            conflicts = self.sod_analyzer.analyze_role(role_id, role_access)
         result.sod_conflicts = conflicts
 
         for conflict in conflicts:
@@ -19,11 +19,20 @@ from .sod_graph import (
     SoDGraph,
     NodeType,
     EdgeType,
+    ReachabilityCache,
 )
 
+from .snapshot import (
+    GraphSnapshot,
+    write_snapshot,
+)
+
+from .role_matrix import RoleActionMatrix
+
 from .risk_patterns import (
     RiskPattern,
     RiskPatternLibrary,
+    CompiledPatternMatcher,
     BUILTIN_RISK_PATTERNS,
 )
 
@@ -50,9 +59,14 @@ __all__ = [
     "SoDGraph",
     "NodeType",
     "EdgeType",
+    "ReachabilityCache",
+    "GraphSnapshot",
+    "write_snapshot",
+    "RoleActionMatrix",
     # Patterns
     "RiskPattern",
     "RiskPatternLibrary",
+    "CompiledPatternMatcher",
     "BUILTIN_RISK_PATTERNS",
     # Detection
     "GraphSoDDetector",
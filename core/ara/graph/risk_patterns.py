@@ -11,10 +11,16 @@ We define:
     "Any path that enables both CREATE_VENDOR and EXECUTE_PAYMENT"
 
 This catches indirect violations through role combinations.
+
+Patterns are matched through CompiledPatternMatcher: actions are interned
+to bit positions, each pattern becomes a bitmask, and patterns are
+indexed by their rarest action so a user's action mask only tests the
+patterns it can plausibly complete.
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Any
+from typing import Callable, Dict, Iterable, List, Set, Optional, Any, Tuple
 from enum import Enum
 from datetime import datetime
 import logging
@@ -284,6 +290,146 @@ BUILTIN_RISK_PATTERNS = [
 ]
 
 
+class CompiledPatternMatcher:
+    """
+    Risk patterns compiled to action bitmasks.
+
+    A pattern matches a user when (user_mask & pattern_mask) == pattern_mask.
+    Each pattern is filed under its rarest action (anchor); a user mask only
+    tests the patterns whose anchor bit it has set, so with a large library
+    most users test a handful of patterns.
+
+    Args:
+        patterns: Patterns to compile (in reporting order)
+        bit_of: Maps an action to its bit (e.g. the SoD graph's interned
+            bit, so graph masks can be matched directly). Returning 0 means
+            no one can reach the action and the pattern can never match.
+            Default: the matcher interns actions itself.
+        frequency: How common an action is (e.g. roles granting it); the
+            least common action of a pattern is its anchor. Default: the
+            number of patterns using the action.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[RiskPattern],
+        bit_of: Optional[Callable[[str], int]] = None,
+        frequency: Optional[Callable[[str], int]] = None
+    ):
+        self._bits: Dict[str, int] = {}
+        self._bit_of = bit_of or self._intern
+        self._external_bits = bit_of is not None
+
+        patterns = list(patterns)
+        if frequency is None:
+            counts = Counter(a for p in patterns for a in p.forbidden_actions)
+            frequency = counts.__getitem__
+
+        # Entries are (order, pattern, mask)
+        self._always: List[Tuple[int, RiskPattern, int]] = []
+        self._anchors: Dict[int, List[Tuple[int, RiskPattern, int]]] = {}
+        self._by_bit: Dict[int, List[Tuple[int, RiskPattern, int]]] = {}
+        self._anchor_mask = 0
+        self.unmatchable: List[RiskPattern] = []
+
+        for order, pattern in enumerate(patterns):
+            actions = sorted(pattern.forbidden_actions)
+            if not actions:
+                # issubset() of the empty set: matches any access
+                self._always.append((order, pattern, 0))
+                continue
+
+            bits = {action: self._bit_of(action) for action in actions}
+            if not all(bits.values()):
+                self.unmatchable.append(pattern)
+                continue
+
+            mask = 0
+            for bit in bits.values():
+                mask |= bit
+            entry = (order, pattern, mask)
+
+            anchor = bits[min(actions, key=lambda a: (frequency(a), a))]
+            self._anchors.setdefault(anchor, []).append(entry)
+            self._anchor_mask |= anchor
+            for bit in bits.values():
+                self._by_bit.setdefault(bit, []).append(entry)
+
+        self.pattern_count = len(patterns)
+
+    def _intern(self, action: str) -> int:
+        bit = self._bits.get(action)
+        if bit is None:
+            bit = self._bits[action] = 1 << len(self._bits)
+        return bit
+
+    def mask_of(self, actions: Iterable[str]) -> int:
+        """Bitmask of actions (actions no pattern uses are ignored)"""
+        mask = 0
+        if self._external_bits:
+            for action in actions:
+                mask |= self._bit_of(action)
+        else:
+            bits = self._bits
+            for action in actions:
+                mask |= bits.get(action, 0)
+        return mask
+
+    @staticmethod
+    def _ordered(entries: List[Tuple[int, RiskPattern, int]]) -> List[RiskPattern]:
+        entries.sort(key=lambda e: e[0])
+        return [pattern for _, pattern, _ in entries]
+
+    def match_mask(self, mask: int) -> List[RiskPattern]:
+        """Patterns fully covered by mask"""
+        hits = list(self._always)
+        candidates = mask & self._anchor_mask
+        while candidates:
+            low = candidates & -candidates
+            for entry in self._anchors[low]:
+                if mask & entry[2] == entry[2]:
+                    hits.append(entry)
+            candidates ^= low
+        return self._ordered(hits)
+
+    def match_actions(self, actions: Iterable[str]) -> List[RiskPattern]:
+        """Patterns whose forbidden actions are all in actions"""
+        return self.match_mask(self.mask_of(actions))
+
+    def delta(self, before: int, after: int) -> Tuple[List[RiskPattern], List[RiskPattern]]:
+        """
+        Patterns gained and lost going from mask `before` to `after`.
+
+        Only patterns using a changed bit can change state, so this is
+        proportional to the change rather than to the library.
+        """
+        changed = before ^ after
+        seen: Set[int] = set()
+        added, removed = [], []
+        while changed:
+            low = changed & -changed
+            for entry in self._by_bit.get(low, ()):
+                if entry[0] in seen:
+                    continue
+                seen.add(entry[0])
+                matched_before = before & entry[2] == entry[2]
+                matched_after = after & entry[2] == entry[2]
+                if matched_after and not matched_before:
+                    added.append(entry)
+                elif matched_before and not matched_after:
+                    removed.append(entry)
+            changed ^= low
+        return self._ordered(added), self._ordered(removed)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "patterns": self.pattern_count,
+            "anchors": len(self._anchors),
+            "largest_anchor_bucket": max((len(v) for v in self._anchors.values()), default=0),
+            "unmatchable": len(self.unmatchable),
+        }
+
+
 class RiskPatternLibrary:
     """
     Library of risk patterns for graph-based detection.
@@ -294,6 +440,8 @@ class RiskPatternLibrary:
     def __init__(self):
         """Initialize with built-in patterns."""
         self.patterns: Dict[str, RiskPattern] = {}
+        self._version = 0
+        self._compiled: Optional[Tuple[Any, CompiledPatternMatcher]] = None
         self._load_builtin_patterns()
 
     def _load_builtin_patterns(self):
@@ -304,12 +452,41 @@ class RiskPatternLibrary:
     def add_pattern(self, pattern: RiskPattern):
         """Add a custom pattern."""
         self.patterns[pattern.pattern_id] = pattern
+        self._version += 1
         logger.info(f"Added pattern: {pattern.pattern_id}")
 
     def remove_pattern(self, pattern_id: str):
         """Remove a pattern."""
         if pattern_id in self.patterns:
             del self.patterns[pattern_id]
+            self._version += 1
+
+    def invalidate(self):
+        """Recompile after patterns were edited in place (forbidden_actions changed)."""
+        self._version += 1
+
+    @property
+    def signature(self) -> Tuple[Any, ...]:
+        """Changes whenever the set of active patterns changes."""
+        return (self._version, len(self.patterns), tuple(p.is_active for p in self.patterns.values()))
+
+    def compile(
+        self,
+        bit_of: Optional[Callable[[str], int]] = None,
+        frequency: Optional[Callable[[str], int]] = None
+    ) -> CompiledPatternMatcher:
+        """
+        Compile the active patterns (see CompiledPatternMatcher). The
+        library's own interning is compiled once and reused until patterns
+        change.
+        """
+        if bit_of is not None or frequency is not None:
+            return CompiledPatternMatcher(self.get_active_patterns(), bit_of, frequency)
+
+        signature = self.signature
+        if self._compiled is None or self._compiled[0] != signature:
+            self._compiled = (signature, CompiledPatternMatcher(self.get_active_patterns()))
+        return self._compiled[1]
 
     def get_pattern(self, pattern_id: str) -> Optional[RiskPattern]:
         """Get a pattern by ID."""
@@ -350,10 +527,7 @@ class RiskPatternLibrary:
 
     def find_matching_patterns(self, user_actions: Set[str]) -> List[RiskPattern]:
         """Find all patterns that match a user's actions."""
-        return [
-            p for p in self.patterns.values()
-            if p.is_active and p.matches_actions(user_actions)
-        ]
+        return self.compile().match_actions(user_actions)
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize library to dictionary."""
@@ -371,6 +545,7 @@ class RiskPatternLibrary:
         for pattern_data in data.get("patterns", []):
             pattern = RiskPattern.from_dict(pattern_data)
             library.patterns[pattern.pattern_id] = pattern
+        library.invalidate()
 
         return library
 
@@ -386,6 +561,7 @@ class RiskPatternLibrary:
             logger.warning("PyYAML not available, cannot load YAML patterns")
         except Exception as e:
             logger.error(f"Error loading YAML patterns: {e}")
+        self.invalidate()
 
     def export_to_yaml(self) -> str:
         """Export patterns to YAML format."""
@@ -0,0 +1,151 @@
+# Role x Action Matrix
+# Whole-catalogue role analysis over reachability bitsets
+
+"""
+Role x action matrix for GOVERNEX+.
+
+Rows are roles and columns business actions. Both directions are kept as
+bitsets - a row is the role's cached action closure, a column the set of
+roles granting the action - which makes a compact sparse boolean matrix
+for catalogues with tens of thousands of roles. Matrix products reduce
+to AND + popcount:
+
+- role x pattern hits:    row & pattern_mask == pattern_mask
+- action co-occurrence:   (A^T A)[i, j] = popcount(column_i & column_j)
+
+Used by ToxicRoleDetector and SoDRuleGenerator to analyse the whole role
+catalogue in one pass instead of role by role and pair by pair.
+"""
+
+from typing import Dict, List, Set, Optional, Any, Iterator, Tuple
+import logging
+
+from .sod_graph import NodeType
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Indexes of the bits set in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class RoleActionMatrix:
+    """
+    Role x action incidence matrix of an SoD graph (or GraphSnapshot).
+
+    Row masks use the graph's interned action bits, so they can be fed to
+    a CompiledPatternMatcher compiled with bit_of=action_bit. Column masks
+    use role positions in role_ids.
+
+    The matrix is a point-in-time view; build a new one after the graph
+    changes.
+    """
+
+    def __init__(self, graph):
+        """
+        Build the matrix from the graph's role closures.
+
+        Args:
+            graph: SoDGraph or GraphSnapshot
+        """
+        self.graph = graph
+        graph.warm_reachability(NodeType.ACTION)
+        self._reach = graph.reachability
+
+        self.role_ids: List[str] = graph.get_node_ids_by_type(NodeType.ROLE)
+        self.rows: List[int] = [graph.get_role_mask(r, NodeType.ACTION) for r in self.role_ids]
+        self.privilege_counts: List[int] = [
+            graph.get_role_mask(r, NodeType.PRIVILEGE).bit_count() for r in self.role_ids
+        ]
+        self.user_counts: List[int] = [len(graph.get_role_users(r)) for r in self.role_ids]
+        self._role_index = {role_id: i for i, role_id in enumerate(self.role_ids)}
+
+        # Transpose: action bit -> roles, built once per column from index lists
+        members: Dict[int, List[int]] = {}
+        for i, row in enumerate(self.rows):
+            for index in _iter_bits(row):
+                members.setdefault(1 << index, []).append(i)
+
+        size = (len(self.role_ids) + 7) // 8
+        self._columns: Dict[int, int] = {}
+        for bit, indexes in members.items():
+            column = bytearray(size)
+            for i in indexes:
+                column[i >> 3] |= 1 << (i & 7)
+            self._columns[bit] = int.from_bytes(column, "little")
+
+        # Columns in graph node order; actions no role grants are left out
+        self.action_ids: List[str] = [
+            a for a in graph.get_node_ids_by_type(NodeType.ACTION) if self.action_bit(a) in self._columns
+        ]
+        self.nnz = sum(len(indexes) for indexes in members.values())
+
+    # Lookups
+
+    def action_bit(self, action_id: str) -> int:
+        """Row bit of an action (0 if no role reaches it)"""
+        return self._reach.mask_of((action_id,), NodeType.ACTION)
+
+    def row(self, role_id: str) -> int:
+        i = self._role_index.get(role_id)
+        return self.rows[i] if i is not None else 0
+
+    def column(self, action_id: str) -> int:
+        """Bitset (over role_ids positions) of the roles granting action_id"""
+        return self._columns.get(self.action_bit(action_id), 0)
+
+    def role_frequency(self, action_id: str) -> int:
+        """Number of roles granting action_id"""
+        return self.column(action_id).bit_count()
+
+    def actions_of(self, row: int) -> Set[str]:
+        return self._reach.decode(row, NodeType.ACTION)
+
+    def roles_of(self, column: int, limit: Optional[int] = None) -> List[str]:
+        """Role ids of a column mask, in catalogue order"""
+        roles = []
+        for i in _iter_bits(column):
+            if limit is not None and len(roles) >= limit:
+                break
+            roles.append(self.role_ids[i])
+        return roles
+
+    def iter_role_pairs(self, column1: int, column2: int) -> Iterator[Tuple[int, int]]:
+        """(i, j) with i < j, role i in column1 and role j in column2"""
+        for i in _iter_bits(column1):
+            for j in _iter_bits(column2 >> (i + 1) << (i + 1)):
+                yield i, j
+
+    # Products
+
+    def cooccurrence(self, min_count: int = 1) -> Dict[Tuple[str, str], int]:
+        """
+        Off-diagonal entries of A^T A that reach min_count.
+
+        Keys are (action1, action2) with action1 before action2 in
+        action_ids. Columns granted by fewer than min_count roles cannot
+        reach the threshold and are skipped.
+        """
+        columns = [(a, self.column(a)) for a in self.action_ids]
+        columns = [(a, c) for a, c in columns if c.bit_count() >= min_count]
+
+        counts: Dict[Tuple[str, str], int] = {}
+        for i, (action1, column1) in enumerate(columns):
+            for action2, column2 in columns[i + 1:]:
+                shared = (column1 & column2).bit_count()
+                if shared >= min_count:
+                    counts[(action1, action2)] = shared
+        return counts
+
+    def get_statistics(self) -> Dict[str, Any]:
+        cells = len(self.role_ids) * len(self.action_ids)
+        return {
+            "roles": len(self.role_ids),
+            "actions": len(self.action_ids),
+            "nonzeros": self.nnz,
+            "density": round(self.nnz / cells, 6) if cells else 0.0,
+        }
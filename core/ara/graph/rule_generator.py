@@ -15,16 +15,22 @@ GOVERNEX+ discovers SoD rules automatically from:
 - Toxic role decomposition
 
 Generated rules are marked as DRAFT and require governance approval.
+
+Action and role analysis run over a RoleActionMatrix: candidate action
+pairs come from co-occurrence counts and keyword/word buckets, so only
+pairs that can pass are checked.
 """
 
 from dataclasses import dataclass, field
 from typing import Dict, List, Set, Optional, Any, Tuple
 from enum import Enum
 from datetime import datetime
+from itertools import permutations, product
 import logging
 import hashlib
 
-from .sod_graph import SoDGraph, NodeType
+from .sod_graph import SoDGraph
+from .role_matrix import RoleActionMatrix
 from .risk_patterns import PatternSeverity, PatternType
 from .toxic_roles import ToxicRoleFinding
 
@@ -66,6 +72,14 @@ class RuleGenerationConfig:
     # Auto-activate rules above this confidence
     auto_activate_threshold: float = 0.95
 
+    # Roles two actions must share to be considered for an action rule
+    min_cooccurring_roles: int = 3
+
+    # Role pairs reported per conflicting action pair (None = all, which
+    # grows with the product of the roles granting each action; large
+    # catalogues should set a cap)
+    max_role_pairs_per_conflict: Optional[int] = None
+
 
 @dataclass
 class GeneratedSoDRule:
@@ -168,6 +182,13 @@ class SoDRuleGenerator:
     All generated rules require governance approval before activation.
     """
 
+    # Keywords for the _looks_like_conflict heuristic
+    CREATE_KEYWORDS = frozenset({"CREATE", "ADD", "INSERT", "NEW", "HIRE"})
+    APPROVE_KEYWORDS = frozenset({"APPROVE", "RELEASE", "POST", "EXECUTE", "PAY"})
+    MODIFY_KEYWORDS = frozenset({"MODIFY", "CHANGE", "UPDATE", "EDIT"})
+    DELETE_KEYWORDS = frozenset({"DELETE", "REMOVE", "RETIRE", "TERMINATE"})
+    STOP_WORDS = frozenset({"THE", "A", "AN", "AND", "OR"})
+
     def __init__(
         self,
         graph: SoDGraph,
@@ -223,65 +244,63 @@ class SoDRuleGenerator:
 
         return self._deduplicate_rules(rules)
 
-    def generate_from_action_analysis(self) -> List[GeneratedSoDRule]:
+    def generate_from_action_analysis(
+        self,
+        matrix: Optional[RoleActionMatrix] = None
+    ) -> List[GeneratedSoDRule]:
         """
         Generate rules by analyzing action co-occurrence patterns.
 
         Finds actions that frequently appear together in roles
         and could represent undocumented SoD conflicts.
 
+        Args:
+            matrix: Prebuilt role x action matrix of this graph (built if omitted)
+
         Returns:
             List of generated rules
         """
         rules = []
+        matrix = matrix or RoleActionMatrix(self.graph)
 
-        # Get all action nodes
-        action_nodes = self.graph.get_nodes_by_type(NodeType.ACTION)
-        actions = [n.node_id for n in action_nodes]
+        # Action pairs granted together by min_cooccurring_roles+ roles
+        # (A^T A over the role x action matrix)
+        shared_counts = matrix.cooccurrence(min_count=self.config.min_cooccurring_roles)
 
-        # Build action co-occurrence matrix
-        # (actions that are reachable from the same roles)
-        action_roles: Dict[str, Set[str]] = {}
+        for (action1, action2), shared in shared_counts.items():
+            # Check if these look like a potential conflict
+            # (This is a simplified heuristic - in production, use domain knowledge)
+            if self._looks_like_conflict(action1, action2):
+                confidence = min(shared / 10, 0.9)
+                shared_roles = matrix.roles_of(matrix.column(action1) & matrix.column(action2), limit=5)
 
-        for action in actions:
-            ancestors = self.graph.get_ancestors(action)
-            action_roles[action] = {
-                a for a in ancestors
-                if self.graph.get_node(a) and
-                   self.graph.get_node(a).node_type == NodeType.ROLE
-            }
-
-        # Find action pairs that share many roles
-        # (indicating they are often granted together)
-        for i, action1 in enumerate(actions):
-            for action2 in actions[i + 1:]:
-                shared_roles = action_roles.get(action1, set()) & action_roles.get(action2, set())
-
-                if len(shared_roles) >= 3:  # Co-occur in 3+ roles
-                    # Check if these look like a potential conflict
-                    # (This is a simplified heuristic - in production, use domain knowledge)
-                    if self._looks_like_conflict(action1, action2):
-                        confidence = min(len(shared_roles) / 10, 0.9)
-
-                        rule = self._create_rule_from_actions(
-                            actions={action1, action2},
-                            source=RuleSource.GRAPH_DISCOVERY,
-                            rationale=f"Actions frequently combined in {len(shared_roles)} roles",
-                            evidence=[
-                                f"Shared roles: {', '.join(list(shared_roles)[:5])}",
-                            ],
-                            confidence=confidence,
-                        )
-                        rules.append(rule)
+                rule = self._create_rule_from_actions(
+                    actions={action1, action2},
+                    source=RuleSource.GRAPH_DISCOVERY,
+                    rationale=f"Actions frequently combined in {shared} roles",
+                    evidence=[
+                        f"Shared roles: {', '.join(shared_roles)}",
+                    ],
+                    confidence=confidence,
+                )
+                rules.append(rule)
 
         return self._deduplicate_rules(rules)
 
-    def generate_from_role_analysis(self) -> List[GeneratedSoDRule]:
+    def generate_from_role_analysis(
+        self,
+        matrix: Optional[RoleActionMatrix] = None
+    ) -> List[GeneratedSoDRule]:
         """
         Generate rules by analyzing role structures.
 
         Identifies roles that should never be combined based on
-        the actions they enable.
+        the actions they enable: for every conflicting action pair
+        (X, Y), each role granting X paired with each later role granting
+        Y (capped by max_role_pairs_per_conflict).
+
+        Args:
+            matrix: Prebuilt role x action matrix of this graph (built if omitted)
 
         Returns:
             List of generated rules
@@ -290,43 +309,70 @@ class SoDRuleGenerator:
             return []
 
         rules = []
-
-        # Get all roles
-        role_nodes = self.graph.get_nodes_by_type(NodeType.ROLE)
-
-        # Build role -> actions mapping
-        role_actions: Dict[str, Set[str]] = {}
-        for node in role_nodes:
-            role_actions[node.node_id] = self.graph.get_role_actions(node.node_id)
-
-        # Find role pairs where one role's actions conflict with another's
-        roles = list(role_actions.keys())
-
-        for i, role1 in enumerate(roles):
-            for role2 in roles[i + 1:]:
-                actions1 = role_actions.get(role1, set())
-                actions2 = role_actions.get(role2, set())
-
-                # Check for complementary danger
-                # (role1 enables X, role2 enables Y, X+Y is dangerous)
-                for action1 in actions1:
-                    for action2 in actions2:
-                        if action1 != action2 and self._looks_like_conflict(action1, action2):
-                            rule = self._create_rule_from_roles(
-                                roles={role1, role2},
-                                actions={action1, action2},
-                                source=RuleSource.GRAPH_DISCOVERY,
-                                rationale=f"Roles grant complementary dangerous actions",
-                                evidence=[
-                                    f"Role {role1} enables {action1}",
-                                    f"Role {role2} enables {action2}",
-                                ],
-                                confidence=0.75,
-                            )
-                            rules.append(rule)
+        matrix = matrix or RoleActionMatrix(self.graph)
+        limit = self.config.max_role_pairs_per_conflict
+
+        # Check for complementary danger
+        # (role1 enables X, role2 enables Y, X+Y is dangerous)
+        for action1, action2 in self._conflicting_action_pairs(matrix.action_ids):
+            pairs = matrix.iter_role_pairs(matrix.column(action1), matrix.column(action2))
+            for n, (i, j) in enumerate(pairs):
+                if limit is not None and n >= limit:
+                    break
+                role1, role2 = matrix.role_ids[i], matrix.role_ids[j]
+                rule = self._create_rule_from_roles(
+                    roles={role1, role2},
+                    actions={action1, action2},
+                    source=RuleSource.GRAPH_DISCOVERY,
+                    rationale=f"Roles grant complementary dangerous actions",
+                    evidence=[
+                        f"Role {role1} enables {action1}",
+                        f"Role {role2} enables {action2}",
+                    ],
+                    confidence=0.75,
+                )
+                rules.append(rule)
 
         return self._deduplicate_rules(rules)
 
+    def _conflicting_action_pairs(self, actions: List[str]) -> List[Tuple[str, str]]:
+        """
+        Ordered pairs (action1, action2) for which _looks_like_conflict holds.
+
+        With the built-in heuristic only pairs that can pass are tested:
+        keyword-class combinations and actions sharing a word. An
+        overridden heuristic is tested on every pair.
+        """
+        if type(self)._looks_like_conflict is not SoDRuleGenerator._looks_like_conflict:
+            candidates = permutations(actions, 2)
+        else:
+            upper = {a: a.upper() for a in actions}
+
+            def having(keywords):
+                return [a for a in actions if any(k in upper[a] for k in keywords)]
+
+            create = having(self.CREATE_KEYWORDS)
+            approve = having(self.APPROVE_KEYWORDS)
+            candidates = set(product(create, approve))
+            candidates.update(product(approve, create))
+            candidates.update(product(create, having(self.DELETE_KEYWORDS)))
+            candidates.update(product(having(self.MODIFY_KEYWORDS), approve))
+
+            by_word: Dict[str, List[str]] = {}
+            for action in actions:
+                for word in set(upper[action].replace("_", " ").split()) - self.STOP_WORDS:
+                    by_word.setdefault(word, []).append(action)
+            for members in by_word.values():
+                candidates.update(permutations(members, 2))
+
+            order = {a: i for i, a in enumerate(actions)}
+            candidates = sorted(candidates, key=lambda pair: (order[pair[0]], order[pair[1]]))
+
+        return [
+            (action1, action2) for action1, action2 in candidates
+            if action1 != action2 and self._looks_like_conflict(action1, action2)
+        ]
+
     def _create_rule_from_actions(
         self,
         actions: Set[str],
@@ -409,10 +455,10 @@ class SoDRuleGenerator:
         In production, this would use domain knowledge and ML.
         """
         # Keywords indicating potential conflicts
-        create_keywords = {"CREATE", "ADD", "INSERT", "NEW", "HIRE"}
-        approve_keywords = {"APPROVE", "RELEASE", "POST", "EXECUTE", "PAY"}
-        modify_keywords = {"MODIFY", "CHANGE", "UPDATE", "EDIT"}
-        delete_keywords = {"DELETE", "REMOVE", "RETIRE", "TERMINATE"}
+        create_keywords = self.CREATE_KEYWORDS
+        approve_keywords = self.APPROVE_KEYWORDS
+        modify_keywords = self.MODIFY_KEYWORDS
+        delete_keywords = self.DELETE_KEYWORDS
 
         action1_upper = action1.upper()
         action2_upper = action2.upper()
@@ -440,7 +486,7 @@ class SoDRuleGenerator:
         # (simplified - in production, use actual business object mapping)
         words1 = set(action1_upper.replace("_", " ").split())
         words2 = set(action2_upper.replace("_", " ").split())
-        common_objects = words1 & words2 - {"THE", "A", "AN", "AND", "OR"}
+        common_objects = words1 & words2 - self.STOP_WORDS
 
         if common_objects:
             # Same object, different operations
@@ -509,12 +555,13 @@ class SoDRuleGenerator:
             Combined list of generated rules
         """
         all_rules = []
+        matrix = RoleActionMatrix(self.graph)
 
         # From action analysis
-        all_rules.extend(self.generate_from_action_analysis())
+        all_rules.extend(self.generate_from_action_analysis(matrix))
 
         # From role analysis
-        all_rules.extend(self.generate_from_role_analysis())
+        all_rules.extend(self.generate_from_role_analysis(matrix))
 
         # Filter by minimum confidence
         filtered = [
@@ -0,0 +1,675 @@
+# SoD Graph Snapshots
+# Compact, memory-mappable binary form of an SoDGraph
+
+"""
+SoD Graph Snapshots.
+
+Stores a graph as flat typed arrays instead of Python objects:
+- node ids interned to dense indices, sorted so a lookup is a binary
+  search over the mapped id column
+- typed CSR adjacency (forward with edge type / weight columns, and
+  reverse)
+- label, system and attribute columns (attributes as JSON per node/edge)
+- per-type node lists and ranks, so a node's bit in a reachability
+  bitset is fixed when the snapshot is written
+
+GraphSnapshot.open() maps the file read-only; worker processes that open
+the same file share its pages. The snapshot answers the read API used by
+the detectors (get_user_actions, get_role_actions, explain_reach, ...)
+directly on the arrays, so no SoDGraph or NetworkX mirror is needed.
+
+Usage:
+    graph.save_snapshot("/var/lib/governex/sod_graph.snap")
+
+    snapshot = GraphSnapshot.open("/var/lib/governex/sod_graph.snap")
+    findings = GraphSoDDetector(snapshot).detect_all_users()
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, List, Set, Optional, Any, Tuple, Iterator
+from datetime import datetime
+import json
+import logging
+import mmap
+import os
+import struct
+
+from .sod_graph import SoDGraph, GraphNode, GraphEdge, NodeType, EdgeType
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SODGSNP1"
+FORMAT_VERSION = 1
+
+# magic, directory offset, directory length
+_HEADER = struct.Struct("<8sQQ")
+_ALIGN = 8
+
+# Ids resolved by binary search are memoized up to this many entries
+LOOKUP_CACHE_SIZE = 65536
+
+# Type codes of the node_type / edge_type columns
+NODE_TYPES: List[NodeType] = list(NodeType)
+EDGE_TYPES: List[EdgeType] = list(EdgeType)
+UNTYPED = 255  # edge endpoint that was never added as a node
+
+
+def _string_column(values: List[str]) -> Tuple[array, bytes]:
+    offsets = array("q", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def _json_or_empty(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=str, separators=(",", ":")) if data else ""
+
+
+def write_snapshot(graph: SoDGraph, path: str) -> Dict[str, Any]:
+    """
+    Write graph to path (atomically, via a temporary file).
+
+    Returns:
+        The snapshot directory (counts and section layout)
+    """
+    nodes = graph._nodes
+    edges = graph._edges
+
+    node_ids = set(nodes)
+    for edge in edges:
+        node_ids.add(edge.source)
+        node_ids.add(edge.target)
+    ids = sorted(node_ids, key=lambda n: n.encode("utf-8"))
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    n = len(ids)
+
+    type_codes = {t: code for code, t in enumerate(NODE_TYPES)}
+    edge_codes = {t: code for code, t in enumerate(EDGE_TYPES)}
+
+    node_type = array("B", bytes(n))
+    type_rank = array("i", [0]) * n
+    members: List[List[int]] = [[] for _ in NODE_TYPES]
+    labels, systems, node_attrs = [], [], []
+    for i, node_id in enumerate(ids):
+        node = nodes.get(node_id)
+        if node is None:
+            node_type[i] = UNTYPED
+            labels.append("")
+            systems.append("")
+            node_attrs.append("")
+            continue
+        code = type_codes[node.node_type]
+        node_type[i] = code
+        type_rank[i] = len(members[code])
+        members[code].append(i)
+        labels.append("" if node.label == node_id else node.label)
+        systems.append(node.system_id or "")
+        node_attrs.append(_json_or_empty(node.attributes))
+
+    type_ptr = array("q", [0])
+    type_nodes = array("i")
+    for group in members:
+        type_nodes.extend(group)
+        type_ptr.append(len(type_nodes))
+
+    # Forward CSR over every edge (in insertion order per source)
+    by_source: List[List[GraphEdge]] = [[] for _ in range(n)]
+    for edge in edges:
+        by_source[index[edge.source]].append(edge)
+    out_ptr = array("q", [0])
+    out_idx = array("i")
+    out_type = array("B")
+    out_weight = array("f")
+    edge_attrs = []
+    for group in by_source:
+        for edge in group:
+            out_idx.append(index[edge.target])
+            out_type.append(edge_codes[edge.edge_type])
+            out_weight.append(edge.weight)
+            edge_attrs.append(_json_or_empty(edge.attributes))
+        out_ptr.append(len(out_idx))
+
+    # Reverse CSR over distinct (target, source) pairs
+    by_target: List[Set[int]] = [set() for _ in range(n)]
+    for i, group in enumerate(by_source):
+        for edge in group:
+            by_target[index[edge.target]].add(i)
+    in_ptr = array("q", [0])
+    in_idx = array("i")
+    for sources in by_target:
+        in_idx.extend(sorted(sources))
+        in_ptr.append(len(in_idx))
+
+    sections: Dict[str, Tuple[str, bytes]] = {}
+    for name, values in (("id", ids), ("label", labels), ("system", systems),
+                         ("node_attr", node_attrs), ("edge_attr", edge_attrs)):
+        offsets, blob = _string_column(values)
+        sections[f"{name}_offsets"] = ("q", offsets.tobytes())
+        sections[f"{name}_blob"] = ("B", blob)
+    for name, column in (("node_type", node_type), ("type_rank", type_rank),
+                         ("type_ptr", type_ptr), ("type_nodes", type_nodes),
+                         ("out_ptr", out_ptr), ("out_idx", out_idx),
+                         ("out_type", out_type), ("out_weight", out_weight),
+                         ("in_ptr", in_ptr), ("in_idx", in_idx)):
+        sections[name] = (column.typecode, column.tobytes())
+
+    directory: Dict[str, Any] = {
+        "format": FORMAT_VERSION,
+        "nodes": n,
+        "edges": len(out_idx),
+        "node_types": [t.value for t in NODE_TYPES],
+        "edge_types": [t.value for t in EDGE_TYPES],
+        "created_at": datetime.now().isoformat(),
+        "sections": {},
+    }
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        offset = _HEADER.size
+        for name, (typecode, data) in sections.items():
+            padding = -offset % _ALIGN
+            f.write(b"\0" * padding)
+            offset += padding
+            directory["sections"][name] = [offset, len(data), typecode]
+            f.write(data)
+            offset += len(data)
+
+        encoded = json.dumps(directory).encode("utf-8")
+        f.write(encoded)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, offset, len(encoded)))
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote graph snapshot {path}: {n} nodes, {len(out_idx)} edges, {offset + len(encoded)} bytes")
+    return directory
+
+
+class SnapshotReachability:
+    """
+    Reachability closures over a snapshot's CSR arrays.
+
+    Same interface as ReachabilityCache; bit positions are the per-type
+    ranks stored in the snapshot, so nothing is interned at run time. The
+    snapshot is read-only, so cached closures never need invalidating.
+    """
+
+    def __init__(self, snapshot: "GraphSnapshot"):
+        self._snapshot = snapshot
+        self._closures: Dict[int, Dict[int, int]] = {}
+        self._paths: Dict[int, Dict[int, Optional[List[str]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bit(self, node_id: str, node_type: NodeType) -> int:
+        """Bit for node_id (0 if it is not a node of node_type)"""
+        s = self._snapshot
+        i = s._lookup(node_id)
+        if i is None or s._node_type[i] != NODE_TYPES.index(node_type):
+            return 0
+        return 1 << s._type_rank[i]
+
+    def mask_of(self, node_ids, node_type: NodeType) -> int:
+        mask = 0
+        for node_id in node_ids:
+            mask |= self.bit(node_id, node_type)
+        return mask
+
+    def decode(self, mask: int, node_type: NodeType) -> Set[str]:
+        s = self._snapshot
+        start = s._type_ptr[NODE_TYPES.index(node_type)]
+        result = set()
+        while mask:
+            low = mask & -mask
+            result.add(s._id(s._type_nodes[start + low.bit_length() - 1]))
+            mask ^= low
+        return result
+
+    def _closure(self, i: int, code: int) -> int:
+        cache = self._closures.setdefault(code, {})
+        mask = cache.get(i)
+        if mask is not None:
+            self.hits += 1
+            return mask
+
+        self.misses += 1
+        s = self._snapshot
+        out_ptr, out_idx = s._out_ptr, s._out_idx
+        node_type, rank = s._node_type, s._type_rank
+        mask = 0
+        visited = {i}
+        queue = deque([i])
+
+        while queue:
+            current = queue.popleft()
+            for neighbor in out_idx[out_ptr[current]:out_ptr[current + 1]]:
+                if neighbor in visited:
+                    continue
+                visited.add(neighbor)
+                if node_type[neighbor] == code:
+                    mask |= 1 << rank[neighbor]
+                cached = cache.get(neighbor)
+                if cached is not None:
+                    mask |= cached
+                else:
+                    queue.append(neighbor)
+
+        cache[i] = mask
+        return mask
+
+    def closure(self, node_id: str, node_type: NodeType) -> int:
+        i = self._snapshot._lookup(node_id)
+        return self._closure(i, NODE_TYPES.index(node_type)) if i is not None else 0
+
+    def union(self, node_id: str, node_type: NodeType) -> int:
+        """closure(node_id) assembled from the closures of its direct successors"""
+        s = self._snapshot
+        i = s._lookup(node_id)
+        if i is None:
+            return 0
+        code = NODE_TYPES.index(node_type)
+        mask = 0
+        for neighbor in s._out_idx[s._out_ptr[i]:s._out_ptr[i + 1]]:
+            if s._node_type[neighbor] == code:
+                mask |= 1 << s._type_rank[neighbor]
+            mask |= self._closure(neighbor, code)
+        return mask
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        s = self._snapshot
+        i, j = s._lookup(source), s._lookup(target)
+        if i is None or j is None:
+            return None
+        paths = self._paths.setdefault(i, {})
+        if j not in paths:
+            path = s._shortest_path(i, j)
+            paths[j] = [s._id(k) for k in path] if path else None
+        return paths[j]
+
+    def interned_count(self, node_type: NodeType) -> int:
+        code = NODE_TYPES.index(node_type)
+        return self._snapshot._type_ptr[code + 1] - self._snapshot._type_ptr[code]
+
+    def bit_frequencies(self, node_type: NodeType) -> Dict[int, int]:
+        """Bit -> number of cached closures containing it"""
+        counts: Dict[int, int] = {}
+        for mask in self._closures.get(NODE_TYPES.index(node_type), {}).values():
+            while mask:
+                low = mask & -mask
+                counts[low] = counts.get(low, 0) + 1
+                mask ^= low
+        return counts
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "cached_closures": {NODE_TYPES[code].value: len(c) for code, c in self._closures.items()},
+            "interned": self._snapshot.get_statistics()["node_types"],
+            "cached_path_sources": len(self._paths),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class GraphSnapshot:
+    """
+    Read-only SoD graph over snapshot arrays.
+
+    Provides the read side of SoDGraph (traversal, user/role queries,
+    reachability bitsets, statistics) so GraphSoDDetector,
+    ToxicRoleDetector and SoDRuleGenerator can run on it unchanged.
+    """
+
+    def __init__(self, buffer, directory: Dict[str, Any], mapped: Optional[mmap.mmap] = None, file=None):
+        if directory.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {directory.get('format')}")
+        if directory["node_types"] != [t.value for t in NODE_TYPES]:
+            raise ValueError("Snapshot node types do not match this version")
+        if directory["edge_types"] != [t.value for t in EDGE_TYPES]:
+            raise ValueError("Snapshot edge types do not match this version")
+
+        self.directory = directory
+        self._mapped = mapped
+        self._file = file
+        self._buffer = memoryview(buffer)
+        self._views: Dict[str, memoryview] = {}
+        for name, (offset, length, typecode) in directory["sections"].items():
+            self._views[name] = self._buffer[offset:offset + length].cast(typecode)
+
+        v = self._views
+        self._id_offsets, self._id_blob = v["id_offsets"], v["id_blob"]
+        self._node_type, self._type_rank = v["node_type"], v["type_rank"]
+        self._type_ptr, self._type_nodes = v["type_ptr"], v["type_nodes"]
+        self._out_ptr, self._out_idx = v["out_ptr"], v["out_idx"]
+        self._out_type, self._out_weight = v["out_type"], v["out_weight"]
+        self._in_ptr, self._in_idx = v["in_ptr"], v["in_idx"]
+
+        self._lookups: Dict[str, Optional[int]] = {}
+        self._reachability = SnapshotReachability(self)
+
+    # Opening
+
+    @classmethod
+    def open(cls, path: str) -> "GraphSnapshot":
+        """Map a snapshot file read-only."""
+        f = open(path, "rb")
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        return cls(mapped, cls._read_directory(mapped), mapped=mapped, file=f)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GraphSnapshot":
+        """Snapshot over an in-memory copy of a snapshot file."""
+        return cls(data, cls._read_directory(data))
+
+    @staticmethod
+    def _read_directory(buffer) -> Dict[str, Any]:
+        magic, offset, length = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an SoD graph snapshot")
+        return json.loads(bytes(buffer[offset:offset + length]).decode("utf-8"))
+
+    def close(self) -> None:
+        """Release the mapping (no views may be in use)."""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._buffer.release()
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "GraphSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Columns
+
+    def _string(self, column: str, i: int) -> str:
+        offsets = self._views[f"{column}_offsets"]
+        blob = self._views[f"{column}_blob"]
+        return bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def _id(self, i: int) -> str:
+        return bytes(self._id_blob[self._id_offsets[i]:self._id_offsets[i + 1]]).decode("utf-8")
+
+    def _lookup(self, node_id: str) -> Optional[int]:
+        """Index of node_id (binary search over the sorted id column)"""
+        try:
+            return self._lookups[node_id]
+        except KeyError:
+            pass
+        if len(self._lookups) >= LOOKUP_CACHE_SIZE:
+            self._lookups.clear()
+        i = self._lookups[node_id] = self._search(node_id)
+        return i
+
+    def _search(self, node_id: str) -> Optional[int]:
+        key = node_id.encode("utf-8")
+        offsets, blob = self._id_offsets, self._id_blob
+        lo, hi = 0, len(offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(blob[offsets[mid]:offsets[mid + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(offsets) - 1 and bytes(blob[offsets[lo]:offsets[lo + 1]]) == key:
+            return lo
+        return None
+
+    def _node(self, i: int) -> Optional[GraphNode]:
+        code = self._node_type[i]
+        if code == UNTYPED:
+            return None
+        node_id = self._id(i)
+        attrs = self._string("node_attr", i)
+        return GraphNode(
+            node_id=node_id,
+            node_type=NODE_TYPES[code],
+            label=self._string("label", i) or node_id,
+            attributes=json.loads(attrs) if attrs else {},
+            system_id=self._string("system", i) or None,
+        )
+
+    def _successors(self, i: int):
+        return self._out_idx[self._out_ptr[i]:self._out_ptr[i + 1]]
+
+    def _predecessors(self, i: int):
+        return self._in_idx[self._in_ptr[i]:self._in_ptr[i + 1]]
+
+    # Nodes
+
+    def get_node(self, node_id: str) -> Optional[GraphNode]:
+        """Get a node by ID."""
+        i = self._lookup(node_id)
+        return self._node(i) if i is not None else None
+
+    def get_node_type(self, node_id: str) -> Optional[NodeType]:
+        """Type of a node (None if absent)."""
+        i = self._lookup(node_id)
+        if i is None or self._node_type[i] == UNTYPED:
+            return None
+        return NODE_TYPES[self._node_type[i]]
+
+    def get_node_ids_by_type(self, node_type: NodeType) -> List[str]:
+        """IDs of all nodes of a specific type."""
+        code = NODE_TYPES.index(node_type)
+        start, end = self._type_ptr[code], self._type_ptr[code + 1]
+        return [self._id(i) for i in self._type_nodes[start:end]]
+
+    def get_nodes_by_type(self, node_type: NodeType) -> List[GraphNode]:
+        """Get all nodes of a specific type."""
+        code = NODE_TYPES.index(node_type)
+        start, end = self._type_ptr[code], self._type_ptr[code + 1]
+        return [self._node(i) for i in self._type_nodes[start:end]]
+
+    # Traversal
+
+    def _bfs(self, i: int, step) -> Set[int]:
+        visited = set()
+        queue = deque([i])
+        while queue:
+            current = queue.popleft()
+            for neighbor in step(current):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+        return visited
+
+    def get_descendants(self, node_id: str) -> Set[str]:
+        """Get all nodes reachable from a given node."""
+        i = self._lookup(node_id)
+        return {self._id(k) for k in self._bfs(i, self._successors)} if i is not None else set()
+
+    def get_ancestors(self, node_id: str) -> Set[str]:
+        """Get all nodes that can reach a given node."""
+        i = self._lookup(node_id)
+        return {self._id(k) for k in self._bfs(i, self._predecessors)} if i is not None else set()
+
+    def get_reachable_by_type(self, node_id: str, target_type: NodeType) -> Set[str]:
+        """Get all reachable nodes of a specific type."""
+        return self._reachability.decode(self._reachability.union(node_id, target_type), target_type)
+
+    def _shortest_path(self, i: int, j: int) -> Optional[List[int]]:
+        if i == j:
+            return [i]
+        parents = {i: -1}
+        queue = deque([i])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self._successors(current):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = current
+                if neighbor == j:
+                    path = [j]
+                    while parents[path[-1]] != -1:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                queue.append(neighbor)
+        return None
+
+    def find_shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Find shortest path between two nodes (BFS)."""
+        i, j = self._lookup(source), self._lookup(target)
+        if i is None or j is None:
+            return None
+        path = self._shortest_path(i, j)
+        return [self._id(k) for k in path] if path else None
+
+    # User / role queries
+
+    def _neighbors_of_type(self, node_id: str, node_type: NodeType, reverse: bool = False) -> Set[str]:
+        i = self._lookup(node_id)
+        if i is None:
+            return set()
+        code = NODE_TYPES.index(node_type)
+        neighbors = self._predecessors(i) if reverse else self._successors(i)
+        return {self._id(k) for k in neighbors if self._node_type[k] == code}
+
+    def get_user_roles(self, user_id: str) -> Set[str]:
+        """Get all roles for a user."""
+        return self._neighbors_of_type(user_id, NodeType.ROLE)
+
+    def get_role_users(self, role_id: str) -> Set[str]:
+        """Get all users with a role."""
+        return self._neighbors_of_type(role_id, NodeType.USER, reverse=True)
+
+    def get_user_mask(self, user_id: str, node_type: NodeType = NodeType.ACTION) -> int:
+        """Bitset of reachable nodes of node_type: the union of the user's role closures."""
+        return self._reachability.union(user_id, node_type)
+
+    def get_role_mask(self, role_id: str, node_type: NodeType = NodeType.ACTION) -> int:
+        """Cached bitset of nodes of node_type reachable from a role."""
+        return self._reachability.closure(role_id, node_type)
+
+    def iter_user_masks(self, node_type: NodeType = NodeType.ACTION) -> Iterator[Tuple[str, int]]:
+        """(user_id, get_user_mask(user_id)) for every user, straight off the arrays."""
+        s_type, rank = self._node_type, self._type_rank
+        out_ptr, out_idx = self._out_ptr, self._out_idx
+        closure = self._reachability._closure
+        code = NODE_TYPES.index(node_type)
+        user_code = NODE_TYPES.index(NodeType.USER)
+        for i in self._type_nodes[self._type_ptr[user_code]:self._type_ptr[user_code + 1]]:
+            mask = 0
+            for neighbor in out_idx[out_ptr[i]:out_ptr[i + 1]]:
+                if s_type[neighbor] == code:
+                    mask |= 1 << rank[neighbor]
+                mask |= closure(neighbor, code)
+            yield self._id(i), mask
+
+    def get_user_privileges(self, user_id: str) -> Set[str]:
+        return self.get_reachable_by_type(user_id, NodeType.PRIVILEGE)
+
+    def get_user_actions(self, user_id: str) -> Set[str]:
+        return self.get_reachable_by_type(user_id, NodeType.ACTION)
+
+    def get_user_outcomes(self, user_id: str) -> Set[str]:
+        return self.get_reachable_by_type(user_id, NodeType.OUTCOME)
+
+    def get_role_privileges(self, role_id: str) -> Set[str]:
+        return self._reachability.decode(self.get_role_mask(role_id, NodeType.PRIVILEGE), NodeType.PRIVILEGE)
+
+    def get_role_actions(self, role_id: str) -> Set[str]:
+        return self._reachability.decode(self.get_role_mask(role_id, NodeType.ACTION), NodeType.ACTION)
+
+    # Reachability
+
+    @property
+    def reachability(self) -> SnapshotReachability:
+        return self._reachability
+
+    def warm_reachability(self, node_type: NodeType = NodeType.ACTION) -> int:
+        """Precompute the closures of every role; returns the number of roles."""
+        role_code = NODE_TYPES.index(NodeType.ROLE)
+        code = NODE_TYPES.index(node_type)
+        start, end = self._type_ptr[role_code], self._type_ptr[role_code + 1]
+        for i in self._type_nodes[start:end]:
+            self._reachability._closure(i, code)
+        return end - start
+
+    def explain_reach(self, source: str, target: str) -> Optional[List[str]]:
+        """Shortest path from source to target via the memoized paths of its successors."""
+        i, j = self._lookup(source), self._lookup(target)
+        if i is None or j is None:
+            return None
+        if i == j:
+            return [source]
+
+        successors = self._successors(i)
+        if j in successors:
+            return [source, target]
+        code = self._node_type[j]
+        if code == UNTYPED:
+            path = self._shortest_path(i, j)
+            return [self._id(k) for k in path] if path else None
+
+        bit = 1 << self._type_rank[j]
+        best = None
+        for neighbor in successors:
+            if not self._reachability._closure(neighbor, code) & bit:
+                continue
+            path = self._reachability.shortest_path(self._id(neighbor), target)
+            if path and (best is None or len(path) < len(best)):
+                best = path
+        return [source] + best if best else None
+
+    # Statistics / conversion
+
+    def node_count(self) -> int:
+        return sum(1 for code in self._node_type if code != UNTYPED)
+
+    def edge_count(self) -> int:
+        return self.directory["edges"]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        type_counts = {
+            t.value: self._type_ptr[code + 1] - self._type_ptr[code]
+            for code, t in enumerate(NODE_TYPES)
+            if self._type_ptr[code + 1] > self._type_ptr[code]
+        }
+        return {
+            "total_nodes": sum(type_counts.values()),
+            "total_edges": self.directory["edges"],
+            "node_types": type_counts,
+            "using_networkx": False,
+            "snapshot_bytes": len(self._buffer),
+            "created_at": self.directory.get("created_at"),
+        }
+
+    def iter_edges(self) -> Iterator[GraphEdge]:
+        """Edges in CSR order."""
+        for i in range(self.directory["nodes"]):
+            source = self._id(i)
+            for k in range(self._out_ptr[i], self._out_ptr[i + 1]):
+                attrs = self._string("edge_attr", k)
+                yield GraphEdge(
+                    source=source,
+                    target=self._id(self._out_idx[k]),
+                    edge_type=EDGE_TYPES[self._out_type[k]],
+                    attributes=json.loads(attrs) if attrs else {},
+                    weight=self._out_weight[k],
+                )
+
+    def to_graph(self, use_networkx: Optional[bool] = False) -> SoDGraph:
+        """Rebuild a mutable SoDGraph (without the NetworkX mirror by default)."""
+        graph = SoDGraph(use_networkx=use_networkx)
+        for i in range(self.directory["nodes"]):
+            node = self._node(i)
+            if node is not None:
+                graph.add_node(node.node_id, node.node_type, node.label, **node.attributes)
+                graph._nodes[node.node_id].system_id = node.system_id
+        for edge in self.iter_edges():
+            graph.add_edge(edge.source, edge.target, edge.edge_type, weight=edge.weight, **edge.attributes)
+        return graph
@@ -29,6 +29,7 @@ from .risk_patterns import (
     RiskPattern,
     RiskPatternLibrary,
     PatternSeverity,
+    CompiledPatternMatcher,
 )
 
 logger = logging.getLogger(__name__)
@@ -129,12 +130,14 @@ class GraphSoDDetector:
         Initialize detector.
 
         Args:
-            graph: SoD graph with access relationships
+            graph: SoD graph with access relationships (an SoDGraph, or a
+                read-only GraphSnapshot)
             pattern_library: Library of risk patterns (uses default if not provided)
         """
         self.graph = graph
         self.pattern_library = pattern_library or RiskPatternLibrary()
         self._finding_counter = 0
+        self._matcher: Optional[Tuple[Any, CompiledPatternMatcher]] = None
 
     def detect_user(self, user_id: str) -> List[GraphSoDFinding]:
         """
@@ -146,22 +149,17 @@ class GraphSoDDetector:
         Returns:
             List of GraphSoDFinding for all matched patterns
         """
-        findings = []
+        # Union of the user's cached role closures
+        mask = self.graph.get_user_mask(user_id, NodeType.ACTION)
 
-        # Get all reachable actions for this user
-        reachable_actions = self.graph.get_user_actions(user_id)
-
-        if not reachable_actions:
+        if not mask:
             logger.debug(f"No reachable actions for user {user_id}")
-            return findings
-
-        # Check each active pattern
-        for pattern in self.pattern_library.get_active_patterns():
-            if pattern.forbidden_actions.issubset(reachable_actions):
-                finding = self._create_finding(user_id, pattern)
-                findings.append(finding)
+            return []
 
-        return findings
+        return [
+            self._create_finding(user_id, pattern)
+            for pattern in self._get_matcher().match_mask(mask)
+        ]
 
     def detect_all_users(self) -> Dict[str, List[GraphSoDFinding]]:
         """
@@ -171,15 +169,43 @@ class GraphSoDDetector:
             Dictionary mapping user_id to list of findings
         """
         results = {}
-        user_nodes = self.graph.get_nodes_by_type(NodeType.USER)
+        self.graph.warm_reachability(NodeType.ACTION)
+        # Masks first, so every reachable action is interned before compiling
+        user_masks = [(u, m) for u, m in self.graph.iter_user_masks(NodeType.ACTION) if m]
+
+        # Anchor each pattern on the action the fewest roles grant
+        role_counts = self.graph.reachability.bit_frequencies(NodeType.ACTION)
+        matcher = self._get_matcher(
+            frequency=lambda action: role_counts.get(self._action_bit(action), 0)
+        )
 
-        for node in user_nodes:
-            findings = self.detect_user(node.node_id)
-            if findings:
-                results[node.node_id] = findings
+        for user_id, user_mask in user_masks:
+            patterns = matcher.match_mask(user_mask)
+            if patterns:
+                results[user_id] = [self._create_finding(user_id, p) for p in patterns]
 
         return results
 
+    def _action_bit(self, action: str) -> int:
+        return self.graph.reachability.mask_of((action,), NodeType.ACTION)
+
+    def _get_matcher(self, frequency=None) -> CompiledPatternMatcher:
+        """
+        Active patterns compiled against the graph's action bits. Recompiled
+        when patterns change or the graph interns new actions.
+        """
+        if frequency is not None:
+            return self.pattern_library.compile(bit_of=self._action_bit, frequency=frequency)
+
+        key = (
+            self.pattern_library.signature,
+            id(self.graph.reachability),
+            self.graph.reachability.interned_count(NodeType.ACTION),
+        )
+        if self._matcher is None or self._matcher[0] != key:
+            self._matcher = (key, self.pattern_library.compile(bit_of=self._action_bit))
+        return self._matcher[1]
+
     def detect_with_pattern(
         self,
         user_id: str,
@@ -219,14 +245,6 @@ class GraphSoDDetector:
         Returns:
             Tuple of (new_violations, resolved_violations)
         """
-        # Get current violations
-        current_findings = self.detect_user(user_id)
-        current_patterns = {f.pattern.pattern_id for f in current_findings}
-
-        # Simulate changes by temporarily modifying graph
-        # (This is a simplified simulation - in production, use a copy of the graph)
-
-        # Calculate new reachable actions
         current_roles = self.graph.get_user_roles(user_id)
         simulated_roles = current_roles.copy()
 
@@ -235,30 +253,19 @@ class GraphSoDDetector:
         if remove_roles:
             simulated_roles -= set(remove_roles)
 
-        # Get actions from simulated role set
-        simulated_actions = set()
+        # Current access vs. the access of the simulated role set
+        current_mask = self.graph.get_user_mask(user_id, NodeType.ACTION)
+        simulated_mask = 0
         for role in simulated_roles:
-            simulated_actions.update(self.graph.get_role_actions(role))
-
-        # Find patterns that would match
-        simulated_patterns = set()
-        simulated_findings = []
-
-        for pattern in self.pattern_library.get_active_patterns():
-            if pattern.forbidden_actions.issubset(simulated_actions):
-                simulated_patterns.add(pattern.pattern_id)
-                if pattern.pattern_id not in current_patterns:
-                    # New violation
-                    finding = self._create_finding(user_id, pattern)
-                    simulated_findings.append(finding)
-
-        # Find resolved patterns
-        resolved_findings = [
-            f for f in current_findings
-            if f.pattern.pattern_id not in simulated_patterns
-        ]
+            simulated_mask |= self.graph.get_role_mask(role, NodeType.ACTION)
+
+        # Only patterns touching a changed action can flip
+        added, removed = self._get_matcher().delta(current_mask, simulated_mask)
 
-        return simulated_findings, resolved_findings
+        new_findings = [self._create_finding(user_id, p) for p in added]
+        resolved_findings = [self._create_finding(user_id, p) for p in removed]
+
+        return new_findings, resolved_findings
 
     def _create_finding(
         self,
@@ -292,7 +299,7 @@ class GraphSoDDetector:
 
     def _explain_path(self, user_id: str, action: str) -> Optional[PathExplanation]:
         """Explain how a user reaches a specific action."""
-        path = self.graph.find_shortest_path(user_id, action)
+        path = self.graph.explain_reach(user_id, action)
 
         if not path:
             return None
@@ -301,27 +308,25 @@ class GraphSoDDetector:
         roles_involved = []
         tcodes_involved = []
 
-        for node_id in path:
-            node = self.graph.get_node(node_id)
-            if node:
-                if node.node_type == NodeType.ROLE:
-                    roles_involved.append(node_id)
-                elif node.node_type == NodeType.PRIVILEGE:
-                    tcodes_involved.append(node_id)
+        node_types = [self.graph.get_node_type(node_id) for node_id in path]
+
+        for node_id, node_type in zip(path, node_types):
+            if node_type == NodeType.ROLE:
+                roles_involved.append(node_id)
+            elif node_type == NodeType.PRIVILEGE:
+                tcodes_involved.append(node_id)
 
         # Build description
         path_parts = []
-        for i, node_id in enumerate(path):
-            node = self.graph.get_node(node_id)
-            if node:
-                if node.node_type == NodeType.USER:
-                    path_parts.append(f"User {node_id}")
-                elif node.node_type == NodeType.ROLE:
-                    path_parts.append(f"Role '{node_id}'")
-                elif node.node_type == NodeType.PRIVILEGE:
-                    path_parts.append(f"TCode {node_id}")
-                elif node.node_type == NodeType.ACTION:
-                    path_parts.append(f"Action '{node_id}'")
+        for node_id, node_type in zip(path, node_types):
+            if node_type == NodeType.USER:
+                path_parts.append(f"User {node_id}")
+            elif node_type == NodeType.ROLE:
+                path_parts.append(f"Role '{node_id}'")
+            elif node_type == NodeType.PRIVILEGE:
+                path_parts.append(f"TCode {node_id}")
+            elif node_type == NodeType.ACTION:
+                path_parts.append(f"Action '{node_id}'")
 
         path_description = " → ".join(path_parts)
 
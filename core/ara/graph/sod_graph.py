@@ -11,10 +11,17 @@ Models access relationships as:
 (Business Action) ──enables──> (Risk Outcome)
 
 A risk path = any path that violates a control principle.
+
+Reachability from roles and privileges is memoized per node type as
+interned bitsets (ReachabilityCache): a user's actions are the union of
+the cached closures of the roles they hold, so analysing many users that
+share roles costs one traversal per role. Adding or removing an edge
+drops the cached closures of the edge source and everything above it.
 """
 
 from dataclasses import dataclass, field
 from typing import Dict, List, Set, Optional, Any, Tuple
+from collections import deque
 from enum import Enum
 from datetime import datetime
 import logging
@@ -84,6 +91,167 @@ class GraphEdge:
         }
 
 
+class ReachabilityCache:
+    """
+    Memoized reachability closures as interned bitsets.
+
+    Every node of a given type is interned to one bit; closure(node, type)
+    is the bitset of all nodes of that type reachable from node (excluding
+    node itself). Closures are computed by BFS that stops at any node whose
+    closure is already cached and ORs that in instead, so privileges shared
+    by many roles are expanded once. Only complete closures are stored,
+    which keeps the result exact on graphs with cycles.
+
+    Shortest paths from cached nodes are memoized alongside and dropped by
+    the same invalidation.
+    """
+
+    def __init__(self, graph: "SoDGraph"):
+        self._graph = graph
+        self._bits: Dict[NodeType, Dict[str, int]] = {}
+        self._ids: Dict[NodeType, List[str]] = {}
+        self._closures: Dict[NodeType, Dict[str, int]] = {}
+        self._paths: Dict[str, Dict[str, Optional[List[str]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # Interning
+
+    def bit(self, node_id: str, node_type: NodeType) -> int:
+        """Bit for node_id (allocated on first use)"""
+        bits = self._bits.setdefault(node_type, {})
+        index = bits.get(node_id)
+        if index is None:
+            ids = self._ids.setdefault(node_type, [])
+            index = bits[node_id] = len(ids)
+            ids.append(node_id)
+        return 1 << index
+
+    def mask_of(self, node_ids, node_type: NodeType) -> int:
+        """Bitset of node_ids; ids never interned contribute nothing"""
+        bits = self._bits.get(node_type, {})
+        mask = 0
+        for node_id in node_ids:
+            index = bits.get(node_id)
+            if index is not None:
+                mask |= 1 << index
+        return mask
+
+    def decode(self, mask: int, node_type: NodeType) -> Set[str]:
+        """Node ids of the bits set in mask"""
+        ids = self._ids.get(node_type, [])
+        result = set()
+        while mask:
+            low = mask & -mask
+            result.add(ids[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    # Closures
+
+    def closure(self, node_id: str, node_type: NodeType) -> int:
+        """Bitset of nodes of node_type reachable from node_id"""
+        cache = self._closures.setdefault(node_type, {})
+        mask = cache.get(node_id)
+        if mask is not None:
+            self.hits += 1
+            return mask
+
+        self.misses += 1
+        nodes = self._graph._nodes
+        adjacency = self._graph._adjacency
+        mask = 0
+        visited = {node_id}
+        queue = deque([node_id])
+
+        while queue:
+            current = queue.popleft()
+            for neighbor in adjacency.get(current, ()):
+                if neighbor in visited:
+                    continue
+                visited.add(neighbor)
+                node = nodes.get(neighbor)
+                if node is not None and node.node_type == node_type:
+                    mask |= self.bit(neighbor, node_type)
+                cached = cache.get(neighbor)
+                if cached is not None:
+                    mask |= cached
+                else:
+                    queue.append(neighbor)
+
+        cache[node_id] = mask
+        return mask
+
+    def union(self, node_id: str, node_type: NodeType) -> int:
+        """
+        closure(node_id) assembled from the cached closures of its direct
+        successors; used for users, whose closures are not worth keeping.
+        """
+        nodes = self._graph._nodes
+        cache = self._closures.setdefault(node_type, {})
+        mask = 0
+        for neighbor in self._graph._adjacency.get(node_id, ()):
+            node = nodes.get(neighbor)
+            if node is not None and node.node_type == node_type:
+                mask |= self.bit(neighbor, node_type)
+            cached = cache.get(neighbor)
+            if cached is None:
+                cached = self.closure(neighbor, node_type)
+            else:
+                self.hits += 1
+            mask |= cached
+        return mask
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Memoized SoDGraph.find_shortest_path"""
+        paths = self._paths.setdefault(source, {})
+        if target not in paths:
+            paths[target] = self._graph.find_shortest_path(source, target)
+        return paths[target]
+
+    def interned_count(self, node_type: NodeType) -> int:
+        return len(self._ids.get(node_type, ()))
+
+    def bit_frequencies(self, node_type: NodeType) -> Dict[int, int]:
+        """Bit -> number of cached closures containing it (how common a node is)"""
+        counts: Dict[int, int] = {}
+        for mask in self._closures.get(node_type, {}).values():
+            while mask:
+                low = mask & -mask
+                counts[low] = counts.get(low, 0) + 1
+                mask ^= low
+        return counts
+
+    # Invalidation
+
+    def invalidate(self, node_id: str) -> None:
+        """Drop closures and paths of node_id and every node that reaches it"""
+        if not any(self._closures.values()) and not self._paths:
+            return
+
+        affected = self._graph._ancestors_bfs(node_id)
+        affected.add(node_id)
+        for cache in self._closures.values():
+            for affected_id in affected:
+                cache.pop(affected_id, None)
+        for affected_id in affected:
+            self._paths.pop(affected_id, None)
+
+    def clear(self) -> None:
+        """Drop all closures; interned bits are kept"""
+        self._closures.clear()
+        self._paths.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "cached_closures": {t.value: len(c) for t, c in self._closures.items()},
+            "interned": {t.value: len(ids) for t, ids in self._ids.items()},
+            "cached_path_sources": len(self._paths),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
 class SoDGraph:
     """
     Directed graph for SoD analysis.
@@ -95,24 +263,36 @@ class SoDGraph:
     - Control bypass chains
 
     Can use NetworkX if available, otherwise uses pure Python implementation.
+    Pass use_networkx=False to skip the NetworkX mirror (halves memory; the
+    traversals then use the adjacency sets). For read-only analysis of a
+    large graph, see save_snapshot() / GraphSnapshot.
     """
 
-    def __init__(self):
-        """Initialize the SoD graph."""
+    def __init__(self, use_networkx: Optional[bool] = None):
+        """
+        Initialize the SoD graph.
+
+        Args:
+            use_networkx: Mirror the graph into NetworkX (None: when installed)
+        """
         self._nodes: Dict[str, GraphNode] = {}
         self._edges: List[GraphEdge] = []
         self._adjacency: Dict[str, Set[str]] = {}  # node_id -> set of target node_ids
         self._reverse_adjacency: Dict[str, Set[str]] = {}  # node_id -> set of source node_ids
+        self._reachability = ReachabilityCache(self)
 
         # Try to use NetworkX for better performance
         self._nx_graph = None
-        try:
-            import networkx as nx
-            self._nx_graph = nx.DiGraph()
-            self._use_networkx = True
-        except ImportError:
-            self._use_networkx = False
-            logger.info("NetworkX not available, using pure Python graph implementation")
+        self._use_networkx = False
+        if use_networkx is not False:
+            try:
+                import networkx as nx
+                self._nx_graph = nx.DiGraph()
+                self._use_networkx = True
+            except ImportError:
+                if use_networkx:
+                    raise
+                logger.info("NetworkX not available, using pure Python graph implementation")
 
     # Node operations
 
@@ -124,6 +304,10 @@ class SoDGraph:
         **attributes
     ) -> GraphNode:
         """Add a node to the graph."""
+        existing = self._nodes.get(node_id)
+        if existing is not None and existing.node_type != node_type:
+            self._reachability.clear()
+
         node = GraphNode(
             node_id=node_id,
             node_type=node_type,
@@ -175,6 +359,15 @@ class SoDGraph:
         """Get all nodes of a specific type."""
         return [n for n in self._nodes.values() if n.node_type == node_type]
 
+    def get_node_type(self, node_id: str) -> Optional[NodeType]:
+        """Type of a node (None if absent)."""
+        node = self._nodes.get(node_id)
+        return node.node_type if node else None
+
+    def get_node_ids_by_type(self, node_type: NodeType) -> List[str]:
+        """IDs of all nodes of a specific type."""
+        return [n.node_id for n in self._nodes.values() if n.node_type == node_type]
+
     # Edge operations
 
     def add_edge(
@@ -195,6 +388,9 @@ class SoDGraph:
         )
         self._edges.append(edge)
 
+        if target not in self._adjacency.get(source, ()):
+            self._reachability.invalidate(source)
+
         if source not in self._adjacency:
             self._adjacency[source] = set()
         self._adjacency[source].add(target)
@@ -213,10 +409,49 @@ class SoDGraph:
 
         return edge
 
+    def remove_edge(
+        self,
+        source: str,
+        target: str,
+        edge_type: Optional[EdgeType] = None
+    ) -> int:
+        """
+        Remove edges from source to target (of edge_type, or of any type).
+
+        Returns:
+            Number of edges removed
+        """
+        kept = [
+            e for e in self._edges
+            if not (e.source == source and e.target == target
+                    and (edge_type is None or e.edge_type == edge_type))
+        ]
+        removed = len(self._edges) - len(kept)
+        if not removed:
+            return 0
+        self._edges = kept
+
+        # Another edge type may still connect the pair
+        if any(e.source == source and e.target == target for e in kept):
+            return removed
+
+        self._reachability.invalidate(source)
+        self._adjacency.get(source, set()).discard(target)
+        self._reverse_adjacency.get(target, set()).discard(source)
+
+        if self._use_networkx and self._nx_graph.has_edge(source, target):
+            self._nx_graph.remove_edge(source, target)
+
+        return removed
+
     def link_user_role(self, user_id: str, role_id: str, **attributes) -> GraphEdge:
         """Link user to role."""
         return self.add_edge(user_id, role_id, EdgeType.HAS_ROLE, **attributes)
 
+    def unlink_user_role(self, user_id: str, role_id: str) -> int:
+        """Remove a user's role assignment."""
+        return self.remove_edge(user_id, role_id, EdgeType.HAS_ROLE)
+
     def link_role_privilege(self, role_id: str, priv_id: str, **attributes) -> GraphEdge:
         """Link role to privilege."""
         return self.add_edge(role_id, priv_id, EdgeType.GRANTS, **attributes)
@@ -239,10 +474,10 @@ class SoDGraph:
 
         # Pure Python BFS
         visited = set()
-        queue = [node_id]
+        queue = deque([node_id])
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             for neighbor in self._adjacency.get(current, set()):
                 if neighbor not in visited:
                     visited.add(neighbor)
@@ -256,12 +491,15 @@ class SoDGraph:
             import networkx as nx
             return set(nx.ancestors(self._nx_graph, node_id))
 
-        # Pure Python reverse BFS
+        return self._ancestors_bfs(node_id)
+
+    def _ancestors_bfs(self, node_id: str) -> Set[str]:
+        """Pure Python reverse BFS"""
         visited = set()
-        queue = [node_id]
+        queue = deque([node_id])
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             for neighbor in self._reverse_adjacency.get(current, set()):
                 if neighbor not in visited:
                     visited.add(neighbor)
@@ -291,10 +529,10 @@ class SoDGraph:
             return [source]
 
         visited = {source}
-        queue = [(source, [source])]
+        queue = deque([(source, [source])])
 
         while queue:
-            current, path = queue.pop(0)
+            current, path = queue.popleft()
             for neighbor in self._adjacency.get(current, set()):
                 if neighbor == target:
                     return path + [neighbor]
@@ -354,25 +592,38 @@ class SoDGraph:
 
     def get_user_privileges(self, user_id: str) -> Set[str]:
         """Get all privileges reachable by a user."""
-        return self.get_reachable_by_type(user_id, NodeType.PRIVILEGE)
+        return self._reachability.decode(self.get_user_mask(user_id, NodeType.PRIVILEGE), NodeType.PRIVILEGE)
 
     def get_user_actions(self, user_id: str) -> Set[str]:
         """Get all business actions reachable by a user."""
-        return self.get_reachable_by_type(user_id, NodeType.ACTION)
+        return self._reachability.decode(self.get_user_mask(user_id, NodeType.ACTION), NodeType.ACTION)
 
     def get_user_outcomes(self, user_id: str) -> Set[str]:
         """Get all risk outcomes reachable by a user."""
-        return self.get_reachable_by_type(user_id, NodeType.OUTCOME)
+        return self._reachability.decode(self.get_user_mask(user_id, NodeType.OUTCOME), NodeType.OUTCOME)
+
+    def get_user_mask(self, user_id: str, node_type: NodeType = NodeType.ACTION) -> int:
+        """Bitset of reachable nodes of node_type: the union of the user's cached role closures."""
+        return self._reachability.union(user_id, node_type)
+
+    def iter_user_masks(self, node_type: NodeType = NodeType.ACTION):
+        """(user_id, get_user_mask(user_id)) for every user."""
+        for user_id in self.get_node_ids_by_type(NodeType.USER):
+            yield user_id, self._reachability.union(user_id, node_type)
 
     # Role-centric operations
 
     def get_role_privileges(self, role_id: str) -> Set[str]:
         """Get all privileges granted by a role."""
-        return self.get_reachable_by_type(role_id, NodeType.PRIVILEGE)
+        return self._reachability.decode(self.get_role_mask(role_id, NodeType.PRIVILEGE), NodeType.PRIVILEGE)
 
     def get_role_actions(self, role_id: str) -> Set[str]:
         """Get all business actions enabled by a role."""
-        return self.get_reachable_by_type(role_id, NodeType.ACTION)
+        return self._reachability.decode(self.get_role_mask(role_id, NodeType.ACTION), NodeType.ACTION)
+
+    def get_role_mask(self, role_id: str, node_type: NodeType = NodeType.ACTION) -> int:
+        """Cached bitset of nodes of node_type reachable from a role."""
+        return self._reachability.closure(role_id, node_type)
 
     def get_role_users(self, role_id: str) -> Set[str]:
         """Get all users with a role."""
@@ -383,6 +634,45 @@ class SoDGraph:
                 users.add(source)
         return users
 
+    # Reachability cache
+
+    @property
+    def reachability(self) -> ReachabilityCache:
+        """Interned bitsets and memoized closures (see ReachabilityCache)."""
+        return self._reachability
+
+    def warm_reachability(self, node_type: NodeType = NodeType.ACTION) -> int:
+        """Precompute the closures of every role; returns the number of roles."""
+        roles = self.get_nodes_by_type(NodeType.ROLE)
+        for node in roles:
+            self._reachability.closure(node.node_id, node_type)
+        return len(roles)
+
+    def explain_reach(self, source: str, target: str) -> Optional[List[str]]:
+        """
+        Shortest path from source to target, built from the memoized paths
+        of source's successors (users share the role-to-action paths).
+        """
+        if source == target:
+            return [source]
+
+        target_node = self._nodes.get(target)
+        successors = self._adjacency.get(source, ())
+        if target in successors:
+            return [source, target]
+        if target_node is None:
+            return None
+
+        bit = self._reachability.bit(target, target_node.node_type)
+        best = None
+        for neighbor in successors:
+            if not self._reachability.closure(neighbor, target_node.node_type) & bit:
+                continue
+            path = self._reachability.shortest_path(neighbor, target)
+            if path and (best is None or len(path) < len(best)):
+                best = path
+        return [source] + best if best else None
+
     # Graph statistics
 
     def node_count(self) -> int:
@@ -405,6 +695,7 @@ class SoDGraph:
             "total_edges": len(self._edges),
             "node_types": type_counts,
             "using_networkx": self._use_networkx,
+            "reachability": self._reachability.get_statistics(),
         }
 
     # Serialization
@@ -441,6 +732,20 @@ class SoDGraph:
 
         return graph
 
+    # Snapshots
+
+    def save_snapshot(self, path: str) -> Dict[str, Any]:
+        """Write a memory-mappable snapshot of the graph (see GraphSnapshot)."""
+        from .snapshot import write_snapshot
+        return write_snapshot(self, path)
+
+    @classmethod
+    def from_snapshot(cls, path: str, use_networkx: Optional[bool] = False) -> "SoDGraph":
+        """Rebuild a mutable graph from a snapshot file."""
+        from .snapshot import GraphSnapshot
+        with GraphSnapshot.open(path) as snapshot:
+            return snapshot.to_graph(use_networkx=use_networkx)
+
     # Bulk loading
 
     def load_from_sap_data(
@@ -15,6 +15,9 @@ This enables:
 - Proactive role remediation
 - Role design improvement
 - Risk concentration identification
+
+find_toxic_roles scores the whole catalogue in one pass over a
+RoleActionMatrix; calculate_toxicity_score remains for single roles.
 """
 
 from dataclasses import dataclass, field
@@ -23,6 +26,7 @@ from datetime import datetime
 import logging
 
 from .sod_graph import SoDGraph, NodeType
+from .role_matrix import RoleActionMatrix
 from .risk_patterns import (
     RiskPattern,
     RiskPatternLibrary,
@@ -154,6 +158,7 @@ class ToxicRoleDetector:
         self.graph = graph
         self.pattern_library = pattern_library or RiskPatternLibrary()
         self._finding_counter = 0
+        self._pattern_pairs: Optional[Tuple[Any, Set[frozenset]]] = None
 
     def calculate_toxicity_score(self, role_id: str) -> RoleToxicityScore:
         """
@@ -167,36 +172,93 @@ class ToxicRoleDetector:
         """
         # Get all actions reachable through this role
         role_actions = self.graph.get_role_actions(role_id)
-        role_privileges = self.graph.get_role_privileges(role_id)
+        patterns = self.pattern_library.get_active_patterns()
 
-        score = RoleToxicityScore(
-            role_id=role_id,
-            toxicity_score=0,
-            risk_concentration=0,
+        # Find forbidden actions this role enables
+        all_forbidden_actions = set()
+        for pattern in patterns:
+            all_forbidden_actions.update(pattern.forbidden_actions)
+
+        return self._score(
+            role_id,
             total_actions=len(role_actions),
-            total_privileges=len(role_privileges),
+            total_privileges=len(self.graph.get_role_privileges(role_id)),
+            users_with_role=len(self.graph.get_role_users(role_id)),
+            forbidden_actions_enabled=role_actions & all_forbidden_actions,
+            patterns_matched=[p.pattern_id for p in patterns if p.forbidden_actions.issubset(role_actions)],
+            forbidden_action_count=len(all_forbidden_actions),
         )
 
-        # Count users with this role
-        score.users_with_role = len(self.graph.get_role_users(role_id))
+    def score_all_roles(
+        self,
+        matrix: Optional[RoleActionMatrix] = None
+    ) -> Dict[str, RoleToxicityScore]:
+        """
+        Toxicity scores of every role in one pass.
 
-        # Find forbidden actions this role enables
-        all_forbidden_actions = set()
-        for pattern in self.pattern_library.get_active_patterns():
-            all_forbidden_actions.update(pattern.forbidden_actions)
+        Same scores as calculate_toxicity_score, computed from the role x
+        action matrix: forbidden actions are one AND per role and pattern
+        hits come from the compiled pattern matcher.
 
-        score.forbidden_actions_enabled = role_actions & all_forbidden_actions
+        Args:
+            matrix: Prebuilt matrix of this graph (built if omitted)
 
-        # Find patterns this role matches
-        for pattern in self.pattern_library.get_active_patterns():
-            if pattern.forbidden_actions.issubset(role_actions):
-                score.patterns_matched.append(pattern.pattern_id)
+        Returns:
+            role_id -> RoleToxicityScore, in catalogue order
+        """
+        matrix = matrix or RoleActionMatrix(self.graph)
+        patterns = self.pattern_library.get_active_patterns()
+        all_forbidden_actions = {a for p in patterns for a in p.forbidden_actions}
+        forbidden_mask = 0
+        for action in all_forbidden_actions:
+            forbidden_mask |= matrix.action_bit(action)
+        matcher = self._compile(matrix)
+
+        scores = {}
+        for i, role_id in enumerate(matrix.role_ids):
+            row = matrix.rows[i]
+            scores[role_id] = self._score(
+                role_id,
+                total_actions=row.bit_count(),
+                total_privileges=matrix.privilege_counts[i],
+                users_with_role=matrix.user_counts[i],
+                forbidden_actions_enabled=matrix.actions_of(row & forbidden_mask),
+                patterns_matched=[p.pattern_id for p in matcher.match_mask(row)],
+                forbidden_action_count=len(all_forbidden_actions),
+            )
+        return scores
+
+    def _compile(self, matrix: RoleActionMatrix):
+        """Active patterns compiled against the matrix rows, anchored on the rarest action"""
+        return self.pattern_library.compile(bit_of=matrix.action_bit, frequency=matrix.role_frequency)
+
+    def _score(
+        self,
+        role_id: str,
+        total_actions: int,
+        total_privileges: int,
+        users_with_role: int,
+        forbidden_actions_enabled: Set[str],
+        patterns_matched: List[str],
+        forbidden_action_count: int,
+    ) -> RoleToxicityScore:
+        """Toxicity score from a role's counts and pattern hits"""
+        score = RoleToxicityScore(
+            role_id=role_id,
+            toxicity_score=0,
+            risk_concentration=0,
+            forbidden_actions_enabled=forbidden_actions_enabled,
+            patterns_matched=patterns_matched,
+            total_actions=total_actions,
+            total_privileges=total_privileges,
+            users_with_role=users_with_role,
+        )
 
         # Calculate toxicity score
         base_score = 0
 
         # Score for forbidden actions (up to 40 points)
-        forbidden_ratio = len(score.forbidden_actions_enabled) / max(len(all_forbidden_actions), 1)
+        forbidden_ratio = len(score.forbidden_actions_enabled) / max(forbidden_action_count, 1)
         base_score += forbidden_ratio * 40
 
         # Score for patterns matched (up to 40 points)
@@ -205,11 +267,11 @@ class ToxicRoleDetector:
             base_score += pattern_score
 
         # Score for privilege breadth (up to 20 points)
-        if len(role_privileges) > 50:
+        if total_privileges > 50:
             base_score += 20
-        elif len(role_privileges) > 25:
+        elif total_privileges > 25:
             base_score += 10
-        elif len(role_privileges) > 10:
+        elif total_privileges > 10:
             base_score += 5
 
         score.toxicity_score = min(base_score, 100)
@@ -222,13 +284,15 @@ class ToxicRoleDetector:
 
     def find_toxic_roles(
         self,
-        min_score: Optional[float] = None
+        min_score: Optional[float] = None,
+        matrix: Optional[RoleActionMatrix] = None
     ) -> List[ToxicRoleFinding]:
         """
         Find all toxic roles in the graph.
 
         Args:
             min_score: Minimum toxicity score to report (default: MIN_TOXICITY_SCORE)
+            matrix: Prebuilt role x action matrix of this graph (built if omitted)
 
         Returns:
             List of ToxicRoleFinding sorted by toxicity score
@@ -236,13 +300,35 @@ class ToxicRoleDetector:
         min_score = min_score or self.MIN_TOXICITY_SCORE
         findings = []
 
-        role_nodes = self.graph.get_nodes_by_type(NodeType.ROLE)
+        matrix = matrix or RoleActionMatrix(self.graph)
+        scores = self.score_all_roles(matrix)
 
-        for node in role_nodes:
-            toxicity = self.calculate_toxicity_score(node.node_id)
+        # Pattern entries by action bit, for contributing patterns
+        patterns = self.pattern_library.get_active_patterns()
+        by_bit: Dict[int, List[int]] = {}
+        for order, pattern in enumerate(patterns):
+            for action in pattern.forbidden_actions:
+                bit = matrix.action_bit(action)
+                if bit:
+                    by_bit.setdefault(bit, []).append(order)
+        matcher = self._compile(matrix)
 
+        for role_id, toxicity in scores.items():
             if toxicity.toxicity_score >= min_score:
-                finding = self._create_finding(node.node_id, toxicity)
+                row = matrix.row(role_id)
+                fully_enabled = matcher.match_mask(row)
+                enabled_ids = {id(p) for p in fully_enabled}
+                touched = set()
+                touching = row
+                while touching:
+                    low = touching & -touching
+                    touched.update(by_bit.get(low, ()))
+                    touching ^= low
+                contributing = [
+                    patterns[order] for order in sorted(touched)
+                    if id(patterns[order]) not in enabled_ids
+                ]
+                finding = self._create_finding(role_id, toxicity, fully_enabled, contributing)
                 findings.append(finding)
 
         # Sort by toxicity score descending
@@ -266,9 +352,16 @@ class ToxicRoleDetector:
     def _create_finding(
         self,
         role_id: str,
-        toxicity: RoleToxicityScore
+        toxicity: RoleToxicityScore,
+        fully_enabled: Optional[List[RiskPattern]] = None,
+        contributing: Optional[List[RiskPattern]] = None
     ) -> ToxicRoleFinding:
-        """Create a detailed finding for a toxic role."""
+        """
+        Create a detailed finding for a toxic role.
+
+        fully_enabled/contributing may be passed in when already known
+        (batch scoring); otherwise they are found by scanning the library.
+        """
         self._finding_counter += 1
         finding_id = f"TOXIC-{role_id}-{self._finding_counter}"
 
@@ -295,23 +388,26 @@ class ToxicRoleDetector:
         )
 
         # Find patterns fully enabled vs contributing
-        role_actions = self.graph.get_role_actions(role_id)
+        if fully_enabled is not None and contributing is not None:
+            finding.fully_enabled_patterns = list(fully_enabled)
+            finding.contributing_patterns = list(contributing)
+        else:
+            role_actions = self.graph.get_role_actions(role_id)
 
-        for pattern in self.pattern_library.get_active_patterns():
-            if pattern.forbidden_actions.issubset(role_actions):
-                finding.fully_enabled_patterns.append(pattern)
-            elif pattern.forbidden_actions & role_actions:
-                finding.contributing_patterns.append(pattern)
+            for pattern in self.pattern_library.get_active_patterns():
+                if pattern.forbidden_actions.issubset(role_actions):
+                    finding.fully_enabled_patterns.append(pattern)
+                elif pattern.forbidden_actions & role_actions:
+                    finding.contributing_patterns.append(pattern)
 
         # Find conflicting action pairs within this role
+        conflicting_pairs = self._get_pattern_pairs()
         forbidden_actions_list = list(toxicity.forbidden_actions_enabled)
         for i, action1 in enumerate(forbidden_actions_list):
             for action2 in forbidden_actions_list[i + 1:]:
                 # Check if these form a conflict
-                for pattern in self.pattern_library.get_active_patterns():
-                    if {action1, action2}.issubset(pattern.forbidden_actions):
-                        finding.conflicting_action_pairs.append((action1, action2))
-                        break
+                if frozenset((action1, action2)) in conflicting_pairs:
+                    finding.conflicting_action_pairs.append((action1, action2))
 
         # Identify sensitive actions
         finding.sensitive_actions = toxicity.forbidden_actions_enabled
@@ -324,6 +420,19 @@ class ToxicRoleDetector:
 
         return finding
 
+    def _get_pattern_pairs(self) -> Set[frozenset]:
+        """Action pairs that appear together in some active pattern"""
+        signature = self.pattern_library.signature
+        if self._pattern_pairs is None or self._pattern_pairs[0] != signature:
+            pairs = set()
+            for pattern in self.pattern_library.get_active_patterns():
+                actions = sorted(pattern.forbidden_actions)
+                for i, action1 in enumerate(actions):
+                    for action2 in actions[i + 1:]:
+                        pairs.add(frozenset((action1, action2)))
+            self._pattern_pairs = (signature, pairs)
+        return self._pattern_pairs[1]
+
     def _generate_recommendations(self, finding: ToxicRoleFinding) -> List[str]:
         """Generate remediation recommendations."""
         recommendations = []
@@ -396,7 +505,7 @@ class ToxicRoleDetector:
         """Get summary of all toxic roles."""
         findings = self.find_toxic_roles(min_score=0)
 
-        total_roles = len(self.graph.get_nodes_by_type(NodeType.ROLE))
+        total_roles = len(self.graph.get_node_ids_by_type(NodeType.ROLE))
         toxic_roles = len([f for f in findings if f.toxicity_score.toxicity_score >= self.MIN_TOXICITY_SCORE])
         critical_roles = len([f for f in findings if f.severity == PatternSeverity.CRITICAL])
 
@@ -29,6 +29,15 @@ from .summarizer import (
     RiskSummaryResult,
 )
 
+from .executor import (
+    LLMExecutor,
+    LLMExecutorConfig,
+    LLMRequest,
+    LLMResponse,
+    ResponseCache,
+    RateLimitError,
+)
+
 from .narratives import (
     ExecutiveNarrativeGenerator,
     NarrativeConfig,
@@ -46,6 +55,13 @@ __all__ = [
     "RiskSummarizer",
     "SummaryConfig",
     "RiskSummaryResult",
+    # Execution
+    "LLMExecutor",
+    "LLMExecutorConfig",
+    "LLMRequest",
+    "LLMResponse",
+    "ResponseCache",
+    "RateLimitError",
     # Narratives
     "ExecutiveNarrativeGenerator",
     "NarrativeConfig",
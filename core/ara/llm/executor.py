@@ -0,0 +1,601 @@
+# LLM Execution Layer
+# Concurrent, cached and coalesced LLM calls
+
+"""
+LLM execution layer for GOVERNEX+.
+
+Sits between the summarizers and the provider clients:
+- bounded concurrency, process-wide: the limit holds across every thread
+  and event loop using the executor (blocking SDK clients run in worker
+  threads)
+- rate-limit awareness: optional request pacing, and on HTTP 429 every
+  worker pauses until the provider's retry-after has passed
+- retries with exponential backoff for rate limits, timeouts, connection
+  failures and 5xx responses only; other errors fail immediately
+- content-addressed response cache keyed on the normalized prompt, with
+  TTL and optional JSON persistence on disk
+- in-flight coalescing: identical requests issued while one is pending
+  share its response instead of calling the provider again; the call
+  keeps running while any caller still waits for it
+- token and latency metrics
+
+The provider call is a plain function (sync or async) taking an
+LLMRequest and returning (content, tokens_used), so the layer works the
+same for OpenAI, Anthropic and the mock provider.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from collections import OrderedDict, deque
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMExecutorConfig:
+    """Configuration for the LLM execution layer."""
+    # Concurrency
+    max_concurrency: int = 8
+    requests_per_minute: Optional[int] = None  # None = no pacing
+
+    # Retries on rate limiting / transient errors
+    max_retries: int = 3
+    retry_base_delay: float = 1.0  # seconds, doubled per attempt
+    retry_max_delay: float = 60.0
+
+    # Response cache
+    cache_enabled: bool = True
+    cache_ttl_seconds: int = 7 * 24 * 3600
+    cache_max_entries: int = 10000
+    cache_path: Optional[str] = None  # JSON file; None = memory only
+
+
+@dataclass
+class LLMRequest:
+    """One completion request."""
+    system: str
+    prompt: str
+    model: str
+    provider: str = ""
+    temperature: float = 0.0
+    max_tokens: int = 500
+
+    # Passed to the provider call, not part of the cache key
+    context: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so formatting differences share a cache entry"""
+        return " ".join(text.split())
+
+    def cache_key(self) -> str:
+        material = json.dumps([
+            self.provider,
+            self.model,
+            self.temperature,
+            self.max_tokens,
+            self.normalize(self.system),
+            self.normalize(self.prompt),
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class LLMResponse:
+    """Completion result, fresh or served from cache."""
+    content: str
+    model: str
+    tokens_used: int = 0
+    latency_ms: float = 0.0
+    cache_key: str = ""
+    cached: bool = False
+    coalesced: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "content": self.content,
+            "model": self.model,
+            "tokens_used": self.tokens_used,
+            "latency_ms": round(self.latency_ms, 2),
+            "cache_key": self.cache_key,
+            "cached": self.cached,
+            "coalesced": self.coalesced,
+        }
+
+
+class RateLimitError(Exception):
+    """Provider rejected a call for rate limiting."""
+
+    def __init__(self, message: str = "rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def rate_limit_delay(error: Exception) -> Optional[float]:
+    """
+    Seconds to wait if error is a rate-limit rejection, else None.
+
+    Recognizes RateLimitError, the OpenAI / Anthropic SDK RateLimitError
+    classes and anything carrying status_code 429; a Retry-After header on
+    the error's response is honoured (0.0 when absent).
+    """
+    if isinstance(error, RateLimitError):
+        return error.retry_after or 0.0
+    status = getattr(error, "status_code", None)
+    if status != 429 and "RateLimit" not in type(error).__name__:
+        return None
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+TRANSIENT_ERROR_NAMES = ("Timeout", "APIConnectionError", "InternalServerError", "ServiceUnavailable", "Overloaded")
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Whether error is worth retrying: a timeout, a connection failure or a
+    5xx from the provider (status_code on the error or its response, or
+    the OpenAI / Anthropic SDK error classes for these). Anything else -
+    bad requests, authentication, programming errors - fails at once.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if any(name in type(error).__name__ for name in TRANSIENT_ERROR_NAMES):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+@dataclass
+class LLMMetrics:
+    """Counters for the execution layer."""
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    tokens_used: int = 0
+    tokens_saved: int = 0  # tokens of responses reused from cache / in-flight calls
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    latencies_ms: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+    def record_call(self, latency_ms: float, tokens: int):
+        self.calls += 1
+        self.tokens_used += tokens
+        self.latency_ms_total += latency_ms
+        self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+        self.latencies_ms.append(latency_ms)
+
+    def _percentile(self, q: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "hit_rate": round((self.cache_hits + self.coalesced) / self.requests, 4) if self.requests else 0.0,
+            "tokens_used": self.tokens_used,
+            "tokens_saved": self.tokens_saved,
+            "latency_ms_avg": round(self.latency_ms_total / self.calls, 2) if self.calls else 0.0,
+            "latency_ms_p50": round(self._percentile(0.5), 2),
+            "latency_ms_p95": round(self._percentile(0.95), 2),
+            "latency_ms_max": round(self.latency_ms_max, 2),
+        }
+
+
+class ResponseCache:
+    """
+    Content-addressed LLM response cache.
+
+    Entries expire after ttl_seconds; the least recently used entry is
+    evicted beyond max_entries. With a path, entries are loaded on start
+    and written back (atomically) by save().
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 10000,
+        path: Optional[str] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path:
+            self.load()
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry["created"] > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, time.time()):
+                del self._entries[key]
+                self._dirty = True
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, content: str, model: str, tokens_used: int):
+        with self._lock:
+            self._entries[key] = {
+                "content": content,
+                "model": model,
+                "tokens_used": tokens_used,
+                "created": time.time(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> int:
+        """Load unexpired entries from path; returns the number loaded"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache {self.path}: {e}")
+            return 0
+
+        now = time.time()
+        with self._lock:
+            for key, entry in sorted(stored.items(), key=lambda item: item[1].get("created", 0)):
+                if not self._expired(entry, now):
+                    self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return len(self._entries)
+
+    def save(self) -> bool:
+        """Write entries to path if changed; returns True if written"""
+        if not self.path:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return False
+            now = time.time()
+            snapshot = {k: e for k, e in self._entries.items() if not self._expired(e, now)}
+            self._dirty = False
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+        return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "path": self.path,
+        }
+
+
+class _ConcurrencyLimit:
+    """
+    Process-wide cap on concurrent provider calls.
+
+    asyncio.Semaphore is bound to one event loop, so run_batch calls from
+    several threads would each get their own; this wraps a
+    threading.BoundedSemaphore for async use instead. Acquisition polls,
+    which never blocks the loop and leaks no slot when cancelled.
+    """
+
+    POLL_SECONDS = 0.005
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+
+    async def __aenter__(self):
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(self.POLL_SECONDS)
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+
+class _InFlight:
+    """A provider call shared by identical requests on one event loop"""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class _LoopState:
+    """Per-event-loop primitives (asyncio objects are bound to one loop)"""
+
+    def __init__(self):
+        self.inflight: Dict[str, _InFlight] = {}
+
+
+class LLMExecutor:
+    """
+    Runs LLM requests with bounded concurrency, caching and coalescing.
+
+    Usage:
+        executor = LLMExecutor(complete, LLMExecutorConfig(max_concurrency=16))
+        responses = executor.run_batch(requests)        # from sync code
+        responses = await executor.run_many(requests)   # from async code
+
+    complete(request) -> (content, tokens_used) may be a regular function
+    (run in a worker thread) or a coroutine function.
+    """
+
+    def __init__(
+        self,
+        complete: Callable[[LLMRequest], Any],
+        config: Optional[LLMExecutorConfig] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        self.complete = complete
+        self.config = config or LLMExecutorConfig()
+        self.cache = cache
+        if self.cache is None and self.config.cache_enabled:
+            self.cache = ResponseCache(
+                ttl_seconds=self.config.cache_ttl_seconds,
+                max_entries=self.config.cache_max_entries,
+                path=self.config.cache_path,
+            )
+        self.metrics = LLMMetrics()
+
+        self._is_async = inspect.iscoroutinefunction(complete)
+        self._lock = threading.Lock()
+        self._slots = _ConcurrencyLimit(self.config.max_concurrency)
+        self._loops: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._resume_at = 0.0  # monotonic time before which no call starts
+        self._next_slot = 0.0  # pacing for requests_per_minute
+
+    # Async API
+
+    async def run(self, request: LLMRequest) -> LLMResponse:
+        """Execute one request (cache -> in-flight -> provider)"""
+        key = request.cache_key()
+        with self._lock:
+            self.metrics.requests += 1
+
+        cached = self._from_cache(key)
+        if cached is not None:
+            return cached
+
+        state = self._loop_state()
+        entry = state.inflight.get(key)
+        leader = entry is None
+        if leader:
+            task = asyncio.get_running_loop().create_task(self._execute(request, key))
+            entry = state.inflight[key] = _InFlight(task)
+            task.add_done_callback(lambda _: self._forget(state, key, entry))
+
+        # Every caller waits through a shield: one of them being cancelled
+        # must not cancel the call for the others. The call itself is
+        # cancelled once nobody is waiting for it any more.
+        entry.waiters += 1
+        try:
+            response = await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            if not entry.task.done():
+                entry.waiters -= 1
+                if entry.waiters == 0:
+                    self._forget(state, key, entry)
+                    entry.task.cancel()
+            raise
+
+        if leader:
+            return response
+        with self._lock:
+            self.metrics.coalesced += 1
+            self.metrics.tokens_saved += response.tokens_used
+        return LLMResponse(
+            content=response.content,
+            model=response.model,
+            tokens_used=0,
+            latency_ms=response.latency_ms,
+            cache_key=key,
+            coalesced=True,
+        )
+
+    async def run_many(
+        self,
+        requests: List[LLMRequest],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Execute requests concurrently; results are in request order"""
+        return await asyncio.gather(
+            *(self.run(r) for r in requests),
+            return_exceptions=return_exceptions,
+        )
+
+    # Sync API
+
+    def run_batch(
+        self,
+        requests: List[LLMRequest],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Blocking run_many; persists the cache afterwards"""
+        try:
+            results = _run_sync(lambda: self.run_many(requests, return_exceptions))
+        finally:
+            self.save_cache()
+        return results
+
+    def run_sync(self, request: LLMRequest) -> LLMResponse:
+        return self.run_batch([request])[0]
+
+    # Internals
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = _LoopState()
+        return state
+
+    @staticmethod
+    def _forget(state: _LoopState, key: str, entry: _InFlight):
+        """Stop coalescing onto entry (unless a newer call replaced it)"""
+        if state.inflight.get(key) is entry:
+            del state.inflight[key]
+
+    def _from_cache(self, key: str) -> Optional[LLMResponse]:
+        if self.cache is None:
+            return None
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        with self._lock:
+            self.metrics.cache_hits += 1
+            self.metrics.tokens_saved += entry["tokens_used"]
+        return LLMResponse(
+            content=entry["content"],
+            model=entry["model"],
+            tokens_used=0,
+            cache_key=key,
+            cached=True,
+        )
+
+    async def _wait_for_slot(self):
+        """Honour a rate-limit pause and requests_per_minute pacing"""
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                paused = now < self._resume_at
+                if paused:
+                    delay = self._resume_at - now
+                elif self.config.requests_per_minute:
+                    # Reserve the next start slot
+                    start = max(now, self._next_slot)
+                    self._next_slot = start + 60.0 / self.config.requests_per_minute
+                    delay = start - now
+                else:
+                    delay = 0.0
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if not paused:
+                return
+
+    async def _call(self, request: LLMRequest) -> Tuple[str, int]:
+        if self._is_async:
+            return await self.complete(request)
+        return await asyncio.to_thread(self.complete, request)
+
+    async def _execute(self, request: LLMRequest, key: str) -> LLMResponse:
+        attempt = 0
+        async with self._slots:
+            while True:
+                await self._wait_for_slot()
+                started = time.perf_counter()
+                try:
+                    content, tokens = await self._call(request)
+                except Exception as e:
+                    delay = rate_limit_delay(e)
+                    with self._lock:
+                        if delay is not None:
+                            self.metrics.rate_limited += 1
+                        elif not is_transient_error(e):
+                            self.metrics.failures += 1
+                            raise
+                        if attempt >= self.config.max_retries:
+                            self.metrics.failures += 1
+                            raise
+                        self.metrics.retries += 1
+                        backoff = min(
+                            self.config.retry_max_delay,
+                            self.config.retry_base_delay * (2 ** attempt),
+                        )
+                        if delay is not None:
+                            # Pause every worker, not just this one
+                            backoff = max(backoff, delay)
+                            self._resume_at = max(self._resume_at, time.monotonic() + backoff)
+                    attempt += 1
+                    logger.warning(f"LLM call failed ({e}); retry {attempt} in {backoff:.1f}s")
+                    if delay is None:
+                        await asyncio.sleep(backoff)
+                    continue
+
+                latency_ms = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    self.metrics.record_call(latency_ms, tokens)
+                if self.cache is not None:
+                    self.cache.put(key, content, request.model, tokens)
+                return LLMResponse(
+                    content=content,
+                    model=request.model,
+                    tokens_used=tokens,
+                    latency_ms=latency_ms,
+                    cache_key=key,
+                )
+
+    def save_cache(self) -> bool:
+        if self.cache is None:
+            return False
+        try:
+            return self.cache.save()
+        except OSError as e:
+            logger.warning(f"Could not persist LLM cache: {e}")
+            return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self.metrics.to_dict()
+        metrics["cache"] = self.cache.get_statistics() if self.cache is not None else None
+        return metrics
+
+
+def _run_sync(make_coroutine: Callable[[], Any]) -> Any:
+    """Run a coroutine to completion from sync code, even inside a running loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(make_coroutine())
+    # Called from async code: use a private loop in a helper thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(lambda: asyncio.run(make_coroutine())).result()
@@ -13,19 +13,32 @@ They need risk stories, not logs.
 
 This module generates board-ready narratives from
 structured risk data.
+
+Each section is cached under a fingerprint of the metrics it reads, so a
+regenerated narrative only rebuilds the sections whose inputs changed.
+With an LLM provider configured, the prose sections are refined through
+the LLM execution layer, all changed sections in one concurrent batch.
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Any, Callable, Tuple, Union
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
+import hashlib
+import json
 import logging
+import threading
 
-from .prompts import EXECUTIVE_NARRATIVE_PROMPT
-from .summarizer import LLMProvider, SummaryConfig
+from .prompts import EXECUTIVE_NARRATIVE_PROMPT, EXECUTIVE_SECTION_INPUT_TEMPLATE
+from .summarizer import LLMProvider, SummaryConfig, RiskSummarizer
+from .executor import LLMExecutor, LLMExecutorConfig, LLMRequest
 
 logger = logging.getLogger(__name__)
 
+# Prose sections refined by the LLM when a provider is configured
+LLM_SECTIONS = ("executive_summary", "trend_narrative", "control_narrative")
+
 
 class NarrativeTone(Enum):
     """Tone for narrative generation."""
@@ -49,6 +62,10 @@ class NarrativeConfig:
     include_recommendations: bool = True
     include_metrics: bool = True
 
+    # Caching / execution
+    section_cache_size: int = 512
+    executor: LLMExecutorConfig = field(default_factory=LLMExecutorConfig)
+
 
 @dataclass
 class RiskStory:
@@ -181,14 +198,36 @@ class ExecutiveNarrativeGenerator:
     narratives suitable for board presentations.
     """
 
-    def __init__(self, config: Optional[NarrativeConfig] = None):
+    def __init__(
+        self,
+        config: Optional[NarrativeConfig] = None,
+        executor: Optional[LLMExecutor] = None
+    ):
         """
         Initialize narrative generator.
 
         Args:
             config: Narrative configuration
+            executor: Shared LLM execution layer (default: built from config)
         """
         self.config = config or NarrativeConfig()
+        self.executor = executor
+        self.llm_enabled = False
+        if self.config.provider in (LLMProvider.OPENAI, LLMProvider.ANTHROPIC):
+            summarizer = RiskSummarizer(SummaryConfig(
+                provider=self.config.provider,
+                model=self.config.model,
+                api_key=self.config.api_key,
+                executor=self.config.executor,
+            ))
+            # Falls back to MOCK when the client library is missing
+            self.llm_enabled = summarizer.config.provider != LLMProvider.MOCK
+            self.executor = self.executor or summarizer.executor
+
+        self._sections: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._rendered: Dict[str, ExecutiveNarrative] = {}
+        self._lock = threading.Lock()
+        self._stats = {"sections_reused": 0, "sections_built": 0, "llm_sections": 0, "llm_failures": 0}
 
     def generate(self, metrics: Dict[str, Any]) -> ExecutiveNarrative:
         """
@@ -209,6 +248,47 @@ class ExecutiveNarrativeGenerator:
         Returns:
             ExecutiveNarrative ready for presentation
         """
+        return self.generate_many([metrics])[0]
+
+    def generate_many(self, metrics_list: List[Dict[str, Any]]) -> List[ExecutiveNarrative]:
+        """
+        Generate narratives for several metric sets (e.g. periods or
+        business units). Unchanged sections come from the section cache;
+        LLM refinements of all changed sections run as one batch.
+        """
+        plans = [self._plan(metrics) for metrics in metrics_list]
+
+        # Reuse cached sections, build the rest; prose drafts go to the LLM if enabled
+        resolved: Dict[Tuple[str, str], Any] = {}
+        pending: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        with self._lock:
+            for plan in plans:
+                for name, (key, inputs, build) in plan["sections"].items():
+                    if key in resolved or key in pending:
+                        continue
+                    if key in self._sections:
+                        self._sections.move_to_end(key)
+                        resolved[key] = self._sections[key]
+                        self._stats["sections_reused"] += 1
+                        continue
+                    value = build()
+                    self._stats["sections_built"] += 1
+                    if self.llm_enabled and name in LLM_SECTIONS:
+                        pending[key] = (value, inputs)
+                        continue
+                    resolved[key] = value
+                    self._store(key, value)
+
+        if pending:
+            resolved.update(self._refine(pending))
+
+        return [
+            self._assemble(plan, {name: resolved[key] for name, (key, _, _) in plan["sections"].items()})
+            for plan in plans
+        ]
+
+    def _plan(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Derived values plus (cache key, inputs, builder) per section."""
         # Extract metrics
         overall_risk = metrics.get("overall_risk", 0)
         total_users = metrics.get("total_users", 0)
@@ -218,7 +298,6 @@ class ExecutiveNarrativeGenerator:
         curr_score = metrics.get("curr_risk_score", 0)
         top_risks = metrics.get("top_risks", [])
         controls = metrics.get("controls", {})
-        affected_areas = metrics.get("affected_areas", [])
 
         # Calculate trends
         if prev_score > 0:
@@ -237,54 +316,179 @@ class ExecutiveNarrativeGenerator:
             risk_posture = "stable"
             trend_direction = "stable"
 
-        # Generate headline
-        headline = self._generate_headline(
-            overall_risk, critical_findings, risk_posture
-        )
+        control_effectiveness = controls.get("effectiveness", 0.85)
 
-        # Generate executive summary
-        executive_summary = self._generate_summary(
-            overall_risk, high_risk_users, total_users, critical_findings
-        )
+        sections = {
+            "headline": (
+                (overall_risk, critical_findings, risk_posture),
+                lambda: self._generate_headline(overall_risk, critical_findings, risk_posture),
+            ),
+            "executive_summary": (
+                (overall_risk, high_risk_users, total_users, critical_findings),
+                lambda: self._generate_summary(overall_risk, high_risk_users, total_users, critical_findings),
+            ),
+            # Simplified exposure estimate - use actual data in production
+            "total_exposure": (
+                (critical_findings, high_risk_users),
+                lambda: self._estimate_exposure(critical_findings, high_risk_users),
+            ),
+            "trend_narrative": (
+                (change_pct, prev_score, curr_score),
+                lambda: self._generate_trend_narrative(change_pct, prev_score, curr_score),
+            ),
+            "risk_stories": (
+                top_risks[:3],
+                lambda: self._generate_risk_stories(top_risks),
+            ),
+            "control_narrative": (
+                controls,
+                lambda: self._generate_control_narrative(controls),
+            ),
+            "recommendations": (
+                (critical_findings, risk_posture, control_effectiveness),
+                lambda: self._generate_recommendations(critical_findings, risk_posture, control_effectiveness),
+            ),
+        }
 
-        # Calculate exposure (simplified - use actual data in production)
-        exposure = self._estimate_exposure(critical_findings, high_risk_users)
+        return {
+            "sections": {
+                name: (self._section_key(name, inputs), inputs, build)
+                for name, (inputs, build) in sections.items()
+            },
+            "risk_posture": risk_posture,
+            "trend_direction": trend_direction,
+            "change_pct": change_pct,
+            "high_risk_users": high_risk_users,
+            "critical_findings": critical_findings,
+            "control_effectiveness": control_effectiveness,
+            "period": metrics.get("period", "Current Period"),
+        }
 
-        # Generate trend narrative
-        trend_narrative = self._generate_trend_narrative(
-            change_pct, prev_score, curr_score
+    def _section_key(self, name: str, inputs: Any) -> Tuple[str, str]:
+        """Cache key: section name + fingerprint of its inputs and the output settings."""
+        material = json.dumps(
+            [inputs, self.config.tone.value, self.config.max_length,
+             self.config.model if self.llm_enabled and name in LLM_SECTIONS else None],
+            sort_keys=True,
+            default=str,
         )
+        return name, hashlib.sha256(material.encode("utf-8")).hexdigest()
 
-        # Generate risk stories
-        risk_stories = self._generate_risk_stories(top_risks)
-
-        # Control narrative
-        control_effectiveness = controls.get("effectiveness", 0.85)
-        control_narrative = self._generate_control_narrative(controls)
-
-        # Recommendations
-        recommended_actions, priority_action = self._generate_recommendations(
-            critical_findings, risk_posture, control_effectiveness
-        )
+    def _store(self, key: Tuple[str, str], value: Any):
+        self._sections[key] = value
+        self._sections.move_to_end(key)
+        while len(self._sections) > self.config.section_cache_size:
+            self._sections.popitem(last=False)
 
+    def _refine(
+        self,
+        pending: Dict[Tuple[str, str], Tuple[str, Any]]
+    ) -> Dict[Tuple[str, str], str]:
+        """Refine draft prose sections with the LLM, concurrently."""
+        max_words = max(self.config.max_length // len(LLM_SECTIONS), 1)
+        requests = [
+            LLMRequest(
+                system=EXECUTIVE_NARRATIVE_PROMPT,
+                prompt=EXECUTIVE_SECTION_INPUT_TEMPLATE.format(
+                    section=key[0].replace("_", " "),
+                    tone=self.config.tone.value,
+                    max_words=max_words,
+                    draft=draft,
+                    data=json.dumps(inputs, default=str),
+                ),
+                model=self.config.model,
+                provider=self.config.provider.value,
+                temperature=0.2,
+                max_tokens=max_words * 3,
+            )
+            for key, (draft, inputs) in pending.items()
+        ]
+        responses = self.executor.run_batch(requests, return_exceptions=True)
+
+        refined = {}
+        with self._lock:
+            for (key, (draft, _)), response in zip(pending.items(), responses):
+                if isinstance(response, BaseException) or not response.content.strip():
+                    # Use the deterministic draft; not cached, so retried next time
+                    logger.warning(f"Narrative section {key[0]} not refined: {response}")
+                    self._stats["llm_failures"] += 1
+                    refined[key] = draft
+                    continue
+                self._stats["llm_sections"] += 1
+                refined[key] = response.content.strip()
+                self._store(key, refined[key])
+        return refined
+
+    def _assemble(self, plan: Dict[str, Any], values: Dict[str, Any]) -> ExecutiveNarrative:
+        recommended_actions, priority_action = values["recommendations"]
         return ExecutiveNarrative(
-            headline=headline,
-            executive_summary=executive_summary,
-            risk_posture=risk_posture,
-            total_exposure=exposure,
-            users_at_risk=high_risk_users,
-            critical_issues=critical_findings,
-            trend_narrative=trend_narrative,
-            trend_direction=trend_direction,
-            period_comparison=f"Risk changed {change_pct:+.1f}% compared to previous period",
-            risk_stories=risk_stories,
-            control_narrative=control_narrative,
-            control_effectiveness=control_effectiveness,
-            recommended_actions=recommended_actions,
+            headline=values["headline"],
+            executive_summary=values["executive_summary"],
+            risk_posture=plan["risk_posture"],
+            total_exposure=values["total_exposure"],
+            users_at_risk=plan["high_risk_users"],
+            critical_issues=plan["critical_findings"],
+            trend_narrative=values["trend_narrative"],
+            trend_direction=plan["trend_direction"],
+            period_comparison=f"Risk changed {plan['change_pct']:+.1f}% compared to previous period",
+            # Copies: cached sections are shared between narratives
+            risk_stories=[replace(story) for story in values["risk_stories"]],
+            control_narrative=values["control_narrative"],
+            control_effectiveness=plan["control_effectiveness"],
+            recommended_actions=list(recommended_actions),
             priority_action=priority_action,
-            reporting_period=metrics.get("period", "Current Period"),
+            reporting_period=plan["period"],
         )
 
+    # Precompute / render from cache
+
+    def precompute(
+        self,
+        metrics: Union[Dict[str, Any], List[Dict[str, Any]]]
+    ) -> List[ExecutiveNarrative]:
+        """
+        Generate and keep narratives for rendering (one per "period").
+
+        Called ahead of time, e.g. by the report scheduler, so executive
+        pages can use get_cached() instead of generating on request.
+        """
+        metrics_list = [metrics] if isinstance(metrics, dict) else list(metrics)
+        narratives = self.generate_many(metrics_list)
+        with self._lock:
+            for narrative in narratives:
+                self._rendered[narrative.reporting_period] = narrative
+        return narratives
+
+    def get_cached(self, period: str = "Current Period") -> Optional[ExecutiveNarrative]:
+        """Last precomputed narrative for a period, if any."""
+        return self._rendered.get(period)
+
+    def precompute_hook(
+        self,
+        metrics_source: Callable[[], Union[Dict[str, Any], List[Dict[str, Any]]]]
+    ) -> Callable[..., List[ExecutiveNarrative]]:
+        """
+        Hook for ReportScheduler.register_precompute_hook: pulls current
+        metrics from metrics_source and precomputes their narratives.
+        """
+        def hook(*_args, **_kwargs) -> List[ExecutiveNarrative]:
+            return self.precompute(metrics_source())
+        return hook
+
+    def clear_cache(self):
+        with self._lock:
+            self._sections.clear()
+            self._rendered.clear()
+
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["cached_sections"] = len(self._sections)
+        stats["rendered_periods"] = sorted(self._rendered)
+        stats["llm_enabled"] = self.llm_enabled
+        if self.llm_enabled:
+            stats["llm"] = self.executor.get_metrics()
+        return stats
+
     def _generate_headline(
         self,
         overall_risk: float,
@@ -111,6 +111,18 @@ Mitigation Options:
 {mitigation_options}
 """
 
+# Template for refining one executive narrative section
+EXECUTIVE_SECTION_INPUT_TEMPLATE = """
+Rewrite the following "{section}" section of an executive risk summary
+for a {tone} audience in at most {max_words} words.
+
+Draft:
+{draft}
+
+Source Data:
+{data}
+"""
+
 # Template for executive narrative input
 EXECUTIVE_NARRATIVE_INPUT_TEMPLATE = """
 Risk Metrics:
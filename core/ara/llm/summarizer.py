@@ -13,10 +13,15 @@ Supports multiple LLM backends:
 - Azure OpenAI
 - Anthropic Claude
 - Local models via Ollama
+
+All calls go through an LLMExecutor (bounded concurrency, response cache,
+in-flight coalescing, metrics). Prompts are rendered with a user
+placeholder, so the same finding for many users is summarized once and
+the user id filled in afterwards.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from datetime import datetime
 from enum import Enum
 import logging
@@ -26,9 +31,13 @@ from .prompts import (
     RISK_SUMMARY_PROMPT,
     RISK_SUMMARY_INPUT_TEMPLATE,
 )
+from .executor import LLMExecutor, LLMExecutorConfig, LLMRequest
 
 logger = logging.getLogger(__name__)
 
+# Stands in for the user id in shared prompts and cached responses
+USER_PLACEHOLDER = "<<USER>>"
+
 
 class LLMProvider(Enum):
     """Supported LLM providers."""
@@ -60,6 +69,10 @@ class SummaryConfig:
     # Fallback
     fallback_to_template: bool = True
 
+    # Execution (concurrency, cache, rate limiting)
+    share_across_users: bool = True  # summarize identical findings once
+    executor: LLMExecutorConfig = field(default_factory=LLMExecutorConfig)
+
 
 @dataclass
 class RiskSummaryResult:
@@ -76,6 +89,7 @@ class RiskSummaryResult:
 
     # Audit trail
     input_hash: str = ""  # Hash of input for reproducibility
+    cached: bool = False  # Reused an earlier response for the same input
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -86,6 +100,8 @@ class RiskSummaryResult:
             "generated_at": self.generated_at.isoformat(),
             "model_used": self.model_used,
             "tokens_used": self.tokens_used,
+            "input_hash": self.input_hash,
+            "cached": self.cached,
         }
 
 
@@ -100,16 +116,22 @@ class RiskSummarizer:
     - Evidence-only summarization
     """
 
-    def __init__(self, config: Optional[SummaryConfig] = None):
+    def __init__(
+        self,
+        config: Optional[SummaryConfig] = None,
+        executor: Optional[LLMExecutor] = None
+    ):
         """
         Initialize summarizer.
 
         Args:
             config: Summarization configuration
+            executor: Shared execution layer (default: one built from config.executor)
         """
         self.config = config or SummaryConfig()
         self._client = None
         self._initialize_client()
+        self.executor = executor or LLMExecutor(self._complete, self.config.executor)
 
     def _initialize_client(self):
         """Initialize LLM client based on provider."""
@@ -149,16 +171,7 @@ class RiskSummarizer:
         Returns:
             RiskSummaryResult with human-readable summary
         """
-        # Format input
-        formatted_input = self._format_input(payload)
-
-        # Generate summary based on provider
-        if self.config.provider == LLMProvider.OPENAI:
-            return self._summarize_openai(formatted_input, payload)
-        elif self.config.provider == LLMProvider.ANTHROPIC:
-            return self._summarize_anthropic(formatted_input, payload)
-        else:
-            return self._summarize_mock(payload)
+        return self.summarize_batch([payload])[0]
 
     def _format_input(self, payload: Dict[str, Any]) -> str:
         """Format payload into structured input."""
@@ -180,70 +193,108 @@ class RiskSummarizer:
             mitigation_options=mitigation_str or "No mitigations available",
         )
 
-    def _summarize_openai(
-        self,
-        formatted_input: str,
-        payload: Dict[str, Any]
-    ) -> RiskSummaryResult:
-        """Summarize using OpenAI."""
-        try:
-            response = self._client.chat.completions.create(
-                model=self.config.model,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-                messages=[
-                    {"role": "system", "content": RISK_SUMMARY_PROMPT},
-                    {"role": "user", "content": formatted_input}
-                ]
-            )
-
-            content = response.choices[0].message.content
-            tokens = response.usage.total_tokens if response.usage else 0
+    def _build_request(self, payload: Dict[str, Any]) -> LLMRequest:
+        """Provider request for a payload (user-neutral when sharing)"""
+        if self.config.share_across_users:
+            payload = {**payload, "user_id": USER_PLACEHOLDER}
+        return LLMRequest(
+            system=RISK_SUMMARY_PROMPT,
+            prompt=self._format_input(payload),
+            model=self.config.model,
+            provider=self.config.provider.value,
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens,
+            context={"payload": payload},
+        )
 
-            return self._parse_summary(
-                content,
-                payload,
-                model=self.config.model,
-                tokens=tokens
-            )
+    def _complete(self, request: LLMRequest) -> Tuple[str, int]:
+        """Provider call used by the executor; returns (content, tokens)"""
+        if self.config.provider == LLMProvider.OPENAI:
+            return self._complete_openai(request)
+        elif self.config.provider == LLMProvider.ANTHROPIC:
+            return self._complete_anthropic(request)
+        else:
+            return self._complete_mock(request)
+
+    def _complete_openai(self, request: LLMRequest) -> Tuple[str, int]:
+        """Complete using OpenAI."""
+        response = self._client.chat.completions.create(
+            model=request.model,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            messages=[
+                {"role": "system", "content": request.system},
+                {"role": "user", "content": request.prompt}
+            ]
+        )
 
-        except Exception as e:
-            logger.error(f"OpenAI summarization failed: {e}")
-            if self.config.fallback_to_template:
-                return self._summarize_mock(payload)
-            raise
+        content = response.choices[0].message.content
+        tokens = response.usage.total_tokens if response.usage else 0
+        return content, tokens
+
+    def _complete_anthropic(self, request: LLMRequest) -> Tuple[str, int]:
+        """Complete using Anthropic Claude."""
+        response = self._client.messages.create(
+            model=request.model,
+            max_tokens=request.max_tokens,
+            system=request.system,
+            messages=[
+                {"role": "user", "content": request.prompt}
+            ]
+        )
 
-    def _summarize_anthropic(
+        content = response.content[0].text
+        tokens = response.usage.input_tokens + response.usage.output_tokens
+        return content, tokens
+
+    def _complete_mock(self, request: LLMRequest) -> Tuple[str, int]:
+        """Template summary, serialized like a provider response."""
+        result = self._summarize_mock(request.context["payload"])
+        return json.dumps({
+            "summary": result.summary,
+            "risk_statement": result.risk_statement,
+            "impact_description": result.impact_description,
+            "remediation_actions": result.remediation_actions,
+        }), 0
+
+    def _to_result(
         self,
-        formatted_input: str,
-        payload: Dict[str, Any]
+        payload: Dict[str, Any],
+        response: Any
     ) -> RiskSummaryResult:
-        """Summarize using Anthropic Claude."""
-        try:
-            response = self._client.messages.create(
-                model=self.config.model,
-                max_tokens=self.config.max_tokens,
-                system=RISK_SUMMARY_PROMPT,
-                messages=[
-                    {"role": "user", "content": formatted_input}
-                ]
-            )
-
-            content = response.content[0].text
-            tokens = response.usage.input_tokens + response.usage.output_tokens
+        """RiskSummaryResult from an executor response (or its exception)."""
+        if isinstance(response, BaseException):
+            logger.error(f"{self.config.provider.value} summarization failed: {response}")
+            if self.config.fallback_to_template:
+                return self._summarize_mock(payload)
+            raise response
 
-            return self._parse_summary(
-                content,
+        if self.config.provider in (LLMProvider.OPENAI, LLMProvider.ANTHROPIC):
+            result = self._parse_summary(
+                response.content,
                 payload,
-                model=self.config.model,
-                tokens=tokens
+                model=response.model,
+                tokens=response.tokens_used
             )
-
-        except Exception as e:
-            logger.error(f"Anthropic summarization failed: {e}")
-            if self.config.fallback_to_template:
-                return self._summarize_mock(payload)
-            raise
+        else:
+            fields = json.loads(response.content)
+            result = RiskSummaryResult(model_used="template", tokens_used=0, **fields)
+
+        result.input_hash = response.cache_key
+        result.cached = response.cached or response.coalesced
+        if self.config.share_across_users:
+            self._fill_user(result, str(payload.get("user_id", "Unknown")))
+        return result
+
+    @staticmethod
+    def _fill_user(result: RiskSummaryResult, user_id: str):
+        """Replace the user placeholder in a shared response."""
+        result.summary = result.summary.replace(USER_PLACEHOLDER, user_id)
+        result.risk_statement = result.risk_statement.replace(USER_PLACEHOLDER, user_id)
+        result.impact_description = result.impact_description.replace(USER_PLACEHOLDER, user_id)
+        result.remediation_actions = [
+            action.replace(USER_PLACEHOLDER, user_id) for action in result.remediation_actions
+        ]
 
     def _summarize_mock(self, payload: Dict[str, Any]) -> RiskSummaryResult:
         """Generate mock/template-based summary."""
@@ -336,8 +387,29 @@ class RiskSummarizer:
         self,
         payloads: List[Dict[str, Any]]
     ) -> List[RiskSummaryResult]:
-        """Summarize multiple findings."""
-        return [self.summarize(p) for p in payloads]
+        """
+        Summarize multiple findings.
+
+        Calls run concurrently through the executor; identical findings
+        share one call. A failed call falls back to the template per
+        finding (if fallback_to_template).
+        """
+        requests = [self._build_request(p) for p in payloads]
+        responses = self.executor.run_batch(requests, return_exceptions=True)
+        return [self._to_result(p, r) for p, r in zip(payloads, responses)]
+
+    async def asummarize_batch(
+        self,
+        payloads: List[Dict[str, Any]]
+    ) -> List[RiskSummaryResult]:
+        """summarize_batch for async callers."""
+        requests = [self._build_request(p) for p in payloads]
+        responses = await self.executor.run_many(requests, return_exceptions=True)
+        return [self._to_result(p, r) for p, r in zip(payloads, responses)]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Token, latency and cache metrics of the execution layer."""
+        return self.executor.get_metrics()
 
     def summarize_finding(
         self,
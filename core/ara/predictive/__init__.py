@@ -19,6 +19,7 @@ from .engine import (
     PredictiveRiskEngine,
     PredictionConfig,
     RiskPrediction,
+    BatchForecast,
     PredictionHorizon,
     TrendDirection,
 )
@@ -34,6 +35,7 @@ from .refactor import (
     RefactorSuggestion,
     RoleSplitRecommendation,
     PrivilegeAnalysis,
+    PrivilegeUsageTable,
 )
 
 __all__ = [
@@ -41,6 +43,7 @@ __all__ = [
     "PredictiveRiskEngine",
     "PredictionConfig",
     "RiskPrediction",
+    "BatchForecast",
     "PredictionHorizon",
     "TrendDirection",
     # Features
@@ -52,4 +55,5 @@ __all__ = [
     "RefactorSuggestion",
     "RoleSplitRecommendation",
     "PrivilegeAnalysis",
+    "PrivilegeUsageTable",
 ]
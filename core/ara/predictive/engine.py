@@ -16,17 +16,30 @@ Uses:
 - Privilege creep indicators
 - Peer comparison
 - Review delays
+
+forecast_batch computes trends and projections for a whole population
+at once (NumPy when available) and returns a BatchForecast; predictions
+are only materialized for the entities that are read.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union, Sequence
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
 import math
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 logger = logging.getLogger(__name__)
 
+# Feature keys used in projections, in the order they are applied
+PROJECTION_FEATURES = ("access_growth_rate", "privilege_creep", "peer_deviation", "review_delay_weeks")
+
 
 class PredictionHorizon(Enum):
     """Prediction time horizons."""
@@ -129,6 +142,104 @@ class RiskPrediction:
         }
 
 
+def _row_sums(block: "np.ndarray") -> "np.ndarray":
+    """
+    Row sums accumulated left to right, like sum() over a list; NumPy's
+    pairwise summation would round differently (e.g. on flat histories).
+    """
+    total = block[:, 0].copy()
+    for k in range(1, block.shape[1]):
+        total += block[:, k]
+    return total
+
+
+@dataclass
+class BatchForecast:
+    """
+    Forecasts for many entities, held column-wise.
+
+    Every column is aligned by position with entity_ids; columns are NumPy
+    arrays when NumPy is available, lists otherwise. threshold_breach_days
+    uses -1 for "no breach expected". Use prediction()/to_predictions() to
+    get RiskPrediction objects for the entities you need.
+    """
+    entity_ids: List[str]
+    entity_types: List[str]
+    has_history: Sequence[bool]
+    history_length: Sequence[int]  # after padding short histories
+    current_risk: Sequence[float]
+    recent_change: Sequence[float]
+    trend_slope: Sequence[float]
+    confidence: Sequence[float]
+    prediction_30d: Sequence[float]
+    prediction_60d: Sequence[float]
+    prediction_90d: Sequence[float]
+    will_exceed_threshold: Sequence[bool]
+    threshold_breach_days: Sequence[int]
+
+    # Source rows, for materializing predictions
+    histories: List[List[float]] = field(default_factory=list, repr=False)
+    features: List[Dict[str, float]] = field(default_factory=list, repr=False)
+    engine: Optional["PredictiveRiskEngine"] = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.entity_ids)
+
+    def forecast(self, horizon: PredictionHorizon = PredictionHorizon.DAYS_90) -> Sequence[float]:
+        """Forecast column for a horizon"""
+        if horizon == PredictionHorizon.DAYS_30:
+            return self.prediction_30d
+        if horizon == PredictionHorizon.DAYS_60:
+            return self.prediction_60d
+        return self.prediction_90d
+
+    def indices_above(
+        self,
+        threshold: float,
+        horizon: PredictionHorizon = PredictionHorizon.DAYS_90
+    ) -> List[int]:
+        """Positions whose forecast exceeds threshold, highest 90-day forecast first"""
+        forecast = self.forecast(horizon)
+        if HAS_NUMPY:
+            hits = np.flatnonzero(np.asarray(forecast) > threshold).tolist()
+        else:
+            hits = [i for i, value in enumerate(forecast) if value > threshold]
+        p90 = self.prediction_90d
+        return sorted(hits, key=lambda i: p90[i], reverse=True)
+
+    def prediction(self, i: int) -> RiskPrediction:
+        """Materialize the RiskPrediction of position i"""
+        return self.engine._materialize(self, i)
+
+    def to_predictions(self, indices: Optional[Sequence[int]] = None) -> List[RiskPrediction]:
+        indices = range(len(self)) if indices is None else indices
+        return [self.prediction(i) for i in indices]
+
+    def summary(self) -> Dict[str, Any]:
+        """Population-level counts without materializing predictions"""
+        n = len(self)
+        slope = self.trend_slope
+        if HAS_NUMPY:
+            slope_arr = np.asarray(slope)
+            increasing = int((slope_arr > 0.5).sum())
+            decreasing = int((slope_arr < -0.5).sum())
+            exceeding = int(np.asarray(self.will_exceed_threshold).sum())
+            mean_p90 = float(np.mean(self.prediction_90d)) if n else 0.0
+        else:
+            increasing = sum(1 for s in slope if s > 0.5)
+            decreasing = sum(1 for s in slope if s < -0.5)
+            exceeding = sum(1 for w in self.will_exceed_threshold if w)
+            mean_p90 = sum(self.prediction_90d) / n if n else 0.0
+        return {
+            "entities": n,
+            "increasing": increasing,
+            "stable": n - increasing - decreasing,
+            "decreasing": decreasing,
+            "will_exceed_threshold": exceeding,
+            "mean_prediction_90d": round(mean_p90, 2),
+        }
+
+
 class PredictiveRiskEngine:
     """
     Predicts future access risk based on historical patterns.
@@ -464,24 +575,255 @@ class PredictiveRiskEngine:
         Returns:
             List of RiskPrediction
         """
-        return [
-            self.predict(
-                entity_id=e["entity_id"],
-                entity_type=e.get("entity_type", "USER"),
-                risk_history=e.get("risk_history", []),
-                features=e.get("features", {}),
-            )
-            for e in entities
+        return self.forecast_batch(entities).to_predictions()
+
+    # Rows per NumPy block; bounds memory for very large populations
+    BATCH_BLOCK_ROWS = 65536
+
+    def forecast_batch(
+        self,
+        entities: List[Dict[str, Any]]
+    ) -> BatchForecast:
+        """
+        Forecast many entities at once.
+
+        Histories are grouped by length into dense 2-D blocks (no padding
+        across lengths), so slopes, R², projections and breach estimates
+        are a handful of array operations per block. Results match
+        predict() per entity up to float rounding in the last digit.
+
+        Args:
+            entities: List of dicts with entity_id, entity_type, risk_history, features
+
+        Returns:
+            BatchForecast
+        """
+        histories = [e.get("risk_history") or [] for e in entities]
+        features = [e.get("features") or {} for e in entities]
+
+        if HAS_NUMPY:
+            columns = self._forecast_columns_numpy(histories, features)
+        else:
+            columns = self._forecast_columns_python(histories, features)
+
+        return BatchForecast(
+            entity_ids=[e["entity_id"] for e in entities],
+            entity_types=[e.get("entity_type", "USER") for e in entities],
+            histories=histories,
+            features=features,
+            engine=self,
+            **columns,
+        )
+
+    def _forecast_columns_numpy(
+        self,
+        histories: List[List[float]],
+        features: List[Dict[str, float]]
+    ) -> Dict[str, Any]:
+        n = len(histories)
+        has_history = np.zeros(n, dtype=bool)
+        length = np.zeros(n, dtype=np.int64)
+        current = np.zeros(n)
+        recent = np.zeros(n)
+        slope = np.zeros(n)
+        confidence = np.zeros(n)
+
+        by_length: Dict[int, List[int]] = {}
+        for i, history in enumerate(histories):
+            if history:
+                by_length.setdefault(len(history), []).append(i)
+
+        for raw_length, rows in by_length.items():
+            for start in range(0, len(rows), self.BATCH_BLOCK_ROWS):
+                idx = np.asarray(rows[start:start + self.BATCH_BLOCK_ROWS])
+                y = np.asarray([histories[i] for i in idx], dtype=float)
+                if raw_length < 3:
+                    # Pad with the first value, as predict() does
+                    y = np.hstack([np.repeat(y[:, :1], 3, axis=1), y])
+                size = y.shape[1]
+
+                # Least squares over x = 0..size-1 for every row
+                x = np.arange(size, dtype=float)
+                x_mean = sum(range(size)) / size
+                y_mean = _row_sums(y) / size
+                numerator = _row_sums((x - x_mean) * (y - y_mean[:, None]))
+                denominator = sum((i - x_mean) ** 2 for i in range(size))
+                block_slope = numerator / denominator
+
+                # R-squared for confidence
+                y_pred = block_slope[:, None] * x + (y_mean - block_slope * x_mean)[:, None]
+                ss_res = _row_sums((y - y_pred) ** 2)
+                ss_tot = _row_sums((y - y_mean[:, None]) ** 2)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    r_squared = np.where(ss_tot == 0, 1.0, 1 - ss_res / ss_tot)
+
+                has_history[idx] = True
+                length[idx] = size
+                current[idx] = y[:, -1]
+                recent[idx] = y[:, -1] - y[:, -2]
+                slope[idx] = block_slope
+                confidence[idx] = np.clip(r_squared, 0, 1)
+
+        feature_columns = [
+            np.asarray([f.get(name, 0) for f in features], dtype=float)
+            for name in PROJECTION_FEATURES
         ]
+        projections = {
+            days: np.where(has_history, self._project_risk_array(current, slope, days, feature_columns), 0.0)
+            for days in (30, 60, 90)
+        }
+
+        threshold = self.config.high_risk_threshold
+        will_exceed = has_history & (projections[90] > threshold)
+        breaching = will_exceed & (current < threshold) & (slope > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weeks_to_breach = np.where(breaching, (threshold - current) / slope, 0.0)
+        breach_days = np.where(breaching, (np.maximum(weeks_to_breach, 0) * 7).astype(np.int64), -1)
+
+        return {
+            "has_history": has_history,
+            "history_length": length,
+            "current_risk": current,
+            "recent_change": recent,
+            "trend_slope": slope,
+            "confidence": confidence,
+            "prediction_30d": projections[30],
+            "prediction_60d": projections[60],
+            "prediction_90d": projections[90],
+            "will_exceed_threshold": will_exceed,
+            "threshold_breach_days": breach_days,
+        }
+
+    def _project_risk_array(
+        self,
+        current_risk: "np.ndarray",
+        slope: "np.ndarray",
+        days: int,
+        feature_columns: List["np.ndarray"]
+    ) -> "np.ndarray":
+        """_project_risk over arrays (same operation order)"""
+        weeks = days / 7
+        access_growth, privilege_creep, peer_deviation, review_delay = feature_columns
+
+        base_projection = current_risk + slope * weeks
+
+        adjustment = access_growth * self.config.access_growth_weight * weeks
+        adjustment = adjustment + privilege_creep * self.config.privilege_creep_weight * weeks
+        adjustment = adjustment + peer_deviation * self.config.peer_deviation_weight
+        adjustment = adjustment + review_delay * self.config.review_delay_weight
+
+        projected = base_projection + adjustment
+
+        dampening = 1 - (days / 365) * 0.2
+        projected = current_risk + (projected - current_risk) * dampening
+
+        return np.clip(projected, 0, 100)
+
+    def _forecast_columns_python(
+        self,
+        histories: List[List[float]],
+        features: List[Dict[str, float]]
+    ) -> Dict[str, Any]:
+        """Column-wise forecasts without NumPy, using the scalar helpers"""
+        columns: Dict[str, List[Any]] = {
+            "has_history": [], "history_length": [], "current_risk": [], "recent_change": [],
+            "trend_slope": [], "confidence": [], "prediction_30d": [], "prediction_60d": [],
+            "prediction_90d": [], "will_exceed_threshold": [], "threshold_breach_days": [],
+        }
+        threshold = self.config.high_risk_threshold
+
+        for history, entity_features in zip(histories, features):
+            if not history:
+                values = (False, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, False, -1)
+            else:
+                if len(history) < 3:
+                    history = [history[0]] * 3 + history
+                current = history[-1]
+                slope, confidence = self._calculate_trend(history)
+                p30, p60, p90 = (
+                    self._project_risk(current, slope, days, entity_features) for days in (30, 60, 90)
+                )
+                will_exceed = p90 > threshold
+                breach_days = None
+                if will_exceed and current < threshold:
+                    breach_days = self._estimate_breach_days(current, slope, threshold)
+                values = (
+                    True, len(history), current, history[-1] - history[-2], slope, confidence,
+                    p30, p60, p90, will_exceed, -1 if breach_days is None else breach_days,
+                )
+            for column, value in zip(columns.values(), values):
+                column.append(value)
+
+        return columns
+
+    def _materialize(self, batch: BatchForecast, i: int) -> RiskPrediction:
+        """RiskPrediction for one position of a BatchForecast"""
+        entity_id, entity_type = batch.entity_ids[i], batch.entity_types[i]
+        if not batch.has_history[i]:
+            return self._empty_prediction(entity_id, entity_type)
+
+        history = batch.histories[i]
+        if len(history) < 3:
+            history = [history[0]] * 3 + history
+        current_risk = float(batch.current_risk[i])
+        slope = float(batch.trend_slope[i])
+        pred_90d = float(batch.prediction_90d[i])
+
+        if slope > 0.5:
+            trend = TrendDirection.INCREASING
+        elif slope < -0.5:
+            trend = TrendDirection.DECREASING
+        else:
+            trend = TrendDirection.STABLE
+
+        factors = self._calculate_factors(history, batch.features[i])
+        primary_driver = max(factors.items(), key=lambda x: abs(x[1]))[0] if factors else ""
+
+        will_exceed = bool(batch.will_exceed_threshold[i])
+        breach_days = int(batch.threshold_breach_days[i])
+        breach_days = None if breach_days < 0 else breach_days
+
+        if will_exceed and (breach_days and breach_days < 30):
+            priority = "HIGH"
+        elif trend == TrendDirection.INCREASING:
+            priority = "MEDIUM"
+        else:
+            priority = "LOW"
+
+        return RiskPrediction(
+            entity_id=entity_id,
+            entity_type=entity_type,
+            current_risk=current_risk,
+            prediction_30d=float(batch.prediction_30d[i]),
+            prediction_60d=float(batch.prediction_60d[i]),
+            prediction_90d=pred_90d,
+            trend=trend,
+            trend_slope=slope,
+            confidence=float(batch.confidence[i]),
+            data_quality=self._assess_data_quality(history),
+            factors=factors,
+            primary_driver=primary_driver,
+            will_exceed_threshold=will_exceed,
+            threshold_breach_days=breach_days,
+            recommended_actions=self._generate_recommendations(current_risk, pred_90d, trend, factors),
+            priority=priority,
+        )
 
     def get_high_risk_forecasts(
         self,
-        predictions: List[RiskPrediction],
+        predictions: Union[List[RiskPrediction], BatchForecast],
         horizon: PredictionHorizon = PredictionHorizon.DAYS_90
     ) -> List[RiskPrediction]:
-        """Get entities forecasted to exceed risk threshold."""
+        """
+        Get entities forecasted to exceed risk threshold.
+
+        With a BatchForecast only the matching entities are materialized.
+        """
         threshold = self.config.high_risk_threshold
 
+        if isinstance(predictions, BatchForecast):
+            return predictions.to_predictions(predictions.indices_above(threshold, horizon))
+
         high_risk = []
         for pred in predictions:
             if horizon == PredictionHorizon.DAYS_30:
@@ -14,13 +14,21 @@ Refactoring triggers:
 - Role has low usage density
 - Role mixes unrelated business actions
 - Role repeatedly causes SoD violations
+
+Batch analysis normalizes usage data once into a PrivilegeUsageTable,
+caches per-privilege analysis across roles (roles share single and
+composite children) and can fan roles out to worker processes.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Set, Optional, Any, Iterator, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from enum import Enum
+import itertools
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +50,14 @@ class RefactorPriority(Enum):
     LOW = "LOW"
 
 
+PRIORITY_ORDER = {
+    RefactorPriority.CRITICAL: 0,
+    RefactorPriority.HIGH: 1,
+    RefactorPriority.MEDIUM: 2,
+    RefactorPriority.LOW: 3,
+}
+
+
 @dataclass
 class PrivilegeAnalysis:
     """Analysis of privilege usage within a role."""
@@ -172,6 +188,44 @@ class RefactorSuggestion:
         }
 
 
+class PrivilegeUsageTable:
+    """
+    Privilege usage normalized once for a batch of roles.
+
+    Holds (count, unique_users, last_used) per privilege with last_used
+    already parsed, and the reference time used for "days since last
+    use", so every role in the batch is judged against the same clock.
+    Tables are immutable and picklable (shipped once to each worker).
+    """
+
+    _tokens = itertools.count()
+
+    def __init__(
+        self,
+        usage_data: Dict[str, Dict[str, Any]],
+        as_of: Optional[datetime] = None
+    ):
+        self.as_of = as_of or datetime.now()
+        # Identifies the table in analysis caches, including in workers
+        self.token = (os.getpid(), next(self._tokens))
+        self._usage: Dict[str, Tuple[int, int, Optional[datetime]]] = {}
+        for priv_id, usage in usage_data.items():
+            last_used = usage.get("last_used")
+            if last_used and isinstance(last_used, str):
+                last_used = datetime.fromisoformat(last_used)
+            self._usage[priv_id] = (
+                usage.get("count", 0),
+                usage.get("unique_users", 0),
+                last_used or None,
+            )
+
+    def get(self, priv_id: str) -> Tuple[int, int, Optional[datetime]]:
+        return self._usage.get(priv_id, (0, 0, None))
+
+    def __len__(self) -> int:
+        return len(self._usage)
+
+
 class RoleRefactorEngine:
     """
     Generates intelligent role refactoring suggestions.
@@ -190,9 +244,21 @@ class RoleRefactorEngine:
     MAX_PRIVILEGES_PER_ROLE = 50  # Above this = too broad
     MIN_USERS_FOR_ROLE = 3  # Below this = consider deprecation
 
+    # Batch processing
+    BATCH_CHUNK_ROLES = 500  # Roles per worker task
+    PRIVILEGE_CACHE_TABLES = 4  # Usage tables whose privilege analyses are kept
+
     def __init__(self):
         """Initialize refactor engine."""
         self._suggestion_counter = 0
+        # usage table token -> {privilege key -> PrivilegeAnalysis}
+        self._privilege_cache: "OrderedDict[Any, Dict[tuple, PrivilegeAnalysis]]" = OrderedDict()
+
+    def __getstate__(self):
+        # Workers build their own privilege cache
+        state = self.__dict__.copy()
+        state["_privilege_cache"] = OrderedDict()
+        return state
 
     def analyze_role(
         self,
@@ -201,7 +267,8 @@ class RoleRefactorEngine:
         usage_data: Dict[str, Dict[str, Any]],
         user_count: int,
         toxicity_score: float = 0,
-        sod_conflicts: int = 0
+        sod_conflicts: int = 0,
+        usage_table: Optional[PrivilegeUsageTable] = None
     ) -> Optional[RefactorSuggestion]:
         """
         Analyze a role and generate refactoring suggestion.
@@ -213,12 +280,36 @@ class RoleRefactorEngine:
             user_count: Number of users with this role
             toxicity_score: Toxicity score from ToxicRoleDetector
             sod_conflicts: Number of SoD conflicts involving this role
+            usage_table: Prebuilt usage table (used instead of usage_data;
+                privilege analyses are cached across roles)
 
         Returns:
             RefactorSuggestion if refactoring recommended, None otherwise
         """
         # Analyze privileges
-        privilege_analysis = self._analyze_privileges(privileges, usage_data)
+        if usage_table is not None:
+            privilege_analysis = self._analyze_privileges_cached(privileges, usage_table)
+        else:
+            privilege_analysis = self._analyze_privileges(privileges, usage_data)
+
+        suggestion = self._suggest(role_id, privilege_analysis, user_count, toxicity_score, sod_conflicts)
+        if suggestion is not None:
+            suggestion.suggestion_id = self._next_suggestion_id(role_id)
+        return suggestion
+
+    def _next_suggestion_id(self, role_id: str) -> str:
+        self._suggestion_counter += 1
+        return f"REFACTOR-{role_id}-{self._suggestion_counter}"
+
+    def _suggest(
+        self,
+        role_id: str,
+        privilege_analysis: List[PrivilegeAnalysis],
+        user_count: int,
+        toxicity_score: float,
+        sod_conflicts: int
+    ) -> Optional[RefactorSuggestion]:
+        """Suggestion for an analyzed role (suggestion_id left for the caller)."""
 
         # Calculate usage metrics
         frequently_used = len([p for p in privilege_analysis if p.usage_count >= self.RARELY_USED_THRESHOLD])
@@ -242,11 +333,8 @@ class RoleRefactorEngine:
             return None
 
         # Create suggestion
-        self._suggestion_counter += 1
-        suggestion_id = f"REFACTOR-{role_id}-{self._suggestion_counter}"
-
         suggestion = RefactorSuggestion(
-            suggestion_id=suggestion_id,
+            suggestion_id="",
             role_id=role_id,
             action=action,
             priority=priority,
@@ -338,6 +426,75 @@ class RoleRefactorEngine:
 
         return analysis
 
+    def _analyze_privileges_cached(
+        self,
+        privileges: List[Dict[str, Any]],
+        usage_table: PrivilegeUsageTable,
+        seen: Optional[Dict[int, PrivilegeAnalysis]] = None
+    ) -> List[PrivilegeAnalysis]:
+        """
+        _analyze_privileges against a usage table, reusing the analysis of
+        privileges already seen in other roles (copies are returned).
+
+        seen maps id(privilege dict) to its analysis for roles sharing the
+        same child objects; only valid while those dicts are alive.
+        """
+        cache = self._privilege_cache.get(usage_table.token)
+        if cache is None:
+            cache = self._privilege_cache[usage_table.token] = {}
+            while len(self._privilege_cache) > self.PRIVILEGE_CACHE_TABLES:
+                self._privilege_cache.popitem(last=False)
+
+        analysis = []
+        for priv in privileges:
+            template = seen.get(id(priv)) if seen is not None else None
+            if template is None:
+                priv_id = priv.get("id") or priv.get("privilege_id", "")
+                key = (
+                    priv_id,
+                    priv.get("tcode", ""),
+                    priv.get("description", ""),
+                    priv.get("is_sensitive", False),
+                    priv.get("business_action", ""),
+                )
+                template = cache.get(key)
+                if template is None:
+                    template = cache[key] = self._analyze_privilege(key, usage_table)
+                if seen is not None:
+                    seen[id(priv)] = template
+            # Shallow copy (cheaper than dataclasses.replace); fields are immutable
+            pa = object.__new__(PrivilegeAnalysis)
+            pa.__dict__.update(template.__dict__)
+            analysis.append(pa)
+        return analysis
+
+    def _analyze_privilege(self, key: tuple, usage_table: PrivilegeUsageTable) -> PrivilegeAnalysis:
+        priv_id, tcode, description, is_sensitive, business_action = key
+        usage_count, unique_users, last_used = usage_table.get(priv_id)
+
+        pa = PrivilegeAnalysis(
+            privilege_id=priv_id,
+            tcode=tcode,
+            description=description,
+            usage_count=usage_count,
+            last_used=last_used,
+            unique_users=unique_users,
+            is_sensitive=is_sensitive,
+            business_action=business_action,
+        )
+
+        # Determine if privilege should be kept
+        if pa.usage_count == 0:
+            pa.keep = False
+            pa.reason = "Never used"
+        elif pa.last_used:
+            days_since = (usage_table.as_of - pa.last_used).days
+            if days_since > self.NEVER_USED_DAYS:
+                pa.keep = False
+                pa.reason = f"Not used in {days_since} days"
+
+        return pa
+
     def _determine_action(
         self,
         total_privileges: int,
@@ -414,7 +571,8 @@ class RoleRefactorEngine:
                 continue
 
             priv_ids = [p.privilege_id for p in privs if p.keep]
-            excluded = [p.privilege_id for p in privilege_analysis if p.privilege_id not in priv_ids]
+            included = set(priv_ids)
+            excluded = [p.privilege_id for p in privilege_analysis if p.privilege_id not in included]
 
             recommendations.append(RoleSplitRecommendation(
                 new_role_name=f"{role_id}_{action.replace(' ', '_').upper()}",
@@ -482,38 +640,136 @@ class RoleRefactorEngine:
 
     def analyze_roles_batch(
         self,
-        roles: List[Dict[str, Any]]
+        roles: List[Dict[str, Any]],
+        usage_data: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
     ) -> List[RefactorSuggestion]:
         """
         Analyze multiple roles and return all suggestions.
 
         Args:
             roles: List of role dicts with id, privileges, usage_data, user_count, etc.
+            usage_data: Usage data shared by all roles (a role's own
+                usage_data takes precedence)
+            max_workers: Worker processes (None or 1 = in process). Fanning
+                out only pays off with several free cores and large
+                batches, since each worker unpickles the analyzer and
+                usage tables first
+            chunk_size: Roles per worker task
 
         Returns:
             List of RefactorSuggestion sorted by priority
         """
+        indexed: List[Tuple[int, RefactorSuggestion]] = []
+        for part in self._run_batch(roles, usage_data, max_workers, chunk_size):
+            indexed.extend(part)
+
+        # Ids in input order, as for one-by-one analysis
+        indexed.sort(key=lambda item: item[0])
         suggestions = []
+        for _, suggestion in indexed:
+            suggestion.suggestion_id = self._next_suggestion_id(suggestion.role_id)
+            suggestions.append(suggestion)
+
+        # Sort by priority
+        suggestions.sort(key=lambda s: PRIORITY_ORDER[s.priority])
+
+        return suggestions
 
-        for role in roles:
-            suggestion = self.analyze_role(
-                role_id=role["id"],
-                privileges=role.get("privileges", []),
-                usage_data=role.get("usage_data", {}),
-                user_count=role.get("user_count", 0),
-                toxicity_score=role.get("toxicity_score", 0),
-                sod_conflicts=role.get("sod_conflicts", 0),
+    def iter_roles_batch(
+        self,
+        roles: List[Dict[str, Any]],
+        usage_data: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[RefactorSuggestion]:
+        """
+        Stream suggestions as worker chunks complete.
+
+        Each chunk is yielded ranked by priority; use analyze_roles_batch
+        for one ranking over all roles.
+        """
+        for part in self._run_batch(roles, usage_data, max_workers, chunk_size):
+            for _, suggestion in sorted(part, key=lambda item: (PRIORITY_ORDER[item[1].priority], item[0])):
+                suggestion.suggestion_id = self._next_suggestion_id(suggestion.role_id)
+                yield suggestion
+
+    def _run_batch(
+        self,
+        roles: List[Dict[str, Any]],
+        usage_data: Optional[Dict[str, Dict[str, Any]]],
+        max_workers: Optional[int],
+        chunk_size: Optional[int]
+    ) -> Iterator[List[Tuple[int, RefactorSuggestion]]]:
+        """Chunks of (role index, suggestion), in completion order."""
+        # One usage table per distinct usage dict (normally just the shared one)
+        as_of = datetime.now()
+        tables: List[PrivilegeUsageTable] = []
+        table_of: Dict[int, int] = {}
+        items = []
+        for i, role in enumerate(roles):
+            role_usage = role.get("usage_data")
+            source = role_usage if role_usage is not None else (usage_data or {})
+            t = table_of.get(id(source))
+            if t is None:
+                t = table_of[id(source)] = len(tables)
+                tables.append(PrivilegeUsageTable(source, as_of))
+            items.append((i, t, {k: v for k, v in role.items() if k != "usage_data"}))
+
+        chunk_size = chunk_size or self.BATCH_CHUNK_ROLES
+        workers = max_workers or 1
+        if workers <= 1 or len(items) <= chunk_size:
+            yield self._analyze_chunk(items, tables)
+            return
+
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_worker,
+            initargs=(self, tables),
+        ) as pool:
+            futures = [pool.submit(_analyze_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _analyze_chunk(
+        self,
+        items: List[Tuple[int, int, Dict[str, Any]]],
+        tables: List[PrivilegeUsageTable]
+    ) -> List[Tuple[int, RefactorSuggestion]]:
+        results = []
+        # Per-table identity memo; items keep the privilege dicts alive
+        seen: Dict[int, Dict[int, PrivilegeAnalysis]] = {}
+        for i, t, role in items:
+            privilege_analysis = self._analyze_privileges_cached(
+                role.get("privileges", []), tables[t], seen.setdefault(t, {})
+            )
+            suggestion = self._suggest(
+                role["id"],
+                privilege_analysis,
+                role.get("user_count", 0),
+                role.get("toxicity_score", 0),
+                role.get("sod_conflicts", 0),
             )
             if suggestion:
-                suggestions.append(suggestion)
+                results.append((i, suggestion))
+        return results
 
-        # Sort by priority
-        priority_order = {
-            RefactorPriority.CRITICAL: 0,
-            RefactorPriority.HIGH: 1,
-            RefactorPriority.MEDIUM: 2,
-            RefactorPriority.LOW: 3,
-        }
-        suggestions.sort(key=lambda s: priority_order[s.priority])
 
-        return suggestions
+# =============================================================================
+# Parallel batch analysis
+# =============================================================================
+
+_worker_engine: Optional[RoleRefactorEngine] = None
+_worker_tables: List[PrivilegeUsageTable] = []
+
+
+def _init_worker(engine: RoleRefactorEngine, tables: List[PrivilegeUsageTable]) -> None:
+    global _worker_engine, _worker_tables
+    _worker_engine = engine
+    _worker_tables = tables
+
+
+def _analyze_chunk(items: List[Tuple[int, int, Dict[str, Any]]]) -> List[Tuple[int, RefactorSuggestion]]:
+    return _worker_engine._analyze_chunk(items, _worker_tables)
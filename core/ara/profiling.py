@@ -0,0 +1,400 @@
+# ARA Profiling
+# Per-rule cost accounting and analyzer latency histograms
+
+"""
+Profiling hooks for the Access Risk Analysis engine.
+
+Answers "which rules, operators and analyzers dominate evaluation time"
+for large rule libraries:
+- per-rule evaluation counters, hits and cumulative / max time
+- per-operator cost of rule conditions (e.g. regex MATCHES)
+- latency histograms per analyzer (sod, sensitive, scorer)
+- optional sampling profiler recording which ARA function is running
+
+Profiling is off by default. RuleDefinition, RuleCondition and
+AccessRiskEngine check a single flag on the shared profiler, so the
+disabled mode costs one attribute lookup per call.
+
+Usage:
+    from core.ara.profiling import get_profiler
+
+    profiler = get_profiler()
+    profiler.enable(sampling=True)
+    ... run analyses ...
+    profiler.top_rules(20)
+    profiler.disable()
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+from collections import Counter
+from contextlib import nullcontext
+import logging
+import os
+import signal
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Sort keys accepted by top_rules
+RULE_SORT_KEYS = ("total_time", "avg_time", "max_time", "evaluations", "hits")
+
+
+@dataclass
+class RuleCost:
+    """Accumulated evaluation cost of one rule."""
+    rule_id: str
+    rule_name: str = ""
+    rule_type: str = ""
+    evaluations: int = 0
+    hits: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def avg_ns(self) -> float:
+        return self.total_ns / self.evaluations if self.evaluations else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rule_id": self.rule_id,
+            "rule_name": self.rule_name,
+            "rule_type": self.rule_type,
+            "evaluations": self.evaluations,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.evaluations, 4) if self.evaluations else 0.0,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "avg_us": round(self.avg_ns / 1e3, 3),
+            "max_us": round(self.max_ns / 1e3, 3),
+        }
+
+
+@dataclass
+class OperatorCost:
+    """Accumulated cost of one condition operator."""
+    operator: str
+    evaluations: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "operator": self.operator,
+            "evaluations": self.evaluations,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "avg_us": round(self.total_ns / self.evaluations / 1e3, 3) if self.evaluations else 0.0,
+            "max_us": round(self.max_ns / 1e3, 3),
+        }
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (bucket bounds in microseconds)."""
+
+    BUCKETS_US = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000, 100000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_US) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, elapsed_ns: int):
+        elapsed_us = elapsed_ns / 1e3
+        for i, bound in enumerate(self.BUCKETS_US):
+            if elapsed_us <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.max_ns = max(self.max_ns, elapsed_ns)
+
+    def percentile_us(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return float(self.BUCKETS_US[i]) if i < len(self.BUCKETS_US) else self.max_ns / 1e3
+        return self.max_ns / 1e3
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={b}us" for b in self.BUCKETS_US] + [f">{self.BUCKETS_US[-1]}us"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "avg_us": round(self.total_ns / self.count / 1e3, 3) if self.count else 0.0,
+            "p50_us": self.percentile_us(0.5),
+            "p95_us": self.percentile_us(0.95),
+            "max_us": round(self.max_ns / 1e3, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for ARA code.
+
+    Every interval seconds of CPU time, records the innermost frame that
+    belongs to the ARA package (samples outside ARA code are skipped).
+
+    Samples are taken by an ITIMER_PROF signal handler, which sees the
+    main thread only but is unbiased. It therefore needs SIGPROF and has
+    to be started from the main thread; start() raises RuntimeError
+    otherwise (a sampling thread would only get the GIL when the workload
+    releases it, so its samples would not reflect actual cost).
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.ticks = 0
+        self.mode: Optional[str] = None
+        self._root = os.path.dirname(os.path.abspath(__file__)) + os.sep
+        self._previous_handler: Any = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Whether start() can run here (SIGPROF available, main thread)"""
+        return hasattr(signal, "SIGPROF") and threading.current_thread() is threading.main_thread()
+
+    @property
+    def is_running(self) -> bool:
+        return self.mode == "signal"
+
+    def start(self):
+        if self.is_running:
+            return
+        if not self.is_supported():
+            raise RuntimeError("Sampling profiler needs SIGPROF and must be started from the main thread")
+        self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.mode = "signal"
+
+    def stop(self):
+        if self.mode == "signal":
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            if threading.current_thread() is threading.main_thread():
+                signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            else:
+                # Handler can only be restored from the main thread; keep it
+                # installed (harmless with the timer stopped)
+                logger.warning("Sampling profiler stopped outside the main thread")
+        self.mode = None
+
+    def _on_signal(self, signum, frame):
+        self.ticks += 1
+        self._record(frame)
+
+    def _record(self, frame):
+        root = self._root
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(root) and not filename.endswith("profiling.py"):
+                self.samples[f"{filename[len(root):]}:{frame.f_code.co_name}"] += 1
+                return
+            frame = frame.f_back
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        total = sum(self.samples.values())
+        return [
+            {"function": name, "samples": n, "share": round(n / total, 4)}
+            for name, n in self.samples.most_common(limit)
+        ]
+
+    def to_dict(self, limit: int = 20) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "mode": self.mode,
+            "interval_ms": self.interval * 1000,
+            "ticks": self.ticks,
+            "samples": sum(self.samples.values()),
+            "top_functions": self.top(limit),
+        }
+
+
+class _AnalyzerTimer:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler: "ARAProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.observe_analyzer(self.name, time.perf_counter_ns() - self.started)
+        return False
+
+
+# Returned by ARAProfiler.analyzer() while disabled
+_NOOP = nullcontext()
+
+
+class ARAProfiler:
+    """
+    Collects ARA evaluation costs.
+
+    enabled and operators are plain attributes read on every rule /
+    condition evaluation; everything else only runs while enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.operators = False  # enabled and tracking condition operators
+        self.rules: Dict[str, RuleCost] = {}
+        self.operator_costs: Dict[str, OperatorCost] = {}
+        self.analyzers: Dict[str, LatencyHistogram] = {}
+        self.sampler: Optional[SamplingProfiler] = None
+        self.enabled_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    # Control
+
+    def enable(
+        self,
+        track_operators: bool = True,
+        sampling: bool = False,
+        sampling_interval: float = 0.005
+    ):
+        """
+        Start collecting (optionally with operator costs and sampling).
+
+        Raises RuntimeError if sampling is requested where
+        SamplingProfiler cannot run (see SamplingProfiler.is_supported).
+        """
+        if sampling and not SamplingProfiler.is_supported():
+            raise RuntimeError("Sampling profiler needs SIGPROF and must be started from the main thread")
+        self.enabled = True
+        self.operators = track_operators
+        self.enabled_at = self.enabled_at or time.time()
+        if sampling:
+            self.start_sampling(sampling_interval)
+        elif self.sampler is not None:
+            self.sampler.stop()
+        logger.info(f"ARA profiling enabled (operators={track_operators}, sampling={sampling})")
+
+    def disable(self):
+        """Stop collecting; collected data is kept until reset()."""
+        self.enabled = False
+        self.operators = False
+        if self.sampler is not None:
+            self.sampler.stop()
+        logger.info("ARA profiling disabled")
+
+    def reset(self):
+        with self._lock:
+            self.rules.clear()
+            self.operator_costs.clear()
+            self.analyzers.clear()
+            self.enabled_at = time.time() if self.enabled else None
+        if self.sampler is not None:
+            self.sampler.samples.clear()
+            self.sampler.ticks = 0
+
+    def start_sampling(self, interval: float = 0.005):
+        if self.sampler is None or self.sampler.interval != interval:
+            if self.sampler is not None:
+                self.sampler.stop()
+            self.sampler = SamplingProfiler(interval)
+        self.sampler.start()
+
+    def stop_sampling(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    # Recording
+
+    def record_rule(self, rule: Any, elapsed_ns: int, hit: bool):
+        with self._lock:
+            cost = self.rules.get(rule.rule_id)
+            if cost is None:
+                cost = self.rules[rule.rule_id] = RuleCost(rule.rule_id, rule.name, rule.rule_type)
+            cost.evaluations += 1
+            cost.hits += hit
+            cost.total_ns += elapsed_ns
+            if elapsed_ns > cost.max_ns:
+                cost.max_ns = elapsed_ns
+
+    def record_operator(self, operator: str, elapsed_ns: int):
+        with self._lock:
+            cost = self.operator_costs.get(operator)
+            if cost is None:
+                cost = self.operator_costs[operator] = OperatorCost(operator)
+            cost.evaluations += 1
+            cost.total_ns += elapsed_ns
+            if elapsed_ns > cost.max_ns:
+                cost.max_ns = elapsed_ns
+
+    def observe_analyzer(self, name: str, elapsed_ns: int):
+        with self._lock:
+            histogram = self.analyzers.get(name)
+            if histogram is None:
+                histogram = self.analyzers[name] = LatencyHistogram()
+            histogram.observe(elapsed_ns)
+
+    def analyzer(self, name: str):
+        """Context manager timing one analyzer call (no-op while disabled)."""
+        if not self.enabled:
+            return _NOOP
+        return _AnalyzerTimer(self, name)
+
+    # Reporting
+
+    def top_rules(self, limit: int = 20, sort_by: str = "total_time") -> List[Dict[str, Any]]:
+        """Most costly rules, by total_time, avg_time, max_time, evaluations or hits."""
+        if sort_by not in RULE_SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(RULE_SORT_KEYS)}")
+        key = {
+            "total_time": lambda c: c.total_ns,
+            "avg_time": lambda c: c.avg_ns,
+            "max_time": lambda c: c.max_ns,
+            "evaluations": lambda c: c.evaluations,
+            "hits": lambda c: c.hits,
+        }[sort_by]
+        with self._lock:
+            ranked = sorted(self.rules.values(), key=key, reverse=True)[:limit]
+            return [c.to_dict() for c in ranked]
+
+    def get_summary(self) -> Dict[str, Any]:
+        with self._lock:
+            total_ns = sum(c.total_ns for c in self.rules.values())
+            evaluations = sum(c.evaluations for c in self.rules.values())
+        return {
+            "enabled": self.enabled,
+            "track_operators": self.operators,
+            "since": self.enabled_at,
+            "rules_tracked": len(self.rules),
+            "rule_evaluations": evaluations,
+            "rule_time_ms": round(total_ns / 1e6, 3),
+        }
+
+    def get_report(self, limit: int = 20, sort_by: str = "total_time") -> Dict[str, Any]:
+        with self._lock:
+            operators = sorted(self.operator_costs.values(), key=lambda c: c.total_ns, reverse=True)
+            operators = [c.to_dict() for c in operators]
+            analyzers = {name: h.to_dict() for name, h in self.analyzers.items()}
+        return {
+            **self.get_summary(),
+            "top_rules": self.top_rules(limit, sort_by),
+            "operators": operators,
+            "analyzers": analyzers,
+            "sampling": self.sampler.to_dict(limit) if self.sampler is not None else None,
+        }
+
+
+# Shared profiler used by the rule engine and AccessRiskEngine
+_profiler = ARAProfiler()
+
+
+def get_profiler() -> ARAProfiler:
+    """The process-wide ARA profiler."""
+    return _profiler
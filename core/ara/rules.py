@@ -18,6 +18,7 @@ from enum import Enum
 import logging
 import json
 import re
+import time
 
 from .models import (
     RiskSeverity,
@@ -26,9 +27,12 @@ from .models import (
     SoDFunction,
     SoDRuleSet,
 )
+from .profiling import get_profiler
 
 logger = logging.getLogger(__name__)
 
+_profiler = get_profiler()
+
 
 # =============================================================================
 # Rule Condition Types
@@ -76,6 +80,14 @@ class RuleCondition:
         Returns:
             True if condition is met
         """
+        if _profiler.operators:
+            started = time.perf_counter_ns()
+            result = self._evaluate(context)
+            _profiler.record_operator(self.operator.value, time.perf_counter_ns() - started)
+            return result
+        return self._evaluate(context)
+
+    def _evaluate(self, context: Dict[str, Any]) -> bool:
         # Get field value from context (supports nested paths)
         field_value = self._get_field_value(context, self.field)
 
@@ -265,6 +277,14 @@ class RuleDefinition:
         Returns:
             True if rule conditions are met (risk exists)
         """
+        if _profiler.enabled:
+            started = time.perf_counter_ns()
+            result = self._evaluate(context)
+            _profiler.record_rule(self, time.perf_counter_ns() - started, result)
+            return result
+        return self._evaluate(context)
+
+    def _evaluate(self, context: Dict[str, Any]) -> bool:
         if not self.is_active():
             return False
 
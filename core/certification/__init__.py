@@ -4,6 +4,10 @@ from .models import (
     CertificationCampaign, CertificationItem, CertificationDecision,
     CampaignStatus, CertificationAction, CampaignType
 )
+from .generator import (
+    AccessSource, StaticAccessSource, RepositoryAccessSource,
+    CampaignItemGenerator, GenerationProgress
+)
 
 __all__ = [
     "CertificationManager",
@@ -12,5 +16,10 @@ __all__ = [
     "CertificationDecision",
     "CampaignStatus",
     "CertificationAction",
-    "CampaignType"
+    "CampaignType",
+    "AccessSource",
+    "StaticAccessSource",
+    "RepositoryAccessSource",
+    "CampaignItemGenerator",
+    "GenerationProgress"
 ]
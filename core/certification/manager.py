@@ -9,8 +9,9 @@ Manages access certification/review campaigns including:
 - Revocation processing
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Set, Tuple
 from datetime import datetime, timedelta
 import uuid
 
@@ -18,6 +19,10 @@ from .models import (
     CertificationCampaign, CertificationItem, CertificationDecision,
     CampaignStatus, CampaignType, CertificationAction
 )
+from .generator import (
+    AccessSource, RepositoryAccessSource, CampaignItemGenerator, GenerationProgress,
+    HIGH_RISK_ROLES, SOD_ROLE_PAIRS
+)
 from core.rules import RuleEngine
 from core.rules.models import UserAccess
 
@@ -35,7 +40,8 @@ class CertificationManager:
     def __init__(self,
                  rule_engine: Optional[RuleEngine] = None,
                  user_connector=None,
-                 notification_handler: Optional[Callable] = None):
+                 notification_handler: Optional[Callable] = None,
+                 access_source: Optional[AccessSource] = None):
         """
         Initialize Certification Manager.
 
@@ -43,14 +49,20 @@ class CertificationManager:
             rule_engine: Risk analysis engine for risk-prioritized reviews
             user_connector: Connector for user/role data
             notification_handler: Function to send notifications
+            access_source: User/role source for streaming item generation
+                (defaults to the user repository of the default tenant)
         """
         self.rule_engine = rule_engine or RuleEngine()
         self.user_connector = user_connector
         self.notification_handler = notification_handler
+        self.access_source = access_source
 
         # In-memory storage (replace with database)
         self.campaigns: Dict[str, CertificationCampaign] = {}
         self.decisions: Dict[str, CertificationDecision] = {}
+        self.generation_progress: Dict[str, GenerationProgress] = {}
+        # Background generations started by start_streaming_generation
+        self._generation_tasks: Set[asyncio.Task] = set()
 
         # Configuration
         self.config = {
@@ -59,7 +71,8 @@ class CertificationManager:
             "auto_revoke_on_timeout": False,
             "require_comments_for_revoke": True,
             "max_items_per_reviewer": 500,
-            "enable_continuous_certification": True
+            "enable_continuous_certification": True,
+            "generation_batch_size": 1000
         }
 
     # =========================================================================
@@ -163,6 +176,115 @@ class CertificationManager:
 
         return campaign
 
+    async def generate_campaign_items_streaming(
+        self,
+        campaign_id: str,
+        access_source: Optional[AccessSource] = None,
+        batch_size: Optional[int] = None,
+        on_progress: Optional[Callable[[GenerationProgress], None]] = None
+    ) -> GenerationProgress:
+        """
+        Generate items from real access data, batch by batch.
+
+        Runs the generator in a worker thread; items are appended to the
+        campaign as each batch completes, and get_generation_progress()
+        reports how far it has got. Only user_access, sensitive_access,
+        sod_violations and manager campaigns are supported.
+        """
+        campaign, generator, progress = self._begin_streaming_generation(
+            campaign_id, access_source, batch_size
+        )
+        return await self._run_streaming_generation(campaign, generator, progress, on_progress)
+
+    def start_streaming_generation(
+        self,
+        campaign_id: str,
+        access_source: Optional[AccessSource] = None,
+        batch_size: Optional[int] = None,
+        on_progress: Optional[Callable[[GenerationProgress], None]] = None
+    ) -> asyncio.Task:
+        """
+        Start a streaming generation in the background (needs a running loop).
+
+        The campaign is validated and its progress marked "running" before
+        this returns, so a second call raises instead of starting a
+        concurrent run. The task is kept referenced until it finishes.
+        """
+        campaign, generator, progress = self._begin_streaming_generation(
+            campaign_id, access_source, batch_size
+        )
+        task = asyncio.create_task(
+            self._run_streaming_generation(campaign, generator, progress, on_progress)
+        )
+        self._generation_tasks.add(task)
+        task.add_done_callback(self._generation_task_done)
+        return task
+
+    def _generation_task_done(self, task: asyncio.Task):
+        self._generation_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # Already recorded on the progress and logged by the generator
+            logger.debug(f"Background item generation ended with: {task.exception()}")
+
+    def _begin_streaming_generation(
+        self,
+        campaign_id: str,
+        access_source: Optional[AccessSource],
+        batch_size: Optional[int]
+    ) -> Tuple[CertificationCampaign, CampaignItemGenerator, GenerationProgress]:
+        """Validate, then mark the generation running (no awaits in between)"""
+        campaign = self.campaigns.get(campaign_id)
+        if not campaign:
+            raise ValueError(f"Campaign {campaign_id} not found")
+
+        if campaign.status != CampaignStatus.DRAFT:
+            raise ValueError("Can only generate items for draft campaigns")
+
+        if campaign.campaign_type == CampaignType.ROLE_MEMBERSHIP:
+            raise ValueError("Streaming generation is not supported for role membership campaigns")
+
+        existing = self.generation_progress.get(campaign_id)
+        if existing and existing.status == "running":
+            raise ValueError("Item generation is already running for this campaign")
+
+        source = access_source or self.access_source or RepositoryAccessSource()
+        generator = CampaignItemGenerator(
+            source,
+            batch_size=batch_size or self.config["generation_batch_size"],
+            # Directory connectors carry a materialized org hierarchy
+            org_index=getattr(self.user_connector, "org_index", None)
+        )
+
+        progress = GenerationProgress(campaign_id=campaign_id, status="running")
+        self.generation_progress[campaign_id] = progress
+        campaign.items = []
+        campaign.total_items = 0
+        return campaign, generator, progress
+
+    async def _run_streaming_generation(
+        self,
+        campaign: CertificationCampaign,
+        generator: CampaignItemGenerator,
+        progress: GenerationProgress,
+        on_progress: Optional[Callable[[GenerationProgress], None]]
+    ) -> GenerationProgress:
+        # Stop early if the campaign is cancelled mid-run
+        def should_stop() -> bool:
+            return campaign.status == CampaignStatus.CANCELLED
+
+        await asyncio.to_thread(generator.generate, campaign, progress, on_progress, should_stop)
+
+        logger.info(
+            f"Generated {progress.items_generated} items for campaign {campaign.campaign_id} "
+            f"from {progress.users_processed} users in {progress.batches} batches"
+        )
+
+        return progress
+
+    def get_generation_progress(self, campaign_id: str) -> Optional[GenerationProgress]:
+        """Progress of the latest streaming generation for a campaign"""
+        return self.generation_progress.get(campaign_id)
+
     async def _generate_user_access_items(self, campaign: CertificationCampaign) -> List[CertificationItem]:
         """Generate items for user access review"""
         items = []
@@ -266,39 +388,25 @@ class CertificationManager:
         return await self._generate_user_access_items(campaign)
 
     async def _calculate_item_risk(self, item: CertificationItem, user_data: Dict) -> float:
-        """Calculate risk score for a certification item"""
-        score = 0.0
-
-        # Role-based risk
-        high_risk_roles = ["Z_PAYROLL_RUN", "Z_PAYMENT_RUN", "Z_BASIS_ADMIN", "Z_USER_ADMIN"]
-        if item.access_id in high_risk_roles:
-            score += 40
+        """
+        Calculate risk score for a certification item.
 
+        Uses the streaming generator's role lists and scoring
+        (CampaignItemGenerator.score_batch), so both paths score alike.
+        """
         # Check for potential SoD
-        user_roles = [r["role_id"] for r in user_data.get("roles", [])]
-        sod_pairs = [
-            (["Z_VENDOR_MAINT"], ["Z_PAYMENT_RUN"]),
-            (["Z_PURCHASER"], ["Z_GR_CLERK"]),
-            (["Z_HR_SPECIALIST"], ["Z_PAYROLL_RUN"])
-        ]
-
-        for role_a_list, role_b_list in sod_pairs:
-            has_a = any(r in user_roles for r in role_a_list)
-            has_b = any(r in user_roles for r in role_b_list)
-            if has_a and has_b:
-                score += 30
+        user_roles = {r["role_id"] for r in user_data.get("roles", [])}
+        sod_hits = 0
+        for side_a, side_b in SOD_ROLE_PAIRS:
+            if user_roles & side_a and user_roles & side_b:
+                sod_hits += 1
                 item.has_sod_violation = True
                 item.risk_flags.append("Potential SoD conflict")
 
         # Tenure-based risk (longer access = higher review priority)
-        if item.granted_date:
-            days_since_grant = (datetime.now() - item.granted_date).days
-            if days_since_grant > 365:
-                score += 10
-            if days_since_grant > 730:
-                score += 10
+        age = (datetime.now() - item.granted_date).days if item.granted_date else 0
 
-        return min(score, 100)
+        return CampaignItemGenerator.score_batch([item.access_id in HIGH_RISK_ROLES], [sod_hits], [age])[0]
 
     # =========================================================================
     # Campaign Lifecycle
@@ -310,6 +418,10 @@ class CertificationManager:
         if not campaign:
             raise ValueError(f"Campaign {campaign_id} not found")
 
+        progress = self.generation_progress.get(campaign_id)
+        if progress and progress.status == "running":
+            raise ValueError("Item generation is still running")
+
         if not campaign.items:
             raise ValueError("Campaign has no items. Generate items first.")
 
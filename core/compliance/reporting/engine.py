@@ -29,11 +29,14 @@ import uuid
 import json
 import io
 import csv
+import logging
 
 from .models import (
     ReportResult, ReportFormat, ReportFrequency, RiskLevel
 )
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================================
 # REPORT REGISTRY
@@ -645,6 +648,7 @@ class ReportScheduler:
     - Create/update/delete schedules
     - Track execution times
     - Handle distribution
+    - Run precompute hooks (e.g. executive narratives) after each report
     """
 
     scheduler_id: str = field(default_factory=lambda: f"SCHED-{str(uuid.uuid4())[:8]}")
@@ -658,6 +662,9 @@ class ReportScheduler:
     # Distribution handlers
     distribution_handlers: Dict[str, Callable] = field(default_factory=dict)
 
+    # Precompute hooks: name -> callable(schedule, result)
+    precompute_hooks: Dict[str, Callable] = field(default_factory=dict)
+
     def create_schedule(
         self,
         report_id: str,
@@ -739,6 +746,9 @@ class ReportScheduler:
             schedule.last_status = "SUCCESS"
             schedule.calculate_next_run()
 
+            # Refresh precomputed content before distribution
+            self.run_precompute_hooks(schedule, result)
+
             # Distribute report
             self._distribute_report(schedule, result)
 
@@ -750,6 +760,31 @@ class ReportScheduler:
             schedule.calculate_next_run()
             raise
 
+    def register_precompute_hook(self, name: str, hook: Callable) -> None:
+        """
+        Register a hook run after every successful scheduled report.
+
+        Hooks receive (schedule, result); use them to warm caches such as
+        ExecutiveNarrativeGenerator.precompute_hook(...).
+        """
+        self.precompute_hooks[name] = hook
+
+    def run_precompute_hooks(
+        self,
+        schedule: Optional[ScheduledReport] = None,
+        result: Optional[ReportResult] = None
+    ) -> Dict[str, str]:
+        """Run all precompute hooks; a failing hook does not fail the report."""
+        statuses = {}
+        for name, hook in self.precompute_hooks.items():
+            try:
+                hook(schedule, result)
+                statuses[name] = "SUCCESS"
+            except Exception as e:
+                logger.error(f"Precompute hook {name} failed: {e}")
+                statuses[name] = f"FAILED: {str(e)}"
+        return statuses
+
     def _distribute_report(self, schedule: ScheduledReport, result: ReportResult) -> None:
         """Distribute report to recipients."""
         # In real implementation, this would email or store the report
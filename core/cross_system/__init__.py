@@ -4,6 +4,10 @@ from .correlation import (
     CrossSystemConflict, CorrelationRule, CorrelationStatus, ConflictSeverity
 )
 
+from .matcher import (
+    AccountMatcher, BlockingIndex, MatchRecord, MatchPair
+)
+
 from .sod_engine import (
     CrossSystemSoDEngine,
     cross_system_engine,
@@ -16,6 +20,9 @@ from .sod_engine import (
     CrossSystemUser
 )
 
+from .rule_index import CompiledRuleIndex
+from .function_index import FunctionTokenIndex
+
 __all__ = [
     # Correlation
     "CrossSystemManager",
@@ -26,6 +33,11 @@ __all__ = [
     "CorrelationRule",
     "CorrelationStatus",
     "ConflictSeverity",
+    # Account Matching
+    "AccountMatcher",
+    "BlockingIndex",
+    "MatchRecord",
+    "MatchPair",
     # Cross-System SoD Engine
     "CrossSystemSoDEngine",
     "cross_system_engine",
@@ -35,5 +47,7 @@ __all__ = [
     "CrossSystemRule",
     "SystemMapping",
     "CrossSystemViolation",
-    "CrossSystemUser"
+    "CrossSystemUser",
+    "CompiledRuleIndex",
+    "FunctionTokenIndex"
 ]
@@ -0,0 +1,158 @@
+"""
+Function Token Index
+
+Inverted index used to propose function mappings between systems without
+comparing every source function with every target function.
+
+A mapping only clears the 0.7 threshold when both the module and at least
+one name token match (module 0.3 + name up to 0.3 + risk 0.2 + tags 0.2),
+so functions are posted under module-qualified name tokens and only
+functions sharing such a posting are scored. Name overlap is weighted by
+inverse document frequency, so generic words like "create" or "manage"
+count for less than "vendor" or "payroll".
+"""
+
+from typing import Dict, List, Optional, Any, Set, Tuple
+import math
+import re
+
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize_name(name: str) -> Set[str]:
+    return set(_TOKEN.findall((name or "").lower()))
+
+
+class _Entry:
+    __slots__ = ("function", "order", "tokens", "module", "tags")
+
+    def __init__(self, function: Any, order: int):
+        self.function = function
+        self.order = order
+        self.tokens = tokenize_name(function.name)
+        self.module = (function.module or "").upper()
+        self.tags = set(function.compliance_tags)
+
+
+class FunctionTokenIndex:
+    """
+    Per-system postings of (module, name token) -> function_ids, plus global
+    token document frequencies for IDF weighting. Kept current by
+    CrossSystemSoDEngine.register_function.
+    """
+
+    def __init__(self, threshold: float = 0.7):
+        self.threshold = threshold
+        self._entries: Dict[str, Dict[str, _Entry]] = {}                     # system -> func_id -> entry
+        self._postings: Dict[str, Dict[Tuple[str, str], Set[str]]] = {}      # system -> key -> func_ids
+        self._doc_freq: Dict[str, int] = {}
+        self._doc_count = 0
+        self._order = 0
+        self._pending: Dict[str, Set[str]] = {}                              # system -> new func_ids
+
+    # ==================== Maintenance ====================
+
+    def add(self, function: Any) -> None:
+        """Index (or re-index) a function"""
+        self.remove(function.system_id, function.function_id)
+        entry = _Entry(function, self._order)
+        self._order += 1
+
+        self._entries.setdefault(function.system_id, {})[function.function_id] = entry
+        postings = self._postings.setdefault(function.system_id, {})
+        for token in entry.tokens:
+            postings.setdefault((entry.module, token), set()).add(function.function_id)
+            self._doc_freq[token] = self._doc_freq.get(token, 0) + 1
+        self._doc_count += 1
+        self._pending.setdefault(function.system_id, set()).add(function.function_id)
+
+    def remove(self, system_id: str, function_id: str) -> None:
+        entry = self._entries.get(system_id, {}).pop(function_id, None)
+        if entry is None:
+            return
+        postings = self._postings[system_id]
+        for token in entry.tokens:
+            key = (entry.module, token)
+            postings[key].discard(function_id)
+            if not postings[key]:
+                del postings[key]
+            self._doc_freq[token] -= 1
+            if not self._doc_freq[token]:
+                del self._doc_freq[token]
+        self._doc_count -= 1
+        self._pending.get(system_id, set()).discard(function_id)
+
+    def remove_system(self, system_id: str) -> None:
+        for function_id in list(self._entries.get(system_id, {})):
+            self.remove(system_id, function_id)
+        self._postings.pop(system_id, None)
+        self._pending.pop(system_id, None)
+
+    def take_pending(self) -> Dict[str, Set[str]]:
+        """Functions added since the last call, by system"""
+        pending = {s: ids for s, ids in self._pending.items() if ids}
+        self._pending = {}
+        return pending
+
+    # ==================== Scoring ====================
+
+    def idf(self, token: str) -> float:
+        return math.log((self._doc_count + 1) / (self._doc_freq.get(token, 0) + 1)) + 1.0
+
+    def similarity(self, source: Any, target: Any) -> float:
+        """Same weighting as the engine's mapping similarity, with IDF name overlap"""
+        return self._score(_Entry(source, 0), _Entry(target, 0))
+
+    def _score(self, src: _Entry, tgt: _Entry) -> float:
+        score = 0.0
+
+        shared = src.tokens & tgt.tokens
+        if shared:
+            weight = sum(self.idf(t) for t in shared)
+            score += 0.3 * weight / max(
+                sum(self.idf(t) for t in src.tokens),
+                sum(self.idf(t) for t in tgt.tokens)
+            )
+
+        if src.module == tgt.module:
+            score += 0.3
+
+        if src.function.risk_level == tgt.function.risk_level:
+            score += 0.2
+
+        if src.tags & tgt.tags:
+            score += 0.2 * len(src.tags & tgt.tags) / max(len(src.tags), len(tgt.tags), 1)
+
+        return min(score, 1.0)
+
+    def candidates(self, function: Any, target_system: str) -> List[Any]:
+        """Target functions sharing the module and a name token, in registration order"""
+        postings = self._postings.get(target_system)
+        if not postings:
+            return []
+        module = (function.module or "").upper()
+        found: Set[str] = set()
+        for token in tokenize_name(function.name):
+            found.update(postings.get((module, token), ()))
+        entries = self._entries[target_system]
+        return [entries[f].function for f in sorted(found, key=lambda f: entries[f].order)]
+
+    def best_match(self, function: Any, target_system: str) -> Optional[Tuple[Any, float]]:
+        """Highest scoring target above the threshold; earliest registered wins ties"""
+        src = self._entries.get(function.system_id, {}).get(function.function_id) or _Entry(function, 0)
+        entries = self._entries.get(target_system, {})
+        best: Optional[Tuple[Any, float]] = None
+        for target in self.candidates(function, target_system):
+            score = self._score(src, entries[target.function_id])
+            if score > self.threshold and (best is None or score > best[1]):
+                best = (target, score)
+        return best
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "functions": self._doc_count,
+            "tokens": len(self._doc_freq),
+            "postings": {s: len(p) for s, p in self._postings.items()},
+            "pending": sum(len(ids) for ids in self._pending.values()),
+        }
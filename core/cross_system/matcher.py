@@ -0,0 +1,375 @@
+"""
+Blocking-Key Account Matcher
+
+Scalable cross-system account correlation:
+- Blocking: every account is indexed under a few normalized keys
+  (email, email local part, employee ID, username, phonetic name), and
+  only accounts sharing a key are ever compared
+- Scoring: candidate pairs are scored against the correlation rules with
+  Jaro-Winkler / trigram similarity instead of word overlap
+- Assignment: accepted pairs are merged greedily by confidence into
+  clusters holding at most one account per system, so competing matches
+  resolve one-to-one
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Any, Tuple, Iterable
+import re
+import time
+import unicodedata
+
+
+# =============================================================================
+# Normalization
+# =============================================================================
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_email(value: str) -> str:
+    """Lower-case and drop +tags: 'J.Smith+sap@Corp.com' -> 'j.smith@corp.com'"""
+    value = (value or "").strip().lower()
+    if "@" not in value:
+        return ""
+    local, _, domain = value.partition("@")
+    local = local.split("+", 1)[0]
+    return f"{local}@{domain}"
+
+
+def normalize_employee_id(value: Any) -> str:
+    """Upper-case alphanumerics without leading zeros: 'e-00123' -> 'E123'"""
+    text = re.sub(r"[^0-9A-Za-z]", "", str(value or "")).upper()
+    return re.sub(r"(?<![0-9])0+(?=[0-9])", "", text)
+
+
+def normalize_name(value: str) -> str:
+    """Accent-free, lower-case tokens; 'Smith, John' becomes 'john smith'"""
+    value = value or ""
+    if "," in value:
+        last, _, first = value.partition(",")
+        value = f"{first} {last}"
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    return " ".join(_NON_ALNUM.sub(" ", value.lower()).split())
+
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"), "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a lower-case ASCII word"""
+    word = "".join(c for c in word if c.isalpha())
+    if not word:
+        return ""
+    code = [word[0].upper()]
+    last = _SOUNDEX_CODES.get(word[0], "")
+    for c in word[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != last:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        if c not in "hw":
+            last = digit
+    return "".join(code).ljust(4, "0")
+
+
+# =============================================================================
+# Similarity
+# =============================================================================
+
+def jaro_winkler(s1: str, s2: str, prefix_scale: float = 0.1) -> float:
+    """Jaro-Winkler similarity in [0, 1]"""
+    if s1 == s2:
+        return 1.0 if s1 else 0.0
+    len1, len2 = len(s1), len(s2)
+    if not len1 or not len2:
+        return 0.0
+
+    window = max(max(len1, len2) // 2 - 1, 0)
+    matched2 = [False] * len2
+    matches1 = []
+    for i, c in enumerate(s1):
+        lo, hi = max(0, i - window), min(i + window + 1, len2)
+        for j in range(lo, hi):
+            if not matched2[j] and s2[j] == c:
+                matched2[j] = True
+                matches1.append(c)
+                break
+    m = len(matches1)
+    if not m:
+        return 0.0
+
+    matches2 = [s2[j] for j in range(len2) if matched2[j]]
+    transpositions = sum(a != b for a, b in zip(matches1, matches2)) / 2
+    jaro = (m / len1 + m / len2 + (m - transpositions) / m) / 3
+
+    prefix = 0
+    for a, b in zip(s1[:4], s2[:4]):
+        if a != b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def trigrams(value: str) -> Set[str]:
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(s1: str, s2: str) -> float:
+    """Jaccard similarity of character trigrams"""
+    if not s1 or not s2:
+        return 0.0
+    a, b = trigrams(s1), trigrams(s2)
+    return len(a & b) / len(a | b)
+
+
+def name_similarity(n1: str, n2: str) -> float:
+    """
+    Similarity of two normalized names.
+
+    Jaro-Winkler on the token-sorted names (order-insensitive), floored by
+    trigram overlap for names with extra middle names or initials.
+    """
+    if not n1 or not n2:
+        return 0.0
+    if n1 == n2:
+        return 1.0
+    sorted1 = " ".join(sorted(n1.split()))
+    sorted2 = " ".join(sorted(n2.split()))
+    return max(jaro_winkler(sorted1, sorted2), trigram_similarity(n1, n2))
+
+
+# =============================================================================
+# Matcher
+# =============================================================================
+
+@dataclass
+class MatchRecord:
+    """Normalized view of an account used for blocking and scoring"""
+    key: str                       # Caller's identifier (account_id, ...)
+    system_id: str
+    email: str = ""
+    employee_id: str = ""
+    name: str = ""
+    username: str = ""
+    department: str = ""
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, key: str, system_id: str, data: Dict[str, Any]) -> "MatchRecord":
+        return cls(
+            key=key,
+            system_id=system_id,
+            email=normalize_email(data.get("email", "")),
+            employee_id=normalize_employee_id(data.get("employee_id", "")),
+            name=normalize_name(data.get("display_name", "") or data.get("name", "")),
+            username=_NON_ALNUM.sub("", str(data.get("username", "")).lower()),
+            department=str(data.get("department", "") or "").strip().lower(),
+            raw=data,
+        )
+
+    def field_value(self, name: str) -> str:
+        if name == "display_name":
+            return self.name
+        value = getattr(self, name, None)
+        if value is None:
+            value = self.raw.get(name, "")
+        return str(value or "").strip().lower()
+
+    def blocking_keys(self) -> List[str]:
+        keys = []
+        if self.email:
+            keys.append(f"e:{self.email}")
+            keys.append(f"l:{self.email.split('@', 1)[0]}")
+        if self.employee_id:
+            keys.append(f"i:{self.employee_id}")
+        if self.username and len(self.username) >= 3:
+            keys.append(f"u:{self.username}")
+        tokens = self.name.split()
+        if len(tokens) >= 2:
+            # Order-insensitive phonetic key, plus surname + first initial
+            keys.append("p:" + "".join(sorted(soundex(t) for t in (tokens[0], tokens[-1]))))
+            keys.append(f"s:{tokens[-1]}:{tokens[0][0]}")
+        return keys
+
+
+@dataclass
+class MatchPair:
+    """A scored candidate pair"""
+    left: str
+    right: str
+    confidence: float
+    rule: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "left": self.left,
+            "right": self.right,
+            "confidence": round(self.confidence, 4),
+            "rule_used": self.rule,
+        }
+
+
+class BlockingIndex:
+    """Inverted index of blocking key -> record keys"""
+
+    def __init__(self, max_block_size: int = 200):
+        self.max_block_size = max_block_size
+        self.records: Dict[str, MatchRecord] = {}
+        self.blocks: Dict[str, List[str]] = {}
+
+    def add(self, record: MatchRecord) -> None:
+        self.records[record.key] = record
+        for key in record.blocking_keys():
+            self.blocks.setdefault(key, []).append(record.key)
+
+    def candidates(self, record: MatchRecord) -> Set[str]:
+        """Record keys sharing at least one usable block with `record`"""
+        found: Set[str] = set()
+        for key in record.blocking_keys():
+            block = self.blocks.get(key)
+            # Oversized blocks (very common names) do not discriminate
+            if block and len(block) <= self.max_block_size:
+                found.update(block)
+        found.discard(record.key)
+        return found
+
+    def candidate_pairs(self) -> Set[Tuple[str, str]]:
+        """All cross-system pairs sharing a usable block"""
+        pairs: Set[Tuple[str, str]] = set()
+        for block in self.blocks.values():
+            if len(block) < 2 or len(block) > self.max_block_size:
+                continue
+            for i, a in enumerate(block):
+                sys_a = self.records[a].system_id
+                for b in block[i + 1:]:
+                    if self.records[b].system_id != sys_a:
+                        pairs.add((a, b) if a < b else (b, a))
+        return pairs
+
+
+class AccountMatcher:
+    """
+    Scores candidate pairs with correlation rules and assigns matches.
+
+    Args:
+        rules: Sequence of (name, match_fields, threshold) taken from the
+            CorrelationRule objects; fields use the existing
+            {source_field, target_field, match_type} shape
+        max_block_size: Blocks larger than this are ignored for candidates
+    """
+
+    def __init__(self, rules: List[Tuple[str, List[Dict], float]], max_block_size: int = 200):
+        self.rules = rules
+        self.max_block_size = max_block_size
+
+    def score(self, left: MatchRecord, right: MatchRecord) -> Optional[Tuple[float, str]]:
+        """Best (confidence, rule_name) over rules that pass their threshold"""
+        best: Optional[Tuple[float, str]] = None
+        for name, fields, threshold in self.rules:
+            if not fields:
+                continue
+            total = 0.0
+            for f in fields:
+                a = left.field_value(f["source_field"])
+                b = right.field_value(f["target_field"])
+                if not a or not b:
+                    continue
+                if f.get("match_type", "exact") == "fuzzy":
+                    total += name_similarity(a, b) if f["source_field"] == "display_name" else jaro_winkler(a, b)
+                elif a == b:
+                    total += 1.0
+            confidence = total / len(fields)
+            if confidence >= threshold and (best is None or confidence > best[0]):
+                best = (confidence, name)
+        return best
+
+    def match_one(self, source: MatchRecord, targets: Iterable[MatchRecord]) -> List[MatchPair]:
+        """Score one record against a target set using blocking"""
+        index = BlockingIndex(self.max_block_size)
+        for target in targets:
+            index.add(target)
+        pairs = []
+        for key in index.candidates(source):
+            scored = self.score(source, index.records[key])
+            if scored:
+                pairs.append(MatchPair(source.key, key, scored[0], scored[1]))
+        return sorted(pairs, key=lambda p: p.confidence, reverse=True)
+
+    def cluster(
+        self,
+        records: Iterable[MatchRecord],
+        initial_systems: Optional[Dict[str, Iterable[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Correlate records from many systems into clusters.
+
+        Accepted pairs are applied in descending confidence; a merge that
+        would put two accounts of the same system in one cluster is
+        rejected and reported as a conflict, which makes assignment
+        one-to-one per system pair.
+
+        initial_systems maps a record key to systems its cluster already
+        covers (e.g. the linked accounts of an existing identity); merges
+        that would add a second account on one of them are conflicts too.
+        """
+        started = time.perf_counter()
+        index = BlockingIndex(self.max_block_size)
+        for record in records:
+            index.add(record)
+
+        candidate_pairs = index.candidate_pairs()
+        scored: List[MatchPair] = []
+        for a, b in candidate_pairs:
+            result = self.score(index.records[a], index.records[b])
+            if result:
+                scored.append(MatchPair(a, b, result[0], result[1]))
+        scored.sort(key=lambda p: p.confidence, reverse=True)
+
+        # Union-find with per-cluster system sets
+        parent: Dict[str, str] = {k: k for k in index.records}
+        systems: Dict[str, Set[str]] = {k: {r.system_id} for k, r in index.records.items()}
+        for key, seeded in (initial_systems or {}).items():
+            if key in systems:
+                systems[key].update(seeded)
+
+        def find(x: str) -> str:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        accepted: List[MatchPair] = []
+        conflicts: List[MatchPair] = []
+        for pair in scored:
+            ra, rb = find(pair.left), find(pair.right)
+            if ra == rb:
+                continue
+            if systems[ra] & systems[rb]:
+                conflicts.append(pair)
+                continue
+            if len(systems[ra]) < len(systems[rb]):
+                ra, rb = rb, ra
+            parent[rb] = ra
+            systems[ra] |= systems.pop(rb)
+            accepted.append(pair)
+
+        clusters: Dict[str, List[str]] = {}
+        for key in index.records:
+            clusters.setdefault(find(key), []).append(key)
+
+        n = len(index.records)
+        return {
+            "clusters": list(clusters.values()),
+            "accepted": accepted,
+            "conflicts": conflicts,
+            "records": n,
+            "blocks": len(index.blocks),
+            "candidate_pairs": len(candidate_pairs),
+            "naive_pairs": n * (n - 1) // 2,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        }
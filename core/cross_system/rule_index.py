@@ -0,0 +1,231 @@
+"""
+Compiled Cross-System Rule Index
+
+Precomputes everything CrossSystemSoDEngine needs to evaluate users
+against the cross-system ruleset:
+- Equivalence classes: a union-find over function mappings, so "does the
+  user's function match the rule function" becomes a class-id comparison
+  instead of a scan over every SystemMapping
+- Permission bitsets: per system, each transaction / permission is
+  interned to a bit; every function is the OR of its bits, and a user's
+  access in that system is turned into one mask, once
+- Rule lookup: rules are keyed by their first function class and checked
+  against the user's class bitset
+
+The index is immutable once built and can be shipped to worker processes
+for parallel enterprise analysis.
+"""
+
+from typing import Dict, List, Optional, Any, Tuple, Iterable
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# (rule_id, system of function_1 match, system of function_2 match)
+RuleHit = Tuple[str, str, str]
+
+
+class CompiledRuleIndex:
+    """
+    Immutable rule index built from an engine's functions, mappings and rules.
+
+    Args:
+        functions: system_id -> {function_id -> SystemFunction}
+        mappings: Iterable of SystemMapping
+        rules: Iterable of CrossSystemRule (in evaluation order)
+    """
+
+    def __init__(self, functions: Dict[str, Dict[str, Any]], mappings: Iterable[Any], rules: Iterable[Any]):
+        self._func_ids: Dict[Tuple[str, str], int] = {}
+        self._parent: List[int] = []
+
+        # Register catalog functions first so ids follow registration order
+        for system_id, funcs in functions.items():
+            for func in funcs.values():
+                self._func_id(func.system_id, func.function_id)
+
+        # Union every function that appears in the same mapping
+        for mapping in mappings:
+            members = [self._func_id(f.system_id, f.function_id) for f in mapping.function_mappings.values()]
+            for other in members[1:]:
+                self._union(members[0], other)
+
+        # Dense class ids so class bitsets stay small
+        class_ids: Dict[int, int] = {}
+        self._class_of: List[int] = []
+        for fid in range(len(self._parent)):
+            root = self._find(fid)
+            self._class_of.append(class_ids.setdefault(root, len(class_ids)))
+        self.class_count = len(class_ids)
+
+        # Per-system interned permission bits and function masks
+        self._tx_bits: Dict[str, Dict[str, int]] = {}
+        self._perm_bits: Dict[str, Dict[str, int]] = {}
+        self._system_functions: Dict[str, List[Tuple[int, int]]] = {}
+        for system_id, funcs in functions.items():
+            tx_bits = self._tx_bits.setdefault(system_id, {})
+            perm_bits = self._perm_bits.setdefault(system_id, {})
+            entries = []
+            for func in funcs.values():
+                mask = 0
+                for tx in func.transactions:
+                    mask |= tx_bits.setdefault(tx, 1 << (len(tx_bits) + len(perm_bits)))
+                for perm in func.permissions:
+                    mask |= perm_bits.setdefault(perm, 1 << (len(tx_bits) + len(perm_bits)))
+                if mask:
+                    entries.append((self._class_of[self._func_ids[(func.system_id, func.function_id)]], mask))
+            self._system_functions[system_id] = entries
+
+        # Rules keyed by the class of function_1
+        self.rules: Dict[str, Any] = {}
+        self._rule_order: Dict[str, int] = {}
+        self._rules_by_class: Dict[int, List[Tuple[str, int]]] = {}
+        for order, rule in enumerate(rules):
+            c1 = self.function_class(rule.function_1.system_id, rule.function_1.function_id)
+            c2 = self.function_class(rule.function_2.system_id, rule.function_2.function_id)
+            self.rules[rule.rule_id] = rule
+            self._rule_order[rule.rule_id] = order
+            self._rules_by_class.setdefault(c1, []).append((rule.rule_id, c2))
+
+    # ==================== Build helpers ====================
+
+    def _func_id(self, system_id: str, function_id: str) -> int:
+        key = (system_id, function_id)
+        fid = self._func_ids.get(key)
+        if fid is None:
+            fid = self._func_ids[key] = len(self._parent)
+            self._parent.append(fid)
+        return fid
+
+    def _find(self, x: int) -> int:
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def _union(self, a: int, b: int) -> None:
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            # Lower id wins so classes are stable across rebuilds
+            if rb < ra:
+                ra, rb = rb, ra
+            self._parent[rb] = ra
+
+    # ==================== Lookups ====================
+
+    def function_class(self, system_id: str, function_id: str) -> int:
+        """Equivalence class of a function, -1 if it is unknown to the index"""
+        fid = self._func_ids.get((system_id, function_id))
+        return self._class_of[fid] if fid is not None else -1
+
+    def are_equivalent(self, func_a: Any, func_b: Any) -> bool:
+        ca = self.function_class(func_a.system_id, func_a.function_id)
+        return ca >= 0 and ca == self.function_class(func_b.system_id, func_b.function_id)
+
+    def access_mask(self, system_id: str, access: Dict[str, Any]) -> int:
+        """Bitset of the interned transactions / permissions in `access`"""
+        mask = 0
+        tx_bits = self._tx_bits.get(system_id)
+        if tx_bits:
+            for tx in access.get("transactions", ()):
+                mask |= tx_bits.get(tx, 0)
+        perm_bits = self._perm_bits.get(system_id)
+        if perm_bits:
+            for perm in access.get("permissions", ()):
+                mask |= perm_bits.get(perm, 0)
+        return mask
+
+    def user_classes(self, access_by_system: Dict[str, Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Function classes the user holds, with the system that granted them.
+
+        When several systems grant the same class the last one wins, which
+        matches the order the per-function scan reported.
+        """
+        held: Dict[int, str] = {}
+        for system_id, access in access_by_system.items():
+            entries = self._system_functions.get(system_id)
+            if not entries:
+                continue
+            mask = self.access_mask(system_id, access)
+            if not mask:
+                continue
+            for class_id, func_mask in entries:
+                if mask & func_mask:
+                    held[class_id] = system_id
+        return held
+
+    def evaluate(self, access_by_system: Dict[str, Dict[str, Any]]) -> List[RuleHit]:
+        """Active rules violated by one user's access, in ruleset order"""
+        held = self.user_classes(access_by_system)
+        if not held:
+            return []
+
+        hits = []
+        for class_id, system_1 in held.items():
+            for rule_id, class_2 in self._rules_by_class.get(class_id, ()):
+                system_2 = held.get(class_2)
+                if system_2 is not None and self.rules[rule_id].is_active:
+                    hits.append((rule_id, system_1, system_2))
+        if len(hits) > 1:
+            hits.sort(key=lambda h: self._rule_order[h[0]])
+        return hits
+
+    def evaluate_many(
+        self,
+        access_data: Iterable[Tuple[str, Dict[str, Dict[str, Any]]]]
+    ) -> List[Tuple[str, List[RuleHit]]]:
+        return [(user_id, self.evaluate(access)) for user_id, access in access_data]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "functions": len(self._func_ids),
+            "equivalence_classes": self.class_count,
+            "rules": len(self.rules),
+            "interned_permissions": {
+                system_id: len(self._tx_bits.get(system_id, {})) + len(self._perm_bits.get(system_id, {}))
+                for system_id in self._system_functions
+            },
+        }
+
+
+# =============================================================================
+# Parallel evaluation
+# =============================================================================
+
+_worker_index: Optional[CompiledRuleIndex] = None
+
+
+def _init_worker(index: CompiledRuleIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+
+def _evaluate_chunk(chunk: List[Tuple[str, Dict[str, Dict[str, Any]]]]) -> List[Tuple[str, List[RuleHit]]]:
+    return _worker_index.evaluate_many(chunk)
+
+
+def evaluate_parallel(
+    index: CompiledRuleIndex,
+    access_data: Dict[str, Dict[str, Dict[str, Any]]],
+    max_workers: Optional[int] = None,
+    chunk_size: int = 2000
+) -> List[Tuple[str, List[RuleHit]]]:
+    """
+    Evaluate many users across worker processes.
+
+    The index is sent to each worker once; users are shipped in chunks and
+    results come back in input order.
+    """
+    items = list(access_data.items())
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(items) <= chunk_size:
+        return index.evaluate_many(items)
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results: List[Tuple[str, List[RuleHit]]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index,)) as pool:
+        for part in pool.map(_evaluate_chunk, chunks):
+            results.extend(part)
+    return results
@@ -6,11 +6,14 @@ Provides SAP GRC-equivalent cross-system risk analysis with enhancements.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Dict, List, Optional, Any, Set
 from enum import Enum
 from datetime import datetime
 import hashlib
 
+from .function_index import FunctionTokenIndex
+from .rule_index import CompiledRuleIndex, RuleHit, evaluate_parallel
+
 
 class SystemType(Enum):
     """Supported system types"""
@@ -185,12 +188,18 @@ class CrossSystemSoDEngine:
         # Function mappings
         self.mappings: Dict[str, SystemMapping] = {}
 
+        # Token index for auto-mapping, kept current on registration
+        self.function_index = FunctionTokenIndex()
+
         # User identity mapping
         self.user_mappings: Dict[str, CrossSystemUser] = {}  # global_id -> user
 
         # Violations
         self.violations: Dict[str, CrossSystemViolation] = {}
 
+        # Compiled rule index, rebuilt lazily after catalog changes
+        self._rule_index: Optional[CompiledRuleIndex] = None
+
         # Initialize with sample data
         self._initialize_sample_systems()
         self._initialize_cross_system_rules()
@@ -218,6 +227,8 @@ class CrossSystemSoDEngine:
         }
 
         self.functions[system_id] = {}
+        self.function_index.remove_system(system_id)
+        self._rule_index = None
 
         return self.systems[system_id]
 
@@ -231,6 +242,8 @@ class CrossSystemSoDEngine:
             self.functions[system_id] = {}
 
         self.functions[system_id][function.function_id] = function
+        self.function_index.add(function)
+        self._rule_index = None
 
         if system_id in self.systems:
             self.systems[system_id]["function_count"] = len(self.functions[system_id])
@@ -259,6 +272,7 @@ class CrossSystemSoDEngine:
             mapping.function_mappings[func.system_id] = func
 
         self.mappings[mapping_id] = mapping
+        self._rule_index = None
         return mapping
 
     def find_equivalent_functions(
@@ -280,67 +294,82 @@ class CrossSystemSoDEngine:
     def auto_map_functions(
         self,
         source_system: str,
-        target_system: str
+        target_system: str,
+        function_ids: Optional[List[str]] = None
     ) -> List[SystemMapping]:
-        """Automatically map functions between systems using ML/heuristics"""
+        """
+        Automatically map functions between systems using heuristics
+
+        Only target functions sharing the module and a name token with the
+        source function are scored (see FunctionTokenIndex).
+
+        Args:
+            function_ids: Restrict to these source functions (default: all)
+        """
         auto_mappings = []
 
         source_funcs = self.functions.get(source_system, {})
-        target_funcs = self.functions.get(target_system, {})
-
-        for src_id, src_func in source_funcs.items():
-            best_match = None
-            best_score = 0.0
-
-            for tgt_id, tgt_func in target_funcs.items():
-                score = self._calculate_mapping_similarity(src_func, tgt_func)
-                if score > best_score and score > 0.7:  # 70% threshold
-                    best_score = score
-                    best_match = tgt_func
-
-            if best_match:
-                mapping = SystemMapping(
-                    mapping_id=f"auto_{src_func.function_id}_{best_match.function_id}",
-                    name=f"{src_func.name} <-> {best_match.name}",
-                    description="Auto-generated mapping",
-                    mapping_type="equivalent",
-                    confidence=best_score
-                )
-                mapping.function_mappings[source_system] = src_func
-                mapping.function_mappings[target_system] = best_match
-                auto_mappings.append(mapping)
+        if function_ids is not None:
+            source_funcs = {f: source_funcs[f] for f in function_ids if f in source_funcs}
+
+        for src_func in source_funcs.values():
+            match = self.function_index.best_match(src_func, target_system)
+            if not match:
+                continue
+            best_match, best_score = match
+
+            mapping = SystemMapping(
+                mapping_id=f"auto_{src_func.function_id}_{best_match.function_id}",
+                name=f"{src_func.name} <-> {best_match.name}",
+                description="Auto-generated mapping",
+                mapping_type="equivalent",
+                confidence=best_score
+            )
+            mapping.function_mappings[source_system] = src_func
+            mapping.function_mappings[target_system] = best_match
+            auto_mappings.append(mapping)
 
         return auto_mappings
 
+    def auto_map_all_systems(
+        self,
+        system_ids: Optional[List[str]] = None
+    ) -> Dict[str, List[SystemMapping]]:
+        """
+        Propose mappings for every pair of systems
+
+        Returns:
+            Dict of "source->target" -> proposed mappings
+        """
+        system_ids = system_ids or list(self.functions.keys())
+        results = {}
+        for i, source in enumerate(system_ids):
+            for target in system_ids[i + 1:]:
+                results[f"{source}->{target}"] = self.auto_map_functions(source, target)
+
+        # Everything registered so far has been considered
+        self.function_index.take_pending()
+        return results
+
+    def auto_map_new_functions(self) -> List[SystemMapping]:
+        """
+        Propose mappings only for functions registered since the last
+        batch or incremental run, against every other system
+        """
+        auto_mappings = []
+        for source, function_ids in self.function_index.take_pending().items():
+            for target in self.functions:
+                if target != source:
+                    auto_mappings.extend(self.auto_map_functions(source, target, sorted(function_ids)))
+        return auto_mappings
+
     def _calculate_mapping_similarity(
         self,
         func1: SystemFunction,
         func2: SystemFunction
     ) -> float:
         """Calculate similarity score between two functions"""
-        score = 0.0
-
-        # Name similarity
-        name1_words = set(func1.name.lower().split())
-        name2_words = set(func2.name.lower().split())
-        if name1_words & name2_words:
-            score += 0.3 * len(name1_words & name2_words) / max(len(name1_words), len(name2_words))
-
-        # Module match
-        if func1.module.upper() == func2.module.upper():
-            score += 0.3
-
-        # Risk level match
-        if func1.risk_level == func2.risk_level:
-            score += 0.2
-
-        # Compliance tags overlap
-        tags1 = set(func1.compliance_tags)
-        tags2 = set(func2.compliance_tags)
-        if tags1 & tags2:
-            score += 0.2 * len(tags1 & tags2) / max(len(tags1), len(tags2), 1)
-
-        return min(score, 1.0)
+        return self.function_index.similarity(func1, func2)
 
     # ==================== Cross-System Rules ====================
 
@@ -379,6 +408,7 @@ class CrossSystemSoDEngine:
         )
 
         self.rules[rule_id] = rule
+        self._rule_index = None
         return rule
 
     def get_rules_for_system(self, system_id: str) -> List[CrossSystemRule]:
@@ -481,79 +511,14 @@ class CrossSystemSoDEngine:
         if not user:
             return {"error": "User not found in identity mapping"}
 
-        violations = []
-        risk_summary = {
-            "intra_system": 0,
-            "inter_system": 0,
-            "cross_platform": 0
-        }
-
-        # Collect all user's functions across systems
-        user_functions: List[Tuple[str, SystemFunction]] = []
-
-        for system_id, access in access_by_system.items():
-            system_funcs = self.functions.get(system_id, {})
-
-            # Match access to functions
-            for func_id, func in system_funcs.items():
-                if self._user_has_function(access, func):
-                    user_functions.append((system_id, func))
-
-        # Check all cross-system rules
-        for rule in self.rules.values():
-            if not rule.is_active:
-                continue
-
-            has_func1 = False
-            has_func2 = False
-            func1_system = None
-            func2_system = None
-
-            for system_id, func in user_functions:
-                if self._functions_match(func, rule.function_1):
-                    has_func1 = True
-                    func1_system = system_id
-                if self._functions_match(func, rule.function_2):
-                    has_func2 = True
-                    func2_system = system_id
-
-            if has_func1 and has_func2:
-                violation = CrossSystemViolation(
-                    violation_id=f"CSV_{global_user_id}_{rule.rule_id}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
-                    user_id=global_user_id,
-                    user_name=user.name,
-                    rule=rule,
-                    system_access={
-                        func1_system: {"function": rule.function_1.name},
-                        func2_system: {"function": rule.function_2.name}
-                    },
-                    risk_level=rule.risk_level,
-                    conflict_type=rule.conflict_type,
-                    systems_affected=[func1_system, func2_system] if func1_system != func2_system else [func1_system],
-                    compliance_impact=rule.compliance_frameworks
-                )
-
-                violations.append(violation)
-                self.violations[violation.violation_id] = violation
-
-                # Update summary
-                if rule.conflict_type == ConflictType.INTRA_SYSTEM:
-                    risk_summary["intra_system"] += 1
-                elif rule.conflict_type == ConflictType.CROSS_PLATFORM:
-                    risk_summary["cross_platform"] += 1
-                else:
-                    risk_summary["inter_system"] += 1
+        violations = self._build_violations(
+            user, self.get_rule_index().evaluate(access_by_system), datetime.utcnow()
+        )
+        risk_summary = self._summarize_conflict_types(violations)
 
         # Calculate aggregate risk
         total_violations = len(violations)
-        critical_count = sum(1 for v in violations if v.risk_level == "critical")
-        high_count = sum(1 for v in violations if v.risk_level == "high")
-
-        risk_score = min(100, (critical_count * 25) + (high_count * 15) + (total_violations * 5))
-
-        # Update user risk profile
-        user.aggregate_risk_score = risk_score
-        user.cross_system_violations = total_violations
+        risk_score = self._update_user_risk(user, violations)
 
         return {
             "user": {
@@ -570,71 +535,69 @@ class CrossSystemSoDEngine:
                 "aggregate_risk_score": risk_score,
                 "risk_level": self._score_to_level(risk_score)
             },
-            "violations": [
-                {
-                    "violation_id": v.violation_id,
-                    "rule_name": v.rule.name,
-                    "rule_description": v.rule.description,
-                    "risk_level": v.risk_level,
-                    "conflict_type": v.conflict_type.value,
-                    "systems_affected": v.systems_affected,
-                    "function_1": {
-                        "system": v.rule.function_1.system_id,
-                        "name": v.rule.function_1.name
-                    },
-                    "function_2": {
-                        "system": v.rule.function_2.system_id,
-                        "name": v.rule.function_2.name
-                    },
-                    "compliance_impact": v.compliance_impact,
-                    "business_process": v.rule.business_process
-                }
-                for v in violations
-            ],
+            "violations": [self._violation_to_dict(v) for v in violations],
             "recommendations": self._generate_recommendations(violations),
             "analyzed_at": datetime.utcnow().isoformat()
         }
 
     def analyze_enterprise_risk(
         self,
-        access_data: Dict[str, Dict[str, Dict[str, Any]]]
+        access_data: Dict[str, Dict[str, Dict[str, Any]]],
+        parallel: bool = False,
+        max_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Enterprise-wide cross-system risk analysis
 
         Args:
             access_data: Dict of global_user_id -> system_id -> access_data
+            parallel: Evaluate users across worker processes
+            max_workers: Worker processes for parallel mode (default: CPU count)
         """
-        all_violations = []
+        index = self.get_rule_index()
+        mapped = {
+            user_id: access for user_id, access in access_data.items()
+            if user_id in self.user_mappings
+        }
+        if parallel:
+            results = evaluate_parallel(index, mapped, max_workers=max_workers)
+        else:
+            results = index.evaluate_many(mapped.items())
+
+        detected_at = datetime.utcnow()
         user_summaries = []
+        by_conflict_type: Dict[str, int] = {}
+        by_compliance: Dict[str, int] = {}
+        critical_violations = []
+        cross_platform_violations = []
+        total_violations = 0
+
+        for global_user_id, hits in results:
+            user = self.user_mappings[global_user_id]
+            violations = self._build_violations(user, hits, detected_at)
+            risk_score = self._update_user_risk(user, violations)
+            total_violations += len(violations)
+            user_summaries.append({
+                "user_id": global_user_id,
+                "name": user.name,
+                "violation_count": len(violations),
+                "risk_score": risk_score
+            })
 
-        for global_user_id, access_by_system in access_data.items():
-            result = self.analyze_user_cross_system(global_user_id, access_by_system)
-            if "violations" in result:
-                all_violations.extend(result["violations"])
-                user_summaries.append({
-                    "user_id": global_user_id,
-                    "name": result["user"]["name"],
-                    "violation_count": result["analysis_summary"]["total_violations"],
-                    "risk_score": result["analysis_summary"]["aggregate_risk_score"]
-                })
+            for v in violations:
+                ct = v.conflict_type.value
+                by_conflict_type[ct] = by_conflict_type.get(ct, 0) + 1
+                for framework in v.compliance_impact:
+                    by_compliance[framework] = by_compliance.get(framework, 0) + 1
+                if v.risk_level == "critical":
+                    critical_violations.append(self._violation_to_dict(v))
+                if v.conflict_type == ConflictType.CROSS_PLATFORM:
+                    cross_platform_violations.append(self._violation_to_dict(v))
 
         # Aggregate statistics
         total_users = len(access_data)
         users_with_violations = len([u for u in user_summaries if u["violation_count"] > 0])
 
-        # Group violations by type
-        by_conflict_type = {}
-        for v in all_violations:
-            ct = v["conflict_type"]
-            by_conflict_type[ct] = by_conflict_type.get(ct, 0) + 1
-
-        # Group by compliance framework
-        by_compliance = {}
-        for v in all_violations:
-            for framework in v["compliance_impact"]:
-                by_compliance[framework] = by_compliance.get(framework, 0) + 1
-
         # Top risky users
         top_risky = sorted(user_summaries, key=lambda x: x["risk_score"], reverse=True)[:10]
 
@@ -643,17 +606,104 @@ class CrossSystemSoDEngine:
                 "total_users_analyzed": total_users,
                 "users_with_violations": users_with_violations,
                 "violation_rate": f"{(users_with_violations/total_users*100):.1f}%" if total_users > 0 else "0%",
-                "total_violations": len(all_violations),
+                "total_violations": total_violations,
                 "systems_analyzed": len(self.systems)
             },
             "violations_by_type": by_conflict_type,
             "violations_by_compliance": by_compliance,
             "top_risky_users": top_risky,
-            "critical_violations": [v for v in all_violations if v["risk_level"] == "critical"],
-            "cross_platform_violations": [v for v in all_violations if v["conflict_type"] == "cross_platform"],
+            "critical_violations": critical_violations,
+            "cross_platform_violations": cross_platform_violations,
             "analyzed_at": datetime.utcnow().isoformat()
         }
 
+    def get_rule_index(self) -> CompiledRuleIndex:
+        """Compiled rule index for the current catalog, mappings and rules"""
+        if self._rule_index is None:
+            self._rule_index = CompiledRuleIndex(
+                self.functions, self.mappings.values(), self.rules.values()
+            )
+        return self._rule_index
+
+    def _build_violations(
+        self,
+        user: CrossSystemUser,
+        hits: List[RuleHit],
+        detected_at: datetime
+    ) -> List[CrossSystemViolation]:
+        """Materialize rule hits as stored violations"""
+        stamp = detected_at.strftime('%Y%m%d%H%M%S')
+        violations = []
+        for rule_id, func1_system, func2_system in hits:
+            rule = self.rules.get(rule_id)
+            if rule is None:
+                continue
+            violation = CrossSystemViolation(
+                violation_id=f"CSV_{user.global_user_id}_{rule.rule_id}_{stamp}",
+                user_id=user.global_user_id,
+                user_name=user.name,
+                rule=rule,
+                system_access={
+                    func1_system: {"function": rule.function_1.name},
+                    func2_system: {"function": rule.function_2.name}
+                },
+                risk_level=rule.risk_level,
+                conflict_type=rule.conflict_type,
+                systems_affected=[func1_system, func2_system] if func1_system != func2_system else [func1_system],
+                compliance_impact=rule.compliance_frameworks,
+                detected_at=detected_at
+            )
+            violations.append(violation)
+            self.violations[violation.violation_id] = violation
+        return violations
+
+    def _summarize_conflict_types(self, violations: List[CrossSystemViolation]) -> Dict[str, int]:
+        risk_summary = {
+            "intra_system": 0,
+            "inter_system": 0,
+            "cross_platform": 0
+        }
+        for v in violations:
+            if v.rule.conflict_type == ConflictType.INTRA_SYSTEM:
+                risk_summary["intra_system"] += 1
+            elif v.rule.conflict_type == ConflictType.CROSS_PLATFORM:
+                risk_summary["cross_platform"] += 1
+            else:
+                risk_summary["inter_system"] += 1
+        return risk_summary
+
+    def _update_user_risk(self, user: CrossSystemUser, violations: List[CrossSystemViolation]) -> float:
+        """Score a user's violations and store it on the risk profile"""
+        total_violations = len(violations)
+        critical_count = sum(1 for v in violations if v.risk_level == "critical")
+        high_count = sum(1 for v in violations if v.risk_level == "high")
+
+        risk_score = min(100, (critical_count * 25) + (high_count * 15) + (total_violations * 5))
+
+        user.aggregate_risk_score = risk_score
+        user.cross_system_violations = total_violations
+        return risk_score
+
+    def _violation_to_dict(self, v: CrossSystemViolation) -> Dict[str, Any]:
+        return {
+            "violation_id": v.violation_id,
+            "rule_name": v.rule.name,
+            "rule_description": v.rule.description,
+            "risk_level": v.risk_level,
+            "conflict_type": v.conflict_type.value,
+            "systems_affected": v.systems_affected,
+            "function_1": {
+                "system": v.rule.function_1.system_id,
+                "name": v.rule.function_1.name
+            },
+            "function_2": {
+                "system": v.rule.function_2.system_id,
+                "name": v.rule.function_2.name
+            },
+            "compliance_impact": v.compliance_impact,
+            "business_process": v.rule.business_process
+        }
+
     def _user_has_function(
         self,
         access: Dict[str, Any],
@@ -661,7 +711,6 @@ class CrossSystemSoDEngine:
     ) -> bool:
         """Check if user's access includes a function"""
         user_transactions = set(access.get("transactions", []))
-        user_roles = set(access.get("roles", []))
         user_permissions = set(access.get("permissions", []))
 
         # Check transactions
@@ -682,17 +731,7 @@ class CrossSystemSoDEngine:
         rule_func: SystemFunction
     ) -> bool:
         """Check if a user's function matches a rule function"""
-        # Direct match
-        if user_func.function_id == rule_func.function_id and user_func.system_id == rule_func.system_id:
-            return True
-
-        # Check equivalents via mapping
-        equivalents = self.find_equivalent_functions(rule_func)
-        for equiv in equivalents:
-            if user_func.function_id == equiv.function_id and user_func.system_id == equiv.system_id:
-                return True
-
-        return False
+        return self.get_rule_index().are_equivalent(user_func, rule_func)
 
     def _score_to_level(self, score: float) -> str:
         """Convert risk score to level"""
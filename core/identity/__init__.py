@@ -29,6 +29,12 @@ from .ldap_connector import (
     LDAPServerType, LDAPAuthType, LDAPConnectionSecurity,
     LDAPOrganizationalUnit, LDAPPasswordPolicy, LDAPSyncResult,
     create_ad_connector, create_openldap_connector, create_azure_ad_ds_connector,
+    LDAPConnectionPool,
+)
+from .org_hierarchy import OrgHierarchyIndex
+from .ldap_sync import (
+    LDAPSearchBackend, Ldap3Backend, InMemoryDirectory,
+    GroupResolver, DirectorySyncEngine,
 )
 
 # SSO (SAML, OAuth, OIDC)
@@ -98,6 +104,13 @@ __all__ = [
     "create_ad_connector",
     "create_openldap_connector",
     "create_azure_ad_ds_connector",
+    "LDAPConnectionPool",
+    "LDAPSearchBackend",
+    "Ldap3Backend",
+    "InMemoryDirectory",
+    "GroupResolver",
+    "DirectorySyncEngine",
+    "OrgHierarchyIndex",
     # SAML
     "SAMLProvider",
     "SAMLServiceProvider",
@@ -30,16 +30,26 @@ Security:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Set, Tuple, Callable
+from typing import Dict, List, Optional, Any, Set, Tuple, Callable, Iterator, Deque, TYPE_CHECKING
 from datetime import datetime, timedelta
 from enum import Enum
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
 import ssl
 import hashlib
 import base64
 import uuid
 import re
 
+from .org_hierarchy import OrgHierarchyIndex
+
+if TYPE_CHECKING:
+    from .ldap_sync import LDAPSearchBackend
+    from .user_profile import UserProfileService
+
 
 # ============================================================
 # ENUMS AND CONSTANTS
@@ -113,6 +123,10 @@ AD_ATTRIBUTES = {
     "uac": "userAccountControl",
     "member_of": "memberOf",
     "direct_reports": "directReports",
+    "dn": "distinguishedName",
+    "member": "member",
+    "group_name": "cn",
+    "usn_changed": "uSNChanged",
 }
 
 # OpenLDAP attributes mapping
@@ -128,6 +142,9 @@ OPENLDAP_ATTRIBUTES = {
     "employee_id": "employeeNumber",
     "phone": "telephoneNumber",
     "member_of": "memberOf",
+    "dn": "entryDN",
+    "member": "member",
+    "group_name": "cn",
 }
 
 
@@ -270,6 +287,7 @@ class LDAPUser:
 
     # Group membership
     member_of: List[str] = field(default_factory=list)
+    nested_member_of: List[str] = field(default_factory=list)  # Inherited via group nesting
     direct_reports: List[str] = field(default_factory=list)
 
     # Raw attributes
@@ -287,10 +305,14 @@ class LDAPUser:
         match = re.search(r'CN=([^,]+)', self.manager_dn, re.IGNORECASE)
         return match.group(1) if match else None
 
-    def get_group_names(self) -> List[str]:
+    def get_effective_groups(self) -> List[str]:
+        """Direct and nested group DNs."""
+        return self.member_of + self.nested_member_of
+
+    def get_group_names(self, include_nested: bool = False) -> List[str]:
         """Extract group names from member_of DNs."""
         names = []
-        for dn in self.member_of:
+        for dn in (self.get_effective_groups() if include_nested else self.member_of):
             match = re.search(r'CN=([^,]+)', dn, re.IGNORECASE)
             if match:
                 names.append(match.group(1))
@@ -421,27 +443,128 @@ class LDAPPasswordPolicy:
 # LDAP CONNECTOR
 # ============================================================
 
-@dataclass
 class LDAPConnectionPool:
-    """Connection pool for LDAP connections."""
-    max_connections: int = 5
-    connections: List[Any] = field(default_factory=list)
-    available: List[Any] = field(default_factory=list)
-    in_use: List[Any] = field(default_factory=list)
-
-    def get_connection(self) -> Any:
-        """Get an available connection from pool."""
-        if self.available:
-            conn = self.available.pop()
-            self.in_use.append(conn)
-            return conn
-        return None
+    """
+    Thread-safe bounded connection pool for LDAP connections.
+
+    Connections are opened lazily through `factory` up to max_connections;
+    once all are checked out, get_connection() blocks until one is released
+    or the timeout expires.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 5,
+        factory: Optional[Callable[[], Any]] = None,
+        closer: Optional[Callable[[Any], None]] = None,
+        acquire_timeout: float = 30.0,
+    ):
+        self.max_connections = max_connections
+        self.factory = factory
+        self.closer = closer
+        self.acquire_timeout = acquire_timeout
+        self.connections: List[Any] = []
+        self.available: Deque[Any] = deque()
+        self.in_use: Set[int] = set()
+        self._cond = threading.Condition()
+
+    def get_connection(self, timeout: Optional[float] = None) -> Any:
+        """
+        Get a connection from the pool.
+
+        Returns None when no connection becomes available in time (or,
+        without a factory, when the pool is empty).
+        """
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        with self._cond:
+            while True:
+                if self.available:
+                    conn = self.available.pop()
+                    self.in_use.add(id(conn))
+                    return conn
+
+                if self.factory and len(self.connections) < self.max_connections:
+                    # Reserve the slot before opening outside the lock
+                    placeholder = object()
+                    self.connections.append(placeholder)
+                    break
+
+                if not self.factory and not self.in_use:
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+        try:
+            conn = self.factory()
+        except Exception:
+            with self._cond:
+                self.connections.remove(placeholder)
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.connections[self.connections.index(placeholder)] = conn
+            self.in_use.add(id(conn))
+        return conn
 
     def release_connection(self, conn: Any) -> None:
         """Return connection to pool."""
-        if conn in self.in_use:
-            self.in_use.remove(conn)
-            self.available.append(conn)
+        with self._cond:
+            if id(conn) in self.in_use:
+                self.in_use.discard(id(conn))
+                self.available.append(conn)
+                self._cond.notify()
+
+    def discard_connection(self, conn: Any) -> None:
+        """Drop a broken connection so a fresh one can be opened."""
+        with self._cond:
+            self.in_use.discard(id(conn))
+            self.connections = [c for c in self.connections if c is not conn]
+            self._cond.notify()
+        if self.closer:
+            try:
+                self.closer(conn)
+            except Exception:
+                pass
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Check out a connection for the duration of a with-block."""
+        conn = self.get_connection(timeout)
+        if conn is None:
+            raise ConnectionError("No LDAP connection available")
+        try:
+            yield conn
+        except Exception:
+            self.discard_connection(conn)
+            raise
+        else:
+            self.release_connection(conn)
+
+    def close_all(self) -> None:
+        """Close idle connections and forget the rest."""
+        with self._cond:
+            idle = list(self.available)
+            self.available.clear()
+            self.connections = [c for c in self.connections if id(c) in self.in_use]
+        if self.closer:
+            for conn in idle:
+                try:
+                    self.closer(conn)
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "max_connections": self.max_connections,
+                "open": len(self.connections),
+                "available": len(self.available),
+                "in_use": len(self.in_use),
+            }
 
 
 @dataclass
@@ -504,13 +627,28 @@ class LDAPConnector:
         connector.disconnect()
     """
 
-    def __init__(self, config: LDAPConfig):
+    def __init__(self, config: LDAPConfig, backend: Optional["LDAPSearchBackend"] = None):
+        """
+        Args:
+            config: Connection configuration
+            backend: Search backend (see core.identity.ldap_sync). Without
+                one the connector returns simulated data.
+        """
         self.config = config
+        self.backend = backend
         self.connection = None
-        self.pool = LDAPConnectionPool(max_connections=config.max_connections)
+        self.pool = LDAPConnectionPool(
+            max_connections=config.max_connections,
+            factory=backend.open if backend else None,
+            closer=backend.close if backend else None,
+            acquire_timeout=config.timeout_seconds,
+        )
         self.is_connected = False
         self._server = None
 
+        # Reporting structure, maintained by full and delta syncs
+        self.org_index = OrgHierarchyIndex()
+
         # Cache
         self._user_cache: Dict[str, LDAPUser] = {}
         self._group_cache: Dict[str, LDAPGroup] = {}
@@ -551,7 +689,14 @@ class LDAPConnector:
             #         auto_bind=True,
             #     )
 
-            # For now, simulate successful connection
+            if self.backend is not None:
+                # Open (and bind) the first pooled connection to validate settings
+                conn = self.pool.get_connection()
+                if conn is None:
+                    raise ConnectionError("connection pool exhausted")
+                self.pool.release_connection(conn)
+
+            # Without a backend, simulate successful connection
             self.is_connected = True
             return True
 
@@ -564,6 +709,7 @@ class LDAPConnector:
         if self.connection:
             # self.connection.unbind()
             pass
+        self.pool.close_all()
         self.is_connected = False
         self.connection = None
 
@@ -609,6 +755,17 @@ class LDAPConnector:
         if dn in self._user_cache:
             return self._user_cache[dn]
 
+        if self.backend is not None:
+            with self.pool.connection() as conn:
+                entries, _ = self.backend.search(
+                    conn, dn, "(objectClass=*)", self._user_attributes(), scope="base"
+                )
+            if entries:
+                user = self._parse_user(entries[0])
+                self._user_cache[dn] = user
+                return user
+            return None
+
         # In production:
         # self.connection.search(
         #     search_base=dn,
@@ -652,22 +809,37 @@ class LDAPConnector:
         search_filter = f"(&{self.config.user_filter}({attr}={employee_id}))"
         return None
 
-    def get_all_users(
+    def _user_attributes(self) -> List[str]:
+        """LDAP attribute names requested for user entries."""
+        names = [
+            "user_id", "username", "upn", "email", "first_name", "last_name",
+            "full_name", "title", "department", "company", "manager",
+            "employee_id", "phone", "mobile", "office", "street", "city",
+            "state", "country", "postal_code", "created", "modified",
+            "last_logon", "pwd_last_set", "account_expires", "uac",
+            "member_of", "direct_reports",
+        ]
+        return list(dict.fromkeys(self.config.get_attribute_name(n) for n in names))
+
+    def iter_users(
         self,
         base_dn: Optional[str] = None,
         include_disabled: bool = False,
         page_size: Optional[int] = None,
-    ) -> List[LDAPUser]:
+    ) -> Iterator[List[LDAPUser]]:
         """
-        Get all users from LDAP.
+        Stream users from LDAP one page at a time.
+
+        Uses the RFC 2696 paged results control, so only one page of
+        entries is held at a time regardless of directory size.
 
         Args:
             base_dn: Search base (defaults to users_base_dn)
             include_disabled: Include disabled accounts
-            page_size: Results per page (for paging)
+            page_size: Results per page (defaults to config.page_size)
 
-        Returns:
-            List of LDAPUser objects
+        Yields:
+            Lists of LDAPUser objects, one per page
         """
         if not self.is_connected:
             raise ConnectionError("Not connected to LDAP")
@@ -679,30 +851,53 @@ class LDAPConnector:
             # Add filter for enabled users only
             search_filter = f"(&{search_filter}(!(userAccountControl:1.2.840.113556.1.4.803:=2)))"
 
-        users = []
+        if self.backend is None:
+            # Simulated response
+            yield [
+                self._create_sample_user("john.doe"),
+                self._create_sample_user("jane.smith"),
+                self._create_sample_user("admin.user"),
+            ]
+            return
+
+        attributes = self._user_attributes()
+        page_size = page_size or self.config.page_size
+        cookie = None
+        while True:
+            # Hold a pooled connection only for the duration of one page
+            with self.pool.connection() as conn:
+                entries, cookie = self.backend.search(
+                    conn, search_base, search_filter, attributes,
+                    page_size=page_size, cookie=cookie,
+                )
+            if entries:
+                yield [self._parse_user(entry) for entry in entries]
+            if not cookie:
+                return
 
-        # In production with paging:
-        # from ldap3 import SUBTREE
-        # from ldap3.extend.microsoft.pagedSearch import PagedResultIterator
-        #
-        # page_size = page_size or self.config.page_size
-        # self.connection.search(
-        #     search_base=search_base,
-        #     search_filter=search_filter,
-        #     search_scope=SUBTREE,
-        #     attributes=list(AD_ATTRIBUTES.values()),
-        #     paged_size=page_size,
-        # )
-        #
-        # for entry in self.connection.entries:
-        #     users.append(self._parse_user(entry))
+    def get_all_users(
+        self,
+        base_dn: Optional[str] = None,
+        include_disabled: bool = False,
+        page_size: Optional[int] = None,
+    ) -> List[LDAPUser]:
+        """
+        Get all users from LDAP.
 
-        # Simulated response
-        users = [
-            self._create_sample_user("john.doe"),
-            self._create_sample_user("jane.smith"),
-            self._create_sample_user("admin.user"),
-        ]
+        Materialises iter_users(); prefer iter_users() or
+        DirectorySyncEngine for large directories.
+
+        Args:
+            base_dn: Search base (defaults to users_base_dn)
+            include_disabled: Include disabled accounts
+            page_size: Results per page (for paging)
+
+        Returns:
+            List of LDAPUser objects
+        """
+        users = []
+        for page in self.iter_users(base_dn, include_disabled, page_size):
+            users.extend(page)
 
         # Update cache
         for user in users:
@@ -730,6 +925,21 @@ class LDAPConnector:
 
     def get_user_manager_chain(self, username: str, max_depth: int = 10) -> List[LDAPUser]:
         """Get user's manager chain up to CEO."""
+        if username in self.org_index:
+            chain = []
+            for manager_id in self.org_index.get_manager_chain(username, max_depth):
+                info = self.org_index.get_info(manager_id)
+                chain.append(LDAPUser(
+                    username=manager_id,
+                    full_name=info.get("name", ""),
+                    email=info.get("email", ""),
+                    department=info.get("department", ""),
+                    title=info.get("title", ""),
+                    is_enabled=info.get("is_available", True),
+                    sync_source=self.config.name,
+                ))
+            return chain
+
         chain = []
         current_user = self.get_user_by_username(username)
 
@@ -745,6 +955,21 @@ class LDAPConnector:
 
     def get_user_direct_reports(self, username: str) -> List[LDAPUser]:
         """Get user's direct reports."""
+        if username in self.org_index:
+            reports = []
+            for report_id in self.org_index.get_direct_reports(username):
+                info = self.org_index.get_info(report_id)
+                reports.append(LDAPUser(
+                    username=report_id,
+                    full_name=info.get("name", ""),
+                    email=info.get("email", ""),
+                    department=info.get("department", ""),
+                    title=info.get("title", ""),
+                    is_enabled=info.get("is_available", True),
+                    sync_source=self.config.name,
+                ))
+            return reports
+
         user = self.get_user_by_username(username)
         if not user:
             return []
@@ -819,27 +1044,48 @@ class LDAPConnector:
         group_dn: str,
         resolve_nested: bool = True,
     ) -> Tuple[List[LDAPUser], List[LDAPGroup]]:
-        """Get group members (users and nested groups)."""
-        users = []
-        nested_groups = []
+        """
+        Get group members (users and nested groups).
 
-        group = self.get_group_by_dn(group_dn)
-        if not group:
+        Nested groups are expanded breadth-first with a visited set, so
+        cyclic nesting terminates and each group is read once.
+        """
+        if self.backend is not None:
+            from .ldap_sync import GroupResolver
+            resolver = GroupResolver(self)
+            user_dns, nested_groups = resolver.expand_group(group_dn, resolve_nested)
+            users = resolver.read_users(user_dns)
+            for user in users:
+                self._user_cache[user.dn] = user
             return users, nested_groups
 
-        for member_dn in group.members:
-            # Determine if member is user or group
-            if "OU=Users" in member_dn or "CN=Users" in member_dn:
-                user = self.get_user_by_dn(member_dn)
-                if user:
-                    users.append(user)
-            elif "OU=Groups" in member_dn:
-                nested_group = self.get_group_by_dn(member_dn)
-                if nested_group:
-                    nested_groups.append(nested_group)
-                    if resolve_nested:
-                        nested_users, _ = self.get_group_members(member_dn, resolve_nested=True)
-                        users.extend(nested_users)
+        users = []
+        nested_groups = []
+        visited = {group_dn}
+        frontier = [group_dn]
+
+        while frontier:
+            next_frontier = []
+            for dn in frontier:
+                group = self.get_group_by_dn(dn)
+                if not group:
+                    continue
+                for member_dn in group.members:
+                    if member_dn in visited:
+                        continue
+                    visited.add(member_dn)
+                    # Determine if member is user or group
+                    if "OU=Users" in member_dn or "CN=Users" in member_dn:
+                        user = self.get_user_by_dn(member_dn)
+                        if user:
+                            users.append(user)
+                    elif "OU=Groups" in member_dn:
+                        nested_group = self.get_group_by_dn(member_dn)
+                        if nested_group:
+                            nested_groups.append(nested_group)
+                            if resolve_nested:
+                                next_frontier.append(member_dn)
+            frontier = next_frontier
 
         return users, nested_groups
 
@@ -923,7 +1169,33 @@ class LDAPConnector:
         if self.config.server_type == LDAPServerType.ACTIVE_DIRECTORY:
             # Use uSNChanged attribute for delta sync
             search_filter = f"(&{self.config.user_filter}(uSNChanged>={usn}))"
-            # Execute search and track highest USN
+
+            if self.backend is not None:
+                usn_attr = self.config.get_attribute_name("usn_changed")
+                attributes = self._user_attributes() + [usn_attr]
+                changed: List[LDAPUser] = []
+                highest = usn
+                cookie = None
+                while True:
+                    with self.pool.connection() as conn:
+                        entries, cookie = self.backend.search(
+                            conn,
+                            self.config.users_base_dn or self.config.base_dn,
+                            search_filter,
+                            attributes,
+                            page_size=self.config.page_size,
+                            cookie=cookie,
+                        )
+                    for entry in entries:
+                        changed.append(self._parse_user(entry))
+                        for key, value in entry[1].items():
+                            if key.lower() == usn_attr.lower() and value:
+                                raw = value[0] if isinstance(value, list) else value
+                                highest = max(highest, int(raw))
+                    if not cookie:
+                        break
+                # Next delta starts after the highest change seen
+                return changed, highest + 1 if changed else usn
 
         return [], usn
 
@@ -949,6 +1221,7 @@ class LDAPConnector:
             # Sync users
             users = self.get_all_users()
             result.users_synced = len(users)
+            self.org_index.apply_ldap_users(users)
 
             # Sync groups
             groups = self.get_all_groups()
@@ -976,6 +1249,13 @@ class LDAPConnector:
             result.users_synced = len(changed_users)
             result.last_usn = new_usn
 
+            # Keep the reporting structure current
+            self.org_index.apply_ldap_users(changed_users)
+            for dn in self.get_deleted_users():
+                self.org_index.remove_dn(dn)
+            for user in changed_users:
+                self._user_cache[user.dn] = user
+
             # Update config
             self.config.last_sync_usn = new_usn
 
@@ -993,12 +1273,89 @@ class LDAPConnector:
     # ============================================================
 
     def _parse_user(self, entry: Any) -> LDAPUser:
-        """Parse LDAP entry into LDAPUser object."""
-        # In production, would parse ldap3 Entry object
-        user = LDAPUser()
-        # Map attributes
+        """Parse an LDAP entry (dn, attributes) into an LDAPUser object."""
+        dn, attrs = entry
+        lowered = {k.lower(): v for k, v in attrs.items()}
+
+        def values(name: str) -> List[Any]:
+            value = lowered.get(self.config.get_attribute_name(name).lower())
+            if value is None:
+                return []
+            return value if isinstance(value, list) else [value]
+
+        def first(name: str) -> Any:
+            found = values(name)
+            return found[0] if found else None
+
+        def text(name: str) -> str:
+            value = first(name)
+            if isinstance(value, bytes):
+                return value.decode("utf-8", errors="replace")
+            return str(value) if value is not None else ""
+
+        guid = first("user_id")
+        if isinstance(guid, bytes) and len(guid) == 16:
+            guid = str(uuid.UUID(bytes_le=guid))
+
+        user = LDAPUser(
+            dn=dn,
+            object_guid=str(guid).strip("{}") if guid else "",
+            username=text("username"),
+            upn=text("upn"),
+            email=text("email"),
+            first_name=text("first_name"),
+            last_name=text("last_name"),
+            full_name=text("full_name"),
+            title=text("title"),
+            department=text("department"),
+            company=text("company"),
+            manager_dn=text("manager"),
+            employee_id=text("employee_id"),
+            phone=text("phone"),
+            mobile=text("mobile"),
+            office=text("office"),
+            street=text("street"),
+            city=text("city"),
+            state=text("state"),
+            country=text("country"),
+            postal_code=text("postal_code"),
+            created=self._parse_timestamp(first("created")),
+            modified=self._parse_timestamp(first("modified")),
+            last_logon=self._parse_timestamp(first("last_logon")),
+            password_last_set=self._parse_timestamp(first("pwd_last_set")),
+            account_expires=self._parse_timestamp(first("account_expires")),
+            member_of=[str(v) for v in values("member_of")],
+            direct_reports=[str(v) for v in values("direct_reports")],
+            sync_source=self.config.name,
+        )
+
+        uac = first("uac")
+        if uac is not None:
+            flags = self._parse_uac_flags(int(uac))
+            user.is_enabled = not flags["disabled"]
+            user.is_locked = flags["locked"]
+            user.password_expired = flags["password_expired"]
+            user.password_never_expires = flags["password_never_expires"]
+        if user.account_expires and user.account_expires < datetime.now():
+            user.is_expired = True
+
         return user
 
+    def _parse_timestamp(self, value: Any) -> Optional[datetime]:
+        """Parse AD integer timestamps and LDAP GeneralizedTime values."""
+        if value is None or value == "":
+            return None
+        if isinstance(value, datetime):
+            return value.replace(tzinfo=None)
+        if isinstance(value, bytes):
+            value = value.decode("ascii", errors="ignore")
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+            return self._parse_ad_timestamp(int(value))
+        try:
+            return datetime.strptime(str(value)[:14], "%Y%m%d%H%M%S")
+        except ValueError:
+            return None
+
     def _parse_ad_timestamp(self, value: int) -> Optional[datetime]:
         """Convert AD timestamp (100-nanosecond intervals since 1601) to datetime."""
         if not value or value == 0 or value == 9223372036854775807:
@@ -1047,16 +1404,21 @@ class LDAPConnector:
         self,
         profile_service: "UserProfileService",
         include_disabled: bool = False,
+        batch_size: int = 500,
+        resolve_nested_groups: bool = True,
     ) -> Dict[str, Any]:
         """
         Sync all LDAP users to UserProfileService.
 
         This is the primary integration point for populating user profiles
-        from LDAP/Active Directory.
+        from LDAP/Active Directory. Users are streamed page by page and
+        written in batches (see DirectorySyncEngine).
 
         Args:
             profile_service: UserProfileService instance to sync to
             include_disabled: Include disabled accounts
+            batch_size: Users per bulk_sync_from_ldap call
+            resolve_nested_groups: Add groups inherited through nesting
 
         Returns:
             Sync statistics
@@ -1082,55 +1444,33 @@ class LDAPConnector:
             result = connector.sync_to_user_profile_service(profile_service)
             print(f"Synced {result['total']} users, {result['created']} new")
         """
-        result = {
-            "source": self.config.name,
-            "source_type": "ldap",
-            "started_at": datetime.now(),
-            "total": 0,
-            "created": 0,
-            "updated": 0,
-            "skipped": 0,
-            "errors": [],
-        }
+        from .ldap_sync import DirectorySyncEngine
 
         try:
             # Ensure connected
             if not self.is_connected:
                 self.connect()
-
-            # Get all users from LDAP
-            ldap_users = self.get_all_users(include_disabled=include_disabled)
-            result["total"] = len(ldap_users)
-
-            # Sync each user to profile service
-            for ldap_user in ldap_users:
-                try:
-                    # Check if user exists
-                    user_id = ldap_user.username
-                    is_new = profile_service.profiles.get(user_id) is None
-
-                    # Sync user
-                    profile_service.sync_from_ldap_user(ldap_user)
-
-                    if is_new:
-                        result["created"] += 1
-                    else:
-                        result["updated"] += 1
-
-                except Exception as e:
-                    result["errors"].append({
-                        "username": ldap_user.username,
-                        "error": str(e),
-                    })
-
-            result["completed_at"] = datetime.now()
-            result["success"] = True
-
         except Exception as e:
-            result["success"] = False
-            result["error"] = str(e)
+            return {
+                "source": self.config.name,
+                "source_type": "ldap",
+                "started_at": datetime.now(),
+                "total": 0,
+                "created": 0,
+                "updated": 0,
+                "skipped": 0,
+                "errors": [],
+                "success": False,
+                "error": str(e),
+            }
 
-        return result
+        engine = DirectorySyncEngine(
+            self,
+            profile_service,
+            batch_size=batch_size,
+            resolve_nested_groups=resolve_nested_groups,
+        )
+        return engine.run(include_disabled=include_disabled)
 
     def get_user_for_profile(self, username: str) -> Optional[Dict[str, Any]]:
         """
@@ -0,0 +1,678 @@
+# LDAP Directory Sync Engine
+# Paged, streaming user sync with batched nested-group resolution
+
+"""
+Streaming directory sync for large LDAP/AD forests.
+
+- LDAPSearchBackend: the wire-level search used by LDAPConnector. Ldap3Backend
+  talks to a real server (RFC 2696 paged results); InMemoryDirectory is an
+  in-process directory with the same paging and range-retrieval behaviour,
+  for development and tests.
+- GroupResolver: resolves nested group membership level by level, reading
+  a whole frontier of groups per query (OR of DNs) with a visited-set cache.
+  Large `member` attributes are followed through AD range retrieval.
+- DirectorySyncEngine: streams user pages from the connector (the next page
+  is fetched while the current one is processed) and pushes them into
+  UserProfileService in batches, building the connector's OrgHierarchyIndex
+  along the way.
+"""
+
+from typing import Dict, List, Optional, Any, Set, Tuple, Iterator, Iterable, Callable, FrozenSet
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import queue
+import re
+import threading
+
+from .ldap_connector import (
+    LDAPConfig, LDAPConnectionSecurity, LDAPAuthType, LDAPUser, LDAPGroup,
+)
+
+try:
+    import ldap3
+    HAS_LDAP3 = True
+except ImportError:
+    HAS_LDAP3 = False
+
+
+# LDAP entry as returned by backends: (dn, {attribute: [values]})
+LDAPEntry = Tuple[str, Dict[str, List[Any]]]
+
+PAGED_RESULTS_OID = "1.2.840.113556.1.4.319"
+MATCHING_RULE_BIT_AND = "1.2.840.113556.1.4.803"
+
+_RANGE_KEY_RE = re.compile(r"^(?P<attr>[^;]+);range=(?P<start>\d+)-(?P<end>\d+|\*)$", re.IGNORECASE)
+
+
+def escape_filter_value(value: str) -> str:
+    """Escape a value for use inside an LDAP filter (RFC 4515)."""
+    return (
+        value.replace("\\", "\\5c")
+        .replace("*", "\\2a")
+        .replace("(", "\\28")
+        .replace(")", "\\29")
+        .replace("\x00", "\\00")
+    )
+
+
+def get_attr(attrs: Dict[str, List[Any]], name: str) -> List[Any]:
+    """Case-insensitive attribute lookup, always returning a list."""
+    value = attrs.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, val in attrs.items():
+            if key.lower() == lowered:
+                value = val
+                break
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+class LDAPSearchBackend:
+    """Wire-level LDAP operations used by LDAPConnector."""
+
+    def open(self) -> Any:
+        """Open and bind a new connection."""
+        raise NotImplementedError
+
+    def close(self, conn: Any) -> None:
+        """Unbind a connection."""
+
+    def search(
+        self,
+        conn: Any,
+        search_base: str,
+        search_filter: str,
+        attributes: List[str],
+        scope: str = "subtree",
+        page_size: int = 0,
+        cookie: Optional[bytes] = None,
+    ) -> Tuple[List[LDAPEntry], Optional[bytes]]:
+        """
+        Run one search request.
+
+        With page_size > 0 the RFC 2696 paged results control is sent and the
+        returned cookie is passed back in to fetch the next page; a None
+        cookie means the result set is exhausted.
+        """
+        raise NotImplementedError
+
+
+class Ldap3Backend(LDAPSearchBackend):
+    """Backend using the ldap3 library."""
+
+    def __init__(self, config: LDAPConfig):
+        if not HAS_LDAP3:
+            raise ImportError("ldap3 is required for Ldap3Backend: pip install ldap3")
+        self.config = config
+        self._server = None
+
+    def _get_server(self):
+        if self._server is None:
+            tls = None
+            if self.config.security != LDAPConnectionSecurity.NONE:
+                import ssl
+                tls = ldap3.Tls(
+                    validate=ssl.CERT_REQUIRED if self.config.validate_certificate else ssl.CERT_NONE,
+                    ca_certs_file=self.config.ca_cert_path or None,
+                    local_certificate_file=self.config.client_cert_path or None,
+                    local_private_key_file=self.config.client_key_path or None,
+                )
+            hosts = [self.config.host] + list(self.config.backup_hosts)
+            servers = [
+                ldap3.Server(
+                    host,
+                    port=self.config.port,
+                    use_ssl=self.config.security == LDAPConnectionSecurity.LDAPS,
+                    tls=tls,
+                    connect_timeout=self.config.timeout_seconds,
+                )
+                for host in hosts
+            ]
+            self._server = servers[0] if len(servers) == 1 else ldap3.ServerPool(
+                servers, ldap3.ROUND_ROBIN, active=True, exhaust=True
+            )
+        return self._server
+
+    def open(self) -> Any:
+        kwargs: Dict[str, Any] = {
+            "receive_timeout": self.config.timeout_seconds,
+            "read_only": True,
+        }
+        if self.config.auth_type == LDAPAuthType.SIMPLE:
+            kwargs.update(user=self.config.bind_dn, password=self.config.bind_password)
+        elif self.config.auth_type == LDAPAuthType.SASL_GSSAPI:
+            kwargs.update(authentication=ldap3.SASL, sasl_mechanism=ldap3.KERBEROS)
+        elif self.config.auth_type == LDAPAuthType.SASL_EXTERNAL:
+            kwargs.update(authentication=ldap3.SASL, sasl_mechanism=ldap3.EXTERNAL)
+        elif self.config.auth_type == LDAPAuthType.ANONYMOUS:
+            kwargs.update(authentication=ldap3.ANONYMOUS)
+
+        conn = ldap3.Connection(self._get_server(), **kwargs)
+        if self.config.security == LDAPConnectionSecurity.START_TLS:
+            conn.open()
+            conn.start_tls()
+        if not conn.bind():
+            raise ConnectionError(f"LDAP bind failed: {conn.result.get('description')}")
+        return conn
+
+    def close(self, conn: Any) -> None:
+        conn.unbind()
+
+    def search(
+        self,
+        conn: Any,
+        search_base: str,
+        search_filter: str,
+        attributes: List[str],
+        scope: str = "subtree",
+        page_size: int = 0,
+        cookie: Optional[bytes] = None,
+    ) -> Tuple[List[LDAPEntry], Optional[bytes]]:
+        conn.search(
+            search_base=search_base,
+            search_filter=search_filter,
+            search_scope=ldap3.BASE if scope == "base" else ldap3.SUBTREE,
+            attributes=attributes,
+            paged_size=page_size or None,
+            paged_cookie=cookie,
+        )
+        entries = [
+            (e["dn"], dict(e["attributes"]))
+            for e in conn.response or []
+            if e.get("type") == "searchResEntry"
+        ]
+        next_cookie = None
+        if page_size:
+            control = conn.result.get("controls", {}).get(PAGED_RESULTS_OID, {})
+            next_cookie = control.get("value", {}).get("cookie") or None
+        return entries, next_cookie
+
+
+class InMemoryDirectory(LDAPSearchBackend):
+    """
+    In-process LDAP directory.
+
+    Supports the filter subset the connector emits (&, |, !, equality,
+    presence, substrings and the AD bitwise-AND matching rule), paged
+    results with opaque cookies, and AD-style range retrieval: multi-valued
+    attributes longer than max_values_per_attribute are returned as
+    `attr;range=0-N` chunks unless a range is requested explicitly.
+    """
+
+    def __init__(self, max_values_per_attribute: int = 1500):
+        self.max_values_per_attribute = max_values_per_attribute
+        self.entries: Dict[str, Dict[str, List[Any]]] = {}  # lower(dn) -> attrs
+        self._dns: Dict[str, str] = {}  # lower(dn) -> dn as added
+        self.search_count = 0
+        self._lock = threading.Lock()
+
+    def add(self, dn: str, attributes: Dict[str, Any]) -> None:
+        attrs = {k: (v if isinstance(v, list) else [v]) for k, v in attributes.items()}
+        attrs.setdefault("distinguishedName", [dn])
+        self.entries[dn.lower()] = attrs
+        self._dns[dn.lower()] = dn
+
+    def open(self) -> Any:
+        # Distinct handle per pooled connection; searches go to the shared entries
+        return object()
+
+    def search(
+        self,
+        conn: Any,
+        search_base: str,
+        search_filter: str,
+        attributes: List[str],
+        scope: str = "subtree",
+        page_size: int = 0,
+        cookie: Optional[bytes] = None,
+    ) -> Tuple[List[LDAPEntry], Optional[bytes]]:
+        with self._lock:
+            self.search_count += 1
+
+        predicate = _parse_filter(search_filter)
+        base = search_base.lower()
+        if scope == "base":
+            candidates = [base] if base in self.entries else []
+        else:
+            candidates = [
+                key for key in self.entries
+                if not base or key == base or key.endswith("," + base)
+            ]
+        matched = [key for key in candidates if predicate(self.entries[key])]
+
+        offset = int(cookie.decode()) if cookie else 0
+        if page_size:
+            page = matched[offset:offset + page_size]
+            end = offset + page_size
+            next_cookie = str(end).encode() if end < len(matched) else None
+        else:
+            page, next_cookie = matched, None
+
+        return [(self._dns[key], self._project(self.entries[key], attributes)) for key in page], next_cookie
+
+    def _project(self, attrs: Dict[str, List[Any]], requested: List[str]) -> Dict[str, List[Any]]:
+        result: Dict[str, List[Any]] = {}
+        for name in requested:
+            base_name, _, option = name.partition(";")
+            values = get_attr(attrs, base_name)
+            if option.lower().startswith("range="):
+                start, _, end = option[6:].partition("-")
+                lo = int(start)
+                hi = len(values) - 1 if end == "*" else min(int(end), len(values) - 1)
+                last = hi >= len(values) - 1
+                hi_label = "*" if last else str(hi)
+                result[f"{base_name};range={lo}-{hi_label}"] = values[lo:hi + 1]
+            elif len(values) > self.max_values_per_attribute:
+                hi = self.max_values_per_attribute - 1
+                result[f"{base_name};range=0-{hi}"] = values[:hi + 1]
+                result[base_name] = []
+            elif values:
+                result[base_name] = list(values)
+        return result
+
+
+def _parse_filter(text: str) -> Callable[[Dict[str, List[Any]]], bool]:
+    """Compile an RFC 4515 filter string into a predicate over attributes."""
+    text = re.sub(r"\s+(?=[()])|(?<=[()])\s+", "", text.strip())
+    predicate, pos = _parse_filter_at(text, 0)
+    if pos != len(text):
+        raise ValueError(f"Invalid LDAP filter: {text}")
+    return predicate
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\([0-9a-fA-F]{2})", lambda m: chr(int(m.group(1), 16)), value)
+
+
+def _parse_filter_at(text: str, pos: int) -> Tuple[Callable, int]:
+    if text[pos] != "(":
+        raise ValueError(f"Invalid LDAP filter at {pos}: {text}")
+    pos += 1
+    op = text[pos]
+
+    if op in "&|":
+        parts = []
+        pos += 1
+        while text[pos] == "(":
+            part, pos = _parse_filter_at(text, pos)
+            parts.append(part)
+        pred = (lambda a, p=parts: all(f(a) for f in p)) if op == "&" else \
+               (lambda a, p=parts: any(f(a) for f in p))
+        return pred, pos + 1
+
+    if op == "!":
+        inner, pos = _parse_filter_at(text, pos + 1)
+        return (lambda a: not inner(a)), pos + 1
+
+    end = text.index(")", pos)
+    while text[end - 1] == "\\":
+        end = text.index(")", end + 1)
+    item = text[pos:end]
+    attr, _, value = item.partition("=")
+
+    if ":" in attr:
+        attr, _, rule = attr.partition(":")
+        rule = rule.rstrip(":")
+        if rule == MATCHING_RULE_BIT_AND:
+            mask = int(value)
+            return (lambda a: any(int(v) & mask == mask for v in get_attr(a, attr))), end + 1
+        raise ValueError(f"Unsupported matching rule: {rule}")
+
+    if value == "*":
+        return (lambda a: bool(get_attr(a, attr))), end + 1
+
+    if "*" in value:
+        pattern = re.compile(
+            "^" + ".*".join(re.escape(_unescape(p)) for p in value.split("*")) + "$",
+            re.IGNORECASE,
+        )
+        return (lambda a: any(pattern.match(str(v)) for v in get_attr(a, attr))), end + 1
+
+    expected = _unescape(value).lower()
+    return (lambda a: any(str(v).lower() == expected for v in get_attr(a, attr))), end + 1
+
+
+# ============================================================
+# GROUP RESOLUTION
+# ============================================================
+
+class GroupResolver:
+    """
+    Batched nested-group resolution with a visited-set cache.
+
+    Group DNs are read a frontier at a time (one OR-of-DNs query per chunk,
+    chunks spread over the connection pool), so a 200k-user sync issues a
+    few queries per nesting level rather than one per group.
+    """
+
+    def __init__(self, connector: "LDAPConnector", chunk_size: int = 200, workers: int = 4):
+        self.connector = connector
+        self.chunk_size = chunk_size
+        self.workers = max(1, workers)
+        self._parents: Dict[str, Tuple[str, ...]] = {}  # lower(group dn) -> parent group DNs
+        self._closure: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    # ----- batched reads -----
+
+    def _dn_filter(self, dns: Iterable[str], object_filter: str) -> str:
+        dn_attr = self.connector.config.get_attribute_name("dn")
+        terms = "".join(f"({dn_attr}={escape_filter_value(dn)})" for dn in dns)
+        return f"(&{object_filter}(|{terms}))"
+
+    def _chunks(self, items: List[str]) -> List[List[str]]:
+        return [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+
+    def _map_chunks(self, fn: Callable[[List[str]], Any], items: List[str]) -> List[Any]:
+        chunks = self._chunks(items)
+        if len(chunks) <= 1 or self.workers == 1:
+            return [fn(c) for c in chunks]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+            return list(executor.map(fn, chunks))
+
+    def _read_entries(
+        self,
+        dns: List[str],
+        attributes: List[str],
+        search_base: str,
+        object_filter: str,
+    ) -> Dict[str, LDAPEntry]:
+        """Read many entries by DN, following range retrieval; keyed by lower(dn)."""
+        def read_chunk(chunk: List[str]) -> Dict[str, LDAPEntry]:
+            with self.connector.pool.connection() as conn:
+                entries, _ = self.connector.backend.search(
+                    conn, search_base, self._dn_filter(chunk, object_filter), attributes
+                )
+                found = {}
+                for dn, attrs in entries:
+                    for name in attributes:
+                        self._complete_range(conn, dn, name, attrs)
+                    found[dn.lower()] = (dn, attrs)
+            with self._lock:
+                self.queries += 1
+            return found
+
+        result: Dict[str, LDAPEntry] = {}
+        for part in self._map_chunks(read_chunk, dns):
+            result.update(part)
+        return result
+
+    def read_groups(self, dns: List[str], attributes: List[str]) -> Dict[str, Dict[str, List[Any]]]:
+        """Read many group entries; attributes keyed by lower(dn)."""
+        config = self.connector.config
+        entries = self._read_entries(
+            dns, attributes, config.groups_base_dn or config.base_dn, config.group_filter
+        )
+        return {key: attrs for key, (_, attrs) in entries.items()}
+
+    def read_users(self, dns: List[str]) -> List[LDAPUser]:
+        """Read many user entries by DN."""
+        config = self.connector.config
+        entries = self._read_entries(
+            dns, self.connector._user_attributes(),
+            config.users_base_dn or config.base_dn, config.user_filter,
+        )
+        return [self.connector._parse_user(entry) for entry in entries.values()]
+
+    def _complete_range(self, conn: Any, dn: str, name: str, attrs: Dict[str, List[Any]]) -> None:
+        """Replace `name;range=a-b` chunks with the full value list."""
+        ranged = None
+        for key in list(attrs):
+            match = _RANGE_KEY_RE.match(key)
+            if match and match.group("attr").lower() == name.lower():
+                ranged = match
+                values = list(attrs.pop(key))
+                break
+        if ranged is None:
+            return
+
+        end = ranged.group("end")
+        while end != "*":
+            start = int(end) + 1
+            entries, _ = self.connector.backend.search(
+                conn, dn, "(objectClass=*)", [f"{name};range={start}-*"], scope="base"
+            )
+            with self._lock:
+                self.queries += 1
+            end = "*"
+            for _, more in entries:
+                for key, chunk in more.items():
+                    match = _RANGE_KEY_RE.match(key)
+                    if match and match.group("attr").lower() == name.lower():
+                        values.extend(chunk)
+                        end = match.group("end")
+        attrs[name] = values
+
+    # ----- user memberships -----
+
+    def _load_parents(self, group_dns: Set[str]) -> None:
+        """Fetch memberOf for every unknown group, level by level."""
+        member_of = self.connector.config.get_attribute_name("member_of")
+        frontier = {dn for dn in group_dns if dn.lower() not in self._parents}
+        while frontier:
+            found = self.read_groups(sorted(frontier), [member_of])
+            next_frontier: Set[str] = set()
+            with self._lock:
+                for dn in frontier:
+                    parents = tuple(str(p) for p in get_attr(found.get(dn.lower(), {}), member_of))
+                    self._parents[dn.lower()] = parents
+                    next_frontier.update(p for p in parents if p.lower() not in self._parents)
+            frontier = next_frontier
+
+    def group_closure(self, group_dn: str) -> FrozenSet[str]:
+        """All groups a group belongs to, directly or transitively (cycle-safe)."""
+        key = group_dn.lower()
+        cached = self._closure.get(key)
+        if cached is not None:
+            return cached
+
+        visited: Set[str] = set()
+        result: Set[str] = set()
+        stack = [group_dn]
+        while stack:
+            dn = stack.pop()
+            if dn.lower() in visited:
+                continue
+            visited.add(dn.lower())
+            known = self._closure.get(dn.lower())
+            if known is not None and dn.lower() != key:
+                result.update(known)
+                continue
+            for parent in self._parents.get(dn.lower(), ()):
+                result.add(parent)
+                stack.append(parent)
+
+        closure = frozenset(result)
+        self._closure[key] = closure
+        return closure
+
+    def resolve_user_groups(self, users: List[LDAPUser]) -> None:
+        """Fill nested_member_of for a batch of users."""
+        direct: Set[str] = set()
+        for user in users:
+            direct.update(user.member_of)
+        if not direct:
+            return
+
+        self._load_parents(direct)
+        for user in users:
+            own = {dn.lower() for dn in user.member_of}
+            nested: Dict[str, str] = {}
+            for dn in user.member_of:
+                for parent in self.group_closure(dn):
+                    if parent.lower() not in own:
+                        nested.setdefault(parent.lower(), parent)
+            user.nested_member_of = list(nested.values())
+
+    # ----- group members -----
+
+    def expand_group(self, group_dn: str, resolve_nested: bool = True) -> Tuple[List[str], List[LDAPGroup]]:
+        """
+        Member DNs of a group: (user_dns, nested_groups).
+
+        Each nesting level is one batched read of the frontier's `member`
+        attribute plus one batched query to tell groups from users.
+        """
+        member_attr = self.connector.config.get_attribute_name("member")
+        name_attr = self.connector.config.get_attribute_name("group_name")
+        visited: Set[str] = {group_dn.lower()}
+        user_dns: Dict[str, str] = {}
+        groups: List[LDAPGroup] = []
+        frontier = [group_dn]
+
+        while frontier:
+            found = self.read_groups(frontier, [member_attr])
+            members: Dict[str, str] = {}
+            for attrs in found.values():
+                for dn in get_attr(attrs, member_attr):
+                    members.setdefault(str(dn).lower(), str(dn))
+
+            candidates = [dn for key, dn in members.items() if key not in visited]
+            group_entries = self.read_groups(candidates, [name_attr]) if candidates else {}
+
+            frontier = []
+            for key, dn in members.items():
+                if key in visited:
+                    continue
+                visited.add(key)
+                if key in group_entries:
+                    names = get_attr(group_entries[key], name_attr)
+                    groups.append(LDAPGroup(dn=dn, name=str(names[0]) if names else ""))
+                    if resolve_nested:
+                        frontier.append(dn)
+                else:
+                    user_dns[key] = dn
+            if not resolve_nested:
+                break
+
+        return list(user_dns.values()), groups
+
+
+# ============================================================
+# SYNC ENGINE
+# ============================================================
+
+class DirectorySyncEngine:
+    """
+    Streams users from an LDAPConnector into UserProfileService.
+
+    A producer thread pages through the directory and hands pages over a
+    small bounded queue, so at most `prefetch_pages` pages are held in
+    memory while the consumer resolves nested groups and writes profiles.
+    """
+
+    def __init__(
+        self,
+        connector: "LDAPConnector",
+        profile_service: Any,
+        batch_size: int = 500,
+        resolve_nested_groups: bool = True,
+        group_workers: int = 4,
+        prefetch_pages: int = 2,
+    ):
+        self.connector = connector
+        self.profile_service = profile_service
+        self.batch_size = batch_size
+        self.resolve_nested_groups = resolve_nested_groups
+        self.prefetch_pages = prefetch_pages
+        self.resolver = GroupResolver(connector, workers=group_workers)
+
+    def _prefetched(self, pages: Iterator[List[LDAPUser]]) -> Iterator[List[LDAPUser]]:
+        buffer: "queue.Queue" = queue.Queue(maxsize=self.prefetch_pages)
+        done = object()
+        stop = threading.Event()
+
+        def offer(item) -> bool:
+            # Never block for good: the consumer may have stopped iterating
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for page in pages:
+                    if not offer(page):
+                        return
+                offer(done)
+            except BaseException as e:
+                offer(e)
+
+        producer = threading.Thread(target=produce, name="ldap-sync-pager", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def iter_batches(self, include_disabled: bool = False) -> Iterator[List[LDAPUser]]:
+        """Yield users in batches of batch_size, with nested groups resolved."""
+        pending: List[LDAPUser] = []
+        pages = self.connector.iter_users(include_disabled=include_disabled)
+        for page in self._prefetched(pages):
+            pending.extend(page)
+            while len(pending) >= self.batch_size:
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                if self.resolve_nested_groups and self.connector.backend is not None:
+                    self.resolver.resolve_user_groups(batch)
+                yield batch
+        if pending:
+            if self.resolve_nested_groups and self.connector.backend is not None:
+                self.resolver.resolve_user_groups(pending)
+            yield pending
+
+    def run(
+        self,
+        include_disabled: bool = False,
+        on_batch: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Run a full sync; returns the same statistics as sync_to_user_profile_service."""
+        result: Dict[str, Any] = {
+            "source": self.connector.config.name,
+            "source_type": "ldap",
+            "started_at": datetime.now(),
+            "total": 0,
+            "created": 0,
+            "updated": 0,
+            "skipped": 0,
+            "batches": 0,
+            "errors": [],
+        }
+
+        try:
+            for batch in self.iter_batches(include_disabled=include_disabled):
+                self.connector.org_index.apply_ldap_users(batch)
+                stats = self.profile_service.bulk_sync_from_ldap(batch)
+                result["total"] += stats["total"]
+                result["created"] += stats["created"]
+                result["updated"] += stats["updated"]
+                result["errors"].extend(stats["errors"])
+                result["batches"] += 1
+                if on_batch:
+                    on_batch(result)
+
+            result["group_queries"] = self.resolver.queries
+            result["completed_at"] = datetime.now()
+            result["success"] = True
+
+        except Exception as e:
+            result["success"] = False
+            result["error"] = str(e)
+
+        return result
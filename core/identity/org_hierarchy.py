@@ -0,0 +1,405 @@
+# Org Hierarchy Index
+# Materialized manager/report structure for approver and reviewer lookups
+
+"""
+Org Hierarchy Index for GOVERNEX+.
+
+Holds the reporting structure in compact arrays so manager chains, report
+trees and "is X in Y's reporting line" checks do not walk the directory:
+
+- parent-pointer array (node -> manager node, -1 for roots)
+- Euler-tour intervals: Y manages X (directly or indirectly) iff
+  tin[Y] < tin[X] and tout[X] <= tout[Y], an O(1) check
+- ancestor lists precomputed up to `ancestor_depth` levels
+
+The index is populated by DirectorySyncEngine during a full sync and kept
+current by LDAPConnector.delta_sync. Structural changes mark the Euler
+tour stale; it is rebuilt (O(n)) on the next query that needs it, so a
+delta batch costs one rebuild rather than one per changed user.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Set
+from datetime import datetime
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class OrgHierarchyIndex:
+    """
+    Materialized org hierarchy keyed by user_id.
+
+    Managers may be given as user_ids or as directory DNs; DN references to
+    users not yet indexed are held and linked when that user arrives, so
+    users can be added in any order (e.g. page by page during a sync).
+    """
+
+    def __init__(self, ancestor_depth: int = 8):
+        self.ancestor_depth = ancestor_depth
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._dn_index: Dict[str, int] = {}
+        self._dns: List[str] = []
+        self._info: List[Dict[str, Any]] = []
+        self._alive = array("b")
+        self._parent = array("i")
+        self._children: List[Set[int]] = []
+
+        # Manager references (DN or user_id) not yet resolvable
+        self._pending: Dict[str, Set[int]] = {}
+        self._pending_ref: Dict[int, str] = {}
+
+        # Derived structures, rebuilt lazily
+        self._tin = array("i")
+        self._tout = array("i")
+        self._depth = array("i")
+        self._order = array("i")
+        self._ancestors: Dict[int, Tuple[int, ...]] = {}
+        self._dirty = True
+
+        self.last_updated: Optional[datetime] = None
+        self._stats = {"rebuilds": 0, "cycles_broken": 0}
+
+    # ============================================================
+    # MAINTENANCE
+    # ============================================================
+
+    def _node(self, user_id: str) -> int:
+        node = self._index.get(user_id)
+        if node is not None:
+            return node
+        node = len(self._ids)
+        self._ids.append(user_id)
+        self._index[user_id] = node
+        self._dns.append("")
+        self._info.append({})
+        self._alive.append(1)
+        self._parent.append(-1)
+        self._children.append(set())
+        return node
+
+    def _set_parent(self, node: int, parent: int) -> None:
+        old = self._parent[node]
+        if old == parent:
+            return
+        if old >= 0:
+            self._children[old].discard(node)
+        self._parent[node] = parent
+        if parent >= 0:
+            self._children[parent].add(node)
+        self._dirty = True
+
+    def _clear_pending(self, node: int) -> None:
+        ref = self._pending_ref.pop(node, None)
+        if ref is not None:
+            waiting = self._pending.get(ref)
+            if waiting:
+                waiting.discard(node)
+                if not waiting:
+                    del self._pending[ref]
+
+    def _resolve_ref(self, ref: str) -> Optional[int]:
+        node = self._dn_index.get(ref.lower())
+        if node is None:
+            node = self._index.get(ref)
+        if node is not None and self._alive[node]:
+            return node
+        return None
+
+    def upsert(
+        self,
+        user_id: str,
+        manager: Optional[str] = None,
+        dn: str = "",
+        info: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Add or update a user.
+
+        Args:
+            user_id: User identifier (username)
+            manager: Manager's user_id or DN (None/"" for no manager)
+            dn: The user's own directory DN, if any
+            info: Display data returned by lookups (name, email, ...)
+        """
+        with self._lock:
+            node = self._node(user_id)
+            self._alive[node] = 1
+            if info is not None:
+                self._info[node] = dict(info)
+
+            if dn and self._dns[node].lower() != dn.lower():
+                if self._dns[node]:
+                    self._dn_index.pop(self._dns[node].lower(), None)
+                self._dns[node] = dn
+                self._dn_index[dn.lower()] = node
+            # Link reports that were waiting for this user
+            for ref in ([dn.lower()] if dn else []) + [user_id]:
+                for child in self._pending.pop(ref, ()):
+                    self._pending_ref.pop(child, None)
+                    self._set_parent(child, node)
+
+            self._clear_pending(node)
+            parent = -1
+            if manager:
+                resolved = self._resolve_ref(manager)
+                if resolved is not None and resolved != node:
+                    parent = resolved
+                elif resolved is None:
+                    key = manager.lower() if "=" in manager else manager
+                    self._pending.setdefault(key, set()).add(node)
+                    self._pending_ref[node] = key
+            self._set_parent(node, parent)
+            self.last_updated = datetime.now()
+
+    def remove(self, user_id: str) -> bool:
+        """Remove a user; their direct reports become roots until re-pointed."""
+        with self._lock:
+            node = self._index.get(user_id)
+            if node is None or not self._alive[node]:
+                return False
+            self._clear_pending(node)
+            for child in list(self._children[node]):
+                self._set_parent(child, -1)
+                # Re-link automatically if the user comes back
+                key = self._dns[node].lower() if self._dns[node] else user_id
+                self._pending.setdefault(key, set()).add(child)
+                self._pending_ref[child] = key
+            self._set_parent(node, -1)
+            self._alive[node] = 0
+            self._dirty = True
+            self.last_updated = datetime.now()
+            return True
+
+    def remove_dn(self, dn: str) -> bool:
+        """Remove a user by directory DN."""
+        node = self._dn_index.get(dn.lower())
+        return self.remove(self._ids[node]) if node is not None else False
+
+    def apply_ldap_users(self, users: Iterable[Any]) -> int:
+        """Upsert LDAPUser objects (full sync pages or delta changes)."""
+        count = 0
+        with self._lock:
+            for user in users:
+                self.upsert(
+                    user.username,
+                    manager=user.manager_dn or None,
+                    dn=user.dn,
+                    info={
+                        "id": user.username,
+                        "name": user.full_name,
+                        "email": user.email,
+                        "department": user.department,
+                        "title": user.title,
+                        "is_available": user.is_enabled,
+                    },
+                )
+                count += 1
+        return count
+
+    def load(self, records: Iterable[Tuple[str, Optional[str], Dict[str, Any]]]) -> None:
+        """Bulk load (user_id, manager_id, info) records, replacing the index."""
+        with self._lock:
+            self._reset()
+            for user_id, manager_id, info in records:
+                self.upsert(user_id, manager=manager_id, info=info)
+
+    # ============================================================
+    # DERIVED STRUCTURES
+    # ============================================================
+
+    def _rebuild(self) -> None:
+        """Recompute Euler-tour intervals and depths (iterative DFS)."""
+        n = len(self._ids)
+        tin = array("i", [-1]) * n
+        tout = array("i", [-1]) * n
+        depth = array("i", [0]) * n
+        order = array("i")
+        clock = 0
+
+        def walk(root: int) -> None:
+            nonlocal clock
+            tin[root] = clock
+            clock += 1
+            order.append(root)
+            stack = [(root, iter(self._children[root]))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    tout[node] = clock
+                    stack.pop()
+                    continue
+                if tin[child] != -1:
+                    continue
+                tin[child] = clock
+                clock += 1
+                depth[child] = depth[node] + 1
+                order.append(child)
+                stack.append((child, iter(self._children[child])))
+
+        for node in range(n):
+            if self._alive[node] and self._parent[node] < 0:
+                walk(node)
+
+        # Nodes still unvisited sit on a manager cycle: break it at that node
+        for node in range(n):
+            if self._alive[node] and tin[node] == -1:
+                self._stats["cycles_broken"] += 1
+                logger.warning(f"Manager cycle detected at {self._ids[node]}; treating as root")
+                self._set_parent(node, -1)
+                walk(node)
+
+        self._tin, self._tout, self._depth, self._order = tin, tout, depth, order
+        self._ancestors.clear()
+        self._dirty = False
+        self._stats["rebuilds"] += 1
+
+    def _ensure_built(self) -> None:
+        if self._dirty:
+            with self._lock:
+                if self._dirty:
+                    self._rebuild()
+
+    def _ancestors_of(self, node: int) -> Tuple[int, ...]:
+        cached = self._ancestors.get(node)
+        if cached is not None:
+            return cached
+        chain: List[int] = []
+        current = self._parent[node]
+        while current >= 0 and len(chain) < self.ancestor_depth:
+            chain.append(current)
+            current = self._parent[current]
+        result = tuple(chain)
+        self._ancestors[node] = result
+        return result
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+
+    def __contains__(self, user_id: str) -> bool:
+        node = self._index.get(user_id)
+        return node is not None and bool(self._alive[node])
+
+    def __len__(self) -> int:
+        return sum(self._alive)
+
+    def get_info(self, user_id: str) -> Optional[Dict[str, Any]]:
+        node = self._index.get(user_id)
+        if node is None or not self._alive[node]:
+            return None
+        return {"id": user_id, **self._info[node]}
+
+    def get_manager(self, user_id: str) -> Optional[str]:
+        node = self._index.get(user_id)
+        if node is None or not self._alive[node] or self._parent[node] < 0:
+            return None
+        return self._ids[self._parent[node]]
+
+    def get_manager_chain(self, user_id: str, max_depth: int = 10) -> List[str]:
+        """Manager user_ids from the direct manager upwards."""
+        self._ensure_built()
+        node = self._index.get(user_id)
+        if node is None or not self._alive[node]:
+            return []
+        chain = list(self._ancestors_of(node)[:max_depth])
+        current = self._parent[chain[-1]] if chain and len(chain) == self.ancestor_depth else -1
+        while current >= 0 and len(chain) < max_depth:
+            chain.append(current)
+            current = self._parent[current]
+        return [self._ids[n] for n in chain]
+
+    def get_direct_reports(self, user_id: str) -> List[str]:
+        node = self._index.get(user_id)
+        if node is None or not self._alive[node]:
+            return []
+        return sorted(self._ids[c] for c in self._children[node])
+
+    def get_all_reports(self, user_id: str) -> List[str]:
+        """Everyone in the user's reporting tree (contiguous Euler-tour slice)."""
+        self._ensure_built()
+        node = self._index.get(user_id)
+        if node is None or not self._alive[node]:
+            return []
+        return [self._ids[n] for n in self._order[self._tin[node] + 1:self._tout[node]]]
+
+    def count_reports(self, user_id: str) -> int:
+        self._ensure_built()
+        node = self._index.get(user_id)
+        if node is None or not self._alive[node]:
+            return 0
+        return self._tout[node] - self._tin[node] - 1
+
+    def is_in_reporting_line(self, user_id: str, manager_id: str) -> bool:
+        """True if manager_id manages user_id directly or indirectly."""
+        self._ensure_built()
+        u = self._index.get(user_id)
+        m = self._index.get(manager_id)
+        if u is None or m is None or u == m or not self._alive[u] or not self._alive[m]:
+            return False
+        return self._tin[m] < self._tin[u] and self._tout[u] <= self._tout[m]
+
+    def get_depth(self, user_id: str) -> Optional[int]:
+        self._ensure_built()
+        node = self._index.get(user_id)
+        if node is None or not self._alive[node]:
+            return None
+        return self._depth[node]
+
+    def resolve_approvers(
+        self,
+        user_ids: Iterable[str],
+        level: int = 1,
+        skip_unavailable: bool = True,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Bulk approver resolution.
+
+        Returns user_id -> info of the manager `level` steps up the chain
+        (1 = line manager). With skip_unavailable, disabled managers are
+        passed over in favour of the next one up. Users with no such
+        manager map to None.
+        """
+        self._ensure_built()
+        result: Dict[str, Optional[Dict[str, Any]]] = {}
+        for user_id in user_ids:
+            if user_id in result:
+                continue
+            node = self._index.get(user_id)
+            if node is None or not self._alive[node]:
+                result[user_id] = None
+                continue
+
+            ancestors = self._ancestors_of(node)
+            steps = 0
+            found = None
+            idx = 0
+            current = ancestors[0] if ancestors else -1
+            while current >= 0:
+                if not skip_unavailable or self._info[current].get("is_available", True):
+                    steps += 1
+                    if steps == level:
+                        found = current
+                        break
+                idx += 1
+                current = ancestors[idx] if idx < len(ancestors) else self._parent[current]
+            result[user_id] = {"id": self._ids[found], **self._info[found]} if found is not None else None
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "users": len(self),
+            "roots": sum(1 for n in range(len(self._ids)) if self._alive[n] and self._parent[n] < 0),
+            "pending_manager_refs": len(self._pending_ref),
+            "ancestor_depth": self.ancestor_depth,
+            "stale": self._dirty,
+            "last_updated": self.last_updated.isoformat() if self.last_updated else None,
+            **self._stats,
+        }
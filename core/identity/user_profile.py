@@ -1216,11 +1216,12 @@ class UserProfileService:
             "lastLogonTimestamp": ldap_user.last_logon,
             "created": ldap_user.created,
             "whenCreated": ldap_user.created,
-            "member_of": ldap_user.member_of,
-            "memberOf": ldap_user.member_of,
+            # Effective groups include those inherited through nesting
+            "member_of": ldap_user.get_effective_groups() if hasattr(ldap_user, 'get_effective_groups') else ldap_user.member_of,
+            "memberOf": ldap_user.get_effective_groups() if hasattr(ldap_user, 'get_effective_groups') else ldap_user.member_of,
             "direct_reports": ldap_user.direct_reports,
             "directReports": ldap_user.direct_reports,
-            "group_names": ldap_user.get_group_names() if hasattr(ldap_user, 'get_group_names') else [],
+            "group_names": ldap_user.get_group_names(include_nested=True) if hasattr(ldap_user, 'get_group_names') else [],
             "manager_username": ldap_user.get_manager_username() if hasattr(ldap_user, 'get_manager_username') else None,
         }
 
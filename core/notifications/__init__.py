@@ -4,6 +4,23 @@ from .service import (
     NotificationChannel, NotificationTemplate, NotificationPreference
 )
 
+from .dispatcher import (
+    NotificationDispatcher,
+    DispatcherConfig,
+    DeliveryJob,
+    DeliveryError,
+    ChannelTransport,
+    SMTPTransport,
+    HTTPTransport,
+    InMemoryTransport
+)
+
+from .inbox import (
+    NotificationInbox,
+    InMemoryInbox,
+    DatabaseInbox
+)
+
 from .template_engine import (
     NotificationTemplateEngine,
     template_engine,
@@ -20,6 +37,19 @@ __all__ = [
     "NotificationChannel",
     "NotificationTemplate",
     "NotificationPreference",
+    # Dispatcher
+    "NotificationDispatcher",
+    "DispatcherConfig",
+    "DeliveryJob",
+    "DeliveryError",
+    "ChannelTransport",
+    "SMTPTransport",
+    "HTTPTransport",
+    "InMemoryTransport",
+    # Inbox
+    "NotificationInbox",
+    "InMemoryInbox",
+    "DatabaseInbox",
     # Template Engine
     "NotificationTemplateEngine",
     "template_engine",
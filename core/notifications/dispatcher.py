@@ -0,0 +1,682 @@
+"""
+Notification Dispatcher
+
+Asynchronous, multi-channel delivery for NotificationService:
+- Per-channel queues and worker pools
+- SMTP / HTTP connection reuse per worker
+- Batched webhook deliveries
+- Retry schedule with backoff
+- Per-recipient digest coalescing
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from datetime import datetime
+from email.message import EmailMessage
+from urllib.parse import urlsplit
+import heapq
+import http.client
+import itertools
+import json
+import logging
+import queue
+import smtplib
+import threading
+import time
+
+from .service import Notification, NotificationChannel, NotificationType
+
+logger = logging.getLogger(__name__)
+
+
+# Terminal and transient delivery states written to Notification.delivery_status
+STATUS_QUEUED = "queued"
+STATUS_DIGEST_PENDING = "digest_pending"
+STATUS_SENT = "sent"
+STATUS_SENT_DIGEST = "sent (digest)"
+_PENDING_PREFIXES = (STATUS_QUEUED, STATUS_DIGEST_PENDING, "retrying")
+
+
+class DeliveryError(Exception):
+    """Raised by a transport when a delivery attempt fails"""
+    pass
+
+
+@dataclass
+class DispatcherConfig:
+    """Configuration for the asynchronous notification dispatcher"""
+    # Worker pools
+    workers_per_channel: Dict[str, int] = field(default_factory=lambda: {
+        "email": 2,
+        "teams": 1,
+        "slack": 1,
+        "webhook": 2,
+        "sms": 1,
+    })
+    queue_size: int = 10000
+    # How long submit() waits for room on a full channel queue before
+    # failing the delivery (keeps request threads from stalling)
+    enqueue_timeout_seconds: float = 0.5
+
+    # Webhook batching
+    webhook_batch_size: int = 50
+    webhook_batch_wait_seconds: float = 0.5
+
+    # Retry schedule (seconds to wait before attempt 2, 3, ...)
+    retry_schedule_seconds: List[float] = field(default_factory=lambda: [5.0, 30.0, 120.0, 600.0])
+
+    # Digest coalescing
+    digest_enabled: bool = True
+    digest_window_seconds: float = 300.0
+    digest_min_items: int = 2
+    digest_channels: List[str] = field(default_factory=lambda: ["email", "teams", "slack"])
+    digest_types: List[NotificationType] = field(default_factory=lambda: [
+        NotificationType.REQUEST_PENDING_APPROVAL,
+        NotificationType.REQUEST_REMINDER,
+        NotificationType.CERT_REVIEW_ASSIGNED,
+        NotificationType.CERT_REMINDER,
+        NotificationType.RISK_MITIGATION_EXPIRING,
+    ])
+
+    # Transport endpoints
+    smtp_host: Optional[str] = None
+    smtp_port: int = 587
+    smtp_use_tls: bool = True
+    smtp_username: Optional[str] = None
+    smtp_password: Optional[str] = None
+    from_address: str = "grc-notifications@company.com"
+    from_name: str = "GRC Platform"
+    channel_urls: Dict[str, str] = field(default_factory=dict)  # channel -> URL
+    http_timeout_seconds: float = 10.0
+
+
+@dataclass
+class DeliveryJob:
+    """A unit of work for a channel worker (one notification or one digest)"""
+    channel: NotificationChannel
+    notifications: List[Notification]
+    digest: bool = False
+    attempt: int = 0
+    last_error: str = ""
+
+
+# =============================================================================
+# Transports
+# =============================================================================
+
+class ChannelTransport:
+    """
+    Base class for delivery transports.
+
+    A transport instance is owned by a single worker thread, so it may hold
+    a live connection between sends without locking.
+    """
+
+    def send(self, jobs: List[DeliveryJob]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LoggingTransport(ChannelTransport):
+    """Transport used when a channel has no endpoint configured"""
+
+    def __init__(self, channel: NotificationChannel):
+        self.channel = channel
+
+    def send(self, jobs: List[DeliveryJob]):
+        for job in jobs:
+            logger.info(
+                "[%s] %s -> %s",
+                self.channel.value.upper(),
+                render_subject(job),
+                job.notifications[0].recipient_email or job.notifications[0].recipient_user_id
+            )
+
+
+class InMemoryTransport(ChannelTransport):
+    """
+    Fake sink that records every delivered job.
+
+    Shared between workers, so appends are guarded by a lock. Set
+    ``fail_times`` to make the first N sends raise DeliveryError.
+    """
+
+    def __init__(self, fail_times: int = 0):
+        self.sent: List[DeliveryJob] = []
+        self.batches: List[List[DeliveryJob]] = []
+        self.fail_times = fail_times
+        self._lock = threading.Lock()
+
+    def send(self, jobs: List[DeliveryJob]):
+        with self._lock:
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                raise DeliveryError("simulated failure")
+            self.batches.append(list(jobs))
+            self.sent.extend(jobs)
+
+
+class SMTPTransport(ChannelTransport):
+    """SMTP transport that keeps one connection open per worker"""
+
+    def __init__(self, config: DispatcherConfig):
+        self.config = config
+        self._conn: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(
+            self.config.smtp_host,
+            self.config.smtp_port,
+            timeout=self.config.http_timeout_seconds
+        )
+        if self.config.smtp_use_tls:
+            conn.starttls()
+        if self.config.smtp_username:
+            conn.login(self.config.smtp_username, self.config.smtp_password or "")
+        return conn
+
+    def _build_message(self, job: DeliveryJob) -> EmailMessage:
+        first = job.notifications[0]
+        msg = EmailMessage()
+        msg["From"] = f"{self.config.from_name} <{self.config.from_address}>"
+        msg["To"] = first.recipient_email
+        msg["Subject"] = render_subject(job)
+        msg.set_content(render_body(job))
+        return msg
+
+    def send(self, jobs: List[DeliveryJob]):
+        for job in jobs:
+            msg = self._build_message(job)
+            try:
+                if self._conn is None:
+                    self._conn = self._connect()
+                self._conn.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server closed an idle connection - reconnect once
+                self._conn = self._connect()
+                self._conn.send_message(msg)
+            except (smtplib.SMTPException, OSError) as e:
+                self.close()
+                raise DeliveryError(str(e)) from e
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._conn = None
+
+
+class HTTPTransport(ChannelTransport):
+    """
+    JSON-over-HTTP transport for Teams, Slack and generic webhooks.
+
+    Keeps a persistent (keep-alive) connection to the endpoint host. Webhook
+    batches are POSTed as a single JSON array.
+    """
+
+    def __init__(self, channel: NotificationChannel, url: str, timeout: float = 10.0):
+        self.channel = channel
+        self.url = url
+        self.timeout = timeout
+        parts = urlsplit(url)
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path or "/"
+        if parts.query:
+            self._path = f"{self._path}?{parts.query}"
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self.timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def _payload(self, jobs: List[DeliveryJob]) -> Any:
+        if self.channel == NotificationChannel.WEBHOOK:
+            return [
+                {
+                    "digest": job.digest,
+                    "notifications": [n.to_dict() for n in job.notifications]
+                }
+                for job in jobs
+            ]
+        job = jobs[0]
+        if self.channel == NotificationChannel.TEAMS:
+            return {
+                "@type": "MessageCard",
+                "@context": "https://schema.org/extensions",
+                "summary": render_subject(job),
+                "title": render_subject(job),
+                "text": render_body(job)
+            }
+        return {"text": f"*{render_subject(job)}*\n{render_body(job)}"}
+
+    def _post(self, body: bytes):
+        if self._conn is None:
+            self._conn = self._connect()
+        self._conn.request(
+            "POST", self._path, body=body,
+            headers={"Content-Type": "application/json", "Connection": "keep-alive"}
+        )
+        response = self._conn.getresponse()
+        response.read()  # drain so the connection can be reused
+        if response.status >= 400:
+            raise DeliveryError(f"HTTP {response.status} from {self.url}")
+
+    def send(self, jobs: List[DeliveryJob]):
+        if self.channel == NotificationChannel.WEBHOOK:
+            bodies = [json.dumps(self._payload(jobs)).encode("utf-8")]
+        else:
+            bodies = [json.dumps(self._payload([job])).encode("utf-8") for job in jobs]
+
+        for body in bodies:
+            try:
+                self._post(body)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Stale keep-alive connection - reconnect once
+                self.close()
+                try:
+                    self._post(body)
+                except (http.client.HTTPException, OSError) as e:
+                    self.close()
+                    raise DeliveryError(str(e)) from e
+            except (http.client.HTTPException, OSError) as e:
+                self.close()
+                raise DeliveryError(str(e)) from e
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def render_subject(job: DeliveryJob) -> str:
+    """Subject line for a job (digest-aware)"""
+    if not job.digest:
+        return job.notifications[0].subject
+    return f"You have {len(job.notifications)} pending notifications"
+
+
+def render_body(job: DeliveryJob) -> str:
+    """Body for a job (digest-aware)"""
+    if not job.digest:
+        return job.notifications[0].body
+    first = job.notifications[0]
+    lines = [f"Hello {first.recipient_name or first.recipient_user_id},", ""]
+    lines.append(f"The following {len(job.notifications)} items need your attention:")
+    lines.append("")
+    for n in job.notifications:
+        line = f"- {n.subject}"
+        if n.action_url:
+            line += f" ({n.action_url})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# =============================================================================
+# Dispatcher
+# =============================================================================
+
+class NotificationDispatcher:
+    """
+    Asynchronous notification dispatcher.
+
+    NotificationService.send() hands notifications to submit(), which returns
+    immediately. Channel workers deliver in the background and write results
+    back to Notification.delivery_status; once every channel of a
+    notification has a final status, on_delivery_update is called with it
+    (NotificationService persists it to the inbox).
+    """
+
+    _WORKER_CHANNELS = [
+        NotificationChannel.EMAIL,
+        NotificationChannel.TEAMS,
+        NotificationChannel.SLACK,
+        NotificationChannel.WEBHOOK,
+        NotificationChannel.SMS,
+    ]
+
+    def __init__(
+        self,
+        config: Optional[DispatcherConfig] = None,
+        transport_factory: Optional[Callable[[NotificationChannel], ChannelTransport]] = None,
+        on_delivery_update: Optional[Callable[[Notification], None]] = None
+    ):
+        self.config = config or DispatcherConfig()
+        self.transport_factory = transport_factory or self._default_transport
+        self.on_delivery_update = on_delivery_update
+
+        self._queues: Dict[NotificationChannel, queue.Queue] = {
+            channel: queue.Queue(maxsize=self.config.queue_size)
+            for channel in self._WORKER_CHANNELS
+        }
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        self._lock = threading.Lock()
+
+        # Retry scheduling: heap of (due_time, seq, job)
+        self._retry_heap: List[Tuple[float, int, DeliveryJob]] = []
+        self._retry_cond = threading.Condition()
+        self._seq = itertools.count()
+
+        # Digest buffers: (recipient_user_id, channel) -> (opened_at, [notifications])
+        self._digests: Dict[Tuple[str, NotificationChannel], Tuple[float, List[Notification]]] = {}
+        self._digest_types = set(self.config.digest_types)
+        self._digest_channels = {NotificationChannel(c) for c in self.config.digest_channels}
+
+        self._in_flight = 0
+        self._idle = threading.Condition(self._lock)
+
+        self._metrics = {
+            "submitted": 0,
+            "delivered": 0,
+            "digests_sent": 0,
+            "digested_notifications": 0,
+            "webhook_batches": 0,
+            "retries": 0,
+            "failed": 0,
+            "dropped": 0,
+        }
+
+    def _default_transport(self, channel: NotificationChannel) -> ChannelTransport:
+        if channel == NotificationChannel.EMAIL and self.config.smtp_host:
+            return SMTPTransport(self.config)
+        url = self.config.channel_urls.get(channel.value)
+        if url:
+            return HTTPTransport(channel, url, timeout=self.config.http_timeout_seconds)
+        return LoggingTransport(channel)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start channel workers, the retry scheduler and the digest flusher"""
+        if self._running:
+            return
+        self._running = True
+
+        for channel in self._WORKER_CHANNELS:
+            count = self.config.workers_per_channel.get(channel.value, 1)
+            for i in range(max(count, 1)):
+                t = threading.Thread(
+                    target=self._worker_loop,
+                    args=(channel,),
+                    name=f"notify-{channel.value}-{i}",
+                    daemon=True
+                )
+                t.start()
+                self._workers.append(t)
+
+        for target, name in ((self._retry_loop, "notify-retry"), (self._digest_loop, "notify-digest")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._workers.append(t)
+
+        logger.info("Notification dispatcher started with %d threads", len(self._workers))
+
+    def stop(self, drain: bool = True, timeout: float = 30.0):
+        """Stop the dispatcher, optionally flushing digests and draining queues"""
+        if drain:
+            self.flush_digests()
+            self.wait_idle(timeout=timeout)
+        self._running = False
+        with self._retry_cond:
+            self._retry_cond.notify_all()
+        for t in self._workers:
+            t.join(timeout=1.0)
+        self._workers = []
+        logger.info("Notification dispatcher stopped")
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no jobs are queued, in flight or awaiting retry"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._in_flight > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    # -------------------------------------------------------------------------
+    # Submission
+    # -------------------------------------------------------------------------
+
+    def submit(self, notification: Notification):
+        """Queue a notification for delivery on all of its channels"""
+        with self._lock:
+            self._metrics["submitted"] += 1
+
+        for channel in notification.channels:
+            if channel == NotificationChannel.IN_APP:
+                # Already stored by the service
+                notification.delivery_status[channel.value] = STATUS_SENT
+                continue
+            if channel not in self._queues:
+                notification.delivery_status[channel.value] = "failed: unsupported channel"
+                continue
+
+            if self._is_digestible(notification, channel):
+                notification.delivery_status[channel.value] = STATUS_DIGEST_PENDING
+                self._add_to_digest(notification, channel)
+            else:
+                notification.delivery_status[channel.value] = STATUS_QUEUED
+                self._enqueue(DeliveryJob(channel=channel, notifications=[notification]))
+
+        self._update_sent_flag(notification)
+
+    def _is_digestible(self, notification: Notification, channel: NotificationChannel) -> bool:
+        return (
+            self.config.digest_enabled
+            and channel in self._digest_channels
+            and notification.notification_type in self._digest_types
+            and bool(notification.recipient_user_id)
+        )
+
+    def _enqueue(self, job: DeliveryJob):
+        with self._lock:
+            self._in_flight += 1
+        try:
+            self._queues[job.channel].put(job, timeout=self.config.enqueue_timeout_seconds)
+        except queue.Full:
+            self._drop(job, "queue full")
+
+    def _drop(self, job: DeliveryJob, reason: str):
+        """Fail a job that could not be queued"""
+        logger.warning(
+            "Dropping %d notification(s) on %s: %s",
+            len(job.notifications), job.channel.value, reason
+        )
+        for n in job.notifications:
+            n.delivery_status[job.channel.value] = f"failed: {reason}"
+            self._update_sent_flag(n)
+        with self._idle:
+            self._in_flight -= 1
+            self._metrics["dropped"] += len(job.notifications)
+            self._idle.notify_all()
+
+    # -------------------------------------------------------------------------
+    # Digests
+    # -------------------------------------------------------------------------
+
+    def _add_to_digest(self, notification: Notification, channel: NotificationChannel):
+        key = (notification.recipient_user_id, channel)
+        with self._lock:
+            self._in_flight += 1
+            opened_at, items = self._digests.get(key, (time.monotonic(), []))
+            items.append(notification)
+            self._digests[key] = (opened_at, items)
+
+    def flush_digests(self, force: bool = True):
+        """Emit buffered digests (all of them, or only those whose window elapsed)"""
+        now = time.monotonic()
+        ready: List[Tuple[NotificationChannel, List[Notification]]] = []
+        with self._lock:
+            for key in list(self._digests):
+                opened_at, items = self._digests[key]
+                if force or now - opened_at >= self.config.digest_window_seconds:
+                    del self._digests[key]
+                    # Buffered items are re-counted by _enqueue below
+                    self._in_flight -= len(items)
+                    ready.append((key[1], items))
+
+        for channel, items in ready:
+            if len(items) >= self.config.digest_min_items:
+                for n in items:
+                    n.delivery_status[channel.value] = STATUS_QUEUED
+                self._enqueue(DeliveryJob(channel=channel, notifications=items, digest=True))
+            else:
+                for n in items:
+                    n.delivery_status[channel.value] = STATUS_QUEUED
+                    self._enqueue(DeliveryJob(channel=channel, notifications=[n]))
+
+        with self._idle:
+            self._idle.notify_all()
+
+    def _digest_loop(self):
+        interval = min(1.0, max(self.config.digest_window_seconds / 10, 0.05))
+        while self._running:
+            time.sleep(interval)
+            self.flush_digests(force=False)
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    def _take_batch(self, channel: NotificationChannel, first: DeliveryJob) -> List[DeliveryJob]:
+        """Coalesce queued webhook jobs into a single POST"""
+        batch = [first]
+        if channel != NotificationChannel.WEBHOOK:
+            return batch
+        deadline = time.monotonic() + self.config.webhook_batch_wait_seconds
+        q = self._queues[channel]
+        while len(batch) < self.config.webhook_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker_loop(self, channel: NotificationChannel):
+        transport = self.transport_factory(channel)
+        q = self._queues[channel]
+        try:
+            while self._running:
+                try:
+                    first = q.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                batch = self._take_batch(channel, first)
+                try:
+                    transport.send(batch)
+                except Exception as e:
+                    for job in batch:
+                        self._handle_failure(job, str(e))
+                else:
+                    self._handle_success(channel, batch)
+        finally:
+            transport.close()
+
+    def _handle_success(self, channel: NotificationChannel, batch: List[DeliveryJob]):
+        for job in batch:
+            status = STATUS_SENT_DIGEST if job.digest else STATUS_SENT
+            for n in job.notifications:
+                n.delivery_status[channel.value] = status
+                self._update_sent_flag(n)
+
+        with self._idle:
+            self._in_flight -= len(batch)
+            self._metrics["delivered"] += sum(len(j.notifications) for j in batch)
+            digests = [j for j in batch if j.digest]
+            self._metrics["digests_sent"] += len(digests)
+            self._metrics["digested_notifications"] += sum(len(j.notifications) for j in digests)
+            if channel == NotificationChannel.WEBHOOK:
+                self._metrics["webhook_batches"] += 1
+            self._idle.notify_all()
+
+    def _handle_failure(self, job: DeliveryJob, error: str):
+        job.attempt += 1
+        job.last_error = error
+        schedule = self.config.retry_schedule_seconds
+
+        if job.attempt <= len(schedule):
+            for n in job.notifications:
+                n.delivery_status[job.channel.value] = f"retrying (attempt {job.attempt + 1}): {error}"
+            with self._retry_cond:
+                due = time.monotonic() + schedule[job.attempt - 1]
+                heapq.heappush(self._retry_heap, (due, next(self._seq), job))
+                self._retry_cond.notify()
+            with self._lock:
+                self._metrics["retries"] += 1
+            return
+
+        logger.warning(
+            "Notification delivery on %s failed after %d attempts: %s",
+            job.channel.value, job.attempt, error
+        )
+        for n in job.notifications:
+            n.delivery_status[job.channel.value] = f"failed: {error}"
+            self._update_sent_flag(n)
+        with self._idle:
+            self._in_flight -= 1
+            self._metrics["failed"] += len(job.notifications)
+            self._idle.notify_all()
+
+    def _retry_loop(self):
+        while self._running:
+            with self._retry_cond:
+                if not self._retry_heap:
+                    self._retry_cond.wait(0.5)
+                    continue
+                due, _, job = self._retry_heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._retry_cond.wait(min(delay, 0.5))
+                    continue
+                heapq.heappop(self._retry_heap)
+            # Still counted as in flight; put straight back on the channel queue
+            self._queues[job.channel].put(job)
+
+    def _update_sent_flag(self, notification: Notification):
+        """
+        Once every channel has a terminal status, mark the notification sent
+        if at least one of them delivered it and report the final status
+        """
+        if notification.is_sent:
+            return
+        for status in notification.delivery_status.values():
+            if status.startswith(_PENDING_PREFIXES):
+                return
+        if any(s in (STATUS_SENT, STATUS_SENT_DIGEST) for s in notification.delivery_status.values()):
+            notification.is_sent = True
+            notification.sent_at = datetime.utcnow()
+        if self.on_delivery_update is not None:
+            try:
+                self.on_delivery_update(notification)
+            except Exception:
+                logger.exception("Could not record delivery status of %s", notification.notification_id)
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Dispatcher metrics and queue depths"""
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["in_flight"] = self._in_flight
+            stats["pending_digests"] = sum(len(items) for _, items in self._digests.values())
+        with self._retry_cond:
+            stats["awaiting_retry"] = len(self._retry_heap)
+        stats["queue_depths"] = {c.value: q.qsize() for c, q in self._queues.items()}
+        stats["running"] = self._running
+        return stats
@@ -0,0 +1,323 @@
+"""
+Notification Inbox Stores
+
+Backing stores for the in-app inbox used by NotificationService:
+- InMemoryInbox: process-local, with maintained unread counters
+- DatabaseInbox: persistent, keyset-paginated, backed by NotificationRepository
+
+Both keep per-user unread counters up to date on every write, so the
+unread badge polled by the frontend and mobile clients is O(1).
+
+Timestamps are naive UTC (datetime.utcnow), like the database columns.
+"""
+
+from typing import List, Optional, Dict, Tuple, Callable, ContextManager, Any
+from datetime import datetime, timedelta
+import threading
+
+from .service import Notification, NotificationType, NotificationChannel, NotificationPriority
+
+
+class NotificationInbox:
+    """Interface implemented by inbox stores"""
+
+    def add(self, notification: Notification):
+        raise NotImplementedError
+
+    def get(self, notification_id: str) -> Optional[Notification]:
+        raise NotImplementedError
+
+    def list_page(
+        self,
+        user_id: str,
+        unread_only: bool = False,
+        notification_type: Optional[NotificationType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Notification], Optional[str]]:
+        raise NotImplementedError
+
+    def unread_count(self, user_id: str) -> int:
+        raise NotImplementedError
+
+    def mark_as_read(self, notification_id: str) -> bool:
+        raise NotImplementedError
+
+    def mark_all_as_read(self, user_id: str) -> int:
+        raise NotImplementedError
+
+    def update_delivery(self, notification: Notification):
+        """Record the notification's channel delivery results"""
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Total and unread notifications, with counts by type"""
+        raise NotImplementedError
+
+    def compact(self, read_retention_days: int = 90) -> int:
+        raise NotImplementedError
+
+
+class InMemoryInbox(NotificationInbox):
+    """
+    Process-local inbox.
+
+    Cursors are the notification_id of the last item on the previous page.
+    """
+
+    def __init__(self):
+        self.notifications: Dict[str, Notification] = {}
+        self.user_notifications: Dict[str, List[str]] = {}  # user_id -> ids, oldest first
+        self._unread: Dict[str, int] = {}
+        self._positions: Dict[str, int] = {}  # notification_id -> index in user list
+        self._lock = threading.Lock()
+
+    def add(self, notification: Notification):
+        user_id = notification.recipient_user_id
+        with self._lock:
+            self.notifications[notification.notification_id] = notification
+            ids = self.user_notifications.setdefault(user_id, [])
+            self._positions[notification.notification_id] = len(ids)
+            ids.append(notification.notification_id)
+            if not notification.is_read:
+                self._unread[user_id] = self._unread.get(user_id, 0) + 1
+
+    def get(self, notification_id: str) -> Optional[Notification]:
+        return self.notifications.get(notification_id)
+
+    def list_page(
+        self,
+        user_id: str,
+        unread_only: bool = False,
+        notification_type: Optional[NotificationType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Notification], Optional[str]]:
+        ids = self.user_notifications.get(user_id, [])
+        start = len(ids) - 1
+        if cursor:
+            if cursor not in self._positions:
+                raise ValueError(f"Invalid cursor: {cursor}")
+            start = self._positions[cursor] - 1
+
+        page: List[Notification] = []
+        idx = start
+        while idx >= 0:
+            n = self.notifications.get(ids[idx])
+            idx -= 1
+            if not n:
+                continue
+            if unread_only and n.is_read:
+                continue
+            if notification_type and n.notification_type != notification_type:
+                continue
+            page.append(n)
+            if len(page) >= limit:
+                break
+
+        next_cursor = page[-1].notification_id if len(page) >= limit and idx >= 0 else None
+        return page, next_cursor
+
+    def unread_count(self, user_id: str) -> int:
+        return self._unread.get(user_id, 0)
+
+    def mark_as_read(self, notification_id: str) -> bool:
+        with self._lock:
+            n = self.notifications.get(notification_id)
+            if not n:
+                return False
+            if not n.is_read:
+                n.is_read = True
+                n.read_at = datetime.utcnow()
+                self._unread[n.recipient_user_id] = max(self._unread.get(n.recipient_user_id, 0) - 1, 0)
+            return True
+
+    def mark_all_as_read(self, user_id: str) -> int:
+        with self._lock:
+            if not self._unread.get(user_id):
+                return 0
+            now = datetime.utcnow()
+            count = 0
+            for nid in self.user_notifications.get(user_id, []):
+                n = self.notifications.get(nid)
+                if n and not n.is_read:
+                    n.is_read = True
+                    n.read_at = now
+                    count += 1
+            self._unread[user_id] = 0
+            return count
+
+    def update_delivery(self, notification: Notification):
+        # The stored object is the one the dispatcher updates
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            notifications = list(self.notifications.values())
+        by_type: Dict[str, int] = {}
+        for n in notifications:
+            by_type[n.notification_type.value] = by_type.get(n.notification_type.value, 0) + 1
+        return {
+            "total_notifications": len(notifications),
+            "unread_count": sum(self._unread.values()),
+            "by_type": by_type,
+        }
+
+    def compact(self, read_retention_days: int = 90) -> int:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(days=read_retention_days)
+        removed = 0
+        with self._lock:
+            for user_id, ids in self.user_notifications.items():
+                kept: List[str] = []
+                for nid in ids:
+                    n = self.notifications.get(nid)
+                    expired = n is not None and n.expires_at is not None and n.expires_at < now
+                    stale = n is not None and n.is_read and n.read_at is not None and n.read_at < cutoff
+                    if n is None or expired or stale:
+                        if n is not None:
+                            if not n.is_read:
+                                self._unread[user_id] = max(self._unread.get(user_id, 0) - 1, 0)
+                            del self.notifications[nid]
+                            removed += 1
+                        self._positions.pop(nid, None)
+                        continue
+                    self._positions[nid] = len(kept)
+                    kept.append(nid)
+                ids[:] = kept
+        return removed
+
+
+class DatabaseInbox(NotificationInbox):
+    """
+    Persistent inbox backed by the inbox_notifications / inbox_counters tables.
+
+    Args:
+        tenant_id: Tenant the inbox belongs to
+        session_scope: Context-manager factory yielding a Session; defaults
+            to the global DatabaseManager.session_scope
+    """
+
+    def __init__(
+        self,
+        tenant_id: str = "tenant_default",
+        session_scope: Optional[Callable[[], ContextManager]] = None
+    ):
+        self.tenant_id = tenant_id
+        self._session_scope = session_scope
+
+    def _scope(self):
+        if self._session_scope is not None:
+            return self._session_scope()
+        from db import database
+        return database.db_manager.session_scope()
+
+    @staticmethod
+    def _repo(session):
+        from repositories.notification_repository import NotificationRepository
+        return NotificationRepository(session)
+
+    @staticmethod
+    def _to_notification(row) -> Notification:
+        return Notification(
+            notification_id=row.notification_id,
+            notification_type=NotificationType(row.notification_type),
+            recipient_user_id=row.recipient_user_id,
+            recipient_email=row.recipient_email or "",
+            subject=row.subject,
+            body=row.body or "",
+            context=row.context or {},
+            reference_type=row.reference_type or "",
+            reference_id=row.reference_id or "",
+            channels=[NotificationChannel.IN_APP],
+            priority=NotificationPriority(row.priority or "normal"),
+            is_read=row.is_read,
+            read_at=row.read_at,
+            is_sent=row.is_sent,
+            sent_at=row.sent_at,
+            delivery_status=dict(row.delivery_status or {}),
+            created_at=row.created_at,
+            expires_at=row.expires_at,
+            action_url=row.action_url,
+            action_label=row.action_label
+        )
+
+    def add(self, notification: Notification):
+        with self._scope() as session:
+            self._repo(session).add_notification(self.tenant_id, {
+                "notification_id": notification.notification_id,
+                "notification_type": notification.notification_type.value,
+                "recipient_user_id": notification.recipient_user_id,
+                "recipient_email": notification.recipient_email,
+                "subject": notification.subject,
+                "body": notification.body,
+                "context": notification.context,
+                "reference_type": notification.reference_type,
+                "reference_id": notification.reference_id,
+                "priority": notification.priority.value,
+                "action_url": notification.action_url,
+                "action_label": notification.action_label,
+                "is_read": notification.is_read,
+                "is_sent": notification.is_sent,
+                "sent_at": notification.sent_at,
+                "delivery_status": dict(notification.delivery_status),
+                "created_at": notification.created_at,
+                "expires_at": notification.expires_at,
+            })
+
+    def get(self, notification_id: str) -> Optional[Notification]:
+        with self._scope() as session:
+            row = self._repo(session).get_by_notification_id(self.tenant_id, notification_id)
+            return self._to_notification(row) if row else None
+
+    def list_page(
+        self,
+        user_id: str,
+        unread_only: bool = False,
+        notification_type: Optional[NotificationType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Notification], Optional[str]]:
+        with self._scope() as session:
+            rows, next_cursor = self._repo(session).list_for_user(
+                self.tenant_id,
+                user_id,
+                unread_only=unread_only,
+                notification_type=notification_type.value if notification_type else None,
+                cursor=cursor,
+                limit=limit
+            )
+            return [self._to_notification(r) for r in rows], next_cursor
+
+    def unread_count(self, user_id: str) -> int:
+        with self._scope() as session:
+            return self._repo(session).get_unread_count(self.tenant_id, user_id)
+
+    def mark_as_read(self, notification_id: str) -> bool:
+        with self._scope() as session:
+            return self._repo(session).mark_as_read(self.tenant_id, notification_id)
+
+    def mark_all_as_read(self, user_id: str) -> int:
+        with self._scope() as session:
+            return self._repo(session).mark_all_as_read(self.tenant_id, user_id)
+
+    def update_delivery(self, notification: Notification):
+        with self._scope() as session:
+            self._repo(session).update_delivery(
+                self.tenant_id,
+                notification.notification_id,
+                is_sent=notification.is_sent,
+                sent_at=notification.sent_at,
+                delivery_status=dict(notification.delivery_status)
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._scope() as session:
+            return self._repo(session).get_stats(self.tenant_id)
+
+    def compact(self, read_retention_days: int = 90) -> int:
+        with self._scope() as session:
+            return self._repo(session).compact(
+                read_retention_days=read_retention_days,
+                tenant_id=self.tenant_id
+            )
@@ -9,11 +9,15 @@ Handles all notifications across the GRC platform including:
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, TYPE_CHECKING
 from datetime import datetime, timedelta
 from enum import Enum
 import uuid
 
+if TYPE_CHECKING:
+    from .dispatcher import NotificationDispatcher, DispatcherConfig
+    from .inbox import NotificationInbox, InMemoryInbox
+
 
 class NotificationType(Enum):
     """Types of notifications"""
@@ -129,7 +133,7 @@ class Notification:
     delivery_status: Dict[str, str] = field(default_factory=dict)  # channel -> status
 
     # Timing
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=datetime.utcnow)  # naive UTC, as stored
     expires_at: Optional[datetime] = None
 
     # Actions
@@ -187,11 +191,18 @@ class NotificationService:
     Provides zero-training experience with smart defaults.
     """
 
-    def __init__(self):
-        self.notifications: Dict[str, Notification] = {}
+    def __init__(
+        self,
+        dispatcher: Optional["NotificationDispatcher"] = None,
+        inbox: Optional["NotificationInbox"] = None
+    ):
+        from .inbox import InMemoryInbox
+
         self.templates: Dict[str, NotificationTemplate] = {}
         self.preferences: Dict[str, NotificationPreference] = {}
-        self.user_notifications: Dict[str, List[str]] = {}  # user_id -> notification_ids
+
+        # Inbox store (in-memory by default, DatabaseInbox for persistence)
+        self.inbox = inbox or InMemoryInbox()
 
         # Email configuration (would be loaded from settings)
         self.email_config = {
@@ -201,8 +212,49 @@ class NotificationService:
             "from_name": "GRC Platform"
         }
 
+        # Optional background dispatcher; when None, delivery is inline
+        self.dispatcher = dispatcher
+
         self._init_templates()
 
+    def _memory_inbox(self) -> "InMemoryInbox":
+        from .inbox import InMemoryInbox
+
+        if not isinstance(self.inbox, InMemoryInbox):
+            raise TypeError(
+                f"{type(self.inbox).__name__} does not keep notifications in memory; "
+                "use the inbox methods (get, list_page, get_notification_stats)"
+            )
+        return self.inbox
+
+    @property
+    def notifications(self) -> Dict[str, Notification]:
+        """All notifications by id (in-memory inbox only)"""
+        return self._memory_inbox().notifications
+
+    @property
+    def user_notifications(self) -> Dict[str, List[str]]:
+        """Notification ids per user, oldest first (in-memory inbox only)"""
+        return self._memory_inbox().user_notifications
+
+    def enable_async_dispatch(
+        self,
+        config: Optional["DispatcherConfig"] = None
+    ) -> "NotificationDispatcher":
+        """Start a background dispatcher so send() no longer blocks on delivery"""
+        from .dispatcher import NotificationDispatcher, DispatcherConfig
+
+        if config is None:
+            config = DispatcherConfig(
+                smtp_host=self.email_config.get("smtp_host"),
+                smtp_port=self.email_config.get("smtp_port", 587),
+                from_address=self.email_config.get("from_address", "grc-notifications@company.com"),
+                from_name=self.email_config.get("from_name", "GRC Platform")
+            )
+        self.dispatcher = NotificationDispatcher(config, on_delivery_update=self.inbox.update_delivery)
+        self.dispatcher.start()
+        return self.dispatcher
+
     def _init_templates(self):
         """Initialize default notification templates"""
         templates = [
@@ -497,16 +549,14 @@ Please review and renew the mitigation or remediate the underlying risk.
             action_label=context.get("action_label")
         )
 
-        # Store notification
-        self.notifications[notification.notification_id] = notification
+        # Store in the recipient's inbox (maintains unread counters)
+        self.inbox.add(notification)
 
-        # Index by user
-        if recipient_user_id not in self.user_notifications:
-            self.user_notifications[recipient_user_id] = []
-        self.user_notifications[recipient_user_id].append(notification.notification_id)
-
-        # Deliver through channels
-        self._deliver(notification)
+        # Deliver through channels (queued when a dispatcher is running)
+        if self.dispatcher is not None:
+            self.dispatcher.submit(notification)
+        else:
+            self._deliver(notification)
 
         return notification
 
@@ -538,7 +588,8 @@ Please review and renew the mitigation or remediate the underlying risk.
                 notification.delivery_status[channel.value] = f"failed: {str(e)}"
 
         notification.is_sent = True
-        notification.sent_at = datetime.now()
+        notification.sent_at = datetime.utcnow()
+        self.inbox.update_delivery(notification)
 
     def _send_email(self, notification: Notification):
         """Send email notification (stub - would use SMTP/SendGrid/etc.)"""
@@ -573,48 +624,59 @@ Please review and renew the mitigation or remediate the underlying risk.
         notification_type: Optional[NotificationType] = None,
         limit: int = 50
     ) -> List[Notification]:
-        """Get notifications for a user"""
-        notification_ids = self.user_notifications.get(user_id, [])
-        notifications = []
-
-        for nid in reversed(notification_ids):  # Most recent first
-            n = self.notifications.get(nid)
-            if not n:
-                continue
-            if unread_only and n.is_read:
-                continue
-            if notification_type and n.notification_type != notification_type:
-                continue
-            notifications.append(n)
-            if len(notifications) >= limit:
-                break
-
+        """Get notifications for a user (most recent first)"""
+        notifications, _ = self.inbox.list_page(
+            user_id,
+            unread_only=unread_only,
+            notification_type=notification_type,
+            limit=limit
+        )
         return notifications
 
+    def get_user_notifications_page(
+        self,
+        user_id: str,
+        unread_only: bool = False,
+        notification_type: Optional[NotificationType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """Get one keyset-paginated page of a user's inbox"""
+        notifications, next_cursor = self.inbox.list_page(
+            user_id,
+            unread_only=unread_only,
+            notification_type=notification_type,
+            cursor=cursor,
+            limit=limit
+        )
+        return {
+            "notifications": notifications,
+            "next_cursor": next_cursor
+        }
+
+    def get_notification(self, notification_id: str) -> Optional[Notification]:
+        """Get a single notification by ID"""
+        return self.inbox.get(notification_id)
+
     def get_unread_count(self, user_id: str) -> int:
-        """Get count of unread notifications"""
-        notification_ids = self.user_notifications.get(user_id, [])
-        return sum(1 for nid in notification_ids
-                   if nid in self.notifications and not self.notifications[nid].is_read)
+        """Get count of unread notifications (maintained counter, O(1))"""
+        return self.inbox.unread_count(user_id)
 
     def mark_as_read(self, notification_id: str) -> bool:
         """Mark notification as read"""
-        if notification_id in self.notifications:
-            self.notifications[notification_id].is_read = True
-            self.notifications[notification_id].read_at = datetime.now()
-            return True
-        return False
+        return self.inbox.mark_as_read(notification_id)
 
     def mark_all_as_read(self, user_id: str) -> int:
         """Mark all notifications as read for a user"""
-        count = 0
-        notification_ids = self.user_notifications.get(user_id, [])
-        for nid in notification_ids:
-            if nid in self.notifications and not self.notifications[nid].is_read:
-                self.notifications[nid].is_read = True
-                self.notifications[nid].read_at = datetime.now()
-                count += 1
-        return count
+        return self.inbox.mark_all_as_read(user_id)
+
+    def compact_inbox(self, read_retention_days: int = 90) -> int:
+        """Drop read notifications older than the retention window and expired ones"""
+        return self.inbox.compact(read_retention_days)
+
+    def get_notification_stats(self) -> Dict[str, Any]:
+        """Total and unread notifications, with counts by type"""
+        return self.inbox.get_stats()
 
     # =========================================================================
     # Preference Management
@@ -6,7 +6,7 @@ Provides SAP GRC-equivalent background job scheduling.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, ContextManager, Iterable, Tuple
 from enum import Enum
 from datetime import datetime, timedelta
 import asyncio
@@ -131,9 +131,13 @@ class SyncScheduler:
     3. Multi-system support
     4. Job monitoring and alerting
     5. Automatic retry and error handling
+
+    Args:
+        session_scope: Context-manager factory yielding a Session; defaults
+            to the global DatabaseManager.session_scope
     """
 
-    def __init__(self):
+    def __init__(self, session_scope: Optional[Callable[[], ContextManager]] = None):
         self.jobs: Dict[str, SyncJob] = {}
         self.executions: Dict[str, SyncExecution] = {}
         self.running_jobs: Dict[str, asyncio.Task] = {}
@@ -141,6 +145,14 @@ class SyncScheduler:
         # Sync handlers by type
         self.sync_handlers: Dict[SyncType, Callable] = {}
 
+        # Record fetchers by (system_id, sync type); see register_source
+        self.record_sources: Dict[Tuple[str, SyncType], Callable] = {}
+
+        # Named maintenance tasks run by CUSTOM jobs; see register_task
+        self.custom_tasks: Dict[str, Callable[[], Any]] = {}
+        self._session_scope = session_scope
+        self.bulk_chunk_size = 1000
+
         # Configuration
         self.max_concurrent_jobs = 5
         self.default_retry_count = 3
@@ -163,6 +175,118 @@ class SyncScheduler:
         self.sync_handlers[SyncType.RISK_ANALYSIS] = self._run_risk_analysis
         self.sync_handlers[SyncType.USAGE_DATA_SYNC] = self._sync_usage_data
         self.sync_handlers[SyncType.AUDIT_LOG_SYNC] = self._sync_audit_logs
+        self.sync_handlers[SyncType.CUSTOM] = self._run_custom_task
+
+    # ==================== Record Sources ====================
+
+    def register_source(
+        self,
+        system_id: str,
+        sync_type: SyncType,
+        fetch: Callable[[SyncJob, Optional[datetime]], Iterable[Dict[str, Any]]]
+    ):
+        """
+        Register the fetcher for a system's user or role syncs.
+
+        fetch(job, since) yields rows shaped for the target table (users or
+        roles); since is None for full syncs. Rows are written with
+        repository bulk upserts keyed on the natural key.
+        """
+        self.record_sources[(system_id, sync_type)] = fetch
+
+    def register_task(self, name: str, task: Callable[[], Any]):
+        """
+        Register a maintenance task for CUSTOM jobs.
+
+        A CUSTOM job runs the task named by job.config["task"] off the event
+        loop; the task's return value is reported as the job result.
+        """
+        self.custom_tasks[name] = task
+
+    def _scope(self):
+        if self._session_scope is not None:
+            return self._session_scope()
+        from db import database
+        return database.db_manager.session_scope()
+
+    @staticmethod
+    def _target_repository(sync_type: SyncType, session):
+        if sync_type in (SyncType.FULL_USER_SYNC, SyncType.INCREMENTAL_USER_SYNC):
+            from repositories.user_repository import UserRepository
+            return UserRepository(session)
+        from repositories.role_repository import RoleRepository
+        return RoleRepository(session)
+
+    def _load_from_source(
+        self,
+        job: SyncJob,
+        fetch: Callable,
+        since: Optional[datetime]
+    ) -> Dict[str, int]:
+        """
+        Stream fetched rows into the database in bulk-upsert chunks, all in
+        one transaction. A full user sync then deactivates this system's
+        users that were not seen.
+        """
+        started = datetime.utcnow()
+        counts = {"fetched": 0, "created": 0, "updated": 0, "deactivated": 0}
+
+        with self._scope() as session:
+            repository = self._target_repository(job.sync_type, session)
+            is_users = repository.model.__tablename__ == "users"
+
+            def flush(chunk: List[Dict[str, Any]]):
+                result = repository.bulk_upsert(
+                    chunk,
+                    tenant_id=job.tenant_id,
+                    chunk_size=self.bulk_chunk_size,
+                    commit=False
+                )
+                counts["created"] += result.inserted
+                counts["updated"] += result.updated
+
+            chunk: List[Dict[str, Any]] = []
+            for row in fetch(job, since):
+                row = dict(row, last_synced_at=started)
+                if is_users:
+                    # Record the job's system, which the deactivation step below matches on
+                    row["sync_source"] = job.system_id
+                chunk.append(row)
+                counts["fetched"] += 1
+                if len(chunk) >= self.bulk_chunk_size:
+                    flush(chunk)
+                    chunk = []
+            if chunk:
+                flush(chunk)
+
+            if is_users and job.sync_type == SyncType.FULL_USER_SYNC:
+                model = repository.model
+                counts["deactivated"] = session.query(model).filter(
+                    model.tenant_id == job.tenant_id,
+                    model.sync_source == job.system_id,
+                    model.status == "active",
+                    model.last_synced_at < started
+                ).update({"status": "inactive"}, synchronize_session=False)
+
+        return counts
+
+    async def _sync_from_source(
+        self,
+        job: SyncJob,
+        execution: SyncExecution,
+        since: Optional[datetime] = None
+    ) -> Optional[Dict[str, int]]:
+        """Run the registered source for the job, if any, off the event loop"""
+        fetch = self.record_sources.get((job.system_id, job.sync_type))
+        if fetch is None:
+            return None
+
+        counts = await asyncio.to_thread(self._load_from_source, job, fetch, since)
+        execution.records_processed = counts["fetched"]
+        execution.records_created = counts["created"]
+        execution.records_updated = counts["updated"]
+        execution.records_deleted = counts["deactivated"]
+        return counts
 
     # ==================== Job Management ====================
 
@@ -405,10 +529,20 @@ class SyncScheduler:
         execution: SyncExecution
     ) -> Dict[str, Any]:
         """Full user synchronization"""
-        # In production, this would use the connector to fetch users
         logger.info(f"Starting full user sync for system: {job.system_id}")
 
-        # Simulated sync
+        counts = await self._sync_from_source(job, execution)
+        if counts is not None:
+            return {
+                "sync_type": "full_user",
+                "users_fetched": counts["fetched"],
+                "users_created": counts["created"],
+                "users_updated": counts["updated"],
+                "users_deactivated": counts["deactivated"],
+                "duration_seconds": (datetime.utcnow() - execution.started_at).total_seconds()
+            }
+
+        # Simulated sync (no source registered for this system)
         users_fetched = 1000
         users_created = 50
         users_updated = 200
@@ -439,7 +573,18 @@ class SyncScheduler:
         # Get changes since last sync
         since = job.last_run or (datetime.utcnow() - timedelta(hours=24))
 
-        # Simulated sync
+        counts = await self._sync_from_source(job, execution, since)
+        if counts is not None:
+            return {
+                "sync_type": "incremental_user",
+                "since": since.isoformat(),
+                "users_changed": counts["fetched"],
+                "users_created": counts["created"],
+                "users_updated": counts["updated"],
+                "users_deactivated": counts["deactivated"]
+            }
+
+        # Simulated sync (no source registered for this system)
         users_changed = 50
         users_created = 5
         users_updated = 40
@@ -467,6 +612,15 @@ class SyncScheduler:
         """Full role synchronization"""
         logger.info(f"Starting full role sync for system: {job.system_id}")
 
+        counts = await self._sync_from_source(job, execution)
+        if counts is not None:
+            return {
+                "sync_type": "full_role",
+                "roles_fetched": counts["fetched"],
+                "roles_created": counts["created"],
+                "roles_updated": counts["updated"]
+            }
+
         roles_fetched = 500
         roles_created = 20
         roles_updated = 100
@@ -490,6 +644,16 @@ class SyncScheduler:
         """Incremental role synchronization"""
         logger.info(f"Starting incremental role sync for system: {job.system_id}")
 
+        since = job.last_run or (datetime.utcnow() - timedelta(hours=24))
+        counts = await self._sync_from_source(job, execution, since)
+        if counts is not None:
+            return {
+                "sync_type": "incremental_role",
+                "roles_changed": counts["fetched"],
+                "roles_created": counts["created"],
+                "roles_updated": counts["updated"]
+            }
+
         roles_changed = 25
         roles_created = 2
         roles_updated = 23
@@ -589,6 +753,24 @@ class SyncScheduler:
             "logs_imported": logs_imported
         }
 
+    async def _run_custom_task(
+        self,
+        job: SyncJob,
+        execution: SyncExecution
+    ) -> Dict[str, Any]:
+        """Run a registered maintenance task"""
+        name = job.config.get("task", "")
+        task = self.custom_tasks.get(name)
+        if task is None:
+            raise ValueError(f"No task registered: {name}")
+
+        logger.info(f"Running task {name} for job: {job.job_id}")
+        result = await asyncio.to_thread(task)
+        if isinstance(result, int):
+            execution.records_processed = result
+
+        return {"task": name, "result": result}
+
     # ==================== Monitoring ====================
 
     def get_scheduler_status(self) -> Dict[str, Any]:
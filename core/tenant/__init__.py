@@ -9,6 +9,9 @@ from .context import (
     TenantContext, get_current_tenant, set_current_tenant,
     tenant_context, require_tenant, create_tenant_context_from_request
 )
+from .context_cache import (
+    TenantContextCache, TenantContextTemplate, build_context_template
+)
 from .isolation import (
     TenantIsolation, DataIsolationStrategy,
     TenantDatabase, TenantStorage
@@ -17,6 +20,10 @@ from .billing import (
     UsageMeter, BillingManager, UsageRecord,
     BillingPlan, Invoice, UsageType
 )
+from .metering import (
+    MeteringEngine, MeteringConfig, SlidingWindowRateLimiter,
+    DatabaseUsageSink
+)
 from .onboarding import (
     TenantOnboarding, OnboardingStep, OnboardingStatus,
     ProvisioningResult
@@ -37,6 +44,10 @@ __all__ = [
     "tenant_context",
     "require_tenant",
     "create_tenant_context_from_request",
+    # Context cache
+    "TenantContextCache",
+    "TenantContextTemplate",
+    "build_context_template",
     # Isolation
     "TenantIsolation",
     "DataIsolationStrategy",
@@ -49,6 +60,11 @@ __all__ = [
     "BillingPlan",
     "Invoice",
     "UsageType",
+    # Metering
+    "MeteringEngine",
+    "MeteringConfig",
+    "SlidingWindowRateLimiter",
+    "DatabaseUsageSink",
     # Onboarding
     "TenantOnboarding",
     "OnboardingStep",
@@ -7,6 +7,9 @@ from enum import Enum
 from datetime import datetime, timedelta
 from collections import defaultdict
 import uuid
+import time
+
+from .metering import MeteringEngine, SlidingWindowRateLimiter, DAY, GRANULARITIES
 
 
 class UsageType(Enum):
@@ -132,19 +135,27 @@ class UsageMeter:
     - Connected systems
     - Storage consumption
     - Feature usage
-    """
 
-    def __init__(self):
-        # Usage records by tenant
-        self.records: Dict[str, List[UsageRecord]] = defaultdict(list)
+    Usage is kept as time-bucketed counters in a MeteringEngine rather than
+    one record per event, and rate limits use a sliding window.
+    """
 
-        # Real-time counters (for rate limiting)
-        self.counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    def __init__(
+        self,
+        engine: Optional[MeteringEngine] = None,
+        rate_limiter: Optional[SlidingWindowRateLimiter] = None
+    ):
+        self.engine = engine or MeteringEngine()
+        self.rate_limiter = rate_limiter or SlidingWindowRateLimiter(window_seconds=DAY)
 
-        # Daily aggregates
-        self.daily_aggregates: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(float))
-        )
+    def record(
+        self,
+        tenant_id: str,
+        usage_type: UsageType,
+        quantity: float = 1.0
+    ) -> None:
+        """Record a usage event (hot path - no record object is created)"""
+        self.engine.record(tenant_id, usage_type.value, quantity)
 
     def record_usage(
         self,
@@ -153,25 +164,15 @@ class UsageMeter:
         quantity: float = 1.0,
         metadata: Dict[str, Any] = None
     ) -> UsageRecord:
-        """Record a usage event"""
-        record = UsageRecord(
+        """Record a usage event and return a receipt for it"""
+        self.engine.record(tenant_id, usage_type.value, quantity)
+        return UsageRecord(
             tenant_id=tenant_id,
             usage_type=usage_type,
             quantity=quantity,
             metadata=metadata or {}
         )
 
-        self.records[tenant_id].append(record)
-
-        # Update real-time counter
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        self.counters[tenant_id][f"{usage_type.value}:{today}"] += int(quantity)
-
-        # Update daily aggregate
-        self.daily_aggregates[tenant_id][today][usage_type.value] += quantity
-
-        return record
-
     def get_usage_summary(
         self,
         tenant_id: str,
@@ -179,18 +180,7 @@ class UsageMeter:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Get usage summary for a period"""
-        records = self.records.get(tenant_id, [])
-
-        # Filter by date range
-        period_records = [
-            r for r in records
-            if start_date <= r.timestamp <= end_date
-        ]
-
-        # Aggregate by type
-        usage_by_type = defaultdict(float)
-        for record in period_records:
-            usage_by_type[record.usage_type.value] += record.quantity
+        usage, event_count = self.engine.summarize(tenant_id, start_date, end_date)
 
         return {
             "tenant_id": tenant_id,
@@ -198,8 +188,8 @@ class UsageMeter:
                 "start": start_date.isoformat(),
                 "end": end_date.isoformat()
             },
-            "usage": dict(usage_by_type),
-            "record_count": len(period_records)
+            "usage": usage,
+            "record_count": event_count
         }
 
     def get_current_month_usage(self, tenant_id: str) -> Dict[str, Any]:
@@ -213,18 +203,51 @@ class UsageMeter:
         self,
         tenant_id: str,
         usage_type: UsageType,
-        limit: int
+        limit: int,
+        consume: bool = False
     ) -> Dict[str, Any]:
-        """Check if tenant is within rate limit"""
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        current = self.counters[tenant_id].get(f"{usage_type.value}:{today}", 0)
+        """
+        Check if tenant is within rate limit over the sliding window.
+
+        With consume=True the call also takes one unit of budget, which is
+        what the request middleware uses. Budget is held per process; it
+        is seeded from the meter (including buckets restored at startup) by
+        restore_rate_limits() and on every peek, so a check without consume
+        reflects all metered usage, not only calls that went through the
+        middleware of this process.
+        """
+        key = f"{tenant_id}:{usage_type.value}"
+        if consume:
+            return self.rate_limiter.hit(key, limit)
+        self._seed_from_meter(tenant_id, usage_type.value)
+        return self.rate_limiter.peek(key, limit)
+
+    def _seed_from_meter(self, tenant_id: str, usage_type: str, now: Optional[float] = None):
+        window = self.rate_limiter.window_seconds
+        if window not in GRANULARITIES:
+            # No meter buckets line up with the limiter's windows
+            return
+        now = now if now is not None else time.time()
+        window_start = int(now - now % window)
+        self.rate_limiter.seed(
+            f"{tenant_id}:{usage_type}",
+            current=self.engine.get_bucket(tenant_id, usage_type, window, window_start)[0],
+            previous=self.engine.get_bucket(tenant_id, usage_type, window, window_start - window)[0],
+            now=now
+        )
 
-        return {
-            "within_limit": current < limit,
-            "current": current,
-            "limit": limit,
-            "remaining": max(0, limit - current)
-        }
+    def restore_rate_limits(self) -> int:
+        """
+        Seed rate-limit windows from the meter, e.g. after MeteringEngine.restore()
+        at startup, so budget spent before a restart still counts.
+
+        Returns the number of keys seeded.
+        """
+        now = time.time()
+        pairs = self.engine.usage_types()
+        for tenant_id, usage_type in pairs:
+            self._seed_from_meter(tenant_id, usage_type, now)
+        return len(pairs)
 
     def get_daily_trend(
         self,
@@ -233,14 +256,10 @@ class UsageMeter:
         days: int = 30
     ) -> List[Dict[str, Any]]:
         """Get daily usage trend"""
-        trend = []
-        for i in range(days):
-            date = (datetime.utcnow() - timedelta(days=i)).strftime("%Y-%m-%d")
-            value = self.daily_aggregates[tenant_id][date].get(usage_type.value, 0)
-            trend.append({"date": date, "value": value})
-
-        trend.reverse()
-        return trend
+        return [
+            {"date": day.strftime("%Y-%m-%d"), "value": value}
+            for day, value in self.engine.daily_series(tenant_id, usage_type.value, days)
+        ]
 
 
 class BillingManager:
@@ -254,11 +273,11 @@ class BillingManager:
     - Usage-based billing calculation
     """
 
-    def __init__(self):
+    def __init__(self, usage_meter: Optional[UsageMeter] = None):
         self.plans: Dict[str, BillingPlan] = {}
         self.subscriptions: Dict[str, Dict[str, Any]] = {}  # tenant_id -> subscription
         self.invoices: Dict[str, List[Invoice]] = defaultdict(list)
-        self.usage_meter = UsageMeter()
+        self.usage_meter = usage_meter or UsageMeter()
 
         self._initialize_plans()
 
@@ -651,15 +670,15 @@ class BillingManager:
 
     def track_api_call(self, tenant_id: str) -> None:
         """Track an API call"""
-        self.usage_meter.record_usage(tenant_id, UsageType.API_CALLS, 1)
+        self.usage_meter.record(tenant_id, UsageType.API_CALLS, 1)
 
     def track_ai_query(self, tenant_id: str) -> None:
         """Track an AI feature usage"""
-        self.usage_meter.record_usage(tenant_id, UsageType.AI_QUERIES, 1)
+        self.usage_meter.record(tenant_id, UsageType.AI_QUERIES, 1)
 
     def track_risk_analysis(self, tenant_id: str, users_analyzed: int = 1) -> None:
         """Track risk analysis usage"""
-        self.usage_meter.record_usage(
+        self.usage_meter.record(
             tenant_id, UsageType.RISK_ANALYSES, users_analyzed
         )
 
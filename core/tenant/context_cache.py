@@ -0,0 +1,151 @@
+# Tenant Context Cache
+# Pre-built, immutable per-tenant context templates for request handling
+
+from dataclasses import dataclass
+from typing import Optional, Any, Dict, Tuple, Mapping
+from types import MappingProxyType
+from datetime import datetime
+import threading
+
+from .manager import TenantManager, Tenant, TenantStatus
+from .context import TenantContext
+
+
+@dataclass(frozen=True)
+class TenantContextTemplate:
+    """
+    Tenant-level half of a TenantContext, built once per tenant version.
+
+    The config/limits/features mappings are read-only and shared by every
+    request context created from the template.
+    """
+    tenant_id: str
+    tenant_slug: str
+    tenant_name: str
+    status: TenantStatus
+    updated_at: datetime
+    config: Mapping[str, Any]
+    limits: Mapping[str, Any]
+    features: Mapping[str, bool]
+
+    # (status_code, message) when requests for this tenant must be rejected
+    rejection: Optional[Tuple[int, str]] = None
+
+    def build_context(
+        self,
+        user_data: Dict[str, Any],
+        request_id: str = "",
+        source_ip: str = ""
+    ) -> TenantContext:
+        """Create a per-request context sharing this template's mappings"""
+        return TenantContext(
+            tenant_id=self.tenant_id,
+            tenant_slug=self.tenant_slug,
+            tenant_name=self.tenant_name,
+            user_id=user_data.get("user_id"),
+            user_email=user_data.get("email"),
+            user_roles=user_data.get("roles", []),
+            is_tenant_admin=user_data.get("is_admin", False),
+            request_id=request_id,
+            source_ip=source_ip,
+            config=self.config,
+            limits=self.limits,
+            features=self.features
+        )
+
+
+def build_context_template(tenant: Tenant) -> TenantContextTemplate:
+    """Build the immutable template for a tenant's current state"""
+    rejection = None
+    if tenant.status == TenantStatus.SUSPENDED:
+        rejection = (403, "This account has been suspended. Please contact support.")
+    elif tenant.status == TenantStatus.DEACTIVATED:
+        rejection = (403, "This account has been deactivated.")
+    elif tenant.status != TenantStatus.ACTIVE:
+        rejection = (403, f"Tenant is not active (status: {tenant.status.value})")
+
+    return TenantContextTemplate(
+        tenant_id=tenant.id,
+        tenant_slug=tenant.slug,
+        tenant_name=tenant.name,
+        status=tenant.status,
+        updated_at=tenant.updated_at,
+        config=MappingProxyType({
+            "timezone": tenant.config.timezone,
+            "language": tenant.config.language,
+            "enabled_modules": tuple(tenant.config.enabled_modules)
+        }),
+        limits=MappingProxyType({
+            "max_users": tenant.limits.max_users,
+            "max_systems": tenant.limits.max_systems,
+            "max_api_calls_per_day": tenant.limits.max_api_calls_per_day
+        }),
+        features=MappingProxyType({
+            "sso_enabled": tenant.limits.sso_enabled,
+            "ai_features": tenant.limits.ai_features,
+            "advanced_analytics": tenant.limits.advanced_analytics,
+            "custom_branding": tenant.limits.custom_branding
+        }),
+        rejection=rejection
+    )
+
+
+class TenantContextCache:
+    """
+    Cache of TenantContextTemplates keyed by tenant_id.
+
+    Entries are dropped when the TenantManager reports a change (suspend,
+    tier change, config update, ...). As a safety net for code that edits a
+    Tenant directly, an entry is also rebuilt when the tenant's updated_at
+    no longer matches the template.
+    """
+
+    def __init__(self, tenant_manager: TenantManager, max_entries: int = 10000):
+        self.tenant_manager = tenant_manager
+        self.max_entries = max_entries
+        self._templates: Dict[str, TenantContextTemplate] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+        tenant_manager.add_change_listener(self.invalidate)
+
+    def get_template(self, tenant_id: str) -> Optional[TenantContextTemplate]:
+        """Get the context template for a tenant, building it on a miss"""
+        tenant = self.tenant_manager.get_tenant(tenant_id)
+        if tenant is None:
+            self.invalidate(tenant_id)
+            return None
+
+        template = self._templates.get(tenant_id)
+        if template is not None and template.updated_at == tenant.updated_at:
+            self._stats["hits"] += 1
+            return template
+
+        self._stats["misses"] += 1
+        template = build_context_template(tenant)
+        with self._lock:
+            if len(self._templates) >= self.max_entries and tenant_id not in self._templates:
+                # Evict the oldest entry (dicts preserve insertion order)
+                self._templates.pop(next(iter(self._templates)))
+            self._templates[tenant_id] = template
+        return template
+
+    def invalidate(self, tenant_id: str):
+        """Drop the cached template for a tenant"""
+        with self._lock:
+            if self._templates.pop(tenant_id, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop all cached templates"""
+        with self._lock:
+            self._templates.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._templates),
+            "hit_ratio": round(self._stats["hits"] / total, 4) if total else 0.0
+        }
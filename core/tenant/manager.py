@@ -2,7 +2,7 @@
 # Core multi-tenant management for SaaS
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 from enum import Enum
 from datetime import datetime, timedelta
 import uuid
@@ -186,6 +186,10 @@ class TenantManager:
         # Tier configurations
         self.tier_limits = self._initialize_tier_limits()
 
+        # Callbacks fired with a tenant_id whenever a tenant changes
+        # (used to invalidate cached request contexts)
+        self._change_listeners: List[Callable[[str], None]] = []
+
         # Initialize demo tenant
         self._create_demo_tenant()
 
@@ -302,6 +306,23 @@ class TenantManager:
         self.tenants[demo.id] = demo
         self.tenants_by_slug[demo.slug] = demo.id
 
+    # ==================== Change Notification ====================
+
+    def add_change_listener(self, callback: Callable[[str], None]):
+        """Register a callback invoked with tenant_id on every tenant change"""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[str], None]):
+        """Unregister a change callback"""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def notify_tenant_changed(self, tenant_id: str):
+        """Signal that a tenant's status, tier, limits or config changed"""
+        for callback in list(self._change_listeners):
+            callback(tenant_id)
+
     # ==================== Tenant Lifecycle ====================
 
     def create_tenant(
@@ -367,6 +388,8 @@ class TenantManager:
         tenant.activated_at = datetime.utcnow()
         tenant.updated_at = datetime.utcnow()
 
+        self.notify_tenant_changed(tenant_id)
+
         return {
             "success": True,
             "tenant_id": tenant_id,
@@ -383,6 +406,8 @@ class TenantManager:
         tenant.status = TenantStatus.SUSPENDED
         tenant.updated_at = datetime.utcnow()
 
+        self.notify_tenant_changed(tenant_id)
+
         return {
             "success": True,
             "tenant_id": tenant_id,
@@ -403,6 +428,8 @@ class TenantManager:
         tenant.status = TenantStatus.ACTIVE
         tenant.updated_at = datetime.utcnow()
 
+        self.notify_tenant_changed(tenant_id)
+
         return {
             "success": True,
             "tenant_id": tenant_id,
@@ -419,6 +446,8 @@ class TenantManager:
         tenant.status = TenantStatus.DEACTIVATED
         tenant.updated_at = datetime.utcnow()
 
+        self.notify_tenant_changed(tenant_id)
+
         return {
             "success": True,
             "tenant_id": tenant_id,
@@ -426,6 +455,40 @@ class TenantManager:
             "message": "Tenant deactivated. Data will be deleted after retention period."
         }
 
+    def update_config(
+        self,
+        tenant_id: str,
+        config: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Update tenant name and configuration fields"""
+        tenant = self.tenants.get(tenant_id)
+        if not tenant:
+            return {"success": False, "error": "Tenant not found"}
+
+        if name:
+            tenant.name = name
+
+        ignored = []
+        for key, value in (config or {}).items():
+            if hasattr(tenant.config, key):
+                setattr(tenant.config, key, value)
+            else:
+                ignored.append(key)
+
+        if tenant.config.custom_domain:
+            self.tenants_by_domain[tenant.config.custom_domain] = tenant_id
+
+        tenant.updated_at = datetime.utcnow()
+        self.notify_tenant_changed(tenant_id)
+
+        return {
+            "success": True,
+            "tenant_id": tenant_id,
+            "ignored_fields": ignored,
+            "message": "Tenant updated"
+        }
+
     # ==================== Tier Management ====================
 
     def upgrade_tier(self, tenant_id: str, new_tier: TenantTier) -> Dict[str, Any]:
@@ -446,6 +509,8 @@ class TenantManager:
         if tenant.trial_ends_at:
             tenant.trial_ends_at = None
 
+        self.notify_tenant_changed(tenant_id)
+
         return {
             "success": True,
             "tenant_id": tenant_id,
@@ -487,6 +552,8 @@ class TenantManager:
         tenant.limits = new_limits
         tenant.updated_at = datetime.utcnow()
 
+        self.notify_tenant_changed(tenant_id)
+
         return {
             "success": True,
             "tenant_id": tenant_id,
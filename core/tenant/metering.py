@@ -0,0 +1,472 @@
+# Usage Metering Engine
+# Sharded time-bucket counters and sliding-window rate limiting
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple, Callable
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+# Bucket granularities (seconds)
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+GRANULARITIES = (MINUTE, HOUR, DAY)
+GRANULARITY_NAMES = {MINUTE: "minute", HOUR: "hour", DAY: "day"}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_epoch(dt: datetime) -> int:
+    """Naive UTC datetime -> epoch seconds"""
+    return int((dt - _EPOCH).total_seconds())
+
+
+def _from_epoch(ts: int) -> datetime:
+    return _EPOCH + timedelta(seconds=ts)
+
+
+def decompose_range(start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Split [start, end) (epoch seconds) into the fewest aligned buckets.
+
+    Returns (granularity, bucket_start) pairs: minute buckets up to the first
+    hour boundary, hour buckets up to the first day boundary, whole days,
+    then hours and minutes for the tail. Seconds below a minute are rounded
+    out to the enclosing minute.
+    """
+    start -= start % MINUTE
+    if end % MINUTE:
+        end += MINUTE - end % MINUTE
+
+    spans: List[Tuple[int, int]] = []
+    cursor = start
+    # Ascend: minute -> hour -> day
+    for fine, coarse in ((MINUTE, HOUR), (HOUR, DAY)):
+        while cursor % coarse and cursor + fine <= end:
+            spans.append((fine, cursor))
+            cursor += fine
+    while cursor + DAY <= end:
+        spans.append((DAY, cursor))
+        cursor += DAY
+    # Descend: hour -> minute
+    for fine in (HOUR, MINUTE):
+        while cursor + fine <= end:
+            spans.append((fine, cursor))
+            cursor += fine
+    return spans
+
+
+@dataclass
+class MeteringConfig:
+    """Configuration for the metering engine"""
+    shards: int = 16
+    flush_interval_seconds: float = 60.0
+
+    # How long each granularity is kept in memory. Range edges older than a
+    # granularity's retention are rounded out to the next coarser bucket.
+    retention_seconds: Dict[int, int] = field(default_factory=lambda: {
+        MINUTE: 2 * DAY,
+        HOUR: 35 * DAY,
+        DAY: 400 * DAY,
+    })
+
+
+class _Shard:
+    """One lock-protected slice of the counter space"""
+
+    __slots__ = ("lock", "totals", "dirty", "types")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (tenant_id, usage_type, granularity, bucket_start) -> [quantity, events]
+        self.totals: Dict[Tuple[str, str, int, int], List[float]] = {}
+        # Deltas not yet flushed, same keys
+        self.dirty: Dict[Tuple[str, str, int, int], List[float]] = {}
+        # tenant_id -> usage types seen
+        self.types: Dict[str, set] = {}
+
+
+class MeteringEngine:
+    """
+    Usage metering with sharded minute/hour/day counters.
+
+    record() costs one shard lock and three dict increments; no per-call
+    record objects are kept. Range summaries are answered from the coarsest
+    buckets that tile the range.
+
+    Args:
+        config: Engine configuration
+        sink: Optional callable receiving flushed rows
+            (tenant_id, usage_type, granularity, bucket_start, quantity, events)
+    """
+
+    def __init__(
+        self,
+        config: Optional[MeteringConfig] = None,
+        sink: Optional[Callable[[List[Tuple[str, str, int, datetime, float, int]]], None]] = None
+    ):
+        self.config = config or MeteringConfig()
+        self.sink = sink
+        self._shards = [_Shard() for _ in range(max(self.config.shards, 1))]
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _shard_for(self, tenant_id: str) -> _Shard:
+        return self._shards[zlib.crc32(tenant_id.encode("utf-8")) % len(self._shards)]
+
+    # ==================== Recording ====================
+
+    def record(
+        self,
+        tenant_id: str,
+        usage_type: str,
+        quantity: float = 1.0,
+        timestamp: Optional[float] = None
+    ):
+        """Add usage to the minute, hour and day buckets containing timestamp"""
+        ts = int(timestamp if timestamp is not None else time.time())
+        shard = self._shard_for(tenant_id)
+        with shard.lock:
+            shard.types.setdefault(tenant_id, set()).add(usage_type)
+            for granularity in GRANULARITIES:
+                key = (tenant_id, usage_type, granularity, ts - ts % granularity)
+                total = shard.totals.get(key)
+                if total is None:
+                    shard.totals[key] = [quantity, 1]
+                else:
+                    total[0] += quantity
+                    total[1] += 1
+                delta = shard.dirty.get(key)
+                if delta is None:
+                    shard.dirty[key] = [quantity, 1]
+                else:
+                    delta[0] += quantity
+                    delta[1] += 1
+
+    # ==================== Queries ====================
+
+    def get_bucket(
+        self,
+        tenant_id: str,
+        usage_type: str,
+        granularity: int,
+        bucket_start: int
+    ) -> Tuple[float, int]:
+        """(quantity, events) for a single bucket"""
+        shard = self._shard_for(tenant_id)
+        total = shard.totals.get((tenant_id, usage_type, granularity, bucket_start))
+        return (total[0], int(total[1])) if total else (0.0, 0)
+
+    def summarize(
+        self,
+        tenant_id: str,
+        start: datetime,
+        end: datetime
+    ) -> Tuple[Dict[str, float], int]:
+        """
+        Usage per type and total event count over [start, end].
+
+        Reads O(days) buckets regardless of traffic volume.
+        """
+        now = int(time.time())
+        spans = []
+        seen = set()
+        for granularity, bucket_start in decompose_range(_to_epoch(start), _to_epoch(end) + 1):
+            # Fine buckets past their retention: use the enclosing coarser one
+            while (granularity != DAY and
+                   bucket_start + granularity < now - self.config.retention_seconds.get(granularity, DAY)):
+                granularity = HOUR if granularity == MINUTE else DAY
+                bucket_start -= bucket_start % granularity
+            if (granularity, bucket_start) not in seen:
+                seen.add((granularity, bucket_start))
+                spans.append((granularity, bucket_start))
+
+        shard = self._shard_for(tenant_id)
+        usage: Dict[str, float] = {}
+        events = 0
+
+        with shard.lock:
+            for usage_type in shard.types.get(tenant_id, ()):
+                quantity = 0.0
+                for granularity, bucket_start in spans:
+                    total = shard.totals.get((tenant_id, usage_type, granularity, bucket_start))
+                    if total:
+                        quantity += total[0]
+                        events += int(total[1])
+                if quantity:
+                    usage[usage_type] = quantity
+
+        return usage, events
+
+    def usage_types(self) -> List[Tuple[str, str]]:
+        """(tenant_id, usage_type) pairs with recorded or restored usage"""
+        pairs: List[Tuple[str, str]] = []
+        for shard in self._shards:
+            with shard.lock:
+                for tenant_id, types in shard.types.items():
+                    pairs.extend((tenant_id, usage_type) for usage_type in types)
+        return pairs
+
+    def daily_series(
+        self,
+        tenant_id: str,
+        usage_type: str,
+        days: int = 30
+    ) -> List[Tuple[datetime, float]]:
+        """Day-bucket values for the last N days, oldest first"""
+        today = int(time.time()) // DAY * DAY
+        return [
+            (_from_epoch(day), self.get_bucket(tenant_id, usage_type, DAY, day)[0])
+            for day in range(today - (days - 1) * DAY, today + 1, DAY)
+        ]
+
+    # ==================== Flushing ====================
+
+    def flush(self) -> int:
+        """
+        Hand accumulated deltas to the sink and prune expired buckets.
+
+        Returns the number of rows flushed.
+        """
+        rows: List[Tuple[str, str, int, datetime, float, int]] = []
+        now = int(time.time())
+
+        for shard in self._shards:
+            with shard.lock:
+                dirty, shard.dirty = shard.dirty, {}
+                expired = [
+                    key for key in shard.totals
+                    if key[3] + key[2] < now - self.config.retention_seconds.get(key[2], DAY)
+                ]
+                for key in expired:
+                    del shard.totals[key]
+            for (tenant_id, usage_type, granularity, bucket_start), (quantity, events) in dirty.items():
+                rows.append((
+                    tenant_id, usage_type, granularity,
+                    _from_epoch(bucket_start), quantity, int(events)
+                ))
+
+        if rows and self.sink is not None:
+            try:
+                self.sink(rows)
+            except Exception as e:
+                logger.error(f"Usage flush failed, re-queueing {len(rows)} rows: {e}")
+                self._requeue(rows)
+                return 0
+        return len(rows)
+
+    def restore(self, rows: List[Tuple[str, str, int, datetime, float, int]]) -> int:
+        """
+        Load previously flushed buckets (e.g. DatabaseUsageSink.load() at
+        startup) into the in-memory totals without marking them dirty.
+
+        Returns the number of rows restored.
+        """
+        now = int(time.time())
+        restored = 0
+        for tenant_id, usage_type, granularity, bucket_start, quantity, events in rows:
+            start = _to_epoch(bucket_start)
+            if start + granularity < now - self.config.retention_seconds.get(granularity, DAY):
+                continue
+            shard = self._shard_for(tenant_id)
+            key = (tenant_id, usage_type, granularity, start)
+            with shard.lock:
+                shard.types.setdefault(tenant_id, set()).add(usage_type)
+                total = shard.totals.setdefault(key, [0.0, 0])
+                total[0] += quantity
+                total[1] += events
+            restored += 1
+        return restored
+
+    def _requeue(self, rows: List[Tuple[str, str, int, datetime, float, int]]):
+        for tenant_id, usage_type, granularity, bucket_start, quantity, events in rows:
+            shard = self._shard_for(tenant_id)
+            key = (tenant_id, usage_type, granularity, _to_epoch(bucket_start))
+            with shard.lock:
+                delta = shard.dirty.setdefault(key, [0.0, 0])
+                delta[0] += quantity
+                delta[1] += events
+
+    def start_background_flush(self):
+        """Flush periodically on a daemon thread"""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _loop():
+            while not self._stop.wait(self.config.flush_interval_seconds):
+                self.flush()
+
+        self._flush_thread = threading.Thread(target=_loop, name="usage-flush", daemon=True)
+        self._flush_thread.start()
+
+    def stop(self):
+        """Stop background flushing and flush what is left"""
+        self._stop.set()
+        if self._flush_thread:
+            self._flush_thread.join(timeout=5.0)
+            self._flush_thread = None
+        self.flush()
+
+
+class SlidingWindowRateLimiter:
+    """
+    Sliding-window rate limiter using the two-window approximation.
+
+    Keeps only the current and previous fixed-window counts per key; the
+    effective count is current + previous * (unelapsed share of the window).
+    Each hit is O(1) with one shard lock.
+    """
+
+    def __init__(self, window_seconds: int = DAY, shards: int = 16):
+        self.window_seconds = window_seconds
+        self._locks = [threading.Lock() for _ in range(max(shards, 1))]
+        # key -> [window_start, current_count, previous_count]
+        self._windows: List[Dict[str, List[float]]] = [{} for _ in range(max(shards, 1))]
+
+    def hit(
+        self,
+        key: str,
+        limit: int,
+        cost: int = 1,
+        now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Consume `cost` from key's budget if it fits within `limit`"""
+        now = now if now is not None else time.time()
+        window = self.window_seconds
+        window_start = now - now % window
+        idx = zlib.crc32(key.encode("utf-8")) % len(self._locks)
+
+        with self._locks[idx]:
+            state = self._windows[idx].get(key)
+            if state is None:
+                state = [window_start, 0.0, 0.0]
+                self._windows[idx][key] = state
+            elif state[0] != window_start:
+                # Roll forward: previous window is the old current one only if adjacent
+                state[2] = state[1] if window_start - state[0] == window else 0.0
+                state[1] = 0.0
+                state[0] = window_start
+
+            weight = 1.0 - (now - window_start) / window
+            estimated = state[1] + state[2] * weight
+            allowed = estimated + cost <= limit
+            if allowed:
+                state[1] += cost
+                estimated += cost
+
+        retry_after = 0
+        if not allowed:
+            retry_after = int(window_start + window - now) + 1
+
+        return {
+            "within_limit": allowed,
+            "current": int(estimated),
+            "limit": limit,
+            "remaining": max(0, int(limit - estimated)),
+            "retry_after_seconds": retry_after
+        }
+
+    def peek(self, key: str, limit: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """Current estimate for key without consuming budget"""
+        return self.hit(key, limit, cost=0, now=now)
+
+    def seed(
+        self,
+        key: str,
+        current: float,
+        previous: float,
+        now: Optional[float] = None
+    ):
+        """
+        Raise key's current / previous window counts to at least the given
+        values (usage counted elsewhere, e.g. persisted meter buckets)
+        """
+        now = now if now is not None else time.time()
+        window_start = now - now % self.window_seconds
+        idx = zlib.crc32(key.encode("utf-8")) % len(self._locks)
+
+        with self._locks[idx]:
+            state = self._windows[idx].get(key)
+            if state is None or state[0] != window_start:
+                state = [window_start, 0.0, 0.0]
+                self._windows[idx][key] = state
+            state[1] = max(state[1], current)
+            state[2] = max(state[2], previous)
+
+
+class DatabaseUsageSink:
+    """
+    Flush sink that accumulates bucket deltas into the usage_buckets table.
+
+    Args:
+        session_scope: Context-manager factory yielding a Session; defaults
+            to the global DatabaseManager.session_scope
+    """
+
+    def __init__(self, session_scope: Optional[Callable[[], Any]] = None):
+        self._session_scope = session_scope
+
+    def _scope(self):
+        if self._session_scope is not None:
+            return self._session_scope()
+        from db import database
+        return database.db_manager.session_scope()
+
+    def load(
+        self,
+        retention_seconds: Optional[Dict[int, int]] = None
+    ) -> List[Tuple[str, str, int, datetime, float, int]]:
+        """Persisted buckets still within retention, as flush rows"""
+        from db.models.usage import UsageBucket
+
+        retention = retention_seconds or MeteringConfig().retention_seconds
+        rows: List[Tuple[str, str, int, datetime, float, int]] = []
+        with self._scope() as session:
+            for granularity, name in GRANULARITY_NAMES.items():
+                cutoff = datetime.utcnow() - timedelta(seconds=retention.get(granularity, DAY) + granularity)
+                for bucket in session.query(UsageBucket).filter(
+                    UsageBucket.granularity == name,
+                    UsageBucket.bucket_start >= cutoff
+                ):
+                    rows.append((
+                        bucket.tenant_id, bucket.usage_type, granularity,
+                        bucket.bucket_start, bucket.quantity, bucket.event_count
+                    ))
+        return rows
+
+    def __call__(self, rows: List[Tuple[str, str, int, datetime, float, int]]):
+        from sqlalchemy import update
+        from db.models.usage import UsageBucket
+
+        with self._scope() as session:
+            for tenant_id, usage_type, granularity, bucket_start, quantity, events in rows:
+                name = GRANULARITY_NAMES[granularity]
+                result = session.execute(
+                    update(UsageBucket)
+                    .where(
+                        UsageBucket.tenant_id == tenant_id,
+                        UsageBucket.usage_type == usage_type,
+                        UsageBucket.granularity == name,
+                        UsageBucket.bucket_start == bucket_start
+                    )
+                    .values(
+                        quantity=UsageBucket.quantity + quantity,
+                        event_count=UsageBucket.event_count + events
+                    )
+                )
+                if not result.rowcount:
+                    session.add(UsageBucket(
+                        tenant_id=tenant_id,
+                        usage_type=usage_type,
+                        granularity=name,
+                        bucket_start=bucket_start,
+                        quantity=quantity,
+                        event_count=events
+                    ))
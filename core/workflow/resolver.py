@@ -17,13 +17,16 @@ their own data sources without engine changes.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable, Protocol
+from typing import Dict, List, Optional, Any, Callable, Protocol, Iterable, TYPE_CHECKING
 from datetime import datetime
 from enum import Enum
 import logging
 
 from .models import WorkflowContext, ApproverTypeEnum
 
+if TYPE_CHECKING:
+    from core.identity.org_hierarchy import OrgHierarchyIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,7 +126,8 @@ class LineManagerResolver:
     def __init__(
         self,
         hr_lookup: Optional[Callable[[str], Dict[str, Any]]] = None,
-        fallback_id: str = "HR_ADMIN"
+        fallback_id: str = "HR_ADMIN",
+        org_index: Optional["OrgHierarchyIndex"] = None
     ):
         """
         Initialize resolver.
@@ -131,9 +135,62 @@ class LineManagerResolver:
         Args:
             hr_lookup: Function that takes user_id and returns manager info
             fallback_id: Fallback approver if resolution fails
+            org_index: Materialized org hierarchy; consulted before hr_lookup
         """
         self.hr_lookup = hr_lookup
         self.fallback_id = fallback_id
+        self.org_index = org_index
+
+    def _lookup(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Manager info for a user from the org index or HR lookup."""
+        if self.org_index is not None and user_id in self.org_index:
+            manager = self.org_index.resolve_approvers([user_id]).get(user_id)
+            if manager:
+                return manager
+        if self.hr_lookup:
+            return self.hr_lookup(user_id)
+        return None
+
+    def _to_approver(self, manager_info: Dict[str, Any]) -> ResolvedApprover:
+        return ResolvedApprover(
+            approver_id=manager_info.get("id", ""),
+            approver_name=manager_info.get("name", ""),
+            approver_email=manager_info.get("email", ""),
+            approver_type=ApproverTypeEnum.LINE_MANAGER,
+            source=ApproverSource.HR_SYSTEM,
+            is_available=manager_info.get("is_available", True),
+            is_ooo=manager_info.get("is_ooo", False),
+            delegate_id=manager_info.get("delegate_id"),
+            delegate_name=manager_info.get("delegate_name"),
+            department=manager_info.get("department", ""),
+            title=manager_info.get("title", ""),
+        )
+
+    def resolve_bulk(self, user_ids: Iterable[str]) -> Dict[str, ResolutionResult]:
+        """
+        Resolve line managers for many users at once.
+
+        Users covered by the org index are answered in one pass over the
+        index; the rest go through the single-user path.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        results: Dict[str, ResolutionResult] = {}
+
+        indexed: Dict[str, Optional[Dict[str, Any]]] = {}
+        if self.org_index is not None:
+            indexed = self.org_index.resolve_approvers(
+                [u for u in user_ids if u in self.org_index]
+            )
+
+        for user_id in user_ids:
+            manager_info = indexed.get(user_id)
+            if manager_info:
+                results[user_id] = ResolutionResult(approver=self._to_approver(manager_info))
+            else:
+                results[user_id] = self.resolve(
+                    WorkflowContext(target_user_id=user_id)
+                )
+        return results
 
     def resolve(
         self,
@@ -147,23 +204,11 @@ class LineManagerResolver:
         try:
             user_id = context.target_user_id or context.requester_id
 
-            if self.hr_lookup:
-                # Use custom HR lookup
-                manager_info = self.hr_lookup(user_id)
+            if self.hr_lookup or (self.org_index is not None and user_id in self.org_index):
+                # Use org index / custom HR lookup
+                manager_info = self._lookup(user_id)
                 if manager_info:
-                    result.approver = ResolvedApprover(
-                        approver_id=manager_info.get("id", ""),
-                        approver_name=manager_info.get("name", ""),
-                        approver_email=manager_info.get("email", ""),
-                        approver_type=ApproverTypeEnum.LINE_MANAGER,
-                        source=ApproverSource.HR_SYSTEM,
-                        is_available=manager_info.get("is_available", True),
-                        is_ooo=manager_info.get("is_ooo", False),
-                        delegate_id=manager_info.get("delegate_id"),
-                        delegate_name=manager_info.get("delegate_name"),
-                        department=manager_info.get("department", ""),
-                        title=manager_info.get("title", ""),
-                    )
+                    result.approver = self._to_approver(manager_info)
                     result.success = True
                 else:
                     # Use fallback
@@ -557,6 +602,37 @@ class ApproverResolver:
             LineManagerResolver(hr_lookup=lookup_function)
         )
 
+    def configure_org_hierarchy(
+        self,
+        org_index: "OrgHierarchyIndex",
+        fallback_id: Optional[str] = None
+    ) -> None:
+        """
+        Use a materialized org hierarchy (e.g. LDAPConnector.org_index) for line managers.
+
+        fallback_id is the approver used when neither the hierarchy nor the
+        HR lookup has a manager; defaults to the current resolver's.
+        """
+        current = self.registry.get_resolver(ApproverTypeEnum.LINE_MANAGER)
+        self.registry.register(
+            ApproverTypeEnum.LINE_MANAGER,
+            LineManagerResolver(
+                hr_lookup=getattr(current, "hr_lookup", None),
+                fallback_id=fallback_id or getattr(current, "fallback_id", "HR_ADMIN"),
+                org_index=org_index
+            )
+        )
+
+    def resolve_line_managers(self, user_ids: Iterable[str]) -> Dict[str, ResolvedApprover]:
+        """Bulk line-manager resolution (user_id -> approver or fallback)."""
+        resolver = self.registry.get_resolver(ApproverTypeEnum.LINE_MANAGER)
+        if isinstance(resolver, LineManagerResolver):
+            return {uid: r.approver for uid, r in resolver.resolve_bulk(user_ids).items()}
+        return {
+            uid: self.resolve(ApproverTypeEnum.LINE_MANAGER, WorkflowContext(target_user_id=uid))
+            for uid in user_ids
+        }
+
     def configure_role_registry(
         self,
         lookup_function: Callable[[str], Dict[str, Any]]
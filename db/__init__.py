@@ -1,6 +1,8 @@
 # GRC Database Module
 from .models import Base, User, Role, UserRole, RiskViolation, FirefighterSession, AuditLog
-from .database import get_db, init_db, DatabaseManager
+from .database import get_db, get_read_db, get_async_db, get_async_read_db, init_db, DatabaseManager
+from .pool import PoolConfig
+from .instrumentation import query_tag
 
 __all__ = [
     "Base",
@@ -11,6 +13,11 @@ __all__ = [
     "FirefighterSession",
     "AuditLog",
     "get_db",
+    "get_read_db",
+    "get_async_db",
+    "get_async_read_db",
     "init_db",
-    "DatabaseManager"
+    "DatabaseManager",
+    "PoolConfig",
+    "query_tag"
 ]
@@ -2,10 +2,20 @@
 Database Configuration and Session Management
 
 Provides database connection, session management, and initialization utilities.
+
+- Sync engine/sessions (get_db) and, alongside them, an AsyncEngine with
+  async sessions (get_async_db) for handlers that must not block the loop
+- Optional read replica (DATABASE_READ_URL) for report and dashboard
+  reads (get_read_db / get_async_read_db); falls back to the primary
+- Pool sizing from the environment (see db.pool.PoolConfig) and pool
+  occupancy / wait metrics (DatabaseManager.get_pool_metrics)
+- Opt-in (DB_QUERY_STATS=1) per-statement timing attributed to repository
+  methods, with a slow statement registry (see db.instrumentation,
+  DatabaseManager.get_query_stats)
 """
 
 import os
-from typing import Generator, Optional
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 from contextlib import contextmanager
 import logging
 
@@ -14,6 +24,9 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 from .models import Base
+from .pool import PoolConfig, TimedQueuePool, TimedAsyncAdaptedQueuePool, pool_status
+from .instrumentation import query_registry, instrument_engine, engine_options, compiled_cache_status
+from .stats_tracking import install_stats_tracking
 
 logger = logging.getLogger(__name__)
 
@@ -23,18 +36,97 @@ DATABASE_URL = os.getenv(
     'sqlite:///./grc_platform.db'
 )
 
+# Optional read replica for reporting / dashboard queries
+DATABASE_READ_URL = os.getenv('DATABASE_READ_URL', '')
+
+# Async drivers substituted when deriving the async URL
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver for its async counterpart (asyncpg / aiosqlite)"""
+    scheme, sep, rest = url.partition('://')
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def _display_url(url: str) -> str:
+    return url.split('@')[-1] if '@' in url else url
+
+
+def _enable_sqlite_foreign_keys(engine) -> None:
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 
 class DatabaseManager:
     """
     Database manager for handling connections and sessions.
+
+    Args:
+        database_url: Primary database URL (default: DATABASE_URL)
+        read_url: Read replica URL (default: DATABASE_READ_URL; empty
+            routes reads to the primary)
+        pool_config: Pool settings (default: PoolConfig.from_env())
+        async_url: Async URL (default: DATABASE_ASYNC_URL, or
+            database_url with the async driver swapped in)
     """
 
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        read_url: Optional[str] = None,
+        pool_config: Optional[PoolConfig] = None,
+        async_url: Optional[str] = None
+    ):
         self.database_url = database_url or DATABASE_URL
+        self.read_url = read_url if read_url is not None else DATABASE_READ_URL
+        self.pool_config = pool_config or PoolConfig.from_env()
+        self.async_url = async_url or os.getenv('DATABASE_ASYNC_URL') or to_async_url(self.database_url)
+
         self.engine = None
         self.SessionLocal = None
+        self.read_engine = None
+        self.ReadSessionLocal = None
         self._initialized = False
 
+        self.async_engine = None
+        self.AsyncSessionLocal = None
+        self.async_read_engine = None
+        self.AsyncReadSessionLocal = None
+        self._async_initialized = False
+
+    def _create_engine(self, url: str, echo: bool, name: str = "primary"):
+        # Handle SQLite special case
+        if url.startswith('sqlite'):
+            engine = create_engine(
+                url,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+                echo=echo,
+                **engine_options(url)
+            )
+            # Enable foreign keys for SQLite
+            _enable_sqlite_foreign_keys(engine)
+        else:
+            # PostgreSQL or other databases
+            engine = create_engine(
+                url,
+                poolclass=TimedQueuePool,
+                echo=echo,
+                **self.pool_config.engine_kwargs(),
+                **engine_options(url)
+            )
+
+        instrument_engine(engine, name)
+        return engine
+
     def init(self, echo: bool = False):
         """
         Initialize database engine and session factory.
@@ -45,39 +137,83 @@ class DatabaseManager:
         if self._initialized:
             return
 
-        # Handle SQLite special case
-        if self.database_url.startswith('sqlite'):
-            self.engine = create_engine(
-                self.database_url,
-                connect_args={"check_same_thread": False},
-                poolclass=StaticPool,
-                echo=echo
+        self.engine = self._create_engine(self.database_url, echo)
+        self.SessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.engine
+        )
+
+        if self.read_url:
+            self.read_engine = self._create_engine(self.read_url, echo, "replica")
+            self.ReadSessionLocal = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=self.read_engine
             )
+        install_stats_tracking()
 
-            # Enable foreign keys for SQLite
-            @event.listens_for(self.engine, "connect")
-            def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
+        self._initialized = True
+        logger.info(f"Database initialized: {_display_url(self.database_url)}")
+        if self.read_url:
+            logger.info(f"Read replica: {_display_url(self.read_url)}")
+
+    def _create_async_engine(self, url: str, echo: bool, name: str = "async_primary"):
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        if url.startswith('sqlite'):
+            engine = create_async_engine(url, poolclass=StaticPool, echo=echo, **engine_options(url))
+            _enable_sqlite_foreign_keys(engine.sync_engine)
         else:
-            # PostgreSQL or other databases
-            self.engine = create_engine(
-                self.database_url,
-                pool_size=5,
-                max_overflow=10,
-                pool_pre_ping=True,
-                echo=echo
+            engine = create_async_engine(
+                url,
+                poolclass=TimedAsyncAdaptedQueuePool,
+                echo=echo,
+                **self.pool_config.engine_kwargs(),
+                **engine_options(url)
             )
 
-        self.SessionLocal = sessionmaker(
-            autocommit=False,
+        instrument_engine(engine, name)
+        return engine
+
+    def init_async(self, echo: bool = False):
+        """
+        Initialize the AsyncEngine and async session factories.
+
+        Requires the async driver for the URL (asyncpg for PostgreSQL,
+        aiosqlite for SQLite). Sessions keep loaded attributes after
+        commit, since async code cannot lazy-load expired ones.
+        """
+        if self._async_initialized:
+            return
+        if not self._initialized:
+            self.init(echo=echo)
+
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        self.async_engine = self._create_async_engine(self.async_url, echo)
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine,
             autoflush=False,
-            bind=self.engine
+            expire_on_commit=False
         )
 
-        self._initialized = True
-        logger.info(f"Database initialized: {self.database_url.split('@')[-1] if '@' in self.database_url else self.database_url}")
+        if self.read_url:
+            self.async_read_engine = self._create_async_engine(to_async_url(self.read_url), echo, "async_replica")
+            self.AsyncReadSessionLocal = async_sessionmaker(
+                bind=self.async_read_engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
+
+        self._async_initialized = True
+        logger.info(f"Async database initialized: {_display_url(self.async_url)}")
+
+    async def dispose_async(self):
+        """Close async pools (call on shutdown)"""
+        for engine in (self.async_engine, self.async_read_engine):
+            if engine is not None:
+                await engine.dispose()
 
     def create_tables(self):
         """Create all database tables"""
@@ -102,6 +238,53 @@ class DatabaseManager:
 
         return self.SessionLocal()
 
+    @property
+    def has_read_replica(self) -> bool:
+        return bool(self.read_url)
+
+    def get_read_session(self) -> Session:
+        """Session on the read replica (the primary when none is configured)"""
+        if not self._initialized:
+            self.init()
+
+        return (self.ReadSessionLocal or self.SessionLocal)()
+
+    def get_async_session(self):
+        """New AsyncSession on the primary"""
+        if not self._async_initialized:
+            self.init_async()
+
+        return self.AsyncSessionLocal()
+
+    def get_async_read_session(self):
+        """New AsyncSession on the read replica (or the primary)"""
+        if not self._async_initialized:
+            self.init_async()
+
+        return (self.AsyncReadSessionLocal or self.AsyncSessionLocal)()
+
+    def _engines(self) -> Dict[str, Any]:
+        """Initialized (sync) engines by name"""
+        engines = {
+            "primary": self.engine,
+            "replica": self.read_engine,
+            "async_primary": self.async_engine.sync_engine if self.async_engine else None,
+            "async_replica": self.async_read_engine.sync_engine if self.async_read_engine else None,
+        }
+        return {name: engine for name, engine in engines.items() if engine is not None}
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Occupancy and checkout wait metrics for every initialized pool"""
+        return {name: pool_status(engine.pool) for name, engine in self._engines().items()}
+
+    def get_query_stats(self, limit: int = 20, order_by: str = "total_ms") -> Dict[str, Any]:
+        """Statement timings by call site, slowest statements and compiled cache usage"""
+        stats = query_registry.snapshot(limit, order_by)
+        stats["compiled_cache"]["engines"] = {
+            name: compiled_cache_status(engine) for name, engine in self._engines().items()
+        }
+        return stats
+
     @contextmanager
     def session_scope(self) -> Generator[Session, None, None]:
         """
@@ -135,7 +318,9 @@ class DatabaseManager:
                 conn.execute(text("SELECT 1"))
             return {
                 "status": "healthy",
-                "database": self.database_url.split('@')[-1] if '@' in self.database_url else "local"
+                "database": self.database_url.split('@')[-1] if '@' in self.database_url else "local",
+                "read_replica": self.has_read_replica,
+                "pools": self.get_pool_metrics()
             }
         except Exception as e:
             return {
@@ -177,3 +362,46 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency for report and dashboard reads; uses the read replica when
+    DATABASE_READ_URL is set. Do not write through this session.
+    """
+    if not db_manager._initialized:
+        db_manager.init()
+        db_manager.create_tables()
+
+    db = db_manager.get_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[Any, None]:
+    """
+    Dependency for async handlers: an AsyncSession on the primary.
+
+    Usage in FastAPI:
+        @app.get("/users")
+        async def get_users(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    if not db_manager._initialized:
+        db_manager.init()
+        db_manager.create_tables()
+
+    async with db_manager.get_async_session() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[Any, None]:
+    """Async counterpart of get_read_db"""
+    if not db_manager._initialized:
+        db_manager.init()
+        db_manager.create_tables()
+
+    async with db_manager.get_async_read_session() as db:
+        yield db
@@ -0,0 +1,337 @@
+"""
+Query Instrumentation
+
+Engine event hooks that time every statement and attribute it to the
+repository method that issued it:
+- per call site (e.g. UserRepository.get_users_page) and per statement:
+  calls, total / max time and affected row counts (null for reads,
+  whose DBAPI rowcount is -1)
+- top-N slowest executions (statement text only, never parameters)
+- opt-in compiled-statement cache sizing with hit-ratio reporting
+
+Call sites are resolved from the stack: the outermost method of the
+repository call that ran the statement. Code outside repositories can
+label its statements with query_tag().
+
+Environment:
+    DB_QUERY_STATS (1 enables instrumentation, default off: every
+        statement pays for a stack walk to resolve its call site)
+    DB_SLOW_QUERY_MS (log statements slower than this, default 200)
+    DB_SLOW_QUERY_TOP (size of the slow statement registry, default 50)
+    DB_QUERY_CACHE_SIZE (compiled statement cache entries per engine;
+        setting it turns on cache hit accounting)
+    DB_PREPARED_CACHE_SIZE (asyncpg prepared statement cache per
+        connection, with DB_QUERY_CACHE_SIZE)
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS", "0") in ("1", "true", "True")
+SLOW_QUERY_MS = _env_int("DB_SLOW_QUERY_MS", 200)
+SLOW_QUERY_TOP = _env_int("DB_SLOW_QUERY_TOP", 50)
+QUERY_CACHE_SIZE = _env_int("DB_QUERY_CACHE_SIZE", 0)
+PREPARED_CACHE_SIZE = _env_int("DB_PREPARED_CACHE_SIZE", 0)
+
+# Distinct (call site, statement) pairs kept before new ones are folded
+# into one bucket per call site
+MAX_TRACKED_STATEMENTS = 1000
+MAX_STATEMENT_LENGTH = 2000
+
+UNATTRIBUTED = "unattributed"
+REPOSITORY_PACKAGE = "repositories."
+# Wrappers that forward to another repository; their frames are skipped
+PASSTHROUGH_MODULES = {"repositories.async_repository"}
+# Frames never used as a fallback call site
+LIBRARY_PREFIXES = ("sqlalchemy.", "greenlet", "contextlib", "asyncio", "concurrent.", "threading", __name__)
+
+_current_tag: ContextVar[Optional[str]] = ContextVar("query_tag", default=None)
+
+# "IN (?, ?, ?)" / "IN (%(id_1_1)s, %(id_1_2)s)" / "IN ($1, $2)" -> "IN (...)"
+_PARAM_LIST = re.compile(
+    r"\(\s*(?:\?|%\([^)]+\)s|%s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\([^)]+\)s|%s|\$\d+|:\w+))+\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@contextmanager
+def query_tag(tag: str) -> Iterator[None]:
+    """
+    Attribute statements run inside the block to `tag`.
+
+    Usage:
+        with query_tag("StatsService.refresh"):
+            service.refresh(tenant_id)
+    """
+    token = _current_tag.set(tag)
+    try:
+        yield
+    finally:
+        _current_tag.reset(token)
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and expanded IN lists so variants share one entry"""
+    statement = _PARAM_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+    return statement[:MAX_STATEMENT_LENGTH]
+
+
+def resolve_call_site() -> str:
+    """Repository.method that issued the current statement"""
+    tag = _current_tag.get()
+    if tag:
+        return tag
+
+    site = None
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(REPOSITORY_PACKAGE):
+            if module not in PASSTHROUGH_MODULES:
+                owner = frame.f_locals.get("self")
+                owner_name = type(owner).__name__ if owner is not None else module
+                site = f"{owner_name}.{frame.f_code.co_name}"
+        elif site is not None:
+            break
+        elif fallback is None and not module.startswith(LIBRARY_PREFIXES):
+            fallback = f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return site or fallback or UNATTRIBUTED
+
+
+@dataclass
+class StatementStats:
+    """Aggregate timings for one statement issued from one call site"""
+    call_site: str
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    # Rows affected, from cursor.rowcount. DBAPIs report -1 for SELECT, so
+    # reads stay None ("unknown") rather than showing 0 rows
+    rows: Optional[int] = None
+
+    def record(self, elapsed_ms: float, rows: Optional[int]) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        if rows is not None:
+            self.rows = (self.rows or 0) + rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "call_site": self.call_site,
+            "statement": self.statement,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+        }
+
+
+class QueryRegistry:
+    """In-process statement statistics (thread-safe)"""
+
+    def __init__(self, top_n: int = SLOW_QUERY_TOP):
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements: Dict[Tuple[str, str], StatementStats] = {}
+            self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+            self._cache: Dict[str, int] = {}
+            self.started_at = datetime.utcnow()
+
+    def record(
+        self,
+        call_site: str,
+        statement: str,
+        elapsed_ms: float,
+        rows: Optional[int] = None,
+        engine: str = "primary",
+        cache: Optional[str] = None
+    ) -> None:
+        statement = normalize_statement(statement)
+        key = (call_site, statement)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                if len(self._statements) >= MAX_TRACKED_STATEMENTS:
+                    key = (call_site, "<other statements>")
+                    stats = self._statements.get(key)
+                if stats is None:
+                    stats = self._statements[key] = StatementStats(*key)
+            stats.record(elapsed_ms, rows)
+
+            if cache is not None:
+                self._cache[cache] = self._cache.get(cache, 0) + 1
+
+            if self.top_n > 0 and (len(self._slowest) < self.top_n or elapsed_ms > self._slowest[0][0]):
+                entry = {
+                    "call_site": call_site,
+                    "statement": statement,
+                    "elapsed_ms": round(elapsed_ms, 3),
+                    "rows": rows,
+                    "engine": engine,
+                    "at": datetime.utcnow().isoformat(),
+                }
+                item = (elapsed_ms, next(self._seq), entry)
+                if len(self._slowest) < self.top_n:
+                    heapq.heappush(self._slowest, item)
+                else:
+                    heapq.heapreplace(self._slowest, item)
+
+    # ============== Reports ==============
+
+    def call_sites(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Call sites ordered by total database time"""
+        sites: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for stats in self._statements.values():
+                site = sites.setdefault(stats.call_site, {
+                    "call_site": stats.call_site,
+                    "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": None, "statements": 0,
+                })
+                site["calls"] += stats.calls
+                site["total_ms"] += stats.total_ms
+                site["max_ms"] = max(site["max_ms"], stats.max_ms)
+                if stats.rows is not None:
+                    site["rows"] = (site["rows"] or 0) + stats.rows
+                site["statements"] += 1
+
+        ranked = sorted(sites.values(), key=lambda s: s["total_ms"], reverse=True)[:limit]
+        for site in ranked:
+            site["avg_ms"] = round(site["total_ms"] / site["calls"], 3) if site["calls"] else 0.0
+            site["total_ms"] = round(site["total_ms"], 3)
+            site["max_ms"] = round(site["max_ms"], 3)
+        return ranked
+
+    def top_statements(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """Statements ordered by total_ms, max_ms or calls"""
+        if order_by not in ("total_ms", "max_ms", "calls"):
+            raise ValueError(f"Unsupported order: {order_by}")
+        with self._lock:
+            ranked = sorted(self._statements.values(), key=lambda s: getattr(s, order_by), reverse=True)[:limit]
+            return [s.to_dict() for s in ranked]
+
+    def slowest(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Slowest individual executions, slowest first"""
+        with self._lock:
+            ranked = sorted(self._slowest, key=lambda item: item[0], reverse=True)
+        return [dict(entry) for _, _, entry in ranked[:limit]]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Compiled cache outcomes (empty unless DB_QUERY_CACHE_SIZE is set)"""
+        with self._lock:
+            outcomes = dict(self._cache)
+        hits = outcomes.get("CACHE_HIT", 0)
+        misses = outcomes.get("CACHE_MISS", 0)
+        return {
+            "enabled": QUERY_CACHE_SIZE > 0,
+            "outcomes": outcomes,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+
+    def snapshot(self, limit: int = 20, order_by: str = "total_ms") -> Dict[str, Any]:
+        with self._lock:
+            calls = sum(s.calls for s in self._statements.values())
+            total_ms = sum(s.total_ms for s in self._statements.values())
+        return {
+            "enabled": QUERY_STATS_ENABLED,
+            "since": self.started_at.isoformat(),
+            "statements_executed": calls,
+            "total_ms": round(total_ms, 3),
+            "slow_threshold_ms": SLOW_QUERY_MS,
+            "call_sites": self.call_sites(limit),
+            "top_statements": self.top_statements(limit, order_by),
+            "slowest": self.slowest(limit),
+            "compiled_cache": self.cache_stats(),
+        }
+
+
+query_registry = QueryRegistry()
+
+
+# ==================== Engine Hooks ====================
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """create_engine() keyword arguments for the opt-in statement caches"""
+    if QUERY_CACHE_SIZE <= 0:
+        return {}
+    options: Dict[str, Any] = {"query_cache_size": QUERY_CACHE_SIZE}
+    if PREPARED_CACHE_SIZE > 0 and url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"prepared_statement_cache_size": PREPARED_CACHE_SIZE}
+    return options
+
+
+def compiled_cache_status(engine) -> Optional[Dict[str, Any]]:
+    """Occupancy of an engine's compiled statement cache"""
+    cache = getattr(getattr(engine, "sync_engine", engine), "_compiled_cache", None)
+    if cache is None:
+        return None
+    return {"entries": len(cache), "capacity": getattr(cache, "capacity", None)}
+
+
+def instrument_engine(engine, name: str = "primary", registry: Optional[QueryRegistry] = None) -> None:
+    """Time and attribute every statement run on engine (sync or async)"""
+    if not QUERY_STATS_ENABLED:
+        return
+    registry = registry or query_registry
+    sync_engine = getattr(engine, "sync_engine", engine)
+    track_cache = QUERY_CACHE_SIZE > 0
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_timing = (time.perf_counter(), resolve_call_site())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timing = getattr(context, "_query_timing", None)
+        if timing is None:
+            return
+        start, call_site = timing
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        rowcount = getattr(cursor, "rowcount", -1)
+        rows = rowcount if rowcount is not None and rowcount >= 0 else None
+
+        cache = None
+        if track_cache and getattr(context, "compiled", None) is not None:
+            outcome = getattr(context, "cache_hit", None)
+            cache = getattr(outcome, "name", None) or str(outcome)
+
+        registry.record(call_site, statement, elapsed_ms, rows, engine=name, cache=cache)
+
+        if elapsed_ms >= SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow query ({elapsed_ms:.1f}ms, {name}) at {call_site}: "
+                f"{normalize_statement(statement)[:200]}"
+            )
@@ -4,6 +4,9 @@ from .user import User, Role, UserRole, UserEntitlement
 from .risk import RiskViolation, MitigationControl, RiskRuleModel
 from .firefighter import FirefighterRequest, FirefighterSession, FirefighterActivity
 from .audit import AuditLog, AccessRequestLog
+from .notification import InboxNotification, InboxCounter
+from .usage import UsageBucket
+from .stats import TenantStatsSummary
 from .sap_security_controls import (
     SAPSecurityControl,
     ControlValueMapping,
@@ -30,6 +33,10 @@ __all__ = [
     "FirefighterActivity",
     "AuditLog",
     "AccessRequestLog",
+    "InboxNotification",
+    "InboxCounter",
+    "UsageBucket",
+    "TenantStatsSummary",
     "SAPSecurityControl",
     "ControlValueMapping",
     "ControlEvaluation",
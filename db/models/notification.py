@@ -0,0 +1,103 @@
+"""
+Database Models - Notification Inbox
+
+Persistent per-user notification inbox with maintained unread counters.
+"""
+
+from sqlalchemy import (
+    Column, Integer, String, Boolean, DateTime, Text, JSON, Index
+)
+from datetime import datetime
+
+from .base import Base
+
+
+class InboxNotification(Base):
+    """
+    A notification delivered to a user's in-app inbox.
+
+    Listing is keyset-paginated over (tenant_id, recipient_user_id,
+    created_at, id), which the composite index below serves directly.
+    """
+    __tablename__ = 'inbox_notifications'
+    __table_args__ = (
+        Index('ix_inbox_user_created', 'tenant_id', 'recipient_user_id', 'created_at', 'id'),
+        Index('ix_inbox_user_unread', 'tenant_id', 'recipient_user_id', 'is_read'),
+        Index('ix_inbox_read_at', 'is_read', 'read_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Multi-tenant support
+    tenant_id = Column(String(100), nullable=False, default='tenant_default')
+
+    # Identity
+    notification_id = Column(String(50), nullable=False, unique=True)
+    notification_type = Column(String(50), nullable=False)
+
+    # Recipient
+    recipient_user_id = Column(String(50), nullable=False)
+    recipient_email = Column(String(255), nullable=True)
+
+    # Content
+    subject = Column(String(500), nullable=False, default='')
+    body = Column(Text, nullable=True)
+    context = Column(JSON, nullable=True)
+    reference_type = Column(String(50), nullable=True)
+    reference_id = Column(String(100), nullable=True)
+    priority = Column(String(20), default='normal')
+    action_url = Column(String(500), nullable=True)
+    action_label = Column(String(100), nullable=True)
+
+    # Status
+    is_read = Column(Boolean, default=False, nullable=False)
+    read_at = Column(DateTime, nullable=True)
+
+    # Delivery on the other channels, written back by the service/dispatcher
+    is_sent = Column(Boolean, default=False, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+    delivery_status = Column(JSON, nullable=True)  # channel -> status
+
+    # Timing
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<InboxNotification(notification_id='{self.notification_id}', user='{self.recipient_user_id}')>"
+
+    def to_dict(self):
+        return {
+            'notification_id': self.notification_id,
+            'notification_type': self.notification_type,
+            'recipient_user_id': self.recipient_user_id,
+            'subject': self.subject,
+            'body': self.body,
+            'reference_type': self.reference_type,
+            'reference_id': self.reference_id,
+            'priority': self.priority,
+            'is_read': self.is_read,
+            'read_at': self.read_at.isoformat() if self.read_at else None,
+            'is_sent': self.is_sent,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'action_url': self.action_url,
+            'action_label': self.action_label
+        }
+
+
+class InboxCounter(Base):
+    """
+    Per-user unread/total counters, maintained in the same transaction as
+    every inbox write so the unread badge is a primary-key lookup.
+    """
+    __tablename__ = 'inbox_counters'
+
+    tenant_id = Column(String(100), primary_key=True, default='tenant_default')
+    user_id = Column(String(50), primary_key=True)
+
+    unread_count = Column(Integer, default=0, nullable=False)
+    total_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<InboxCounter(user='{self.user_id}', unread={self.unread_count})>"
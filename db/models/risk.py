@@ -6,7 +6,7 @@ Models for storing risk analysis results, violations, and mitigation controls.
 
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, Text,
-    ForeignKey, JSON, Float, Enum as SQLEnum
+    ForeignKey, JSON, Float, Enum as SQLEnum, Index
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -42,6 +42,10 @@ class RiskViolation(Base, TimestampMixin):
     or sensitive permissions that violate defined risk rules.
     """
     __tablename__ = 'risk_violations'
+    __table_args__ = (
+        Index('ix_risk_violations_keyset', 'tenant_id', 'detected_at', 'id'),
+        Index('uq_risk_violations_tenant_violation', 'tenant_id', 'violation_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -182,6 +186,9 @@ class RiskRuleModel(Base, TimestampMixin):
     Complements the in-memory rules with database persistence.
     """
     __tablename__ = 'risk_rules'
+    __table_args__ = (
+        Index('uq_risk_rules_tenant_rule', 'tenant_id', 'rule_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
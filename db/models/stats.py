@@ -0,0 +1,32 @@
+"""
+Database Models - Statistics Summaries
+
+Materialized per-tenant dashboard statistics maintained by StatsService.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime
+
+from .base import Base
+
+
+class TenantStatsSummary(Base):
+    """
+    Last computed statistics for one tenant and entity.
+
+    Writes to the underlying table bump `version` in the same transaction;
+    the row is current while computed_version == version.
+    """
+    __tablename__ = 'tenant_stats_summaries'
+
+    tenant_id = Column(String(100), primary_key=True)
+    entity = Column(String(50), primary_key=True)  # users, violations, rules
+
+    payload = Column(JSON, nullable=False, default=dict)
+    version = Column(Integer, nullable=False, default=0)
+    computed_version = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return (f"<TenantStatsSummary(tenant='{self.tenant_id}', entity='{self.entity}', "
+                f"version={self.version}, computed={self.computed_version})>")
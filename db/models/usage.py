@@ -0,0 +1,41 @@
+"""
+Database Models - Usage Metering
+
+Time-bucketed usage counters flushed from the in-process metering engine.
+"""
+
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Float, UniqueConstraint, Index
+)
+
+from .base import Base
+
+
+class UsageBucket(Base):
+    """
+    Aggregated usage for one tenant, usage type and time bucket.
+
+    Rows are accumulated (not replaced) on every metering flush.
+    """
+    __tablename__ = 'usage_buckets'
+    __table_args__ = (
+        UniqueConstraint(
+            'tenant_id', 'usage_type', 'granularity', 'bucket_start',
+            name='uq_usage_bucket'
+        ),
+        Index('ix_usage_buckets_range', 'tenant_id', 'granularity', 'bucket_start'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    tenant_id = Column(String(100), nullable=False)
+    usage_type = Column(String(50), nullable=False)
+    granularity = Column(String(10), nullable=False)  # minute, hour, day
+    bucket_start = Column(DateTime, nullable=False)
+
+    quantity = Column(Float, default=0.0, nullable=False)
+    event_count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return (f"<UsageBucket(tenant='{self.tenant_id}', type='{self.usage_type}', "
+                f"{self.granularity}={self.bucket_start}, quantity={self.quantity})>")
@@ -7,7 +7,7 @@ synchronized from SAP and other connected systems.
 
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, Text,
-    ForeignKey, Table, JSON, Float, Enum as SQLEnum, UniqueConstraint
+    ForeignKey, Table, JSON, Float, Enum as SQLEnum, UniqueConstraint, Index, func
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -119,6 +119,10 @@ class User(Base, TimestampMixin):
         }
 
 
+# Keyset ordering used by UserRepository.LIST_ORDER
+Index('ix_users_keyset_name', User.tenant_id, func.coalesce(User.full_name, ''), User.id)
+
+
 class Role(Base, TimestampMixin):
     """
     Role model representing authorization roles from connected systems.
@@ -0,0 +1,130 @@
+"""
+Statistics Change Tracking
+
+Session hooks that notice writes to the tables behind tenant dashboard
+statistics:
+- after_flush: records (tenant_id, entity) for every new, changed or
+  deleted row, and bumps the matching TenantStatsSummary.version in the
+  same transaction
+- after_commit: notifies in-process listeners (the stats cache) so the
+  next read recomputes
+- rollbacks discard what was recorded
+
+Core-level bulk writes (BaseRepository.bulk_insert / bulk_upsert) bypass
+the flush, so they report what they touched through record_bulk_write().
+"""
+
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+import logging
+import threading
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from .models.stats import TenantStatsSummary
+
+logger = logging.getLogger(__name__)
+
+# Table name -> statistics entity
+TRACKED_TABLES: Dict[str, str] = {
+    "users": "users",
+    "risk_violations": "violations",
+    "risk_rules": "rules",
+}
+
+_SESSION_KEY = "stats_touched"
+
+_listeners: List[Callable[[str, str], None]] = []
+_summary_tables: Dict[int, bool] = {}
+_install_lock = threading.Lock()
+_installed = False
+
+
+def add_invalidation_listener(listener: Callable[[str, str], None]) -> None:
+    """Call listener(tenant_id, entity) after each commit that changed it"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def summaries_enabled(connection) -> bool:
+    """
+    Whether the summary table exists on this connection's engine (checked
+    once). Inspects through the given connection so the check joins the
+    current transaction instead of checking out another connection.
+    """
+    key = id(connection.engine)
+    if key not in _summary_tables:
+        try:
+            _summary_tables[key] = inspect(connection).has_table(TenantStatsSummary.__tablename__)
+        except Exception as e:
+            logger.debug(f"Stats summary table check failed: {e}")
+            _summary_tables[key] = False
+    return _summary_tables[key]
+
+
+def _record(session: Session, touched: Set[Tuple[str, str]]) -> None:
+    pending = session.info.setdefault(_SESSION_KEY, set())
+    new = touched - pending
+    pending.update(touched)
+
+    connection = session.connection()
+    if new and summaries_enabled(connection):
+        for tenant_id, entity in new:
+            connection.execute(
+                update(TenantStatsSummary)
+                .where(
+                    TenantStatsSummary.tenant_id == tenant_id,
+                    TenantStatsSummary.entity == entity
+                )
+                .values(version=TenantStatsSummary.version + 1)
+            )
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    touched: Set[Tuple[str, str]] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        entity = TRACKED_TABLES.get(getattr(obj, "__tablename__", None))
+        tenant_id = getattr(obj, "tenant_id", None)
+        if entity and tenant_id:
+            touched.add((tenant_id, entity))
+    if touched:
+        _record(session, touched)
+
+
+def record_bulk_write(session: Session, table_name: str, tenant_ids: Iterable[str]) -> None:
+    """Record a write that did not go through the session flush"""
+    entity = TRACKED_TABLES.get(table_name)
+    if entity:
+        touched = {(tenant_id, entity) for tenant_id in tenant_ids if tenant_id}
+        if touched:
+            _record(session, touched)
+
+
+def _after_commit(session: Session) -> None:
+    touched = session.info.pop(_SESSION_KEY, None)
+    if not touched:
+        return
+    for tenant_id, entity in touched:
+        for listener in _listeners:
+            try:
+                listener(tenant_id, entity)
+            except Exception as e:
+                logger.warning(f"Stats invalidation listener failed: {e}")
+
+
+def _after_soft_rollback(session: Session, previous_transaction) -> None:
+    # Only a rollback of the outermost transaction discards the writes
+    if previous_transaction.parent is None:
+        session.info.pop(_SESSION_KEY, None)
+
+
+def install_stats_tracking() -> None:
+    """Register the session hooks (idempotent)"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_soft_rollback)
+        _installed = True
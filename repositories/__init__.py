@@ -4,14 +4,30 @@ Database operations with tenant isolation
 """
 
 from .base import BaseRepository
+from .pagination import Page, KeysetColumn, CountCache, count_cache
 from .user_repository import UserRepository
 from .role_repository import RoleRepository
 from .risk_repository import RiskViolationRepository, RiskRuleRepository
+from .notification_repository import NotificationRepository
+from .audit_repository import AuditLogRepository
+from .async_repository import (
+    AsyncRepository, AsyncUserRepository, AsyncRiskViolationRepository, AsyncAuditLogRepository
+)
 
 __all__ = [
     "BaseRepository",
+    "Page",
+    "KeysetColumn",
+    "CountCache",
+    "count_cache",
     "UserRepository",
     "RoleRepository",
     "RiskViolationRepository",
     "RiskRuleRepository",
+    "NotificationRepository",
+    "AuditLogRepository",
+    "AsyncRepository",
+    "AsyncUserRepository",
+    "AsyncRiskViolationRepository",
+    "AsyncAuditLogRepository",
 ]
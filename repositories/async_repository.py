@@ -0,0 +1,66 @@
+"""
+Async Repositories
+AsyncSession variants of the repositories behind the hot read endpoints
+"""
+
+from typing import Any, Callable, Generic, Type, TypeVar
+
+from .base import BaseRepository
+from .user_repository import UserRepository
+from .risk_repository import RiskViolationRepository
+from .audit_repository import AuditLogRepository
+
+RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
+T = TypeVar("T")
+
+
+class AsyncRepository(Generic[RepositoryType]):
+    """
+    Async wrapper around a synchronous repository.
+
+    Each call runs the repository method inside AsyncSession.run_sync, so
+    statements go through the async driver (asyncpg / aiosqlite) without
+    blocking the event loop, and the query logic lives in one place.
+
+    Any relationship the caller needs must be loaded inside the call
+    (eager options in the repository, or use run()); touching an unloaded
+    lazy attribute afterwards raises MissingGreenlet.
+
+    Usage:
+        repo = AsyncUserRepository(db)
+        page = await repo.get_users_page(tenant_id, status="active")
+        count = await repo.run(lambda r: r.get_count(tenant_id))
+    """
+
+    repository_class: Type[RepositoryType]
+
+    def __init__(self, db: Any):
+        self.db = db
+
+    async def run(self, fn: Callable[[RepositoryType], T]) -> T:
+        """Run fn(sync_repository) on this session's connection"""
+        return await self.db.run_sync(lambda session: fn(self.repository_class(session)))
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.repository_class, name)
+        if name.startswith("__") or not callable(attr):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self.run(lambda repository: getattr(repository, name)(*args, **kwargs))
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+
+class AsyncUserRepository(AsyncRepository[UserRepository]):
+    repository_class = UserRepository
+
+
+class AsyncRiskViolationRepository(AsyncRepository[RiskViolationRepository]):
+    repository_class = RiskViolationRepository
+
+
+class AsyncAuditLogRepository(AsyncRepository[AuditLogRepository]):
+    repository_class = AuditLogRepository
@@ -0,0 +1,137 @@
+"""
+Audit Repository
+Database queries over the audit trail
+"""
+
+from typing import Optional, List, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from datetime import datetime
+
+from .base import BaseRepository
+from db.models.audit import AuditLog, AuditAction
+
+
+class AuditLogRepository(BaseRepository[AuditLog]):
+    """
+    Repository for audit log queries.
+
+    Audit entries are platform-wide (no tenant_id column); reports are
+    aggregated in SQL rather than by loading every entry in the period.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(db, AuditLog)
+
+    def _filtered_logs_query(
+        self,
+        action: Optional[AuditAction] = None,
+        actor_user_id: Optional[str] = None,
+        target_id: Optional[str] = None,
+        target_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        success_only: bool = False,
+        action_prefix: Optional[str] = None
+    ):
+        query = self.db.query(AuditLog)
+
+        if action:
+            query = query.filter(AuditLog.action == action)
+        if action_prefix:
+            actions = [a for a in AuditAction if a.value.startswith(action_prefix)]
+            query = query.filter(AuditLog.action.in_(actions))
+        if actor_user_id:
+            query = query.filter(AuditLog.actor_user_id == actor_user_id)
+        if target_id:
+            query = query.filter(AuditLog.target_id == target_id)
+        if target_type:
+            query = query.filter(AuditLog.target_type == target_type)
+        if start_date:
+            query = query.filter(AuditLog.timestamp >= start_date)
+        if end_date:
+            query = query.filter(AuditLog.timestamp <= end_date)
+        if success_only:
+            query = query.filter(AuditLog.success == True)
+
+        return query
+
+    def query_logs(
+        self,
+        action: Optional[AuditAction] = None,
+        actor_user_id: Optional[str] = None,
+        target_id: Optional[str] = None,
+        target_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        success_only: bool = False,
+        action_prefix: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[AuditLog]:
+        """Audit entries matching the filters, newest first"""
+        query = self._filtered_logs_query(
+            action, actor_user_id, target_id, target_type,
+            start_date, end_date, success_only, action_prefix
+        )
+        return query.order_by(AuditLog.timestamp.desc()).offset(offset).limit(limit).all()
+
+    def get_activity_summary(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        top: int = 10
+    ) -> Dict[str, Any]:
+        """Entry, failure and actor counts plus top actions/actors and a per-day histogram"""
+        in_period = (AuditLog.timestamp >= start_date, AuditLog.timestamp <= end_date)
+
+        total, failed, actors = self.db.query(
+            func.count(AuditLog.id),
+            func.coalesce(func.sum(case((AuditLog.success == False, 1), else_=0)), 0),
+            func.count(func.distinct(AuditLog.actor_user_id))
+        ).filter(*in_period).one()
+
+        by_action = self.db.query(
+            AuditLog.action, func.count(AuditLog.id).label("n")
+        ).filter(*in_period).group_by(AuditLog.action).order_by(func.count(AuditLog.id).desc()).limit(top).all()
+
+        by_actor = self.db.query(
+            AuditLog.actor_user_id, func.count(AuditLog.id).label("n")
+        ).filter(*in_period, AuditLog.actor_user_id.isnot(None)).group_by(
+            AuditLog.actor_user_id
+        ).order_by(func.count(AuditLog.id).desc()).limit(top).all()
+
+        day = func.date(AuditLog.timestamp)
+        by_day = self.db.query(day, func.count(AuditLog.id)).filter(*in_period).group_by(day).order_by(day).all()
+
+        return {
+            "total_entries": total,
+            "failed_actions": int(failed),
+            "unique_actors": actors,
+            "top_actors": [{"user_id": a, "count": n} for a, n in by_actor],
+            "top_actions": [{"action": a.value, "count": n} for a, n in by_action],
+            "by_day": {str(d): n for d, n in by_day},
+        }
+
+    def get_compliance_summary(
+        self,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, Any]:
+        """Compliance-relevant entries per action with failure counts"""
+        rows = self.db.query(
+            AuditLog.action,
+            func.count(AuditLog.id),
+            func.coalesce(func.sum(case((AuditLog.success == False, 1), else_=0)), 0)
+        ).filter(
+            AuditLog.timestamp >= start_date,
+            AuditLog.timestamp <= end_date,
+            AuditLog.compliance_relevant == True
+        ).group_by(AuditLog.action).all()
+
+        by_action = {action.value: {"count": count, "failed": int(failed)} for action, count, failed in rows}
+        return {
+            "total_entries": sum(v["count"] for v in by_action.values()),
+            "by_action": by_action,
+            "failed_actions": sum(v["failed"] for v in by_action.values()),
+        }
@@ -3,13 +3,30 @@ Base Repository
 Provides common database operations with tenant isolation
 """
 
-from typing import TypeVar, Generic, Type, Optional, List, Any
+from typing import TypeVar, Generic, Type, Optional, List, Any, Tuple, Dict, Iterable
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, tuple_, insert, update, select, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+import json
+import logging
+
 from db.models.base import Base
+from db.stats_tracking import record_bulk_write
+from .pagination import (
+    KeysetColumn, encode_cursor, decode_cursor, count_cache,
+    COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE
+)
+from .bulk import (
+    BulkWriteResult, BULK_CHUNK_SIZE, chunked, group_by_columns, dedupe_by_key, copy_buffer
+)
+
+logger = logging.getLogger(__name__)
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Below this planner estimate an exact COUNT is cheap enough to run instead
+EXACT_COUNT_THRESHOLD = 10000
+
 
 class BaseRepository(Generic[ModelType]):
     """
@@ -70,6 +87,165 @@ class BaseRepository(Generic[ModelType]):
 
         return query.count()
 
+    # ==================== Keyset Pagination ====================
+
+    def _keyset_expression(self, column: KeysetColumn):
+        expr = getattr(self.model, column.name)
+        if column.null_value is not None:
+            expr = func.coalesce(expr, column.null_value)
+        return expr
+
+    @staticmethod
+    def _keyset_value(row: Any, column: KeysetColumn) -> Any:
+        value = getattr(row, column.name)
+        return column.null_value if value is None else value
+
+    def _keyset_after(self, exprs: List[Any], order: List[KeysetColumn], values: List[Any]):
+        """Condition selecting rows strictly after `values` in `order`"""
+        directions = {c.descending for c in order}
+        if len(directions) == 1:
+            # Row-value comparison lets the planner use a composite index range
+            if order[0].descending:
+                return tuple_(*exprs) < tuple_(*values)
+            return tuple_(*exprs) > tuple_(*values)
+
+        clauses = []
+        for i, (expr, column) in enumerate(zip(exprs, order)):
+            step = expr < values[i] if column.descending else expr > values[i]
+            clauses.append(and_(*[exprs[j] == values[j] for j in range(i)], step))
+        return or_(*clauses)
+
+    def paginate_keyset(
+        self,
+        query,
+        order: List[KeysetColumn],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Tuple[List[ModelType], Optional[str], bool]:
+        """
+        Fetch one page ordered by `order`, continuing after `cursor`.
+
+        The last KeysetColumn must be unique (normally "id"). offset is only
+        honoured for the first page, for callers still paging by offset.
+
+        Returns:
+            Tuple of (rows, next_cursor, has_more)
+
+        Raises:
+            ValueError: If the cursor is malformed or from another ordering
+        """
+        exprs = [self._keyset_expression(c) for c in order]
+        if cursor:
+            values = decode_cursor(cursor, len(order))
+            query = query.filter(self._keyset_after(exprs, order, values))
+
+        query = query.order_by(*[e.desc() if c.descending else e.asc() for e, c in zip(exprs, order)])
+        if offset and not cursor:
+            query = query.offset(offset)
+
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = encode_cursor([self._keyset_value(rows[-1], c) for c in order])
+        return rows, next_cursor, has_more
+
+    # ==================== Counts ====================
+
+    def count_cache_key(self, tenant_id: Optional[str], **filters) -> Tuple:
+        """Cache key for a filtered count; starts with (table, tenant)"""
+        return (
+            self.model.__tablename__,
+            tenant_id,
+            tuple(sorted((k, str(v)) for k, v in filters.items() if v is not None))
+        )
+
+    def invalidate_counts(self, tenant_id: Optional[str] = None) -> None:
+        """Forget cached counts for this table (and tenant)"""
+        prefix = (self.model.__tablename__, tenant_id) if tenant_id else (self.model.__tablename__,)
+        count_cache.invalidate(prefix)
+
+    @staticmethod
+    def _driver_params(compiled, dialect) -> Dict[str, Any]:
+        """
+        Compiled parameters as the driver expects them: values go through
+        their column type's bind processor (Enum members become the stored
+        label), expanded IN-list parameters included.
+        """
+        params = {}
+        for name, value in compiled.params.items():
+            # Expanded IN-list parameters are named <bind>_<n>
+            bind = compiled.binds.get(name)
+            if bind is None:
+                bind = compiled.binds.get(name.rsplit("_", 1)[0])
+            processor = bind.type.bind_processor(dialect) if bind is not None else None
+            params[name] = processor(value) if processor and value is not None else value
+        return params
+
+    def _planner_estimate(self, query) -> Optional[int]:
+        """Row estimate from PostgreSQL's planner statistics (no scan)"""
+        dialect = self.db.get_bind().dialect
+        compiled = query.order_by(None).statement.compile(
+            dialect=dialect, compile_kwargs={"render_postcompile": True}
+        )
+        try:
+            params = self._driver_params(compiled, dialect)
+            with self.db.begin_nested():
+                plan = self.db.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", params
+                ).scalar()
+        except Exception as e:
+            logger.debug(f"Planner estimate unavailable for {self.model.__tablename__}: {e}")
+            return None
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def count_query(
+        self,
+        query,
+        mode: str = COUNT_EXACT,
+        cache_key: Optional[Tuple] = None
+    ) -> Tuple[Optional[int], bool]:
+        """
+        Count the rows a query would return.
+
+        Modes:
+            exact: COUNT(*)
+            estimate: planner estimate on PostgreSQL (exact below
+                EXACT_COUNT_THRESHOLD); elsewhere an exact count cached
+                under cache_key for a short TTL
+            none: skip counting
+
+        Returns:
+            Tuple of (count, is_estimate)
+        """
+        if mode == COUNT_NONE:
+            return None, False
+
+        if mode == COUNT_ESTIMATE:
+            if self.db.get_bind().dialect.name == "postgresql":
+                estimate = self._planner_estimate(query)
+                if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+                    return estimate, True
+                logger.debug(
+                    f"Exact count for {self.model.__tablename__}: "
+                    + ("no planner estimate" if estimate is None else f"estimate {estimate} below threshold")
+                )
+            elif cache_key is not None:
+                cached = count_cache.get(cache_key)
+                if cached is not None:
+                    return cached, True
+
+        total = query.order_by(None).count()
+        if mode == COUNT_ESTIMATE and cache_key is not None:
+            count_cache.set(cache_key, total)
+        return total, False
+
     def create(self, obj_data: dict, tenant_id: Optional[str] = None) -> ModelType:
         """Create a new record"""
         if tenant_id and hasattr(self.model, 'tenant_id'):
@@ -139,15 +315,289 @@ class BaseRepository(Generic[ModelType]):
         objects_data: List[dict],
         tenant_id: Optional[str] = None
     ) -> List[ModelType]:
-        """Create multiple records"""
-        db_objects = []
-        for obj_data in objects_data:
-            if tenant_id and hasattr(self.model, 'tenant_id'):
-                obj_data['tenant_id'] = tenant_id
-            db_objects.append(self.model(**obj_data))
-
-        self.db.add_all(db_objects)
+        """
+        Create multiple records.
+
+        Uses an ORM bulk INSERT ... RETURNING, so the created objects come
+        back fully loaded without a SELECT per row.
+        """
+        rows = self._bulk_rows(objects_data, tenant_id)
+        db_objects: List[ModelType] = []
+        for chunk in chunked(rows, BULK_CHUNK_SIZE):
+            created: List[Any] = [None] * len(chunk)
+            for positions, group in group_by_columns(chunk):
+                returned = self.db.scalars(
+                    insert(self.model).returning(self.model, sort_by_parameter_order=True),
+                    group
+                ).all()
+                for position, obj in zip(positions, returned):
+                    created[position] = obj
+            db_objects.extend(created)
+        self._after_bulk_write(rows)
         self.db.commit()
-        for obj in db_objects:
-            self.db.refresh(obj)
         return db_objects
+
+    # ==================== Bulk Writes ====================
+
+    # Natural key for bulk_upsert when conflict_keys is not given; must
+    # match a unique constraint on the table
+    NATURAL_KEY: Tuple[str, ...] = ()
+
+    def _bulk_rows(self, rows: Iterable[dict], tenant_id: Optional[str]) -> List[Dict[str, Any]]:
+        table = self.model.__table__
+        prepared = []
+        for row in rows:
+            values = dict(row)
+            if tenant_id and 'tenant_id' in table.c:
+                values['tenant_id'] = tenant_id
+            unknown = [k for k in values if k not in table.c]
+            if unknown:
+                raise ValueError(f"Unknown columns for {table.name}: {', '.join(sorted(unknown))}")
+            prepared.append(values)
+        return prepared
+
+    def _after_bulk_write(self, rows: List[Dict[str, Any]]) -> None:
+        """Core writes skip the flush; report them to stats and count caches"""
+        tenant_ids = {row.get('tenant_id') for row in rows}
+        record_bulk_write(self.db, self.model.__tablename__, tenant_ids)
+        for tenant_id in tenant_ids:
+            self.invalidate_counts(tenant_id)
+
+    def _dialect_insert(self):
+        """INSERT construct with ON CONFLICT support, if the dialect has one"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            return postgresql.insert(self.model.__table__)
+        if dialect == 'sqlite':
+            return sqlite.insert(self.model.__table__)
+        return None
+
+    def _returning_columns(self, returning: Optional[List[str]]):
+        table = self.model.__table__
+        return [table.c[name] for name in returning] if returning else []
+
+    def _existing_keys(self, rows: List[Dict[str, Any]], keys: Tuple[str, ...]) -> set:
+        table = self.model.__table__
+        key_columns = [table.c[k] for k in keys]
+        wanted = {tuple(row.get(k) for k in keys) for row in rows}
+        if len(keys) == 1:
+            condition = key_columns[0].in_([w[0] for w in wanted])
+        else:
+            condition = tuple_(*key_columns).in_(list(wanted))
+        return {tuple(r) for r in self.db.execute(select(*key_columns).where(condition))}
+
+    def bulk_insert(
+        self,
+        rows: Iterable[dict],
+        tenant_id: Optional[str] = None,
+        returning: Optional[List[str]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        commit: bool = True
+    ) -> BulkWriteResult:
+        """
+        Insert rows with batched Core INSERTs (executemany).
+
+        Args:
+            rows: Column -> value dictionaries
+            tenant_id: Stamped on every row when given
+            returning: Column names to return per row (e.g. ["id"]), in
+                input order
+            chunk_size: Rows per batch
+            commit: Commit when done (otherwise the caller's transaction
+                holds the writes)
+
+        Raises:
+            ValueError: If a row has a column the table does not
+        """
+        rows = self._bulk_rows(rows, tenant_id)
+        result = BulkWriteResult()
+        columns = self._returning_columns(returning)
+
+        for chunk in chunked(rows, chunk_size):
+            returned: List[Any] = [None] * len(chunk)
+            for positions, group in group_by_columns(chunk):
+                stmt = insert(self.model.__table__)
+                if columns:
+                    stmt = stmt.returning(*columns, sort_by_parameter_order=True)
+                    for position, row in zip(positions, self.db.execute(stmt, group).all()):
+                        returned[position] = row
+                else:
+                    self.db.execute(stmt, group)
+            if columns:
+                result.rows.extend(returned)
+            result.inserted += len(chunk)
+            result.chunks += 1
+
+        if rows:
+            self._after_bulk_write(rows)
+        if commit:
+            self.db.commit()
+        return result
+
+    def bulk_upsert(
+        self,
+        rows: Iterable[dict],
+        tenant_id: Optional[str] = None,
+        conflict_keys: Optional[Tuple[str, ...]] = None,
+        update_columns: Optional[List[str]] = None,
+        returning: Optional[List[str]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        commit: bool = True
+    ) -> BulkWriteResult:
+        """
+        Insert rows, updating existing ones matched on a natural key.
+
+        Uses INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite, and
+        a keyed UPDATE plus INSERT per batch elsewhere. Rows repeating a key
+        collapse to the last occurrence.
+
+        Args:
+            rows: Column -> value dictionaries
+            tenant_id: Stamped on every row when given
+            conflict_keys: Unique key columns (default: NATURAL_KEY)
+            update_columns: Columns overwritten on conflict (default: every
+                supplied column except the key and creation columns)
+            returning: Column names to return per row, in input order
+            chunk_size: Rows per batch
+            commit: Commit when done
+
+        Raises:
+            ValueError: If no conflict key is known or a row has a column
+                the table does not
+        """
+        keys = tuple(conflict_keys or self.NATURAL_KEY)
+        if not keys:
+            raise ValueError(f"No conflict key for {self.model.__tablename__}")
+
+        rows = dedupe_by_key(self._bulk_rows(rows, tenant_id), keys)
+        result = BulkWriteResult()
+        table = self.model.__table__
+        columns = self._returning_columns(returning)
+        base_insert = self._dialect_insert()
+        skip = set(keys) | {c.name for c in table.primary_key.columns} | {'created_at'}
+
+        for chunk in chunked(rows, chunk_size):
+            existing = self._existing_keys(chunk, keys)
+            returned: List[Any] = [None] * len(chunk)
+
+            for positions, group in group_by_columns(chunk):
+                targets = update_columns or [c for c in group[0] if c not in skip]
+                onupdate = {
+                    c.name: c.onupdate.arg(None)
+                    for c in table.columns
+                    if c.onupdate is not None and c.onupdate.is_callable and c.name not in targets
+                }
+
+                if base_insert is not None:
+                    stmt = base_insert.on_conflict_do_update(
+                        index_elements=[table.c[k] for k in keys],
+                        set_={
+                            **{c: base_insert.excluded[c] for c in targets},
+                            **onupdate,
+                        }
+                    )
+                    if columns:
+                        stmt = stmt.returning(*columns, sort_by_parameter_order=True)
+                        for position, row in zip(positions, self.db.execute(stmt, group).all()):
+                            returned[position] = row
+                    else:
+                        self.db.execute(stmt, group)
+                    continue
+
+                # Portable path: UPDATE the rows whose key exists, INSERT the rest
+                updates = [r for r in group if tuple(r.get(k) for k in keys) in existing]
+                inserts = [r for r in group if tuple(r.get(k) for k in keys) not in existing]
+                if updates and targets:
+                    self.db.execute(
+                        update(table)
+                        .where(*[table.c[k] == bindparam(f"key_{k}") for k in keys])
+                        .values({**{c: bindparam(f"val_{c}") for c in targets}, **onupdate}),
+                        [
+                            {**{f"key_{k}": r[k] for k in keys}, **{f"val_{c}": r.get(c) for c in targets}}
+                            for r in updates
+                        ]
+                    )
+                if inserts:
+                    self.db.execute(insert(table), inserts)
+                if columns:
+                    key_columns = [table.c[k] for k in keys]
+                    found = {
+                        tuple(r[:len(keys)]): r[len(keys):]
+                        for r in self.db.execute(
+                            select(*key_columns, *columns)
+                            .where(tuple_(*key_columns).in_([tuple(r[k] for k in keys) for r in group]))
+                        )
+                    }
+                    for position, row in zip(positions, group):
+                        returned[position] = found.get(tuple(row[k] for k in keys))
+
+            if columns:
+                result.rows.extend(returned)
+            updated = sum(1 for r in chunk if tuple(r.get(k) for k in keys) in existing)
+            result.updated += updated
+            result.inserted += len(chunk) - updated
+            result.chunks += 1
+
+        if rows:
+            self._after_bulk_write(rows)
+        if commit:
+            self.db.commit()
+        return result
+
+    def copy_rows(
+        self,
+        rows: Iterable[dict],
+        tenant_id: Optional[str] = None,
+        commit: bool = True
+    ) -> int:
+        """
+        Load rows with PostgreSQL COPY FROM STDIN (append only).
+
+        Python-side column defaults are filled in first, since COPY only
+        applies server defaults. Falls back to bulk_insert on other
+        databases or drivers without copy_expert.
+
+        Returns:
+            Number of rows loaded
+        """
+        rows = self._bulk_rows(rows, tenant_id)
+        if not rows:
+            return 0
+
+        bind = self.db.get_bind()
+        cursor = None
+        if bind.dialect.name == 'postgresql':
+            cursor = self.db.connection().connection.cursor()
+            if not hasattr(cursor, 'copy_expert'):
+                cursor.close()
+                cursor = None
+        if cursor is None:
+            return self.bulk_insert(rows, commit=commit).inserted
+
+        table = self.model.__table__
+        defaults = {
+            c.name: c.default
+            for c in table.columns
+            if c.default is not None and not c.primary_key and (c.default.is_scalar or c.default.is_callable)
+        }
+        names = {k for row in rows for k in row} | set(defaults)
+        columns = [c.name for c in table.columns if c.name in names]
+        for row in rows:
+            for name, default in defaults.items():
+                if name not in row:
+                    row[name] = default.arg if default.is_scalar else default.arg(None)
+
+        processors = {c: table.c[c].type.bind_processor(bind.dialect) for c in columns}
+        column_list = ", ".join(bind.dialect.identifier_preparer.quote(c) for c in columns)
+        try:
+            cursor.copy_expert(
+                f"COPY {bind.dialect.identifier_preparer.format_table(table)} ({column_list}) FROM STDIN",
+                copy_buffer(rows, columns, processors)
+            )
+        finally:
+            cursor.close()
+
+        self._after_bulk_write(rows)
+        if commit:
+            self.db.commit()
+        return len(rows)
@@ -0,0 +1,115 @@
+"""
+Bulk Write Helpers
+Result container, chunking and PostgreSQL COPY encoding for BaseRepository
+bulk inserts and upserts
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import date, datetime
+from enum import Enum
+import io
+import json
+
+# Rows per statement batch; SQLAlchemy splits each batch further to stay
+# under the driver's bound-parameter limit
+BULK_CHUNK_SIZE = 1000
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of a bulk insert / upsert"""
+    inserted: int = 0
+    updated: int = 0
+    rows: List[Any] = field(default_factory=list)  # RETURNING rows, in input order
+    chunks: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "total": self.total,
+            "chunks": self.chunks,
+        }
+
+
+def chunked(rows: List[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), max(size, 1)):
+        yield rows[start:start + size]
+
+
+def group_by_columns(rows: List[Dict[str, Any]]) -> List[Tuple[List[int], List[Dict[str, Any]]]]:
+    """
+    Split rows into groups sharing the same key set (executemany needs
+    homogeneous parameters). Returns (input positions, rows) per group.
+    """
+    groups: Dict[frozenset, Tuple[List[int], List[Dict[str, Any]]]] = {}
+    for i, row in enumerate(rows):
+        positions, members = groups.setdefault(frozenset(row), ([], []))
+        positions.append(i)
+        members.append(row)
+    return list(groups.values())
+
+
+def dedupe_by_key(rows: List[Dict[str, Any]], keys: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """
+    Keep the last row per natural key. PostgreSQL rejects an upsert that
+    touches the same row twice in one statement.
+    """
+    latest: Dict[Tuple, Dict[str, Any]] = {}
+    for row in rows:
+        latest[tuple(row.get(k) for k in keys)] = row
+    return list(latest.values())
+
+
+# ==================== PostgreSQL COPY ====================
+
+def _copy_value(value: Any) -> str:
+    """Encode one value for COPY ... FROM STDIN (text format)"""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, Enum):
+        value = value.name
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, default=str)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_buffer(
+    rows: Iterable[Dict[str, Any]],
+    columns: List[str],
+    processors: Optional[Dict[str, Any]] = None
+) -> io.StringIO:
+    """
+    Build a COPY text-format buffer. processors maps column -> the column
+    type's bind processor, so JSON and Enum columns are stored exactly as an
+    INSERT would store them.
+    """
+    processors = processors or {}
+    buffer = io.StringIO()
+    for row in rows:
+        values = []
+        for column in columns:
+            value = row.get(column)
+            processor = processors.get(column)
+            if processor is not None and value is not None:
+                value = processor(value)
+            values.append(_copy_value(value))
+        buffer.write("\t".join(values))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,291 @@
+"""
+Notification Repository
+Database operations for the in-app notification inbox with tenant isolation
+"""
+
+from typing import Optional, List, Tuple, Dict
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, update, delete, func
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import base64
+
+from .base import BaseRepository
+from db.models.notification import InboxNotification, InboxCounter
+
+
+def encode_inbox_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode an opaque (created_at, id) keyset cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_inbox_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_inbox_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class NotificationRepository(BaseRepository[InboxNotification]):
+    """
+    Repository for the notification inbox.
+
+    Unread counts are served from InboxCounter, which every write below
+    keeps in step within the same transaction.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(db, InboxNotification)
+
+    # =========================================================================
+    # Counters
+    # =========================================================================
+
+    def _bump_counter(self, tenant_id: str, user_id: str, unread: int, total: int):
+        """Apply a delta to a user's counters, creating the row if needed"""
+        result = self.db.execute(
+            update(InboxCounter)
+            .where(InboxCounter.tenant_id == tenant_id, InboxCounter.user_id == user_id)
+            .values(
+                unread_count=InboxCounter.unread_count + unread,
+                total_count=InboxCounter.total_count + total,
+                updated_at=datetime.utcnow()
+            )
+        )
+        if result.rowcount:
+            return
+
+        try:
+            with self.db.begin_nested():
+                self.db.add(InboxCounter(
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                    unread_count=max(unread, 0),
+                    total_count=max(total, 0)
+                ))
+        except IntegrityError:
+            # Another writer created the row first - apply the delta to it
+            self._bump_counter(tenant_id, user_id, unread, total)
+
+    def get_unread_count(self, tenant_id: str, user_id: str) -> int:
+        """Unread badge count (single primary-key lookup)"""
+        counter = self.db.get(InboxCounter, (tenant_id, user_id))
+        return counter.unread_count if counter else 0
+
+    def get_counts(self, tenant_id: str, user_id: str) -> Dict[str, int]:
+        """Unread and total counts for a user"""
+        counter = self.db.get(InboxCounter, (tenant_id, user_id))
+        if not counter:
+            return {"unread": 0, "total": 0}
+        return {"unread": counter.unread_count, "total": counter.total_count}
+
+    # =========================================================================
+    # Writes
+    # =========================================================================
+
+    def add_notification(self, tenant_id: str, data: dict) -> InboxNotification:
+        """Insert a notification and bump the recipient's counters"""
+        data['tenant_id'] = tenant_id
+        row = InboxNotification(**data)
+        self.db.add(row)
+        self._bump_counter(
+            tenant_id, row.recipient_user_id,
+            unread=0 if row.is_read else 1, total=1
+        )
+        self.db.commit()
+        return row
+
+    def mark_as_read(self, tenant_id: str, notification_id: str) -> bool:
+        """Mark one notification read; returns False if it does not exist"""
+        row = self._get_base_query(tenant_id).filter(
+            InboxNotification.notification_id == notification_id
+        ).with_entities(InboxNotification.recipient_user_id).first()
+        if not row:
+            return False
+
+        result = self.db.execute(
+            update(InboxNotification)
+            .where(
+                InboxNotification.tenant_id == tenant_id,
+                InboxNotification.notification_id == notification_id,
+                InboxNotification.is_read == False
+            )
+            .values(is_read=True, read_at=datetime.utcnow())
+        )
+        if result.rowcount:
+            self._bump_counter(tenant_id, row.recipient_user_id, unread=-result.rowcount, total=0)
+        self.db.commit()
+        return True
+
+    def update_delivery(
+        self,
+        tenant_id: str,
+        notification_id: str,
+        is_sent: bool,
+        sent_at: Optional[datetime],
+        delivery_status: Dict[str, str]
+    ) -> bool:
+        """Record channel delivery results; returns False if the notification is gone"""
+        result = self.db.execute(
+            update(InboxNotification)
+            .where(
+                InboxNotification.tenant_id == tenant_id,
+                InboxNotification.notification_id == notification_id
+            )
+            .values(is_sent=is_sent, sent_at=sent_at, delivery_status=delivery_status)
+        )
+        self.db.commit()
+        return bool(result.rowcount)
+
+    def mark_all_as_read(self, tenant_id: str, user_id: str) -> int:
+        """Mark every unread notification for a user read in one statement"""
+        result = self.db.execute(
+            update(InboxNotification)
+            .where(
+                InboxNotification.tenant_id == tenant_id,
+                InboxNotification.recipient_user_id == user_id,
+                InboxNotification.is_read == False
+            )
+            .values(is_read=True, read_at=datetime.utcnow())
+        )
+        self.db.execute(
+            update(InboxCounter)
+            .where(InboxCounter.tenant_id == tenant_id, InboxCounter.user_id == user_id)
+            .values(unread_count=0, updated_at=datetime.utcnow())
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def compact(
+        self,
+        read_retention_days: int = 90,
+        tenant_id: Optional[str] = None,
+        batch_size: int = 5000
+    ) -> int:
+        """
+        Delete read notifications older than the retention window, and
+        expired notifications, adjusting counters per user.
+
+        Works in batches so a large backlog does not hold long locks.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=read_retention_days)
+        now = datetime.utcnow()
+        removed = 0
+
+        while True:
+            query = self.db.query(
+                InboxNotification.id,
+                InboxNotification.tenant_id,
+                InboxNotification.recipient_user_id,
+                InboxNotification.is_read
+            ).filter(
+                or_(
+                    and_(InboxNotification.is_read == True, InboxNotification.read_at < cutoff),
+                    InboxNotification.expires_at < now
+                )
+            )
+            if tenant_id:
+                query = query.filter(InboxNotification.tenant_id == tenant_id)
+            rows = query.limit(batch_size).all()
+            if not rows:
+                break
+
+            deltas: Dict[Tuple[str, str], List[int]] = {}
+            for _, t_id, u_id, is_read in rows:
+                delta = deltas.setdefault((t_id, u_id), [0, 0])
+                delta[1] -= 1
+                if not is_read:
+                    delta[0] -= 1
+
+            self.db.execute(
+                delete(InboxNotification).where(InboxNotification.id.in_([r[0] for r in rows]))
+            )
+            for (t_id, u_id), (unread, total) in deltas.items():
+                self._bump_counter(t_id, u_id, unread=unread, total=total)
+            self.db.commit()
+
+            removed += len(rows)
+            if len(rows) < batch_size:
+                break
+
+        return removed
+
+    # =========================================================================
+    # Reads
+    # =========================================================================
+
+    def get_stats(self, tenant_id: str) -> Dict[str, object]:
+        """Total and unread notifications for the tenant, with counts by type"""
+        rows = self._get_base_query(tenant_id).with_entities(
+            InboxNotification.notification_type,
+            InboxNotification.is_read,
+            func.count(InboxNotification.id)
+        ).group_by(InboxNotification.notification_type, InboxNotification.is_read).all()
+
+        total = unread = 0
+        by_type: Dict[str, int] = {}
+        for notification_type, is_read, count in rows:
+            total += count
+            if not is_read:
+                unread += count
+            by_type[notification_type] = by_type.get(notification_type, 0) + count
+        return {"total_notifications": total, "unread_count": unread, "by_type": by_type}
+
+    def get_by_notification_id(
+        self,
+        tenant_id: str,
+        notification_id: str
+    ) -> Optional[InboxNotification]:
+        """Get a notification by its public ID"""
+        return self._get_base_query(tenant_id).filter(
+            InboxNotification.notification_id == notification_id
+        ).first()
+
+    def list_for_user(
+        self,
+        tenant_id: str,
+        user_id: str,
+        unread_only: bool = False,
+        notification_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[InboxNotification], Optional[str]]:
+        """
+        Newest-first inbox page using keyset pagination.
+
+        Returns (notifications, next_cursor); next_cursor is None on the
+        last page.
+        """
+        query = self._get_base_query(tenant_id).filter(
+            InboxNotification.recipient_user_id == user_id
+        )
+        if unread_only:
+            query = query.filter(InboxNotification.is_read == False)
+        if notification_type:
+            query = query.filter(InboxNotification.notification_type == notification_type)
+
+        if cursor:
+            created_at, row_id = decode_inbox_cursor(cursor)
+            query = query.filter(
+                or_(
+                    InboxNotification.created_at < created_at,
+                    and_(InboxNotification.created_at == created_at, InboxNotification.id < row_id)
+                )
+            )
+
+        rows = query.order_by(
+            InboxNotification.created_at.desc(),
+            InboxNotification.id.desc()
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_inbox_cursor(last.created_at, last.id)
+
+        return rows, next_cursor
@@ -0,0 +1,124 @@
+"""
+Pagination Helpers
+Opaque keyset cursors, page containers and a TTL cache for list counts
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+from datetime import datetime
+from enum import Enum
+import base64
+import json
+import threading
+import time
+
+T = TypeVar("T")
+
+
+# Count modes accepted by BaseRepository.count_query
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+
+
+@dataclass(frozen=True)
+class KeysetColumn:
+    """
+    One column of a keyset ordering.
+
+    null_value stands in for NULLs (in the ORDER BY and in the cursor) so
+    nullable columns still give a total order; the last column of every
+    ordering should be unique (normally the primary key).
+    """
+    name: str
+    descending: bool = False
+    null_value: Any = None
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset-paginated listing"""
+    items: List[T]
+    next_cursor: Optional[str]
+    has_more: bool
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort-key values of the last row of a page"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int) -> List[Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if not isinstance(values, list) or len(values) != expected_length:
+            raise ValueError("cursor shape mismatch")
+        return [_decode_value(v) for v in values]
+    except (ValueError, UnicodeDecodeError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class CountCache:
+    """
+    Thread-safe TTL cache for list totals.
+
+    Used where the database has no cheap row estimate: repeat page loads
+    of the same filtered listing reuse one COUNT for ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def set(self, key: Tuple, count: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, count)
+
+    def invalidate(self, prefix: Tuple = ()) -> None:
+        """Drop entries whose key starts with prefix (all entries by default)"""
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                return
+            n = len(prefix)
+            self._entries = {k: v for k, v in self._entries.items() if k[:n] != prefix}
+
+
+# Shared by all repositories; keys start with (table_name, tenant_id)
+count_cache = CountCache()
@@ -5,11 +5,12 @@ Database operations for Risk/Violation management with tenant isolation
 
 from typing import Optional, List, Tuple, Dict, Any
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, case
 from datetime import datetime, timedelta
 import uuid
 
 from .base import BaseRepository
+from .pagination import KeysetColumn, Page, COUNT_EXACT
 from db.models.risk import RiskViolation, RiskRuleModel, MitigationControl, ViolationStatus, RiskSeverityLevel
 
 
@@ -19,10 +20,19 @@ class RiskViolationRepository(BaseRepository[RiskViolation]):
     All operations are tenant-isolated.
     """
 
+    # Listing order: newest first, primary key as the unique tiebreaker.
+    # detected_at is nullable; rows without one sort last.
+    LIST_ORDER = [
+        KeysetColumn("detected_at", descending=True, null_value=datetime(1970, 1, 1)),
+        KeysetColumn("id", descending=True),
+    ]
+
+    NATURAL_KEY = ("tenant_id", "violation_id")
+
     def __init__(self, db: Session):
         super().__init__(db, RiskViolation)
 
-    def get_violations(
+    def _filtered_violations_query(
         self,
         tenant_id: str,
         search: Optional[str] = None,
@@ -32,11 +42,8 @@ class RiskViolationRepository(BaseRepository[RiskViolation]):
         user_id: Optional[str] = None,
         rule_id: Optional[str] = None,
         date_from: Optional[datetime] = None,
-        date_to: Optional[datetime] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[RiskViolation], int]:
-        """Get paginated list of violations with filters"""
+        date_to: Optional[datetime] = None
+    ):
         query = self._get_base_query(tenant_id)
 
         # Search filter
@@ -85,6 +92,66 @@ class RiskViolationRepository(BaseRepository[RiskViolation]):
         if date_to:
             query = query.filter(RiskViolation.detected_at <= date_to)
 
+        return query
+
+    def get_violations_page(
+        self,
+        tenant_id: str,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        violation_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        rule_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        count_mode: str = COUNT_EXACT
+    ) -> Page[RiskViolation]:
+        """Keyset-paginated list of violations, newest first"""
+        filters = dict(
+            search=search, status=status, severity=severity, violation_type=violation_type,
+            user_id=user_id, rule_id=rule_id, date_from=date_from, date_to=date_to
+        )
+        query = self._filtered_violations_query(tenant_id, **filters)
+
+        violations, next_cursor, has_more = self.paginate_keyset(
+            query, self.LIST_ORDER, cursor=cursor, limit=limit, offset=offset
+        )
+        total, is_estimate = self.count_query(
+            query, count_mode, self.count_cache_key(tenant_id, **filters)
+        )
+
+        return Page(
+            items=violations,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            total=total,
+            total_is_estimate=is_estimate
+        )
+
+    def get_violations(
+        self,
+        tenant_id: str,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        violation_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        rule_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[RiskViolation], int]:
+        """Get paginated list of violations with filters"""
+        query = self._filtered_violations_query(
+            tenant_id, search, status, severity, violation_type,
+            user_id, rule_id, date_from, date_to
+        )
+
         # Get total count
         total = query.count()
 
@@ -163,72 +230,68 @@ class RiskViolationRepository(BaseRepository[RiskViolation]):
         return query.order_by(RiskViolation.detected_at.desc()).all()
 
     def get_violation_stats(self, tenant_id: str) -> dict:
-        """Get violation statistics"""
-        base_query = self._get_base_query(tenant_id)
-
-        total = base_query.count()
-        open_count = base_query.filter(
-            RiskViolation.status == ViolationStatus.OPEN
-        ).count()
+        """
+        Get violation statistics.
 
-        # By severity
-        severity_counts = self.db.query(
+        One grouped query over (status, severity, type) with the 30-day
+        mitigation count as a conditional sum; all buckets are folded from
+        its few rows.
+        """
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        rows = self.db.query(
+            RiskViolation.status,
             RiskViolation.severity,
-            func.count(RiskViolation.id).label('count')
-        ).filter(
-            RiskViolation.tenant_id == tenant_id,
-            RiskViolation.status == ViolationStatus.OPEN
-        ).group_by(RiskViolation.severity).all()
-
-        # By type
-        type_counts = self.db.query(
             RiskViolation.rule_type,
-            func.count(RiskViolation.id).label('count')
-        ).filter(
-            RiskViolation.tenant_id == tenant_id,
-            RiskViolation.status == ViolationStatus.OPEN
-        ).group_by(RiskViolation.rule_type).all()
-
-        # By status
-        status_counts = self.db.query(
-            RiskViolation.status,
-            func.count(RiskViolation.id).label('count')
+            func.count(RiskViolation.id),
+            func.sum(case(
+                (and_(
+                    RiskViolation.status == ViolationStatus.MITIGATED,
+                    RiskViolation.resolved_at >= thirty_days_ago
+                ), 1),
+                else_=0
+            ))
         ).filter(
             RiskViolation.tenant_id == tenant_id
-        ).group_by(RiskViolation.status).all()
-
-        # Mitigated in last 30 days
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        mitigated_30d = base_query.filter(
-            RiskViolation.status == ViolationStatus.MITIGATED,
-            RiskViolation.resolved_at >= thirty_days_ago
-        ).count()
-
-        critical_open = base_query.filter(
-            RiskViolation.status == ViolationStatus.OPEN,
-            RiskViolation.severity == RiskSeverityLevel.CRITICAL
-        ).count()
-
-        high_open = base_query.filter(
-            RiskViolation.status == ViolationStatus.OPEN,
-            RiskViolation.severity == RiskSeverityLevel.HIGH
-        ).count()
-
-        return {
-            "total_violations": total,
-            "open_violations": open_count,
-            "critical_violations": critical_open,
-            "high_violations": high_open,
-            "mitigated_last_30_days": mitigated_30d,
-            "by_severity": {s.value if s else 'unknown': c for s, c in severity_counts},
-            "by_type": {t or 'unknown': c for t, c in type_counts},
-            "by_status": {s.value if s else 'unknown': c for s, c in status_counts}
+        ).group_by(
+            RiskViolation.status, RiskViolation.severity, RiskViolation.rule_type
+        ).all()
+
+        stats = {
+            "total_violations": 0,
+            "open_violations": 0,
+            "critical_violations": 0,
+            "high_violations": 0,
+            "mitigated_last_30_days": 0,
+            "by_severity": {},
+            "by_type": {},
+            "by_status": {}
         }
+        for status, severity, rule_type, count, mitigated in rows:
+            status_key = status.value if status else 'unknown'
+            stats["total_violations"] += count
+            stats["mitigated_last_30_days"] += int(mitigated or 0)
+            stats["by_status"][status_key] = stats["by_status"].get(status_key, 0) + count
+
+            if status != ViolationStatus.OPEN:
+                continue
+            severity_key = severity.value if severity else 'unknown'
+            type_key = rule_type or 'unknown'
+            stats["open_violations"] += count
+            stats["by_severity"][severity_key] = stats["by_severity"].get(severity_key, 0) + count
+            stats["by_type"][type_key] = stats["by_type"].get(type_key, 0) + count
+            if severity == RiskSeverityLevel.CRITICAL:
+                stats["critical_violations"] += count
+            elif severity == RiskSeverityLevel.HIGH:
+                stats["high_violations"] += count
+
+        return stats
 
 
 class RiskRuleRepository(BaseRepository[RiskRuleModel]):
     """Repository for SoD Rule CRUD operations"""
 
+    NATURAL_KEY = ("tenant_id", "rule_id")
+
     def __init__(self, db: Session):
         super().__init__(db, RiskRuleModel)
 
@@ -331,32 +394,30 @@ class RiskRuleRepository(BaseRepository[RiskRuleModel]):
         return True
 
     def get_rule_stats(self, tenant_id: str) -> dict:
-        """Get rule statistics"""
-        base_query = self._get_base_query(tenant_id)
-
-        total = base_query.count()
-        active = base_query.filter(RiskRuleModel.is_enabled == True).count()
-
-        # By category
-        category_counts = self.db.query(
+        """Get rule statistics (one grouped query by category)"""
+        rows = self.db.query(
             RiskRuleModel.risk_category,
-            func.count(RiskRuleModel.id).label('count')
+            func.count(RiskRuleModel.id),
+            func.sum(case((RiskRuleModel.is_enabled == True, 1), else_=0)),
+            func.sum(RiskRuleModel.violation_count)
         ).filter(
             RiskRuleModel.tenant_id == tenant_id
         ).group_by(RiskRuleModel.risk_category).all()
 
-        # Total violations across rules
-        total_violations = self.db.query(
-            func.sum(RiskRuleModel.violation_count)
-        ).filter(
-            RiskRuleModel.tenant_id == tenant_id
-        ).scalar() or 0
+        by_category = {}
+        total = active = total_violations = 0
+        for category, count, enabled, violations in rows:
+            key = category or 'Unknown'
+            by_category[key] = by_category.get(key, 0) + count
+            total += count
+            active += int(enabled or 0)
+            total_violations += int(violations or 0)
 
         return {
             "total_rules": total,
             "active_rules": active,
-            "total_violations": int(total_violations),
-            "by_category": {c or 'Unknown': count for c, count in category_counts}
+            "total_violations": total_violations,
+            "by_category": by_category
         }
 
     def get_categories(self, tenant_id: str) -> List[str]:
@@ -18,6 +18,8 @@ class RoleRepository(BaseRepository[Role]):
     All operations are tenant-isolated.
     """
 
+    NATURAL_KEY = ("tenant_id", "role_id")
+
     def __init__(self, db: Session):
         super().__init__(db, Role)
 
@@ -4,25 +4,67 @@ Database operations for User management with tenant isolation
 """
 
 from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_, or_, func, case
 from datetime import datetime
 
 from .base import BaseRepository
+from .pagination import KeysetColumn, Page, COUNT_EXACT
 from db.models.user import User, Role, UserRole, UserEntitlement
 from db.models.risk import RiskViolation
 
 
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input matches literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class UserRepository(BaseRepository[User]):
     """
     Repository for User CRUD operations.
     All operations are tenant-isolated.
     """
 
+    # Listing order: name, then primary key as the unique tiebreaker
+    LIST_ORDER = [KeysetColumn("full_name", null_value=""), KeysetColumn("id")]
+
+    NATURAL_KEY = ("tenant_id", "user_id")
+
     def __init__(self, db: Session):
         super().__init__(db, User)
 
-    def get_users(
+    @staticmethod
+    def search_document():
+        """
+        Lower-cased text searched by the user list.
+
+        Must stay identical to the expression behind the ix_users_search_trgm
+        trigram index, otherwise PostgreSQL cannot use it.
+        """
+        return func.lower(
+            func.coalesce(User.full_name, '') + ' ' +
+            func.coalesce(User.email, '') + ' ' +
+            User.user_id + ' ' +
+            User.username + ' ' +
+            func.coalesce(User.department, '')
+        )
+
+    def _search_filter(self, search: str):
+        """Substring search over name, email, IDs and department"""
+        pattern = f"%{escape_like(search.strip().lower())}%"
+        if self.db.get_bind().dialect.name == "postgresql":
+            # One LIKE over the indexed document instead of five ILIKE scans
+            return self.search_document().like(pattern, escape="\\")
+
+        return or_(
+            User.full_name.ilike(pattern, escape="\\"),
+            User.email.ilike(pattern, escape="\\"),
+            User.user_id.ilike(pattern, escape="\\"),
+            User.username.ilike(pattern, escape="\\"),
+            User.department.ilike(pattern, escape="\\")
+        )
+
+    def _filtered_users_query(
         self,
         tenant_id: str,
         search: Optional[str] = None,
@@ -30,28 +72,13 @@ class UserRepository(BaseRepository[User]):
         department: Optional[str] = None,
         risk_level: Optional[str] = None,
         user_type: Optional[str] = None,
-        has_violations: Optional[bool] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[User], int]:
-        """
-        Get paginated list of users with filters.
-        Returns tuple of (users, total_count)
-        """
+        has_violations: Optional[bool] = None
+    ):
         query = self._get_base_query(tenant_id)
 
         # Search filter (name, email, user_id)
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    User.full_name.ilike(search_term),
-                    User.email.ilike(search_term),
-                    User.user_id.ilike(search_term),
-                    User.username.ilike(search_term),
-                    User.department.ilike(search_term)
-                )
-            )
+            query = query.filter(self._search_filter(search))
 
         # Status filter
         if status:
@@ -83,6 +110,71 @@ class UserRepository(BaseRepository[User]):
             else:
                 query = query.filter(User.violation_count == 0)
 
+        return query
+
+    def get_users_page(
+        self,
+        tenant_id: str,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        user_type: Optional[str] = None,
+        has_violations: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        count_mode: str = COUNT_EXACT
+    ) -> Page[User]:
+        """
+        Keyset-paginated list of users with filters.
+
+        Pass the returned next_cursor to fetch the following page; see
+        BaseRepository.count_query for count_mode.
+        """
+        filters = dict(
+            search=search, status=status, department=department,
+            risk_level=risk_level, user_type=user_type, has_violations=has_violations
+        )
+        query = self._filtered_users_query(tenant_id, **filters)
+
+        # Roles are summarized per row; load them in one extra query
+        users, next_cursor, has_more = self.paginate_keyset(
+            query.options(selectinload(User.roles)), self.LIST_ORDER,
+            cursor=cursor, limit=limit, offset=offset
+        )
+        total, is_estimate = self.count_query(
+            query, count_mode, self.count_cache_key(tenant_id, **filters)
+        )
+
+        return Page(
+            items=users,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            total=total,
+            total_is_estimate=is_estimate
+        )
+
+    def get_users(
+        self,
+        tenant_id: str,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        user_type: Optional[str] = None,
+        has_violations: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[User], int]:
+        """
+        Get paginated list of users with filters.
+        Returns tuple of (users, total_count)
+        """
+        query = self._filtered_users_query(
+            tenant_id, search, status, department, risk_level, user_type, has_violations
+        )
+
         # Get total count before pagination
         total = query.count()
 
@@ -323,35 +415,42 @@ class UserRepository(BaseRepository[User]):
     # ============== Statistics ==============
 
     def get_user_stats(self, tenant_id: str) -> dict:
-        """Get user statistics for dashboard"""
-        base_query = self._get_base_query(tenant_id)
-
-        total = base_query.count()
-        active = base_query.filter(User.status == 'active').count()
-        inactive = base_query.filter(User.status == 'inactive').count()
-        suspended = base_query.filter(User.status == 'suspended').count()
-        high_risk = base_query.filter(User.risk_score >= 60).count()
-        with_violations = base_query.filter(User.violation_count > 0).count()
-
-        # Department breakdown
-        departments = self.db.query(
+        """
+        Get user statistics for dashboard.
+
+        One grouped query by (status, department) with the risk and
+        violation buckets as conditional sums.
+        """
+        rows = self.db.query(
+            User.status,
             User.department,
-            func.count(User.id).label('count')
+            func.count(User.id),
+            func.sum(case((User.risk_score >= 60, 1), else_=0)),
+            func.sum(case((User.violation_count > 0, 1), else_=0))
         ).filter(
-            User.tenant_id == tenant_id,
-            User.status == 'active'
-        ).group_by(User.department).all()
+            User.tenant_id == tenant_id
+        ).group_by(User.status, User.department).all()
+
+        by_status = {}
+        departments = {}
+        high_risk = with_violations = 0
+        for status, department, count, risky, violating in rows:
+            by_status[status] = by_status.get(status, 0) + count
+            high_risk += int(risky or 0)
+            with_violations += int(violating or 0)
+            if status == 'active':
+                departments[department] = departments.get(department, 0) + count
 
         return {
-            "total_users": total,
-            "active_users": active,
-            "inactive_users": inactive,
-            "suspended_users": suspended,
+            "total_users": sum(by_status.values()),
+            "active_users": by_status.get('active', 0),
+            "inactive_users": by_status.get('inactive', 0),
+            "suspended_users": by_status.get('suspended', 0),
             "high_risk_users": high_risk,
             "users_with_violations": with_violations,
             "departments": [
                 {"name": dept or "Unknown", "count": count}
-                for dept, count in departments
+                for dept, count in departments.items()
             ]
         }
 
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cross-System SoD Benchmark
+
+Generates a synthetic enterprise (5 systems, mapped functions, random
+access) and times enterprise analysis three ways:
+- baseline: per-user scan of every function and mapping (sampled)
+- compiled: CompiledRuleIndex, single process
+- parallel: CompiledRuleIndex across worker processes
+
+Run:
+    python scripts/benchmark_cross_system_sod.py
+    python scripts/benchmark_cross_system_sod.py --users 100000 --workers 8
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.cross_system.sod_engine import (
+    CrossSystemSoDEngine, SystemFunction, SystemType
+)
+
+
+SYSTEMS = [
+    ("BENCH_ECC", SystemType.SAP_ECC),
+    ("BENCH_S4", SystemType.SAP_S4HANA),
+    ("BENCH_ARIBA", SystemType.SAP_ARIBA),
+    ("BENCH_SFDC", SystemType.SALESFORCE),
+    ("BENCH_WD", SystemType.WORKDAY),
+]
+
+
+def build_engine(functions_per_system: int, rules: int, seed: int) -> CrossSystemSoDEngine:
+    rng = random.Random(seed)
+    engine = CrossSystemSoDEngine()
+    catalog = {}
+
+    for system_id, system_type in SYSTEMS:
+        engine.register_system(system_id, system_type, system_id, {})
+        sap = system_type.value.startswith("sap")
+        for i in range(functions_per_system):
+            grants = [f"{system_id}_P{i}_{k}" for k in range(3)]
+            func = SystemFunction(
+                f"{system_id}_F{i}", system_id, system_type, f"Function {i}", "", "BENCH",
+                transactions=grants if sap else [],
+                permissions=[] if sap else grants,
+                risk_level=rng.choice(["medium", "high", "critical"])
+            )
+            engine.register_function(system_id, func)
+        catalog[system_id] = list(engine.functions[system_id].values())
+
+    # Function i is equivalent across all systems
+    for i in range(functions_per_system):
+        engine.create_function_mapping(
+            f"BENCH_MAP_{i}", f"Function {i}", "", [catalog[s][i] for s, _ in SYSTEMS]
+        )
+
+    for r in range(rules):
+        s1, s2 = rng.sample([s for s, _ in SYSTEMS], 2)
+        engine.create_cross_system_rule(
+            f"BENCH_R{r}", f"Rule {r}", "",
+            rng.choice(catalog[s1]), rng.choice(catalog[s2]),
+            risk_level=rng.choice(["high", "critical"]),
+            compliance_frameworks=["SOX"]
+        )
+    return engine
+
+
+def build_access(engine: CrossSystemSoDEngine, users: int, functions_per_system: int, seed: int):
+    rng = random.Random(seed)
+    access_data = {}
+    for u in range(users):
+        user_id = f"G{u:07d}"
+        engine.map_user_identity(user_id, f"{user_id}@bench", user_id, "Bench", {s: user_id for s, _ in SYSTEMS})
+        access = {}
+        for system_id, system_type in rng.sample(SYSTEMS, rng.randint(1, len(SYSTEMS))):
+            grants = [
+                f"{system_id}_P{rng.randrange(functions_per_system)}_{rng.randrange(3)}"
+                for _ in range(rng.randint(1, 6))
+            ]
+            key = "transactions" if system_type.value.startswith("sap") else "permissions"
+            access[system_id] = {key: grants, "roles": []}
+        access_data[user_id] = access
+    return access_data
+
+
+def baseline_user(engine: CrossSystemSoDEngine, access_by_system):
+    """Rule evaluation as done before the compiled index"""
+    def functions_match(user_func, rule_func):
+        if user_func.function_id == rule_func.function_id and user_func.system_id == rule_func.system_id:
+            return True
+        for mapping in engine.mappings.values():
+            mapped = mapping.function_mappings.get(rule_func.system_id)
+            if mapped and mapped.function_id == rule_func.function_id:
+                for sys_id, equiv in mapping.function_mappings.items():
+                    if sys_id != rule_func.system_id and equiv.function_id == user_func.function_id \
+                            and equiv.system_id == user_func.system_id:
+                        return True
+        return False
+
+    user_functions = [
+        (system_id, func)
+        for system_id, access in access_by_system.items()
+        for func in engine.functions.get(system_id, {}).values()
+        if engine._user_has_function(access, func)
+    ]
+    hits = []
+    for rule in engine.rules.values():
+        sys1 = sys2 = None
+        for system_id, func in user_functions:
+            if functions_match(func, rule.function_1):
+                sys1 = system_id
+            if functions_match(func, rule.function_2):
+                sys2 = system_id
+        if sys1 and sys2:
+            hits.append((rule.rule_id, sys1, sys2))
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cross-system SoD analysis")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--functions", type=int, default=40, help="Functions per system")
+    parser.add_argument("--rules", type=int, default=300)
+    parser.add_argument("--baseline-sample", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = build_engine(args.functions, args.rules, args.seed)
+    access_data = build_access(engine, args.users, args.functions, args.seed)
+    print(f"Systems: {len(SYSTEMS)}  users: {args.users}  rules: {len(engine.rules)}  "
+          f"mappings: {len(engine.mappings)}")
+
+    started = time.perf_counter()
+    index = engine.get_rule_index()
+    print(f"Index build: {(time.perf_counter() - started) * 1000:.1f} ms  {index.get_stats()['equivalence_classes']} classes")
+
+    sample = list(access_data.items())[:args.baseline_sample]
+    started = time.perf_counter()
+    baseline = [(user_id, baseline_user(engine, access)) for user_id, access in sample]
+    per_user = (time.perf_counter() - started) / max(len(sample), 1)
+    print(f"Baseline:  {per_user * 1e6:9.1f} us/user  (~{per_user * args.users:.1f} s extrapolated)")
+
+    mismatches = sum(1 for (user_id, hits) in baseline if hits != index.evaluate(access_data[user_id]))
+    print(f"Sample agreement: {len(sample) - mismatches}/{len(sample)}")
+
+    for label, parallel in (("Compiled:", False), ("Parallel:", True)):
+        engine.violations.clear()
+        started = time.perf_counter()
+        result = engine.analyze_enterprise_risk(access_data, parallel=parallel, max_workers=args.workers)
+        elapsed = time.perf_counter() - started
+        summary = result["enterprise_summary"]
+        print(f"{label:10} {elapsed / args.users * 1e6:9.1f} us/user  ({elapsed:.2f} s total, "
+              f"{summary['total_violations']} violations, {summary['users_with_violations']} users)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+SoD Graph Benchmark
+
+Generates a synthetic access graph (users -> roles -> tcodes -> business
+actions) and times graph SoD detection:
+- baseline: per-user descendant BFS, pattern subset checks and shortest
+  path search from the user (sampled, extrapolated)
+- cached: GraphSoDDetector.detect_all_users over the role closure cache
+- snapshot: the same detection on a memory-mapped GraphSnapshot
+
+Run:
+    python scripts/benchmark_sod_graph.py
+    python scripts/benchmark_sod_graph.py --users 100000 --roles 20000
+    python scripts/benchmark_sod_graph.py --patterns 2000   # rich pattern library
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ara.graph import (
+    SoDGraph, NodeType, GraphSoDDetector, GraphSnapshot, RiskPattern, RiskPatternLibrary
+)
+
+
+def build_graph(users: int, roles: int, tcodes: int, seed: int) -> SoDGraph:
+    rng = random.Random(seed)
+    library = RiskPatternLibrary()
+    actions = sorted({a for p in library.get_active_patterns() for a in p.forbidden_actions})
+    actions += [f"BENCH_ACTION_{i}" for i in range(200)]
+
+    tcode_actions = {f"T{t:05d}": [rng.choice(actions)] for t in range(tcodes)}
+    role_tcodes = {
+        f"R{r:05d}": rng.sample(list(tcode_actions), rng.randint(3, 12))
+        for r in range(roles)
+    }
+    role_ids = list(role_tcodes)
+    # Users mostly draw from a smaller set of common roles, as in practice
+    common = role_ids[:max(roles // 20, 1)]
+    user_roles = {
+        f"U{u:07d}": [
+            rng.choice(common) if rng.random() < 0.7 else rng.choice(role_ids)
+            for _ in range(rng.randint(1, 5))
+        ]
+        for u in range(users)
+    }
+
+    graph = SoDGraph()
+    graph.load_from_sap_data(user_roles, role_tcodes, tcode_actions)
+    return graph
+
+
+def build_library(extra_patterns: int, seed: int) -> RiskPatternLibrary:
+    """Built-in patterns plus synthetic 3-4 action patterns over the bench actions"""
+    rng = random.Random(seed)
+    library = RiskPatternLibrary()
+    for i in range(extra_patterns):
+        actions = {f"BENCH_ACTION_{rng.randrange(200)}" for _ in range(rng.randint(3, 4))}
+        library.add_pattern(RiskPattern(f"BENCH-{i}", f"Bench pattern {i}", "", forbidden_actions=actions))
+    return library
+
+
+def baseline_user(graph: SoDGraph, patterns, user_id: str):
+    """Per-user detection as done before the closure cache"""
+    actions = graph.get_reachable_by_type(user_id, NodeType.ACTION)
+    hits = []
+    for pattern in patterns:
+        if pattern.forbidden_actions.issubset(actions):
+            paths = [graph.find_shortest_path(user_id, a) for a in pattern.forbidden_actions]
+            hits.append((pattern.pattern_id, tuple(len(p) for p in paths if p)))
+    return sorted(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark graph SoD detection")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--roles", type=int, default=20000)
+    parser.add_argument("--tcodes", type=int, default=5000)
+    parser.add_argument("--patterns", type=int, default=0, help="Synthetic patterns added to the library")
+    parser.add_argument("--baseline-sample", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    graph = build_graph(args.users, args.roles, args.tcodes, args.seed)
+    stats = graph.get_statistics()
+    print(f"Graph: {stats['total_nodes']} nodes, {stats['total_edges']} edges "
+          f"(build {time.perf_counter() - started:.1f} s, networkx={stats['using_networkx']})")
+
+    detector = GraphSoDDetector(graph, build_library(args.patterns, args.seed))
+    patterns = detector.pattern_library.get_active_patterns()
+    user_ids = [n.node_id for n in graph.get_nodes_by_type(NodeType.USER)]
+
+    sample = user_ids[:args.baseline_sample]
+    started = time.perf_counter()
+    baseline = {user_id: baseline_user(graph, patterns, user_id) for user_id in sample}
+    per_user = (time.perf_counter() - started) / max(len(sample), 1)
+    print(f"Baseline: {per_user * 1e6:9.1f} us/user  (~{per_user * len(user_ids):.1f} s extrapolated)")
+
+    started = time.perf_counter()
+    warmed = graph.warm_reachability(NodeType.ACTION)
+    print(f"Warm:     {(time.perf_counter() - started) * 1000:9.1f} ms for {warmed} role closures")
+
+    started = time.perf_counter()
+    results = detector.detect_all_users()
+    elapsed = time.perf_counter() - started
+    findings = sum(len(f) for f in results.values())
+    print(f"Cached:   {elapsed / len(user_ids) * 1e6:9.1f} us/user  ({elapsed:.2f} s total, "
+          f"{findings} findings, {len(results)} users)")
+
+    mismatches = 0
+    for user_id, expected in baseline.items():
+        got = sorted(
+            (f.pattern.pattern_id, tuple(len(p.path) for p in f.path_explanations))
+            for f in results.get(user_id, [])
+        )
+        if [(pid, sorted(lengths)) for pid, lengths in got] != \
+                [(pid, sorted(lengths)) for pid, lengths in expected]:
+            mismatches += 1
+    print(f"Sample agreement: {len(sample) - mismatches}/{len(sample)}")
+    print(f"Cache: {graph.reachability.get_statistics()}")
+
+    # Pattern matching alone: set scan vs. compiled bitmask matcher
+    masks = [m for _, m in graph.iter_user_masks(NodeType.ACTION)]
+    action_sets = [graph.reachability.decode(m, NodeType.ACTION) for m in masks]
+    started = time.perf_counter()
+    scanned = [[p for p in patterns if p.forbidden_actions.issubset(a)] for a in action_sets]
+    scan_elapsed = time.perf_counter() - started
+    matcher = detector._get_matcher()
+    started = time.perf_counter()
+    compiled = [matcher.match_mask(m) for m in masks]
+    match_elapsed = time.perf_counter() - started
+    print(f"Matching: set scan {scan_elapsed / len(masks) * 1e6:.1f} us/user, compiled "
+          f"{match_elapsed / len(masks) * 1e6:.1f} us/user ({len(patterns)} patterns, "
+          f"agree: {scanned == compiled}, {matcher.get_statistics()})")
+    del scanned, compiled, action_sets
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sod_graph.snap")
+        started = time.perf_counter()
+        graph.save_snapshot(path)
+        print(f"Snapshot: {os.path.getsize(path) / 1e6:.1f} MB written in {time.perf_counter() - started:.2f} s")
+
+        started = time.perf_counter()
+        with GraphSnapshot.open(path) as snapshot:
+            print(f"Open:     {(time.perf_counter() - started) * 1000:9.1f} ms")
+            started = time.perf_counter()
+            snapshot_results = GraphSoDDetector(snapshot, detector.pattern_library).detect_all_users()
+            elapsed = time.perf_counter() - started
+            same = {u: sorted(f.pattern.pattern_id for f in fs) for u, fs in snapshot_results.items()} == \
+                {u: sorted(f.pattern.pattern_id for f in fs) for u, fs in results.items()}
+            print(f"Snapshot: {elapsed / len(user_ids) * 1e6:9.1f} us/user  ({elapsed:.2f} s total, "
+                  f"matches in-memory graph: {same})")
+            del snapshot_results
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
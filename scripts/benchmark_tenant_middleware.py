@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tenant Middleware Benchmark
+
+Creates a tenant population and times the per-request work in
+TenantMiddleware:
+- path rules: the former linear prefix loop vs. the compiled PathClassifier
+- context resolution: building the tenant context from the Tenant on every
+  request (uncached) vs. TenantContextCache templates (cached)
+- dispatch: TenantMiddleware.dispatch end to end with both variants
+
+Run:
+    python scripts/benchmark_tenant_middleware.py
+    python scripts/benchmark_tenant_middleware.py --tenants 5000 --requests 200000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from api.middleware.tenant import TenantMiddleware
+from core.tenant import TenantManager, TenantContextCache
+from core.tenant.context_cache import build_context_template
+
+
+class UncachedContextCache(TenantContextCache):
+    """Resolves the tenant and rebuilds its template on every request"""
+
+    def get_template(self, tenant_id: str):
+        tenant = self.tenant_manager.get_tenant(tenant_id)
+        return build_context_template(tenant) if tenant is not None else None
+
+
+class LinearPathMiddleware(TenantMiddleware):
+    """Middleware with the former per-prefix path checks"""
+
+    def _is_public_path(self, path: str) -> bool:
+        for public_path in self.public_paths:
+            if path == public_path or path.startswith(f"{public_path}/"):
+                return True
+        return False
+
+    def _is_admin_path(self, path: str) -> bool:
+        for admin_path in self.admin_paths:
+            if path == admin_path or path.startswith(f"{admin_path}/"):
+                return True
+        return False
+
+
+def build_tenants(count: int) -> TenantManager:
+    manager = TenantManager()
+    for i in range(count):
+        created = manager.create_tenant(f"Tenant {i}", f"owner{i}@example.com")
+        manager.activate_tenant(created["tenant_id"])
+    return manager
+
+
+def make_request(path: str, tenant_id: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [
+            (b"x-tenant-id", tenant_id.encode()),
+            (b"x-user-id", b"U0001"),
+            (b"x-user-roles", b"auditor,viewer"),
+        ],
+        "client": ("127.0.0.1", 50000),
+    })
+
+
+async def run_dispatch(middleware: TenantMiddleware, requests) -> float:
+    async def call_next(request):
+        return Response()
+
+    started = time.perf_counter()
+    for request in requests:
+        await middleware.dispatch(request, call_next)
+    return time.perf_counter() - started
+
+
+def per_call_us(elapsed: float, count: int) -> float:
+    return elapsed / max(count, 1) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tenant middleware context resolution")
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    manager = build_tenants(args.tenants)
+    tenant_ids = list(manager.tenants)
+    # Skewed traffic: most requests come from a few busy tenants
+    traffic = [tenant_ids[min(int(rng.paretovariate(1.2)) - 1, len(tenant_ids) - 1)]
+               for _ in range(args.requests)]
+    paths = ["/tenant-data/items", "/risk/rules", "/tenants/abc/users", "/analytics/summary"]
+    path_sample = [rng.choice(paths) for _ in range(args.requests)]
+    print(f"Tenants: {len(tenant_ids)}, requests: {args.requests}")
+
+    # Path rules
+    linear = LinearPathMiddleware(None, tenant_manager=manager)
+    compiled = TenantMiddleware(None, tenant_manager=manager)
+    for label, middleware in (("linear", linear), ("compiled", compiled)):
+        started = time.perf_counter()
+        for path in path_sample:
+            middleware._is_public_path(path) or middleware._is_admin_path(path)
+        print(f"Path rules ({label:8s}): {per_call_us(time.perf_counter() - started, len(path_sample)):7.2f} us/request")
+
+    # Context resolution
+    uncached = UncachedContextCache(manager)
+    cached = TenantContextCache(manager)
+    user_data = {"user_id": "U0001", "roles": ["auditor"], "is_admin": False}
+    for label, cache in (("uncached", uncached), ("cached", cached)):
+        started = time.perf_counter()
+        for tenant_id in traffic:
+            cache.get_template(tenant_id).build_context(user_data, request_id="r", source_ip="127.0.0.1")
+        print(f"Context    ({label:8s}): {per_call_us(time.perf_counter() - started, len(traffic)):7.2f} us/request")
+    print(f"Cache stats: {cached.get_stats()}")
+
+    # End-to-end dispatch
+    requests = [make_request("/tenant-data/items", tenant_id) for tenant_id in traffic]
+    baseline = LinearPathMiddleware(None, tenant_manager=manager, context_cache=UncachedContextCache(manager))
+    current = TenantMiddleware(None, tenant_manager=manager)
+    for label, middleware in (("uncached", baseline), ("cached", current)):
+        elapsed = asyncio.run(run_dispatch(middleware, requests))
+        print(f"Dispatch   ({label:8s}): {per_call_us(elapsed, len(requests)):7.2f} us/request")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Toxic Role / Rule Generation Benchmark
+
+Generates a synthetic role catalogue (roles -> tcodes -> business actions
+named VERB_OBJECT, plus the built-in pattern actions) and times the
+whole-catalogue analysis:
+- toxicity: per-role calculate_toxicity_score (sampled, extrapolated)
+  vs. ToxicRoleDetector.score_all_roles over the role x action matrix
+- action rules: all-pairs shared-role loop (sampled, extrapolated) vs.
+  co-occurrence counts on the matrix
+- role rules: matrix-driven generate_from_role_analysis with a cap on
+  role pairs per conflicting action pair
+
+Run:
+    python scripts/benchmark_toxic_roles.py
+    python scripts/benchmark_toxic_roles.py --roles 25000 --users 50000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ara.graph import (
+    SoDGraph, RiskPatternLibrary, RoleActionMatrix,
+    ToxicRoleDetector, SoDRuleGenerator, RuleGenerationConfig,
+)
+
+VERBS = ["CREATE", "CHANGE", "DISPLAY", "APPROVE", "RELEASE", "POST", "DELETE", "REVERSE", "ARCHIVE", "PRINT"]
+OBJECTS = [
+    "VENDOR", "CUSTOMER", "MATERIAL", "INVOICE", "PAYMENT", "JOURNAL", "ASSET", "CONTRACT",
+    "PURCHASE_ORDER", "SALES_ORDER", "GOODS_RECEIPT", "DELIVERY", "BILLING", "CREDIT_MEMO",
+    "BANK_ACCOUNT", "COST_CENTER", "PROFIT_CENTER", "GL_ACCOUNT", "BUDGET", "EMPLOYEE",
+    "PAYROLL", "TIMESHEET", "PRICE", "QUOTATION", "WAREHOUSE", "INVENTORY", "BATCH", "PROJECT",
+    "USER", "ROLE",
+]
+
+
+def build_graph(users: int, roles: int, tcodes: int, seed: int) -> SoDGraph:
+    rng = random.Random(seed)
+    library = RiskPatternLibrary()
+    actions = sorted({a for p in library.get_active_patterns() for a in p.forbidden_actions})
+    actions += [f"{verb}_{obj}" for verb in VERBS for obj in OBJECTS]
+
+    tcode_actions = {f"T{t:05d}": [rng.choice(actions)] for t in range(tcodes)}
+    tcode_ids = list(tcode_actions)
+    role_tcodes = {f"R{r:05d}": rng.sample(tcode_ids, rng.randint(3, 15)) for r in range(roles)}
+    role_ids = list(role_tcodes)
+    user_roles = {
+        f"U{u:07d}": rng.sample(role_ids, rng.randint(1, 4))
+        for u in range(users)
+    }
+
+    graph = SoDGraph()
+    graph.load_from_sap_data(user_roles, role_tcodes, tcode_actions)
+    return graph
+
+
+def same_score(a, b) -> bool:
+    """Equal scores (forbidden_actions_enabled compared as a set)"""
+    unordered = {"forbidden_actions_enabled": None}
+    return a.to_dict() | unordered == b.to_dict() | unordered and \
+        a.forbidden_actions_enabled == b.forbidden_actions_enabled
+
+
+def baseline_action_pairs(generator: SoDRuleGenerator, action_roles, actions, min_shared: int):
+    """The former all-pairs loop over per-action role sets"""
+    hits = 0
+    for i, action1 in enumerate(actions):
+        for action2 in actions[i + 1:]:
+            shared = action_roles[action1] & action_roles[action2]
+            if len(shared) >= min_shared and generator._looks_like_conflict(action1, action2):
+                hits += 1
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark toxic role scoring and rule generation")
+    parser.add_argument("--roles", type=int, default=25000)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--tcodes", type=int, default=8000)
+    parser.add_argument("--baseline-sample", type=int, default=500, help="Roles scored one by one")
+    parser.add_argument("--baseline-actions", type=int, default=40, help="Actions in the all-pairs baseline")
+    parser.add_argument("--role-pairs", type=int, default=3, help="Role pairs per conflicting action pair")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    graph = build_graph(args.users, args.roles, args.tcodes, args.seed)
+    stats = graph.get_statistics()
+    print(f"Graph:    {stats['total_nodes']} nodes, {stats['total_edges']} edges "
+          f"(build {time.perf_counter() - started:.1f} s)")
+
+    # Includes warming the action and privilege closures of every role
+    started = time.perf_counter()
+    matrix = RoleActionMatrix(graph)
+    print(f"Matrix:   {(time.perf_counter() - started) * 1000:9.1f} ms  {matrix.get_statistics()}")
+
+    # Toxicity
+    detector = ToxicRoleDetector(graph)
+    sample = matrix.role_ids[:args.baseline_sample]
+    started = time.perf_counter()
+    baseline = {role_id: detector.calculate_toxicity_score(role_id) for role_id in sample}
+    per_role = (time.perf_counter() - started) / max(len(sample), 1)
+    print(f"Per-role: {per_role * 1e6:9.1f} us/role  (~{per_role * len(matrix.role_ids):.1f} s extrapolated)")
+
+    started = time.perf_counter()
+    scores = detector.score_all_roles(matrix)
+    elapsed = time.perf_counter() - started
+    agree = sum(same_score(scores[r], s) for r, s in baseline.items())
+    print(f"Batch:    {elapsed / len(scores) * 1e6:9.1f} us/role  ({elapsed:.2f} s total, "
+          f"sample agreement {agree}/{len(baseline)})")
+
+    started = time.perf_counter()
+    findings = detector.find_toxic_roles(min_score=20, matrix=matrix)
+    print(f"Findings: {len(findings)} roles >= 20 in {time.perf_counter() - started:.2f} s")
+
+    # Action rules
+    generator = SoDRuleGenerator(graph, RuleGenerationConfig(max_role_pairs_per_conflict=args.role_pairs))
+    min_shared = generator.config.min_cooccurring_roles
+    actions = matrix.action_ids[:args.baseline_actions]
+    started = time.perf_counter()
+    action_roles = {a: set(matrix.roles_of(matrix.column(a))) for a in actions}
+    baseline_hits = baseline_action_pairs(generator, action_roles, actions, min_shared)
+    elapsed = time.perf_counter() - started
+    # Role sets grow with the action count, the pair loop with its square
+    scale = (len(matrix.action_ids) / max(len(actions), 1)) ** 2
+    print(f"All-pairs: {elapsed:.2f} s for {len(actions)} actions (~{elapsed * scale:.1f} s for "
+          f"{len(matrix.action_ids)} extrapolated, {baseline_hits} rules)")
+
+    started = time.perf_counter()
+    action_rules = generator.generate_from_action_analysis(matrix)
+    elapsed = time.perf_counter() - started
+    subset = set(actions)
+    same = sum(1 for r in action_rules if r.conflicting_actions <= subset) == baseline_hits
+    print(f"Co-occur: {elapsed:.2f} s for {len(matrix.action_ids)} actions "
+          f"({len(action_rules)} rules, subset matches baseline: {same})")
+
+    # Role rules
+    started = time.perf_counter()
+    role_rules = generator.generate_from_role_analysis(matrix)
+    print(f"Role rules: {len(role_rules)} in {time.perf_counter() - started:.2f} s "
+          f"(<= {args.role_pairs} role pairs per conflicting action pair)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,12 @@ from .user_service import UserService
 from .role_service import RoleService
 from .risk_service import RiskService
 from .auth_service import AuthService
+from .stats_service import StatsService
 
 __all__ = [
     "UserService",
     "RoleService",
     "RiskService",
     "AuthService",
+    "StatsService",
 ]
@@ -17,6 +17,7 @@ from api.schemas.risk import (
     RiskAnalysisResult, RoleSimulationResult
 )
 from audit.logger import AuditLogger
+from .stats_service import StatsService
 
 
 class RiskService:
@@ -38,11 +39,25 @@ class RiskService:
         tenant_id: str,
         filters: ViolationFilters,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ) -> PaginatedViolationsResponse:
-        """List violations with pagination and filters"""
-        violations, total = self.violation_repo.get_violations(
+        """List violations with keyset pagination and filters"""
+        page = self.violation_repo.get_violations_page(
             tenant_id=tenant_id,
+            cursor=cursor,
+            limit=limit,
+            offset=offset,
+            count_mode=count_mode,
+            **self.page_filters(filters)
+        )
+        return self.page_response(page, limit, offset, cursor)
+
+    @staticmethod
+    def page_filters(filters: ViolationFilters) -> dict:
+        """RiskViolationRepository.get_violations_page filter arguments for ViolationFilters"""
+        return dict(
             search=filters.search,
             status=filters.status.value if filters.status else None,
             severity=filters.severity.value if filters.severity else None,
@@ -50,19 +65,26 @@ class RiskService:
             user_id=filters.user_id,
             rule_id=filters.rule_id,
             date_from=filters.date_from,
-            date_to=filters.date_to,
-            skip=offset,
-            limit=limit
+            date_to=filters.date_to
         )
 
-        items = [self._to_violation_summary(v) for v in violations]
-
+    @classmethod
+    def page_response(
+        cls,
+        page,
+        limit: int,
+        offset: int,
+        cursor: Optional[str] = None
+    ) -> PaginatedViolationsResponse:
+        """Build the list response from a repository page"""
         return PaginatedViolationsResponse(
-            items=items,
-            total=total,
+            items=[cls._to_violation_summary(v) for v in page.items],
+            total=page.total,
             limit=limit,
-            offset=offset,
-            has_more=(offset + limit) < total
+            offset=0 if cursor else offset,
+            has_more=page.has_more,
+            next_cursor=page.next_cursor,
+            total_is_estimate=page.total_is_estimate
         )
 
     def get_violation(
@@ -156,7 +178,9 @@ class RiskService:
 
     def get_violation_stats(self, tenant_id: str) -> ViolationStatsResponse:
         """Get violation statistics"""
-        stats = self.violation_repo.get_violation_stats(tenant_id)
+        stats = StatsService(self.db).get_violation_stats(tenant_id)
+        # Persist a summary row recomputed by this read
+        self.db.commit()
         return ViolationStatsResponse(
             total_violations=stats["total_violations"],
             open_violations=stats["open_violations"],
@@ -432,7 +456,8 @@ class RiskService:
 
     # ============== Private Methods ==============
 
-    def _to_violation_summary(self, violation) -> ViolationSummary:
+    @staticmethod
+    def _to_violation_summary(violation) -> ViolationSummary:
         """Convert violation to summary"""
         return ViolationSummary(
             id=violation.id,
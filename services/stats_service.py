@@ -0,0 +1,162 @@
+"""
+Stats Service
+Tenant dashboard statistics with caching and materialized summaries
+"""
+
+from typing import Optional, Dict, Any, Callable, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import copy
+import threading
+import time
+
+from repositories.user_repository import UserRepository
+from repositories.risk_repository import RiskViolationRepository, RiskRuleRepository
+from db.models.stats import TenantStatsSummary
+from db.stats_tracking import add_invalidation_listener, summaries_enabled
+
+# Summaries older than this are recomputed even without writes, since
+# some buckets (e.g. mitigated in the last 30 days) depend on the clock
+MAX_SUMMARY_AGE = timedelta(minutes=15)
+
+
+class TenantStatsCache:
+    """
+    In-process per-tenant statistics cache.
+
+    Entries are dropped when a commit touches the entity (see
+    db.stats_tracking) and expire after ttl_seconds to pick up writes made
+    by other processes.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id: str, entity: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get((tenant_id, entity))
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return copy.deepcopy(entry[1])
+
+    def set(self, tenant_id: str, entity: str, stats: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[(tenant_id, entity)] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(stats))
+
+    def invalidate(self, tenant_id: str, entity: Optional[str] = None) -> None:
+        with self._lock:
+            if entity:
+                self._entries.pop((tenant_id, entity), None)
+            else:
+                for key in [k for k in self._entries if k[0] == tenant_id]:
+                    del self._entries[key]
+
+
+stats_cache = TenantStatsCache()
+add_invalidation_listener(stats_cache.invalidate)
+
+
+class StatsService:
+    """
+    Service layer for dashboard statistics.
+
+    Reads go cache -> summary row -> one aggregate query per entity, so
+    repeated dashboard loads cost a dictionary lookup (or one primary-key
+    read in another process) regardless of tenant size.
+
+    Recomputed summary rows are flushed, not committed: they are persisted
+    when the caller commits its session.
+    """
+
+    def __init__(self, db: Session, use_summaries: bool = True):
+        self.db = db
+        self.use_summaries = use_summaries
+        self._loaders: Dict[str, Callable[[str], Dict[str, Any]]] = {
+            "users": UserRepository(db).get_user_stats,
+            "violations": RiskViolationRepository(db).get_violation_stats,
+            "rules": RiskRuleRepository(db).get_rule_stats,
+        }
+
+    def _get(self, tenant_id: str, entity: str) -> Dict[str, Any]:
+        stats = stats_cache.get(tenant_id, entity)
+        if stats is not None:
+            return stats
+
+        if self.use_summaries and summaries_enabled(self.db.connection()):
+            stats = self._from_summary(tenant_id, entity)
+        else:
+            stats = self._loaders[entity](tenant_id)
+
+        stats_cache.set(tenant_id, entity, stats)
+        return stats
+
+    def _from_summary(self, tenant_id: str, entity: str) -> Dict[str, Any]:
+        """Serve the materialized row, recomputing it when writes bumped its version"""
+        summary = self.db.get(TenantStatsSummary, (tenant_id, entity))
+        if (
+            summary is not None
+            and summary.computed_version == summary.version
+            and summary.computed_at >= datetime.utcnow() - MAX_SUMMARY_AGE
+        ):
+            return summary.payload
+
+        # Remember the version we computed against; a write landing while we
+        # aggregate bumps it again and keeps the row stale
+        version = summary.version if summary is not None else 0
+        stats = self._loaders[entity](tenant_id)
+
+        if summary is None:
+            try:
+                with self.db.begin_nested():
+                    self.db.add(TenantStatsSummary(
+                        tenant_id=tenant_id,
+                        entity=entity,
+                        payload=stats,
+                        version=0,
+                        computed_version=0,
+                        computed_at=datetime.utcnow()
+                    ))
+            except IntegrityError:
+                # Another reader materialized it first; theirs is as fresh
+                pass
+        else:
+            summary.payload = stats
+            summary.computed_version = version
+            summary.computed_at = datetime.utcnow()
+        self.db.flush()
+        return stats
+
+    # ============== Statistics ==============
+
+    def get_user_stats(self, tenant_id: str) -> Dict[str, Any]:
+        return self._get(tenant_id, "users")
+
+    def get_violation_stats(self, tenant_id: str) -> Dict[str, Any]:
+        return self._get(tenant_id, "violations")
+
+    def get_rule_stats(self, tenant_id: str) -> Dict[str, Any]:
+        return self._get(tenant_id, "rules")
+
+    def get_dashboard_stats(self, tenant_id: str) -> Dict[str, Any]:
+        """Users, violations and rules statistics for the tenant dashboard"""
+        return {
+            "tenant_id": tenant_id,
+            "users": self.get_user_stats(tenant_id),
+            "violations": self.get_violation_stats(tenant_id),
+            "rules": self.get_rule_stats(tenant_id),
+            "generated_at": datetime.utcnow().isoformat()
+        }
+
+    def refresh(self, tenant_id: str) -> Dict[str, Any]:
+        """Drop cached statistics for a tenant and recompute them"""
+        stats_cache.invalidate(tenant_id)
+        if self.use_summaries and summaries_enabled(self.db.connection()):
+            for entity in self._loaders:
+                summary = self.db.get(TenantStatsSummary, (tenant_id, entity))
+                if summary is not None:
+                    summary.computed_version = summary.version - 1
+            self.db.flush()
+        return self.get_dashboard_stats(tenant_id)
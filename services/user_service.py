@@ -25,6 +25,7 @@ from api.schemas.user import (
     RoleAssignment,
 )
 from audit.logger import AuditLogger, AuditAction
+from .stats_service import StatsService
 
 
 class UserService:
@@ -38,7 +39,8 @@ class UserService:
         self.repository = UserRepository(db)
         self.audit_logger = AuditLogger()
 
-    def _get_risk_level(self, risk_score: float) -> str:
+    @staticmethod
+    def _get_risk_level(risk_score: float) -> str:
         """Convert risk score to risk level"""
         if risk_score < 30:
             return "low"
@@ -48,7 +50,8 @@ class UserService:
             return "high"
         return "critical"
 
-    def _user_to_summary(self, user) -> UserSummary:
+    @classmethod
+    def _user_to_summary(cls, user) -> UserSummary:
         """Convert User model to UserSummary schema"""
         role_count = len([r for r in user.roles if r.is_active]) if user.roles else 0
         return UserSummary(
@@ -61,13 +64,14 @@ class UserService:
             title=user.title,
             status=user.status,
             risk_score=user.risk_score or 0.0,
-            risk_level=self._get_risk_level(user.risk_score or 0),
+            risk_level=cls._get_risk_level(user.risk_score or 0),
             violation_count=user.violation_count or 0,
             role_count=role_count,
             last_login=user.last_login
         )
 
-    def _user_to_detail(self, user) -> UserDetailResponse:
+    @classmethod
+    def _user_to_detail(cls, user) -> UserDetailResponse:
         """Convert User model to UserDetailResponse schema"""
         roles = []
         for ur in (user.roles or []):
@@ -125,7 +129,7 @@ class UserService:
             status=user.status,
             user_type=user.user_type or 'dialog',
             risk_score=user.risk_score or 0.0,
-            risk_level=self._get_risk_level(user.risk_score or 0),
+            risk_level=cls._get_risk_level(user.risk_score or 0),
             violation_count=user.violation_count or 0,
             last_login=user.last_login,
             last_synced_at=user.last_synced_at,
@@ -146,31 +150,63 @@ class UserService:
         tenant_id: str,
         filters: UserFilters,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ) -> PaginatedUsersResponse:
-        """List users with pagination and filters"""
-        users, total = self.repository.get_users(
+        """
+        List users with pagination and filters.
+
+        Pass next_cursor from the previous response as cursor to page
+        without OFFSET; count_mode "estimate" avoids a full COUNT on large
+        tenants.
+        """
+        page = self.repository.get_users_page(
             tenant_id=tenant_id,
+            cursor=cursor,
+            limit=limit,
+            offset=offset,
+            count_mode=count_mode,
+            **self.page_filters(filters)
+        )
+        return self.page_response(page, limit, offset, cursor)
+
+    @staticmethod
+    def page_filters(filters: UserFilters) -> dict:
+        """UserRepository.get_users_page filter arguments for UserFilters"""
+        return dict(
             search=filters.search,
             status=filters.status.value if filters.status else None,
             department=filters.department,
             risk_level=filters.risk_level.value if filters.risk_level else None,
             user_type=filters.user_type.value if filters.user_type else None,
-            has_violations=filters.has_violations,
-            skip=offset,
-            limit=limit
+            has_violations=filters.has_violations
         )
 
-        items = [self._user_to_summary(u) for u in users]
-
+    @classmethod
+    def page_response(
+        cls,
+        page,
+        limit: int,
+        offset: int,
+        cursor: Optional[str] = None
+    ) -> PaginatedUsersResponse:
+        """Build the list response from a repository page"""
         return PaginatedUsersResponse(
-            items=items,
-            total=total,
+            items=[cls._user_to_summary(u) for u in page.items],
+            total=page.total,
             limit=limit,
-            offset=offset,
-            has_more=(offset + len(items)) < total
+            offset=0 if cursor else offset,
+            has_more=page.has_more,
+            next_cursor=page.next_cursor,
+            total_is_estimate=page.total_is_estimate
         )
 
+    @classmethod
+    def detail_response(cls, user) -> UserDetailResponse:
+        """Build the detail response from a user loaded with get_user_with_details"""
+        return cls._user_to_detail(user)
+
     def get_user(self, tenant_id: str, user_id: str) -> Optional[UserDetailResponse]:
         """Get user detail by user_id"""
         user = self.repository.get_user_with_details(tenant_id, user_id)
@@ -399,7 +435,9 @@ class UserService:
 
     def get_user_stats(self, tenant_id: str) -> UserStatsResponse:
         """Get user statistics"""
-        stats = self.repository.get_user_stats(tenant_id)
+        stats = StatsService(self.db).get_user_stats(tenant_id)
+        # Persist a summary row recomputed by this read
+        self.db.commit()
         return UserStatsResponse(**stats)
 
     def get_departments(self, tenant_id: str) -> List[str]:
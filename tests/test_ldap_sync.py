@@ -0,0 +1,76 @@
+"""DirectorySyncEngine page prefetching"""
+
+import threading
+
+import pytest
+
+from core.identity.ldap_sync import DirectorySyncEngine
+
+
+def make_engine(prefetch_pages: int = 1) -> DirectorySyncEngine:
+    return DirectorySyncEngine(connector=None, profile_service=None, prefetch_pages=prefetch_pages)
+
+
+def pager_threads():
+    return [t for t in threading.enumerate() if t.name == "ldap-sync-pager"]
+
+
+def assert_pager_exits():
+    for thread in pager_threads():
+        thread.join(timeout=5.0)
+        assert not thread.is_alive(), "producer thread still blocked after the consumer stopped"
+
+
+def test_prefetched_yields_every_page_in_order():
+    pages = [[f"user{i}"] for i in range(10)]
+    assert list(make_engine(prefetch_pages=2)._prefetched(iter(pages))) == pages
+    assert_pager_exits()
+
+
+def test_early_exit_stops_producer_blocked_on_page():
+    stream = make_engine()._prefetched(iter([["a"]] * 100))
+    assert next(stream) == ["a"]
+    stream.close()
+    assert_pager_exits()
+
+
+def exhausted_pages(pages, exhausted: threading.Event, error: Exception = None):
+    """Yield pages, then flag that the producer has none left (and raise error)"""
+    yield from pages
+    exhausted.set()
+    if error is not None:
+        raise error
+
+
+def test_early_exit_stops_producer_blocked_on_end_marker():
+    # The buffer still holds page "b" when the producer runs out of pages,
+    # so the end marker waits for room the stopped consumer never makes
+    exhausted = threading.Event()
+    stream = make_engine()._prefetched(exhausted_pages([["a"], ["b"]], exhausted))
+    assert next(stream) == ["a"]
+    assert exhausted.wait(timeout=5.0)
+    stream.close()
+    assert_pager_exits()
+
+
+def test_early_exit_stops_producer_blocked_on_error():
+    exhausted = threading.Event()
+    stream = make_engine()._prefetched(
+        exhausted_pages([["a"], ["b"]], exhausted, RuntimeError("directory unavailable"))
+    )
+    assert next(stream) == ["a"]
+    assert exhausted.wait(timeout=5.0)
+    stream.close()
+    assert_pager_exits()
+
+
+def test_producer_error_is_raised_to_consumer():
+    def pages():
+        yield ["a"]
+        raise RuntimeError("directory unavailable")
+
+    stream = make_engine()._prefetched(pages())
+    assert next(stream) == ["a"]
+    with pytest.raises(RuntimeError, match="directory unavailable"):
+        next(stream)
+    assert_pager_exits()
@@ -0,0 +1,148 @@
+"""LLMExecutor caching, coalescing, retries and concurrency on the mock provider"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.ara.llm.executor import LLMExecutor, LLMExecutorConfig, RateLimitError
+from core.ara.llm.summarizer import RiskSummarizer, SummaryConfig
+
+
+def finding(user_id: str = "jdoe", rule_name: str = "Create Vendor + Pay Vendor") -> dict:
+    return {
+        "user_id": user_id,
+        "risk_score": 85,
+        "severity": "high",
+        "rule_name": rule_name,
+        "evidence": ["XK01 executed", "F110 executed"],
+    }
+
+
+class MockProvider:
+    """The summarizer's mock provider, counting calls and failing on demand"""
+
+    def __init__(self, delay: float = 0.0, failures=()):
+        self.summarizer = RiskSummarizer(SummaryConfig())
+        self.delay = delay
+        self.failures = list(failures)
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            failure = self.failures.pop(0) if self.failures else None
+        try:
+            time.sleep(self.delay)
+            if failure is not None:
+                raise failure
+            return self.summarizer._complete_mock(request)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_executor(provider: MockProvider, **config) -> LLMExecutor:
+    config.setdefault("retry_base_delay", 0.0)
+    return LLMExecutor(provider, LLMExecutorConfig(**config))
+
+
+def request_for(payload: dict):
+    return RiskSummarizer(SummaryConfig())._build_request(payload)
+
+
+def test_cache_serves_repeat_requests_without_provider_call():
+    provider = MockProvider()
+    executor = make_executor(provider)
+
+    first = executor.run_sync(request_for(finding()))
+    second = executor.run_sync(request_for(finding()))
+
+    assert provider.calls == 1
+    assert not first.cached and second.cached
+    assert second.content == first.content
+    assert executor.metrics.cache_hits == 1
+
+
+def test_summarizer_shares_one_call_across_users():
+    summarizer = RiskSummarizer(SummaryConfig())
+    results = summarizer.summarize_batch([finding("alice"), finding("bob")])
+
+    assert summarizer.executor.metrics.calls == 1
+    assert "alice" in results[0].summary and "bob" in results[1].summary
+
+
+def test_identical_in_flight_requests_are_coalesced():
+    provider = MockProvider(delay=0.1)
+    executor = make_executor(provider, cache_enabled=False)
+
+    responses = executor.run_batch([request_for(finding())] * 5)
+
+    assert provider.calls == 1
+    assert sum(r.coalesced for r in responses) == 4
+    assert len({r.content for r in responses}) == 1
+
+
+def test_cancelled_leader_does_not_cancel_coalesced_waiters():
+    provider = MockProvider(delay=0.2)
+    executor = make_executor(provider, cache_enabled=False)
+    request = request_for(finding())
+
+    async def scenario():
+        leader = asyncio.ensure_future(executor.run(request))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.ensure_future(executor.run(request))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        response = await waiter
+        assert leader.cancelled()
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.coalesced
+    assert provider.calls == 1
+
+
+def test_rate_limits_and_transient_errors_are_retried():
+    provider = MockProvider(failures=[RateLimitError(retry_after=0.01), TimeoutError("read timed out")])
+    executor = make_executor(provider, cache_enabled=False)
+
+    response = executor.run_sync(request_for(finding()))
+
+    assert response.content
+    assert provider.calls == 3
+    assert executor.metrics.retries == 2
+    assert executor.metrics.rate_limited == 1
+
+
+def test_other_errors_fail_without_retry():
+    provider = MockProvider(failures=[ValueError("bad request")])
+    executor = make_executor(provider, cache_enabled=False)
+
+    with pytest.raises(ValueError):
+        executor.run_sync(request_for(finding()))
+    assert provider.calls == 1
+    assert executor.metrics.failures == 1
+
+
+def test_concurrency_limit_holds_across_threads():
+    provider = MockProvider(delay=0.05)
+    executor = make_executor(provider, max_concurrency=2, cache_enabled=False)
+
+    def batch(thread_no: int):
+        executor.run_batch([request_for(finding(rule_name=f"rule {thread_no}-{i}")) for i in range(4)])
+
+    threads = [threading.Thread(target=batch, args=(n,)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert provider.calls == 12
+    assert provider.peak <= 2